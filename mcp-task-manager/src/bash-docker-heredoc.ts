@@ -5,6 +5,8 @@
  * by detecting heredocs and converting them to a more compatible format.
  */
 
+import { isValidContainerName } from './scope.js';
+
 export function transformHeredocCommand(command: string): string {
   // Pattern to detect heredoc: cat > file << 'EOF' or cat > file <<EOF
   const heredocPattern = /cat\s*>\s*([^\s]+)\s*<<\s*['"]?(\w+)['"]?\n([\s\S]*?)\n\2/;
@@ -66,19 +68,27 @@ export function transformHeredocCommandBase64(command: string): string {
 /**
  * Another approach: Create a temporary script file
  * This is useful for very long heredocs
+ *
+ * Commands run through `docker exec` with an argument list (execFile), so
+ * neither the container name nor the command passes through a host shell.
  */
 export async function handleHeredocViaScript(
   containerName: string,
   command: string,
-  execAsync: Function
+  execFileAsync: (file: string, args: string[]) => Promise<{ stdout: string; stderr: string }>
 ): Promise<{ stdout: string; stderr: string }> {
+  if (!isValidContainerName(containerName)) {
+    throw new Error(`Invalid Docker container name: ${JSON.stringify(containerName)}`);
+  }
+  const dockerBash = (script: string) =>
+    execFileAsync('docker', ['exec', containerName, '/bin/bash', '-c', script]);
+
   const heredocPattern = /cat\s*>\s*([^\s]+)\s*<<\s*['"]?(\w+)['"]?\n([\s\S]*?)\n\2/;
   const match = command.match(heredocPattern);
 
   if (!match) {
     // No heredoc, execute normally
-    const dockerCommand = `docker exec ${containerName} /bin/bash -c ${JSON.stringify(command)}`;
-    return execAsync(dockerCommand);
+    return dockerBash(command);
   }
 
   const [fullMatch, fileName, delimiter, content] = match;
@@ -93,23 +103,20 @@ ${content}
 ${delimiter}
 `;
 
-  // First, create the script file
-  const createScriptCmd = `docker exec ${containerName} /bin/bash -c ${JSON.stringify(`echo ${JSON.stringify(scriptContent)} > ${scriptName} && chmod +x ${scriptName}`)}`;
-  await execAsync(createScriptCmd);
+  // First, create the script file (content passed base64-encoded, never interpreted)
+  const encoded = Buffer.from(scriptContent).toString('base64');
+  await dockerBash(`echo ${encoded} | base64 -d > ${scriptName} && chmod +x ${scriptName}`);
 
   // Execute the script
-  const executeScriptCmd = `docker exec ${containerName} ${scriptName}`;
-  const result = await execAsync(executeScriptCmd);
+  const result = await execFileAsync('docker', ['exec', containerName, scriptName]);
 
   // Clean up the script
-  const cleanupCmd = `docker exec ${containerName} rm ${scriptName}`;
-  await execAsync(cleanupCmd).catch(() => {}); // Ignore cleanup errors
+  await execFileAsync('docker', ['exec', containerName, 'rm', scriptName]).catch(() => {}); // Ignore cleanup errors
 
   // If there were more commands after the heredoc, execute them
   const remainingCommand = command.replace(fullMatch, '').trim();
   if (remainingCommand) {
-    const remainingCmd = `docker exec ${containerName} /bin/bash -c ${JSON.stringify(remainingCommand)}`;
-    const remainingResult = await execAsync(remainingCmd);
+    const remainingResult = await dockerBash(remainingCommand);
     return {
       stdout: result.stdout + remainingResult.stdout,
       stderr: result.stderr + remainingResult.stderr
@@ -7,30 +7,33 @@ import { Pool } from 'pg';
 import type {
   Epic, Task, Test, ProjectStatus, EpicProgress,
   TaskWithEpic, TaskDetail, Session, NewEpic, NewTask, NewTest,
-  EpicTest, NewEpicTest
+  EpicTest, NewEpicTest, RoadmapEpic, CreatedRoadmapEpic
 } from './types.js';
+import { currentScope } from './scope.js';
 
 export class TaskDatabase {
   private pool: Pool;
-  private projectId: string;
 
-  constructor() {
+  /**
+   * @param requireProject - Fail without PROJECT_ID (stdio mode). The shared
+   *   HTTP server has no project of its own; each call brings its scope.
+   */
+  constructor(requireProject: boolean = true) {
     // Get PostgreSQL connection from environment
     const connectionString = process.env.DATABASE_URL;
     if (!connectionString) {
       throw new Error('DATABASE_URL environment variable is required');
     }
 
-    // Get project ID from environment
-    this.projectId = process.env.PROJECT_ID || '';
-    if (!this.projectId) {
+    if (requireProject && !process.env.PROJECT_ID) {
       throw new Error('PROJECT_ID environment variable is required');
     }
 
-    // Create connection pool
+    // Create connection pool (one per stdio server, so keep it small; see database.mcp_pool_max_size.
+    // The shared server sizes it for all sessions; see mcp.pool_max_size)
     this.pool = new Pool({
       connectionString,
-      max: 10, // Maximum number of connections in the pool
+      max: parseInt(process.env.DB_POOL_MAX || '3', 10), // Maximum number of connections in the pool
       idleTimeoutMillis: 30000, // Close idle clients after 30 seconds
       connectionTimeoutMillis: 2000, // Return an error after 2 seconds if connection could not be established
     });
@@ -41,10 +44,45 @@ export class TaskDatabase {
     });
   }
 
-  // Execute a query and return results
-  async query<T>(sql: string, params: any[] = []): Promise<T[]> {
+  // Session scope of the current call (see scope.ts)
+  private get projectId(): string {
+    const projectId = currentScope().projectId;
+    if (!projectId) {
+      throw new Error('No PROJECT_ID for this session');
+    }
+    return projectId;
+  }
+
+  // Optional epic scope (set for parallel epic sessions)
+  private get epicId(): string | null {
+    return currentScope().epicId;
+  }
+
+  // Optional task leasing (set per agent session so concurrent sessions never share a task)
+  private get workerId(): string | null {
+    return currentScope().workerId;
+  }
+
+  private get leaseTtl(): number {
+    return currentScope().leaseTtl;
+  }
+
+  // Connection pool usage (shared server health check)
+  getPoolStats(): { total: number; idle: number; waiting: number } {
+    return {
+      total: this.pool.totalCount,
+      idle: this.pool.idleCount,
+      waiting: this.pool.waitingCount,
+    };
+  }
+
+  // Execute a query and return results.
+  // A name makes it a prepared statement, parsed and planned once per pooled connection (use for hot queries).
+  async query<T>(sql: string, params: any[] = [], name?: string): Promise<T[]> {
     try {
-      const result = await this.pool.query(sql, params);
+      const result = name
+        ? await this.pool.query({ name, text: sql, values: params })
+        : await this.pool.query(sql, params);
       return result.rows as T[];
     } catch (error: any) {
       throw new Error(`Database query failed: ${error.message}\nSQL: ${sql}`);
@@ -63,27 +101,20 @@ export class TaskDatabase {
   // Query methods
 
   async getProjectStatus(): Promise<ProjectStatus> {
+    // project_progress is maintained by triggers (Migration 026), so this is a single-row lookup
     const result = await this.query<ProjectStatus>(`
       SELECT
-        (SELECT COUNT(*)::int FROM epics WHERE project_id = $1) as total_epics,
-        (SELECT COUNT(*)::int FROM epics WHERE project_id = $1 AND status = 'completed') as completed_epics,
-        (SELECT COUNT(*)::int FROM tasks WHERE project_id = $1) as total_tasks,
-        (SELECT COUNT(*)::int FROM tasks WHERE project_id = $1 AND done = true) as completed_tasks,
-        (SELECT COUNT(*)::int FROM task_tests t
-         JOIN tasks tk ON t.task_id = tk.id
-         WHERE tk.project_id = $1) as total_tests,
-        (SELECT COUNT(*)::int FROM task_tests t
-         JOIN tasks tk ON t.task_id = tk.id
-         WHERE tk.project_id = $1 AND t.passes = true) as passing_tests,
-        COALESCE(ROUND(100.0 * (SELECT COUNT(*) FROM tasks WHERE project_id = $1 AND done = true) /
-              NULLIF((SELECT COUNT(*) FROM tasks WHERE project_id = $1), 0), 1), 0) as task_completion_pct,
-        COALESCE(ROUND(100.0 * (SELECT COUNT(*) FROM task_tests t
-         JOIN tasks tk ON t.task_id = tk.id
-         WHERE tk.project_id = $1 AND t.passes = true) /
-              NULLIF((SELECT COUNT(*) FROM task_tests t
-         JOIN tasks tk ON t.task_id = tk.id
-         WHERE tk.project_id = $1), 0), 1), 0) as test_pass_pct
-    `, [this.projectId]);
+        total_epics,
+        completed_epics,
+        total_tasks,
+        completed_tasks,
+        total_task_tests as total_tests,
+        passing_task_tests as passing_tests,
+        COALESCE(ROUND(100.0 * completed_tasks / NULLIF(total_tasks, 0), 1), 0) as task_completion_pct,
+        COALESCE(ROUND(100.0 * passing_task_tests / NULLIF(total_task_tests, 0), 1), 0) as test_pass_pct
+      FROM project_progress
+      WHERE project_id = $1
+    `, [this.projectId], 'project-status');
 
     return result[0] ? { ...result[0], project_id: this.projectId } : {
       project_id: this.projectId,
@@ -117,6 +148,7 @@ export class TaskDatabase {
         LEFT JOIN epic_tests et ON et.epic_id = e.id AND et.project_id = e.project_id
         WHERE e.project_id = $1
           AND e.status != 'completed'
+          AND ($2::int IS NULL OR e.id = $2::int)
         GROUP BY e.id, e.name
         HAVING COUNT(t.id) > 0  -- Has tasks
       )
@@ -130,7 +162,7 @@ export class TaskDatabase {
         AND (epic_test_status IS NULL OR epic_test_status != 'passed')  -- But epic test not passed
       ORDER BY id
       LIMIT 1
-    `, [this.projectId]);
+    `, [this.projectId, this.epicId], 'epics-pending-tests');
 
     if (epicsPendingTests.length > 0) {
       const epic = epicsPendingTests[0];
@@ -156,6 +188,10 @@ export class TaskDatabase {
       } as TaskWithEpic;
     }
 
+    if (this.workerId) {
+      return this.claimNextTask();
+    }
+
     // If no epics need testing, return the next pending task as before
     const result = await this.query<TaskWithEpic>(`
       SELECT
@@ -173,9 +209,51 @@ export class TaskDatabase {
       FROM tasks t
       JOIN epics e ON t.epic_id = e.id
       WHERE t.project_id = $1 AND t.done = false
+        AND ($2::int IS NULL OR t.epic_id = $2::int)
       ORDER BY e.priority, t.priority
       LIMIT 1
-    `, [this.projectId]);
+    `, [this.projectId, this.epicId], 'next-task');
+
+    return result[0] || null;
+  }
+
+  /**
+   * Lease the next pending task to this worker.
+   * FOR UPDATE SKIP LOCKED keeps concurrent workers from claiming the same row;
+   * tasks with an expired lease (or already leased to this worker) are claimable.
+   */
+  private async claimNextTask(): Promise<TaskWithEpic | null> {
+    const result = await this.query<TaskWithEpic>(`
+      UPDATE tasks t
+      SET leased_by = $3,
+          lease_expires_at = NOW() + ($4::int * INTERVAL '1 second')
+      FROM epics e
+      WHERE e.id = t.epic_id
+        AND t.id = (
+          SELECT ct.id
+          FROM tasks ct
+          JOIN epics ce ON ct.epic_id = ce.id
+          WHERE ct.project_id = $1 AND ct.done = false
+            AND ce.status != 'completed'
+            AND ($2::int IS NULL OR ct.epic_id = $2::int)
+            AND (ct.leased_by IS NULL OR ct.leased_by = $3 OR ct.lease_expires_at < NOW())
+          ORDER BY ce.priority, ct.priority, ct.id
+          LIMIT 1
+          FOR UPDATE OF ct SKIP LOCKED
+        )
+      RETURNING
+        t.id::text,
+        t.epic_id::text,
+        t.description,
+        t.action,
+        'pending' as status,
+        t.priority,
+        t.created_at,
+        t.completed_at,
+        t.session_notes,
+        CASE WHEN t.done = true THEN 1 ELSE 0 END as done,
+        e.name as epic_name
+    `, [this.projectId, this.epicId, this.workerId, this.leaseTtl], 'claim-next-task');
 
     return result[0] || null;
   }
@@ -684,7 +762,9 @@ export class TaskDatabase {
 
     await this.exec(`
       UPDATE tasks
-      SET done = $1, completed_at = ${completedAt}
+      SET done = $1, completed_at = ${completedAt},
+          leased_by = CASE WHEN $1 THEN NULL ELSE leased_by END,
+          lease_expires_at = CASE WHEN $1 THEN NULL ELSE lease_expires_at END
       WHERE id = $2 AND project_id = $3
     `, [done, String(taskId), this.projectId]);
 
@@ -991,6 +1071,151 @@ export class TaskDatabase {
     return createdTasks;
   }
 
+  /**
+   * Create epics with their tasks and tests in one transaction.
+   * IDs are reserved from the sequences first, then each table gets a single
+   * INSERT ... SELECT FROM unnest(...), so a whole roadmap takes a handful of
+   * round trips instead of one per row. Entries with epic_id add tasks to an
+   * existing epic. Nothing is written if any row fails.
+   */
+  async createRoadmap(epics: RoadmapEpic[]): Promise<CreatedRoadmapEpic[]> {
+    const client = await this.pool.connect();
+    try {
+      await client.query('BEGIN');
+
+      const reserve = async (table: string, count: number): Promise<number[]> => {
+        if (count === 0) return [];
+        const res = await client.query(
+          `SELECT nextval(pg_get_serial_sequence('${table}', 'id'))::int AS id FROM generate_series(1, $1)`,
+          [count]
+        );
+        return res.rows.map((row: { id: number }) => row.id);
+      };
+
+      const existingIds = epics.filter(e => e.epic_id != null).map(e => Number(e.epic_id));
+      const existing = new Map<number, { name: string; max_task_priority: number }>();
+      if (existingIds.length > 0) {
+        const res = await client.query(`
+          SELECT e.id, e.name, COALESCE(MAX(t.priority), 0)::int AS max_task_priority
+          FROM epics e
+          LEFT JOIN tasks t ON t.epic_id = e.id
+          WHERE e.project_id = $1 AND e.id = ANY($2::int[])
+          GROUP BY e.id
+        `, [this.projectId, existingIds]);
+        for (const row of res.rows) {
+          existing.set(row.id, { name: row.name, max_task_priority: row.max_task_priority });
+        }
+        const missing = existingIds.filter(id => !existing.has(id));
+        if (missing.length > 0) {
+          throw new Error(`Epic(s) ${missing.join(', ')} not found in this project`);
+        }
+      }
+
+      const priorityRes = await client.query(
+        'SELECT COALESCE(MAX(priority), 0)::int + 1 AS next FROM epics WHERE project_id = $1',
+        [this.projectId]
+      );
+      let nextEpicPriority: number = priorityRes.rows[0].next;
+
+      const allTasks = epics.flatMap(e => e.tasks || []);
+      const newEpicIds = await reserve('epics', epics.filter(e => e.epic_id == null).length);
+      const taskIds = await reserve('tasks', allTasks.length);
+      const testIds = await reserve('task_tests', allTasks.flatMap(t => t.tests || []).length);
+
+      const epicCols = { id: [] as number[], name: [] as string[], description: [] as (string | null)[], priority: [] as number[] };
+      const taskCols = { id: [] as number[], epic_id: [] as number[], description: [] as string[], action: [] as (string | null)[], priority: [] as number[] };
+      const testCols = {
+        id: [] as number[], task_id: [] as number[], category: [] as string[], test_type: [] as string[],
+        description: [] as string[], requirements: [] as (string | null)[], success_criteria: [] as (string | null)[],
+        steps: [] as string[]
+      };
+      const created: CreatedRoadmapEpic[] = [];
+
+      for (const epic of epics) {
+        let epicId: number;
+        let epicName: string;
+        let nextTaskPriority: number;
+        if (epic.epic_id != null) {
+          epicId = Number(epic.epic_id);
+          epicName = existing.get(epicId)!.name;
+          nextTaskPriority = existing.get(epicId)!.max_task_priority + 1;
+        } else {
+          if (!epic.name) throw new Error('New epics need a name (or pass epic_id to add tasks to an existing epic)');
+          epicId = newEpicIds.shift()!;
+          epicName = epic.name;
+          nextTaskPriority = 1;
+          epicCols.id.push(epicId);
+          epicCols.name.push(epic.name);
+          epicCols.description.push(epic.description || null);
+          epicCols.priority.push(epic.priority ?? nextEpicPriority);
+          nextEpicPriority++;
+        }
+
+        const createdTasks: CreatedRoadmapEpic['tasks'] = [];
+        for (const task of epic.tasks || []) {
+          const taskId = taskIds.shift()!;
+          taskCols.id.push(taskId);
+          taskCols.epic_id.push(epicId);
+          taskCols.description.push(task.description);
+          taskCols.action.push(task.action || null);
+          taskCols.priority.push(task.priority ?? nextTaskPriority);
+          nextTaskPriority++;
+
+          const createdTests: Array<{ id: string; description: string }> = [];
+          for (const test of task.tests || []) {
+            const testId = testIds.shift()!;
+            testCols.id.push(testId);
+            testCols.task_id.push(taskId);
+            testCols.category.push(test.category || 'functional');
+            testCols.test_type.push(test.test_type || 'unit');
+            testCols.description.push(test.description);
+            testCols.requirements.push(test.requirements || null);
+            testCols.success_criteria.push(test.success_criteria || null);
+            testCols.steps.push(JSON.stringify(test.steps || []));
+            createdTests.push({ id: String(testId), description: test.description });
+          }
+          createdTasks.push({ id: String(taskId), description: task.description, tests: createdTests });
+        }
+        created.push({ id: String(epicId), name: epicName, tasks: createdTasks });
+      }
+
+      // Parents before children so foreign keys hold
+      if (epicCols.id.length > 0) {
+        await client.query(`
+          INSERT INTO epics (id, project_id, name, description, priority)
+          SELECT id, $1::uuid, name, description, priority
+          FROM unnest($2::int[], $3::text[], $4::text[], $5::int[]) AS r(id, name, description, priority)
+        `, [this.projectId, epicCols.id, epicCols.name, epicCols.description, epicCols.priority]);
+      }
+      if (taskCols.id.length > 0) {
+        await client.query(`
+          INSERT INTO tasks (id, epic_id, project_id, description, action, priority)
+          SELECT id, epic_id, $1::uuid, description, action, priority
+          FROM unnest($2::int[], $3::int[], $4::text[], $5::text[], $6::int[]) AS r(id, epic_id, description, action, priority)
+        `, [this.projectId, taskCols.id, taskCols.epic_id, taskCols.description, taskCols.action, taskCols.priority]);
+      }
+      if (testCols.id.length > 0) {
+        await client.query(`
+          INSERT INTO task_tests (id, task_id, project_id, category, test_type, description, requirements, success_criteria, steps)
+          SELECT id, task_id, $1::uuid, category, test_type, description, requirements, success_criteria, steps
+          FROM unnest($2::int[], $3::int[], $4::text[], $5::text[], $6::text[], $7::text[], $8::text[], $9::jsonb[])
+            AS r(id, task_id, category, test_type, description, requirements, success_criteria, steps)
+        `, [
+          this.projectId, testCols.id, testCols.task_id, testCols.category, testCols.test_type,
+          testCols.description, testCols.requirements, testCols.success_criteria, testCols.steps
+        ]);
+      }
+
+      await client.query('COMMIT');
+      return created;
+    } catch (error: any) {
+      await client.query('ROLLBACK').catch(() => {});
+      throw new Error(`Failed to create roadmap: ${error.message}`);
+    } finally {
+      client.release();
+    }
+  }
+
   async markProjectComplete(): Promise<void> {
     await this.exec(`
       UPDATE projects
@@ -0,0 +1,156 @@
+/**
+ * Shared task manager server (MCP_TRANSPORT=http)
+ *
+ * One long-lived process per host serves the task-manager tools to every
+ * agent session over MCP Streamable HTTP, with a single Postgres pool,
+ * instead of one stdio process (and pool) per session.
+ *
+ * Every request must carry `Authorization: Bearer <MCP_SHARED_SECRET>`, the
+ * per-run secret the spawning process passed in the environment.
+ *
+ * - POST/GET/DELETE /mcp: MCP endpoint. An initialize request opens an MCP
+ *   session whose scope comes from the request headers (X-Project-Id,
+ *   X-Epic-Id, X-Worker-Id, X-Task-Lease-Ttl, X-Docker-Container); later
+ *   requests carry the mcp-session-id header.
+ * - GET /health: pool and session counts, 503 if Postgres is unreachable.
+ *
+ * Started and health-checked by server/client/mcp_server.py.
+ */
+
+import http from 'http';
+import { randomUUID, timingSafeEqual } from 'crypto';
+import type { Server } from '@modelcontextprotocol/sdk/server/index.js';
+import { StreamableHTTPServerTransport } from '@modelcontextprotocol/sdk/server/streamableHttp.js';
+import { isInitializeRequest } from '@modelcontextprotocol/sdk/types.js';
+import type { TaskDatabase } from './database.js';
+import { isValidContainerName, scopeFromHeaders } from './scope.js';
+import type { SessionScope } from './scope.js';
+
+interface McpSession {
+  transport: StreamableHTTPServerTransport;
+  scope: SessionScope;
+}
+
+function sendJson(res: http.ServerResponse, status: number, body: unknown): void {
+  res.writeHead(status, { 'Content-Type': 'application/json' });
+  res.end(JSON.stringify(body));
+}
+
+function sendRpcError(res: http.ServerResponse, status: number, message: string): void {
+  sendJson(res, status, { jsonrpc: '2.0', error: { code: -32000, message }, id: null });
+}
+
+async function readJson(req: http.IncomingMessage): Promise<unknown> {
+  const chunks: Buffer[] = [];
+  for await (const chunk of req) {
+    chunks.push(chunk as Buffer);
+  }
+  const text = Buffer.concat(chunks).toString('utf8');
+  return text ? JSON.parse(text) : undefined;
+}
+
+function isAuthorized(req: http.IncomingMessage, secret: string): boolean {
+  const header = req.headers['authorization'];
+  const value = Array.isArray(header) ? header[0] : header;
+  const expected = Buffer.from(`Bearer ${secret}`);
+  const actual = Buffer.from(value || '');
+  return actual.length === expected.length && timingSafeEqual(actual, expected);
+}
+
+export function startHttpServer(
+  createServer: (scope: SessionScope) => Server,
+  db: TaskDatabase,
+  host: string,
+  port: number,
+  secret: string
+): http.Server {
+  const sessions = new Map<string, McpSession>();
+  const startedAt = Date.now();
+  let sessionsOpened = 0;
+
+  async function handleMcp(req: http.IncomingMessage, res: http.ServerResponse): Promise<void> {
+    const sessionIdHeader = req.headers['mcp-session-id'];
+    const sessionId = Array.isArray(sessionIdHeader) ? sessionIdHeader[0] : sessionIdHeader;
+    const body = req.method === 'POST' ? await readJson(req) : undefined;
+
+    const existing = sessionId ? sessions.get(sessionId) : undefined;
+    if (existing) {
+      await existing.transport.handleRequest(req, res, body);
+      return;
+    }
+
+    if (req.method !== 'POST' || sessionId || !isInitializeRequest(body)) {
+      sendRpcError(res, sessionId ? 404 : 400, sessionId ? 'Unknown MCP session' : 'Expected an initialize request');
+      return;
+    }
+
+    const scope = scopeFromHeaders(req.headers);
+    if (!scope.projectId) {
+      sendRpcError(res, 400, 'X-Project-Id header is required');
+      return;
+    }
+    if (scope.dockerContainer && !isValidContainerName(scope.dockerContainer)) {
+      sendRpcError(res, 400, 'Invalid X-Docker-Container header');
+      return;
+    }
+
+    const transport: StreamableHTTPServerTransport = new StreamableHTTPServerTransport({
+      sessionIdGenerator: () => randomUUID(),
+      onsessioninitialized: (id: string) => {
+        sessions.set(id, { transport, scope });
+        sessionsOpened += 1;
+        console.error(`[shared] Session ${id} opened for project ${scope.projectId} (${sessions.size} open)`);
+      },
+    });
+    transport.onclose = () => {
+      if (transport.sessionId && sessions.delete(transport.sessionId)) {
+        console.error(`[shared] Session ${transport.sessionId} closed (${sessions.size} open)`);
+      }
+    };
+
+    await createServer(scope).connect(transport);
+    await transport.handleRequest(req, res, body);
+  }
+
+  async function handleHealth(res: http.ServerResponse): Promise<void> {
+    const projects = new Set(Array.from(sessions.values(), (session) => session.scope.projectId));
+    const stats = {
+      sessions: sessions.size,
+      sessions_opened: sessionsOpened,
+      projects: projects.size,
+      uptime_seconds: Math.round((Date.now() - startedAt) / 1000),
+      pool: db.getPoolStats(),
+    };
+    try {
+      await db.query('SELECT 1');
+      sendJson(res, 200, { status: 'ok', ...stats });
+    } catch (error: any) {
+      sendJson(res, 503, { status: 'error', error: error.message, ...stats });
+    }
+  }
+
+  const httpServer = http.createServer(async (req, res) => {
+    const url = new URL(req.url || '/', 'http://localhost');
+    try {
+      if (!isAuthorized(req, secret)) {
+        sendJson(res, 401, { error: 'Unauthorized' });
+      } else if (url.pathname === '/health' && req.method === 'GET') {
+        await handleHealth(res);
+      } else if (url.pathname === '/mcp') {
+        await handleMcp(req, res);
+      } else {
+        sendJson(res, 404, { error: 'Not found' });
+      }
+    } catch (error: any) {
+      console.error(`[shared] ${req.method} ${url.pathname} failed:`, error);
+      if (!res.headersSent) {
+        sendRpcError(res, 500, error.message || 'Internal server error');
+      }
+    }
+  });
+
+  httpServer.listen(port, host, () => {
+    console.error(`MCP Task Manager shared server listening on http://${host}:${port}/mcp`);
+  });
+  return httpServer;
+}
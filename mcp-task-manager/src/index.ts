@@ -2,6 +2,9 @@
 /**
  * MCP Server for Task Management
  * Provides structured task management capabilities for YokeFlow agents
+ *
+ * MCP_TRANSPORT=stdio (default): one server per agent session, scoped by PROJECT_ID etc.
+ * MCP_TRANSPORT=http: one shared server per host for all sessions (see http-server.ts)
  */
 
 import { Server } from '@modelcontextprotocol/sdk/server/index.js';
@@ -12,27 +15,36 @@ import {
   ListToolsRequestSchema,
   ListResourcesRequestSchema
 } from '@modelcontextprotocol/sdk/types.js';
-import type { Tool } from '@modelcontextprotocol/sdk/types.js';
+import type { CallToolRequest, Tool } from '@modelcontextprotocol/sdk/types.js';
 import { z } from 'zod';
-import { exec } from 'child_process';
+import { execFile } from 'child_process';
 import { promisify } from 'util';
 import path from 'path';
 import { fileURLToPath } from 'url';
 // Import database implementation
 import { TaskDatabase } from './database.js';
-import type { NewTask, NewTest, NewEpic, NewEpicTest } from './types.js';
+import { dockerContainerName, scopeFromEnv, scopeStorage } from './scope.js';
+import type { SessionScope } from './scope.js';
+import { startHttpServer } from './http-server.js';
+import type { NewTask, NewTest, NewEpic, NewEpicTest, RoadmapEpic } from './types.js';
 
-const execAsync = promisify(exec);
+const execFileAsync = promisify(execFile);
 
 // Get __dirname equivalent in ES modules
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
-// Initialize database
-const db = new TaskDatabase();
+const transportMode = process.env.MCP_TRANSPORT || 'stdio';
+
+// Initialize database (the shared server gets the project from each session)
+const db = new TaskDatabase(transportMode !== 'http');
 
 // Log database info
-console.error(`Using PostgreSQL database for project: ${process.env.PROJECT_ID || 'unknown'}`);
+if (transportMode === 'http') {
+  console.error('Using PostgreSQL database for all projects (shared server)');
+} else {
+  console.error(`Using PostgreSQL database for project: ${process.env.PROJECT_ID || 'unknown'}`);
+}
 
 // Helper to define ID field that works with both legacy (number) and PostgreSQL (string/UUID)
 const idFieldSchema = {
@@ -671,6 +683,65 @@ const tools: Tool[] = [
       required: ['epic_id', 'tasks']
     }
   },
+  {
+    name: 'create_roadmap',
+    description: 'Create several epics with their tasks and task tests in one call (one database transaction). Use instead of many create_epic/expand_epic/create_task_test calls. Pass epic_id instead of name to add tasks to an existing epic. Returns the created IDs.',
+    inputSchema: {
+      type: 'object',
+      properties: {
+        epics: {
+          type: 'array',
+          items: {
+            type: 'object',
+            properties: {
+              epic_id: {
+                ...idFieldSchema,
+                description: 'Existing epic to add tasks to (omit to create a new epic)'
+              },
+              name: { type: 'string', description: 'Name of the new epic' },
+              description: { type: 'string' },
+              priority: { type: 'number', description: 'Optional, continues after existing epics' },
+              tasks: {
+                type: 'array',
+                items: {
+                  type: 'object',
+                  properties: {
+                    description: { type: 'string' },
+                    action: { type: 'string' },
+                    priority: { type: 'number', description: 'Optional, auto-increments within the epic' },
+                    tests: {
+                      type: 'array',
+                      items: {
+                        type: 'object',
+                        properties: {
+                          category: {
+                            type: 'string',
+                            enum: ['functional', 'style', 'accessibility', 'performance']
+                          },
+                          test_type: {
+                            type: 'string',
+                            enum: ['unit', 'api', 'browser', 'database', 'integration']
+                          },
+                          description: { type: 'string' },
+                          steps: { type: 'array', items: { type: 'string' } },
+                          requirements: { type: 'string' },
+                          success_criteria: { type: 'string' }
+                        },
+                        required: ['description']
+                      }
+                    }
+                  },
+                  required: ['description', 'action']
+                }
+              }
+            }
+          },
+          description: 'Epics to create (or extend), each with nested tasks and tests'
+        }
+      },
+      required: ['epics']
+    }
+  },
   {
     name: 'mark_project_complete',
     description: 'Mark the project as complete when all epics, tasks, and tests are finished. Sets the completion timestamp in the database.',
@@ -833,32 +904,18 @@ const tools: Tool[] = [
 
 ];
 
-// Create MCP server
-const server = new Server(
-  {
-    name: 'mcp-task-manager',
-    version: '1.0.0'
-  },
-  {
-    capabilities: {
-      tools: {},
-      resources: {}
-    }
-  }
-);
-
 // Handle tool listing
-server.setRequestHandler(ListToolsRequestSchema, async () => {
+async function handleListTools() {
   return { tools };
-});
+}
 
 // Handle resource listing (we don't use resources, but SDK might expect this)
-server.setRequestHandler(ListResourcesRequestSchema, async () => {
+async function handleListResources() {
   return { resources: [] };
-});
+}
 
 // Handle tool calls
-server.setRequestHandler(CallToolRequestSchema, async (request) => {
+async function handleCallTool(request: CallToolRequest) {
   const { name, arguments: args } = request.params;
 
   try {
@@ -1330,6 +1387,21 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
           ]
         };
 
+      case 'create_roadmap':
+        const roadmap = await db.createRoadmap(args?.epics as RoadmapEpic[]);
+        const roadmapTasks = roadmap.flatMap(e => e.tasks);
+        const roadmapTestCount = roadmapTasks.reduce((n, t) => n + t.tests.length, 0);
+        return {
+          content: [
+            {
+              type: 'text',
+              text: `Created ${roadmapTasks.length} tasks and ${roadmapTestCount} tests in ${roadmap.length} epics:\n${
+                JSON.stringify(roadmap, null, 2)
+              }`
+            }
+          ]
+        };
+
       // REMOVED: case 'log_session' - deprecated tool that created phantom sessions
       // Sessions are now managed entirely by the orchestrator
 
@@ -1357,7 +1429,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
 
       case 'bash_docker':
         // Get Docker configuration from environment
-        const containerName = process.env.DOCKER_CONTAINER_NAME || 'yokeflow-container';
+        const containerName = dockerContainerName();
         let command = args?.command as string;
 
         if (!command) {
@@ -1391,9 +1463,8 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
         }
 
         try {
-          // Execute command in Docker container
-          const dockerCommand = `docker exec ${containerName} /bin/bash -c ${JSON.stringify(command)}`;
-          const { stdout, stderr } = await execAsync(dockerCommand, {
+          // Execute command in Docker container (no host shell involved)
+          const { stdout, stderr } = await execFileAsync('docker', ['exec', containerName, '/bin/bash', '-c', command], {
             maxBuffer: 10 * 1024 * 1024, // 10MB buffer
             timeout: 300000 // 5 minute timeout
           });
@@ -1680,12 +1751,46 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
       isError: true
     };
   }
-});
+}
+
+// Create an MCP server whose tool calls run in a session's scope
+function createServer(scope: SessionScope): Server {
+  const server = new Server(
+    {
+      name: 'mcp-task-manager',
+      version: '1.0.0'
+    },
+    {
+      capabilities: {
+        tools: {},
+        resources: {}
+      }
+    }
+  );
+
+  server.setRequestHandler(ListToolsRequestSchema, handleListTools);
+  server.setRequestHandler(ListResourcesRequestSchema, handleListResources);
+  server.setRequestHandler(CallToolRequestSchema, (request) =>
+    scopeStorage.run(scope, () => handleCallTool(request))
+  );
+  return server;
+}
 
 // Start the server
 async function main() {
+  if (transportMode === 'http') {
+    const host = process.env.MCP_HOST || '127.0.0.1';
+    const port = parseInt(process.env.MCP_PORT || '8765', 10);
+    const secret = process.env.MCP_SHARED_SECRET;
+    if (!secret) {
+      throw new Error('MCP_SHARED_SECRET is required when MCP_TRANSPORT=http');
+    }
+    startHttpServer(createServer, db, host, port, secret);
+    return;
+  }
+
   const transport = new StdioServerTransport();
-  await server.connect(transport);
+  await createServer(scopeFromEnv()).connect(transport);
   console.error('MCP Task Manager Server started');
 }
 
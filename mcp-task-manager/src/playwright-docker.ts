@@ -5,10 +5,11 @@
  * inside Docker containers, eliminating port forwarding issues.
  */
 
-import { exec } from 'child_process';
+import { execFile } from 'child_process';
 import { promisify } from 'util';
+import { dockerContainerName } from './scope.js';
 
-const execAsync = promisify(exec);
+const execFileAsync = promisify(execFile);
 
 interface PlaywrightResult {
   success: boolean;
@@ -26,16 +27,14 @@ async function executePlaywrightScript(
   script: string
 ): Promise<PlaywrightResult> {
   try {
-    // Escape the script for shell execution
-    const escapedScript = script.replace(/'/g, "'\\''");
-
-    // Create a temporary file with the script and execute it
-    const command = `docker exec ${containerName} bash -c "cat > /tmp/playwright-script.js << 'PLAYWRIGHT_EOF'
+    // Create a temporary file with the script and execute it. The quoted
+    // heredoc keeps the script literal; no host shell is involved.
+    const command = `cat > /tmp/playwright-script.js << 'PLAYWRIGHT_EOF'
 ${script}
 PLAYWRIGHT_EOF
-node /tmp/playwright-script.js"`;
+node /tmp/playwright-script.js`;
 
-    const { stdout, stderr } = await execAsync(command, {
+    const { stdout, stderr } = await execFileAsync('docker', ['exec', containerName, 'bash', '-c', command], {
       maxBuffer: 10 * 1024 * 1024, // 10MB buffer for large outputs
     });
 
@@ -70,7 +69,7 @@ export const playwrightDockerTools = [
       properties: {},
     },
     handler: async () => {
-      const containerName = process.env.DOCKER_CONTAINER_NAME || 'yokeflow-container';
+      const containerName = dockerContainerName();
 
       const script = `
 const { chromium } = require('playwright');
@@ -123,7 +122,7 @@ const { chromium } = require('playwright');
       required: ['url'],
     },
     handler: async (params: any) => {
-      const containerName = process.env.DOCKER_CONTAINER_NAME || 'yokeflow-container';
+      const containerName = dockerContainerName();
       const { url, screenshotPath = '/workspace/screenshot.png', actions = [] } = params;
 
       // Build action script
@@ -252,7 +251,7 @@ ${actionScript}
       required: ['url', 'taskId'],
     },
     handler: async (params: any) => {
-      const containerName = process.env.DOCKER_CONTAINER_NAME || 'yokeflow-container';
+      const containerName = dockerContainerName();
       const { url, taskId, checks = [] } = params;
       const screenshotPath = `/workspace/screenshots/task_${taskId}_verification.png`;
 
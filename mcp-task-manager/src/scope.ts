@@ -0,0 +1,87 @@
+/**
+ * Per-session scope of the task manager.
+ *
+ * A stdio server serves one agent session and takes its scope from the
+ * environment. The shared HTTP server serves every session on the host and
+ * takes the scope from the headers that open each MCP session; tool handlers run
+ * inside scopeStorage.run() so TaskDatabase sees the calling session's scope.
+ */
+
+import { AsyncLocalStorage } from 'async_hooks';
+import type { IncomingHttpHeaders } from 'http';
+
+export interface SessionScope {
+  projectId: string;
+  epicId: string | null;  // Set for parallel epic sessions
+  workerId: string | null;  // Task lease owner (usually the session ID)
+  leaseTtl: number;  // Seconds
+  dockerContainer: string | null;  // Container for bash_docker / Playwright tools
+}
+
+export const scopeStorage = new AsyncLocalStorage<SessionScope>();
+
+// Docker container names; anything else is rejected before it reaches `docker exec`
+const CONTAINER_NAME_PATTERN = /^[a-zA-Z0-9][a-zA-Z0-9_.-]*$/;
+
+export function isValidContainerName(name: string): boolean {
+  return CONTAINER_NAME_PATTERN.test(name);
+}
+
+let envScope: SessionScope | null = null;
+
+/**
+ * Scope from PROJECT_ID / EPIC_ID / WORKER_ID / TASK_LEASE_TTL / DOCKER_CONTAINER_NAME.
+ */
+export function scopeFromEnv(): SessionScope {
+  return {
+    projectId: process.env.PROJECT_ID || '',
+    epicId: process.env.EPIC_ID || null,
+    workerId: process.env.WORKER_ID || null,
+    leaseTtl: parseInt(process.env.TASK_LEASE_TTL || '300', 10),
+    dockerContainer: process.env.DOCKER_CONTAINER_NAME || null,
+  };
+}
+
+/**
+ * Scope from the X-Project-Id / X-Epic-Id / X-Worker-Id / X-Task-Lease-Ttl /
+ * X-Docker-Container headers of a shared-server connection.
+ */
+export function scopeFromHeaders(headers: IncomingHttpHeaders): SessionScope {
+  const header = (name: string): string | null => {
+    const value = headers[name];
+    return (Array.isArray(value) ? value[0] : value) || null;
+  };
+  return {
+    projectId: header('x-project-id') || '',
+    epicId: header('x-epic-id'),
+    workerId: header('x-worker-id'),
+    leaseTtl: parseInt(header('x-task-lease-ttl') || '300', 10),
+    dockerContainer: header('x-docker-container'),
+  };
+}
+
+/**
+ * Scope of the tool call being handled (environment scope outside a shared-server call).
+ */
+export function currentScope(): SessionScope {
+  const scope = scopeStorage.getStore();
+  if (scope) {
+    return scope;
+  }
+  if (!envScope) {
+    envScope = scopeFromEnv();
+  }
+  return envScope;
+}
+
+/**
+ * Container for bash_docker / Playwright tools of the current call.
+ * Throws if the configured name is not a valid Docker container name.
+ */
+export function dockerContainerName(): string {
+  const name = currentScope().dockerContainer || 'yokeflow-container';
+  if (!isValidContainerName(name)) {
+    throw new Error(`Invalid Docker container name: ${JSON.stringify(name)}`);
+  }
+  return name;
+}
@@ -125,6 +125,34 @@ export interface NewTest {
   success_criteria?: string;  // Clear success criteria
 }
 
+// Bulk roadmap creation (create_roadmap): new epics, or tasks for an existing epic
+export interface RoadmapTest extends Omit<NewTest, 'task_id' | 'category' | 'steps'> {
+  category?: Test['category'];
+  steps?: string[];
+}
+
+export interface RoadmapTask extends Omit<NewTask, 'epic_id'> {
+  tests?: RoadmapTest[];
+}
+
+export interface RoadmapEpic {
+  epic_id?: EntityId;  // Add tasks to this existing epic instead of creating one
+  name?: string;
+  description?: string;
+  priority?: number;
+  tasks?: RoadmapTask[];
+}
+
+export interface CreatedRoadmapEpic {
+  id: string;
+  name: string;
+  tasks: Array<{
+    id: string;
+    description: string;
+    tests: Array<{ id: string; description: string }>;
+  }>;
+}
+
 export interface EpicTest {
   id: string; // UUID
   epic_id: EntityId;
@@ -16,6 +16,11 @@
 --      - Migration 018: Epic test failures table with comprehensive tracking
 --      - Migration 019: Epic re-testing system (epic_retest_runs, epic_stability_metrics)
 --      - Migration 020: Project completion reviews (spec verification)
+--      - Migration 024: Epic leases for parallel epic sessions
+--      - Migration 025: Task leases with expiry for concurrent agents
+--      - Migration 026: Trigger-maintained project_progress counters (replaces v_progress reads)
+--      - Migration 027: Delta-chained, content-addressed session checkpoints
+--      - Migration 028: NOTIFY triggers for the API read-through cache
 --      - Cleanup: Removed 17 unused tables and 21 unused views
 --      - Note: All migrations consolidated into this file for clarity
 --   2.0.0 (Jan 9, 2026): Consolidated with all migrations (011-016) - Production ready
@@ -2495,6 +2500,599 @@ COMMENT ON VIEW v_completion_requirement_summary IS 'Summary of requirement stat
 COMMENT ON VIEW v_completion_section_summary IS 'Summary of requirements grouped by section (Frontend, Backend, etc.)';
 COMMENT ON VIEW v_project_completion_stats IS 'Completion statistics for all completed projects';
 
+-- -----------------------------------------------------------------------------
+-- Migration 024: Epic Leases for Parallel Sessions
+-- -----------------------------------------------------------------------------
+-- Parallel coding sessions each lease one epic so that concurrent workers never
+-- pick the same epic. Leases are claimed with SELECT ... FOR UPDATE SKIP LOCKED
+-- and released when the session ends (or reclaimed by cleanup_stale_sessions).
+
+ALTER TABLE epics ADD COLUMN IF NOT EXISTS leased_by TEXT;
+ALTER TABLE epics ADD COLUMN IF NOT EXISTS leased_at TIMESTAMPTZ;
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS epic_id INTEGER REFERENCES epics(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_epics_leased ON epics(project_id) WHERE leased_by IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_sessions_epic_id ON sessions(epic_id) WHERE epic_id IS NOT NULL;
+
+COMMENT ON COLUMN epics.leased_by IS 'Worker currently holding this epic in a parallel session (NULL = available)';
+COMMENT ON COLUMN epics.leased_at IS 'When the current epic lease was claimed';
+COMMENT ON COLUMN sessions.epic_id IS 'Epic a parallel session is scoped to (NULL = regular sequential session)';
+
+-- -----------------------------------------------------------------------------
+-- Migration 025: Task Leases
+-- -----------------------------------------------------------------------------
+-- Workers claim tasks with SELECT ... FOR UPDATE SKIP LOCKED and hold a lease
+-- until lease_expires_at. The session heartbeat extends the lease; expired
+-- leases are reclaimed by cleanup_stale_sessions.
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS leased_by TEXT;
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_tasks_leased_by ON tasks(leased_by) WHERE leased_by IS NOT NULL;
+
+COMMENT ON COLUMN tasks.leased_by IS 'Worker (session ID) currently holding this task (NULL = available)';
+COMMENT ON COLUMN tasks.lease_expires_at IS 'Lease expiry; expired leases can be claimed by other workers';
+
+-- -----------------------------------------------------------------------------
+-- Migration 026: Incrementally Maintained Project Progress
+-- -----------------------------------------------------------------------------
+-- v_progress joins projects -> epics -> tasks -> task_tests -> epic_tests and
+-- de-duplicates with COUNT(DISTINCT), so its cost grows with the product of
+-- rows per project. project_progress keeps the same counters in one row per
+-- project, adjusted by triggers on every write path (Python API and the MCP
+-- task manager alike). rebuild_project_progress() recomputes the counters
+-- from scratch; v_project_progress_drift lists projects whose stored counters
+-- disagree with the source tables.
+--
+-- The triggers are statement-level with transition tables: each statement
+-- applies one aggregated delta per project, so a bulk COPY of a roadmap is a
+-- single counter update and concurrent writers hold the hot counter row for
+-- one update per statement rather than one per row. Transition tables do not
+-- allow UPDATE OF column lists or several events per trigger, hence three
+-- triggers per table; updates that leave the counted columns unchanged
+-- produce a zero delta and do not touch project_progress.
+
+CREATE TABLE IF NOT EXISTS project_progress (
+    project_id UUID PRIMARY KEY REFERENCES projects(id) ON DELETE CASCADE,
+    total_epics INTEGER NOT NULL DEFAULT 0,
+    completed_epics INTEGER NOT NULL DEFAULT 0,
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    completed_tasks INTEGER NOT NULL DEFAULT 0,
+    total_task_tests INTEGER NOT NULL DEFAULT 0,
+    passing_task_tests INTEGER NOT NULL DEFAULT 0,
+    total_epic_tests INTEGER NOT NULL DEFAULT 0,
+    passing_epic_tests INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Create the counter row with every new project
+CREATE OR REPLACE FUNCTION trg_project_progress_init()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO project_progress (project_id) VALUES (NEW.id)
+    ON CONFLICT (project_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS project_progress_init ON projects;
+CREATE TRIGGER project_progress_init
+    AFTER INSERT ON projects
+    FOR EACH ROW EXECUTE FUNCTION trg_project_progress_init();
+
+-- Epics: total_epics / completed_epics
+CREATE OR REPLACE FUNCTION trg_project_progress_epics()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE project_progress pp
+        SET total_epics = pp.total_epics + d.total,
+            completed_epics = pp.completed_epics + d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, COUNT(*) as total, SUM((status IS NOT DISTINCT FROM 'completed')::int) as done
+            FROM new_rows GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE project_progress pp
+        SET total_epics = pp.total_epics - d.total,
+            completed_epics = pp.completed_epics - d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, COUNT(*) as total, SUM((status IS NOT DISTINCT FROM 'completed')::int) as done
+            FROM old_rows GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id;
+    ELSE
+        UPDATE project_progress pp
+        SET total_epics = pp.total_epics + d.total,
+            completed_epics = pp.completed_epics + d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, SUM(total) as total, SUM(done) as done
+            FROM (
+                SELECT project_id, 1 as total, (status IS NOT DISTINCT FROM 'completed')::int as done FROM new_rows
+                UNION ALL
+                SELECT project_id, -1, -(status IS NOT DISTINCT FROM 'completed')::int FROM old_rows
+            ) changes
+            GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id
+          AND (d.total <> 0 OR d.done <> 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS project_progress_epics ON epics;
+DROP TRIGGER IF EXISTS project_progress_epics_insert ON epics;
+CREATE TRIGGER project_progress_epics_insert
+    AFTER INSERT ON epics
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_epics();
+DROP TRIGGER IF EXISTS project_progress_epics_update ON epics;
+CREATE TRIGGER project_progress_epics_update
+    AFTER UPDATE ON epics
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_epics();
+DROP TRIGGER IF EXISTS project_progress_epics_delete ON epics;
+CREATE TRIGGER project_progress_epics_delete
+    AFTER DELETE ON epics
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_epics();
+
+-- Tasks: total_tasks / completed_tasks
+CREATE OR REPLACE FUNCTION trg_project_progress_tasks()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE project_progress pp
+        SET total_tasks = pp.total_tasks + d.total,
+            completed_tasks = pp.completed_tasks + d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, COUNT(*) as total, SUM(COALESCE(done, false)::int) as done
+            FROM new_rows GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE project_progress pp
+        SET total_tasks = pp.total_tasks - d.total,
+            completed_tasks = pp.completed_tasks - d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, COUNT(*) as total, SUM(COALESCE(done, false)::int) as done
+            FROM old_rows GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id;
+    ELSE
+        UPDATE project_progress pp
+        SET total_tasks = pp.total_tasks + d.total,
+            completed_tasks = pp.completed_tasks + d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, SUM(total) as total, SUM(done) as done
+            FROM (
+                SELECT project_id, 1 as total, COALESCE(done, false)::int as done FROM new_rows
+                UNION ALL
+                SELECT project_id, -1, -COALESCE(done, false)::int FROM old_rows
+            ) changes
+            GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id
+          AND (d.total <> 0 OR d.done <> 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS project_progress_tasks ON tasks;
+DROP TRIGGER IF EXISTS project_progress_tasks_insert ON tasks;
+CREATE TRIGGER project_progress_tasks_insert
+    AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_tasks();
+DROP TRIGGER IF EXISTS project_progress_tasks_update ON tasks;
+CREATE TRIGGER project_progress_tasks_update
+    AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_tasks();
+DROP TRIGGER IF EXISTS project_progress_tasks_delete ON tasks;
+CREATE TRIGGER project_progress_tasks_delete
+    AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_tasks();
+
+-- Task tests: total_task_tests / passing_task_tests
+CREATE OR REPLACE FUNCTION trg_project_progress_task_tests()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE project_progress pp
+        SET total_task_tests = pp.total_task_tests + d.total,
+            passing_task_tests = pp.passing_task_tests + d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, COUNT(*) as total, SUM(COALESCE(passes, false)::int) as done
+            FROM new_rows GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE project_progress pp
+        SET total_task_tests = pp.total_task_tests - d.total,
+            passing_task_tests = pp.passing_task_tests - d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, COUNT(*) as total, SUM(COALESCE(passes, false)::int) as done
+            FROM old_rows GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id;
+    ELSE
+        UPDATE project_progress pp
+        SET total_task_tests = pp.total_task_tests + d.total,
+            passing_task_tests = pp.passing_task_tests + d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, SUM(total) as total, SUM(done) as done
+            FROM (
+                SELECT project_id, 1 as total, COALESCE(passes, false)::int as done FROM new_rows
+                UNION ALL
+                SELECT project_id, -1, -COALESCE(passes, false)::int FROM old_rows
+            ) changes
+            GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id
+          AND (d.total <> 0 OR d.done <> 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS project_progress_task_tests ON task_tests;
+DROP TRIGGER IF EXISTS project_progress_task_tests_insert ON task_tests;
+CREATE TRIGGER project_progress_task_tests_insert
+    AFTER INSERT ON task_tests
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_task_tests();
+DROP TRIGGER IF EXISTS project_progress_task_tests_update ON task_tests;
+CREATE TRIGGER project_progress_task_tests_update
+    AFTER UPDATE ON task_tests
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_task_tests();
+DROP TRIGGER IF EXISTS project_progress_task_tests_delete ON task_tests;
+CREATE TRIGGER project_progress_task_tests_delete
+    AFTER DELETE ON task_tests
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_task_tests();
+
+-- Epic tests: total_epic_tests / passing_epic_tests
+CREATE OR REPLACE FUNCTION trg_project_progress_epic_tests()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE project_progress pp
+        SET total_epic_tests = pp.total_epic_tests + d.total,
+            passing_epic_tests = pp.passing_epic_tests + d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, COUNT(*) as total, SUM((last_result IS NOT DISTINCT FROM 'passed')::int) as done
+            FROM new_rows GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE project_progress pp
+        SET total_epic_tests = pp.total_epic_tests - d.total,
+            passing_epic_tests = pp.passing_epic_tests - d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, COUNT(*) as total, SUM((last_result IS NOT DISTINCT FROM 'passed')::int) as done
+            FROM old_rows GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id;
+    ELSE
+        UPDATE project_progress pp
+        SET total_epic_tests = pp.total_epic_tests + d.total,
+            passing_epic_tests = pp.passing_epic_tests + d.done,
+            updated_at = NOW()
+        FROM (
+            SELECT project_id, SUM(total) as total, SUM(done) as done
+            FROM (
+                SELECT project_id, 1 as total, (last_result IS NOT DISTINCT FROM 'passed')::int as done FROM new_rows
+                UNION ALL
+                SELECT project_id, -1, -(last_result IS NOT DISTINCT FROM 'passed')::int FROM old_rows
+            ) changes
+            GROUP BY project_id
+        ) d
+        WHERE pp.project_id = d.project_id
+          AND (d.total <> 0 OR d.done <> 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS project_progress_epic_tests ON epic_tests;
+DROP TRIGGER IF EXISTS project_progress_epic_tests_insert ON epic_tests;
+CREATE TRIGGER project_progress_epic_tests_insert
+    AFTER INSERT ON epic_tests
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_epic_tests();
+DROP TRIGGER IF EXISTS project_progress_epic_tests_update ON epic_tests;
+CREATE TRIGGER project_progress_epic_tests_update
+    AFTER UPDATE ON epic_tests
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_epic_tests();
+DROP TRIGGER IF EXISTS project_progress_epic_tests_delete ON epic_tests;
+CREATE TRIGGER project_progress_epic_tests_delete
+    AFTER DELETE ON epic_tests
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_project_progress_epic_tests();
+
+-- Counters computed directly from the source tables (one aggregate per table, no fan-out)
+CREATE OR REPLACE VIEW v_project_progress_actual AS
+SELECT
+    p.id as project_id,
+    COALESCE(ep.total, 0)::int as total_epics,
+    COALESCE(ep.completed, 0)::int as completed_epics,
+    COALESCE(tk.total, 0)::int as total_tasks,
+    COALESCE(tk.completed, 0)::int as completed_tasks,
+    COALESCE(tt.total, 0)::int as total_task_tests,
+    COALESCE(tt.passing, 0)::int as passing_task_tests,
+    COALESCE(et.total, 0)::int as total_epic_tests,
+    COALESCE(et.passing, 0)::int as passing_epic_tests
+FROM projects p
+LEFT JOIN (
+    SELECT project_id, COUNT(*) as total, COUNT(*) FILTER (WHERE status = 'completed') as completed
+    FROM epics GROUP BY project_id
+) ep ON ep.project_id = p.id
+LEFT JOIN (
+    SELECT project_id, COUNT(*) as total, COUNT(*) FILTER (WHERE done = true) as completed
+    FROM tasks GROUP BY project_id
+) tk ON tk.project_id = p.id
+LEFT JOIN (
+    SELECT project_id, COUNT(*) as total, COUNT(*) FILTER (WHERE passes = true) as passing
+    FROM task_tests GROUP BY project_id
+) tt ON tt.project_id = p.id
+LEFT JOIN (
+    SELECT project_id, COUNT(*) as total, COUNT(*) FILTER (WHERE last_result = 'passed') as passing
+    FROM epic_tests GROUP BY project_id
+) et ON et.project_id = p.id;
+
+-- Projects whose stored counters disagree with the source tables
+CREATE OR REPLACE VIEW v_project_progress_drift AS
+SELECT a.*, (pp.project_id IS NULL) as missing_row
+FROM v_project_progress_actual a
+LEFT JOIN project_progress pp ON pp.project_id = a.project_id
+WHERE pp.project_id IS NULL
+   OR (pp.total_epics, pp.completed_epics, pp.total_tasks, pp.completed_tasks,
+       pp.total_task_tests, pp.passing_task_tests, pp.total_epic_tests, pp.passing_epic_tests)
+      IS DISTINCT FROM
+      (a.total_epics, a.completed_epics, a.total_tasks, a.completed_tasks,
+       a.total_task_tests, a.passing_task_tests, a.total_epic_tests, a.passing_epic_tests);
+
+-- Recompute counters from scratch (all projects when p_project_id is NULL)
+CREATE OR REPLACE FUNCTION rebuild_project_progress(p_project_id UUID DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    rebuilt INTEGER;
+BEGIN
+    INSERT INTO project_progress (
+        project_id, total_epics, completed_epics, total_tasks, completed_tasks,
+        total_task_tests, passing_task_tests, total_epic_tests, passing_epic_tests, updated_at
+    )
+    SELECT
+        a.project_id, a.total_epics, a.completed_epics, a.total_tasks, a.completed_tasks,
+        a.total_task_tests, a.passing_task_tests, a.total_epic_tests, a.passing_epic_tests, NOW()
+    FROM v_project_progress_actual a
+    WHERE p_project_id IS NULL OR a.project_id = p_project_id
+    ON CONFLICT (project_id) DO UPDATE SET
+        total_epics = EXCLUDED.total_epics,
+        completed_epics = EXCLUDED.completed_epics,
+        total_tasks = EXCLUDED.total_tasks,
+        completed_tasks = EXCLUDED.completed_tasks,
+        total_task_tests = EXCLUDED.total_task_tests,
+        passing_task_tests = EXCLUDED.passing_task_tests,
+        total_epic_tests = EXCLUDED.total_epic_tests,
+        passing_epic_tests = EXCLUDED.passing_epic_tests,
+        updated_at = NOW();
+
+    GET DIAGNOSTICS rebuilt = ROW_COUNT;
+    RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill existing projects
+SELECT rebuild_project_progress();
+
+COMMENT ON TABLE project_progress IS 'Per-project progress counters maintained by triggers (O(1) progress reads)';
+COMMENT ON VIEW v_project_progress_actual IS 'Progress counters computed from source tables, used to rebuild/check project_progress';
+COMMENT ON VIEW v_project_progress_drift IS 'Projects whose project_progress counters disagree with the source tables';
+COMMENT ON FUNCTION rebuild_project_progress IS 'Recompute project_progress from source tables (NULL = all projects)';
+
+-- -----------------------------------------------------------------------------
+-- Migration 027: Delta-Chained Session Checkpoints
+-- -----------------------------------------------------------------------------
+-- Checkpoints used to store the full conversation_history on every write, so
+-- late checkpoints in a long session were huge and mostly duplicated their
+-- predecessor. Messages are now stored once in checkpoint_messages, keyed by
+-- the SHA-256 of their canonical JSON. A checkpoint lists the hashes of the
+-- messages appended since parent_checkpoint_id (and only the changed
+-- tool_results_cache entries); every Nth checkpoint is a keyframe listing the
+-- whole conversation. Recovery replays the chain from the nearest keyframe.
+-- Rows with message_hashes IS NULL are legacy full snapshots.
+
+CREATE TABLE IF NOT EXISTS checkpoint_messages (
+    hash TEXT PRIMARY KEY, -- SHA-256 of the canonical JSON message
+    message JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE session_checkpoints ADD COLUMN IF NOT EXISTS parent_checkpoint_id UUID
+    REFERENCES session_checkpoints(id) ON DELETE CASCADE;
+ALTER TABLE session_checkpoints ADD COLUMN IF NOT EXISTS is_keyframe BOOLEAN NOT NULL DEFAULT TRUE;
+ALTER TABLE session_checkpoints ADD COLUMN IF NOT EXISTS base_message_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE session_checkpoints ADD COLUMN IF NOT EXISTS message_hashes TEXT[];
+ALTER TABLE session_checkpoints ADD COLUMN IF NOT EXISTS conversation_hash TEXT;
+ALTER TABLE session_checkpoints ADD COLUMN IF NOT EXISTS tool_results_removed TEXT[] NOT NULL DEFAULT '{}';
+
+CREATE INDEX IF NOT EXISTS idx_checkpoints_parent ON session_checkpoints(parent_checkpoint_id)
+    WHERE parent_checkpoint_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_checkpoints_message_hashes ON session_checkpoints USING GIN (message_hashes);
+
+-- Delete messages no checkpoint refers to any more (e.g. after sessions were deleted)
+CREATE OR REPLACE FUNCTION prune_checkpoint_messages()
+RETURNS INTEGER AS $$
+DECLARE
+    pruned INTEGER;
+BEGIN
+    DELETE FROM checkpoint_messages m
+    WHERE NOT EXISTS (
+        SELECT 1 FROM session_checkpoints c
+        WHERE c.message_hashes @> ARRAY[m.hash]
+    );
+
+    GET DIAGNOSTICS pruned = ROW_COUNT;
+    RETURN pruned;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE checkpoint_messages IS 'Content-addressed conversation messages shared by session checkpoints';
+COMMENT ON COLUMN session_checkpoints.parent_checkpoint_id IS 'Previous checkpoint this delta applies to (NULL for keyframes)';
+COMMENT ON COLUMN session_checkpoints.is_keyframe IS 'TRUE if the row holds the full state (no parent needed to restore)';
+COMMENT ON COLUMN session_checkpoints.base_message_count IS 'Messages inherited from the parent; message_hashes continue from here';
+COMMENT ON COLUMN session_checkpoints.message_hashes IS 'Hashes of messages appended since the parent (all messages for keyframes); NULL = legacy full snapshot in conversation_history';
+COMMENT ON COLUMN session_checkpoints.conversation_hash IS 'SHA-256 over the full conversation''s message hashes, checked after replay';
+COMMENT ON COLUMN session_checkpoints.tool_results_removed IS 'tool_results_cache keys removed since the parent (deltas only)';
+COMMENT ON FUNCTION prune_checkpoint_messages IS 'Delete checkpoint_messages rows no longer referenced by any checkpoint';
+
+-- -----------------------------------------------------------------------------
+-- Migration 028: Query Cache Invalidation Notifications
+-- -----------------------------------------------------------------------------
+-- The API caches get_project / get_active_session / get_progress in-process
+-- (server/database/cache.py). These triggers announce every change to the
+-- underlying rows on the yokeflow_cache_invalidation channel as
+-- '<kind>:<project_id>', whichever process made it (other API workers, the
+-- orchestrator, the MCP task manager), so every cache can drop the entry.
+-- NOTIFY is delivered on commit, and duplicates within a transaction are
+-- folded into one.
+
+CREATE OR REPLACE FUNCTION trg_notify_cache_invalidation()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed JSONB;
+BEGIN
+    -- TG_ARGV[0] = kind, TG_ARGV[1] = column holding the project ID
+    IF TG_OP = 'DELETE' THEN
+        changed := to_jsonb(OLD);
+    ELSE
+        changed := to_jsonb(NEW);
+    END IF;
+    PERFORM pg_notify(
+        'yokeflow_cache_invalidation',
+        TG_ARGV[0] || ':' || COALESCE(changed ->> TG_ARGV[1], '')
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS cache_invalidation_projects ON projects;
+CREATE TRIGGER cache_invalidation_projects
+    AFTER UPDATE OR DELETE ON projects
+    FOR EACH ROW EXECUTE FUNCTION trg_notify_cache_invalidation('project', 'id');
+
+DROP TRIGGER IF EXISTS cache_invalidation_sessions ON sessions;
+CREATE TRIGGER cache_invalidation_sessions
+    AFTER INSERT OR DELETE OR UPDATE OF status, project_id ON sessions
+    FOR EACH ROW EXECUTE FUNCTION trg_notify_cache_invalidation('session', 'project_id');
+
+DROP TRIGGER IF EXISTS cache_invalidation_project_progress ON project_progress;
+CREATE TRIGGER cache_invalidation_project_progress
+    AFTER INSERT OR UPDATE OR DELETE ON project_progress
+    FOR EACH ROW EXECUTE FUNCTION trg_notify_cache_invalidation('progress', 'project_id');
+
+COMMENT ON FUNCTION trg_notify_cache_invalidation IS 'NOTIFY yokeflow_cache_invalidation with <kind>:<project_id> for API cache invalidation';
+
+-- -----------------------------------------------------------------------------
+-- Migration 029: Deep Review Job Queue
+-- -----------------------------------------------------------------------------
+-- Deep reviews requested through the API are queued here and run by a bounded
+-- worker pool (server/quality/review_queue.py). Workers claim jobs with
+-- SELECT ... FOR UPDATE SKIP LOCKED and hold a lease until lease_expires_at;
+-- failed jobs are re-queued with backoff until max_attempts. The partial
+-- unique index keeps at most one queued or running job per session.
+
+CREATE TABLE IF NOT EXISTS review_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    session_id UUID NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    session_number INTEGER,
+    model VARCHAR(100),
+    status VARCHAR(20) NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'completed', 'failed', 'cancelled')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    leased_by TEXT,
+    lease_expires_at TIMESTAMPTZ,
+    last_error TEXT,
+    result JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    completed_at TIMESTAMPTZ
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_review_jobs_in_flight
+    ON review_jobs(session_id) WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_review_jobs_runnable
+    ON review_jobs(run_after, created_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_review_jobs_project
+    ON review_jobs(project_id, created_at DESC);
+
+COMMENT ON TABLE review_jobs IS 'Queued and historical deep review jobs run by the API review worker pool';
+COMMENT ON COLUMN review_jobs.run_after IS 'Earliest time the job may be claimed (pushed back on retry)';
+COMMENT ON COLUMN review_jobs.leased_by IS 'Worker currently running the job; expired leases are re-queued';
+COMMENT ON COLUMN review_jobs.result IS 'check_id and overall_rating of the stored deep review';
+
+-- -----------------------------------------------------------------------------
+-- Migration 030: Session Job Queue
+-- -----------------------------------------------------------------------------
+-- With runner.mode = worker, the API queues initialization and coding runs
+-- here instead of running agent sessions on its own event loop. Session
+-- worker processes (python -m server.agent.session_worker) claim jobs with
+-- SELECT ... FOR UPDATE SKIP LOCKED and renew the lease while the job runs.
+-- Stop requests travel through stop_requested / stop_after_current, which the
+-- owning worker polls. At most one queued or running job per project.
+
+CREATE TABLE IF NOT EXISTS session_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('initialize', 'coding')),
+    params JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'completed', 'failed', 'cancelled')),
+    leased_by TEXT,
+    lease_expires_at TIMESTAMPTZ,
+    stop_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    stop_session_id UUID,
+    stop_after_current BOOLEAN NOT NULL DEFAULT FALSE,
+    error TEXT,
+    result JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    completed_at TIMESTAMPTZ
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_session_jobs_active
+    ON session_jobs(project_id) WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_session_jobs_queued
+    ON session_jobs(created_at) WHERE status = 'queued';
+
+COMMENT ON TABLE session_jobs IS 'Initialization/coding runs queued for out-of-process session workers';
+COMMENT ON COLUMN session_jobs.params IS 'Arguments for the run (models, max_iterations, parallel)';
+COMMENT ON COLUMN session_jobs.leased_by IS 'Session worker running the job; renewed every poll while alive';
+COMMENT ON COLUMN session_jobs.stop_session_id IS 'Session the API asked the worker to stop (with stop_requested)';
+COMMENT ON COLUMN session_jobs.stop_after_current IS 'Finish the current session, then end the run';
+
 -- ============================================================================
 -- End of Consolidated Schema
 -- ============================================================================
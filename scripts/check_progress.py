@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Check Project Progress Counters
+===============================
+
+Verify the trigger-maintained project_progress counters against the source
+tables (epics, tasks, task_tests, epic_tests), and optionally rebuild them.
+
+Counters should never drift while the triggers are installed. Drift usually
+means rows were changed with triggers disabled (e.g. a bulk restore) or the
+database predates Migration 026.
+
+Usage:
+    python scripts/check_progress.py [--project PROJECT_NAME] [--rebuild]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.database.connection import DatabaseManager
+
+
+async def check_progress(project_name: str = None, rebuild: bool = False) -> int:
+    """
+    Report (and optionally repair) drifted progress counters.
+
+    Args:
+        project_name: Optional project name to check
+        rebuild: Rebuild counters for drifted projects
+
+    Returns:
+        Number of drifted projects found
+    """
+    async with DatabaseManager() as db:
+        project_id = None
+        if project_name:
+            project = await db.get_project_by_name(project_name)
+            if not project:
+                print(f"Project not found: {project_name}")
+                return -1
+            project_id = project['id']
+
+        print("\n" + "="*80)
+        print("Checking project progress counters...")
+        print("="*80 + "\n")
+
+        drifted = await db.check_progress_consistency(project_id)
+
+        if not drifted:
+            print("✓ All progress counters match the source tables.\n")
+            return 0
+
+        print(f"Found {len(drifted)} project(s) with drifted counters:\n")
+        for row in drifted:
+            if row['missing_row']:
+                print(f"  • {row['project_name']}: no project_progress row")
+            else:
+                print(
+                    f"  • {row['project_name']}: actual epics {row['completed_epics']}/{row['total_epics']}, "
+                    f"tasks {row['completed_tasks']}/{row['total_tasks']}, "
+                    f"task tests {row['passing_task_tests']}/{row['total_task_tests']}, "
+                    f"epic tests {row['passing_epic_tests']}/{row['total_epic_tests']}"
+                )
+        print()
+
+        if rebuild:
+            total = 0
+            for row in drifted:
+                total += await db.rebuild_progress(row['project_id'])
+            print(f"✓ Rebuilt progress counters for {total} project(s)\n")
+        else:
+            print("💡 Run with --rebuild to recompute the counters\n")
+
+        return len(drifted)
+
+
+async def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Check and rebuild YokeFlow project progress counters",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Check all projects
+  python scripts/check_progress.py
+
+  # Check a single project
+  python scripts/check_progress.py --project my_project
+
+  # Rebuild drifted counters
+  python scripts/check_progress.py --rebuild
+        """,
+    )
+
+    parser.add_argument(
+        "--project",
+        type=str,
+        help="Only check a specific project name",
+    )
+
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute counters for projects that have drifted",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        count = await check_progress(project_name=args.project, rebuild=args.rebuild)
+        sys.exit(0 if count >= 0 else 1)
+    except Exception as e:
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
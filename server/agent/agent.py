@@ -85,6 +85,12 @@ class SessionManager:
                 print("✓ Session logs saved")
             except Exception as e:
                 print(f"Warning: Could not finalize session logs: {e}")
+            finally:
+                # Make sure buffered log lines reach disk even if finalize failed
+                try:
+                    self.current_logger.flush()
+                except Exception:
+                    pass
 
         print("\nSession interrupted. To resume, run the same command again.")
         print(f"{'='*70}\n")
@@ -7,11 +7,20 @@ Enables sessions to be resumed from the last successful state after crashes or e
 
 Key Features:
 - Automatic checkpointing after epic completion
-- Full conversation history preservation
+- Full conversation history preservation (delta-chained, content-addressed)
 - State validation before resumption
 - Recovery attempt tracking
+
+Storage:
+Each checkpoint stores only the messages appended since its parent checkpoint
+(by SHA-256 hash; message contents live once in checkpoint_messages) and the
+tool_results_cache entries that changed. Every KEYFRAME_INTERVAL-th checkpoint
+- and any checkpoint whose conversation no longer extends its parent's - is a
+keyframe listing the whole conversation, which bounds how far recovery has to
+replay.
 """
 
+import hashlib
 import json
 import logging
 from typing import Dict, List, Optional, Any, Tuple
@@ -23,6 +32,65 @@ from server.database.connection import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Every Nth checkpoint in a session stores the full state
+KEYFRAME_INTERVAL = 10
+
+
+def message_hash(message: Dict[str, Any]) -> str:
+    """Content hash of a conversation message (SHA-256 of its canonical JSON)."""
+    canonical = json.dumps(message, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def conversation_hash(message_hashes: List[str]) -> str:
+    """Hash of a whole conversation, from its message hashes in order."""
+    return hashlib.sha256("".join(message_hashes).encode("ascii")).hexdigest()
+
+
+def replay_checkpoint_chain(
+    chain: List[Dict[str, Any]],
+    messages: Dict[str, Any]
+) -> Tuple[List[Dict], Dict[str, Any]]:
+    """
+    Rebuild conversation history and tool results cache from a checkpoint chain.
+
+    Args:
+        chain: Checkpoints from a keyframe to the target, oldest first
+            (as returned by TaskDatabase.get_checkpoint_chain)
+        messages: Message contents by hash
+
+    Returns:
+        Tuple of (conversation_history, tool_results_cache)
+
+    Raises:
+        ValueError: If the chain is incomplete or does not replay to the stored state
+    """
+    if not chain or not chain[0].get("is_keyframe"):
+        raise ValueError("Checkpoint chain does not start at a keyframe")
+
+    hashes: List[str] = []
+    tool_results: Dict[str, Any] = {}
+    for checkpoint in chain:
+        if len(hashes) != checkpoint.get("base_message_count", 0):
+            raise ValueError(
+                f"Checkpoint {checkpoint.get('id')} expects {checkpoint.get('base_message_count')} "
+                f"inherited messages, chain has {len(hashes)}"
+            )
+        hashes.extend(checkpoint.get("message_hashes") or [])
+        tool_results.update(checkpoint.get("tool_results_cache") or {})
+        for key in checkpoint.get("tool_results_removed") or []:
+            tool_results.pop(key, None)
+
+    expected = chain[-1].get("conversation_hash")
+    if expected and conversation_hash(hashes) != expected:
+        raise ValueError(f"Checkpoint {chain[-1].get('id')} conversation hash mismatch after replay")
+
+    missing = [h for h in hashes if h not in messages]
+    if missing:
+        raise ValueError(f"{len(missing)} checkpoint messages are missing (first: {missing[0]})")
+
+    return [messages[h] for h in hashes], tool_results
+
 
 class CheckpointManager:
     """
@@ -34,19 +102,27 @@ class CheckpointManager:
     - Before error handling (error)
     """
 
-    def __init__(self, session_id: str, project_id: str):
+    def __init__(self, session_id: str, project_id: str, keyframe_interval: int = KEYFRAME_INTERVAL):
         """
         Initialize checkpoint manager for a session.
 
         Args:
             session_id: UUID of the current session
             project_id: UUID of the project
+            keyframe_interval: Store the full state every N checkpoints
         """
         self.session_id = UUID(session_id)
         self.project_id = UUID(project_id)
+        self.keyframe_interval = max(keyframe_interval, 1)
         self.checkpoint_count = 0
         self.last_checkpoint_id: Optional[UUID] = None
 
+        # State of the last checkpoint, to compute the next delta
+        self._message_hashes: List[str] = []
+        self._tool_results: Dict[str, Any] = {}
+        self._deltas_since_keyframe = 0
+        self._stored_hashes: set = set()  # Messages already in checkpoint_messages
+
     async def create_checkpoint(
         self,
         checkpoint_type: str,
@@ -86,6 +162,33 @@ class CheckpointManager:
         Returns:
             UUID of the created checkpoint
         """
+        tool_results_cache = tool_results_cache or {}
+        hashes = [message_hash(message) for message in conversation_history]
+
+        # Delta against the previous checkpoint if the conversation only grew
+        base = len(self._message_hashes)
+        is_keyframe = (
+            self.last_checkpoint_id is None
+            or self._deltas_since_keyframe + 1 >= self.keyframe_interval
+            or hashes[:base] != self._message_hashes
+        )
+        if is_keyframe:
+            base = 0
+            tool_results = tool_results_cache
+            tool_results_removed = []
+        else:
+            tool_results = {
+                key: value for key, value in tool_results_cache.items()
+                if key not in self._tool_results or self._tool_results[key] != value
+            }
+            tool_results_removed = [key for key in self._tool_results if key not in tool_results_cache]
+
+        appended = hashes[base:]
+        new_messages = {
+            h: message for h, message in zip(appended, conversation_history[base:])
+            if h not in self._stored_hashes
+        }
+
         async with DatabaseManager() as db:
             checkpoint_id = await db.create_checkpoint(
                 session_id=self.session_id,
@@ -95,8 +198,14 @@ class CheckpointManager:
                 current_epic_id=current_epic_id,
                 message_count=message_count,
                 iteration_count=iteration_count,
-                conversation_history=conversation_history,
-                tool_results_cache=tool_results_cache or {},
+                message_hashes=appended,
+                messages=new_messages,
+                parent_checkpoint_id=None if is_keyframe else self.last_checkpoint_id,
+                is_keyframe=is_keyframe,
+                base_message_count=base,
+                conversation_hash=conversation_hash(hashes),
+                tool_results_cache=tool_results,
+                tool_results_removed=tool_results_removed,
                 completed_tasks=completed_tasks or [],
                 in_progress_tasks=in_progress_tasks or [],
                 blocked_tasks=blocked_tasks or [],
@@ -108,10 +217,15 @@ class CheckpointManager:
 
         self.checkpoint_count += 1
         self.last_checkpoint_id = checkpoint_id
+        self._message_hashes = hashes
+        self._tool_results = dict(tool_results_cache)
+        self._deltas_since_keyframe = 0 if is_keyframe else self._deltas_since_keyframe + 1
+        self._stored_hashes.update(new_messages)
 
         logger.info(
             f"Created checkpoint {self.checkpoint_count} for session {self.session_id}: "
-            f"type={checkpoint_type}, task={current_task_id}, messages={message_count}"
+            f"type={checkpoint_type}, task={current_task_id}, messages={message_count}, "
+            f"{'keyframe' if is_keyframe else 'delta'} (+{len(appended)} messages, {len(new_messages)} stored)"
         )
 
         return checkpoint_id
@@ -272,6 +386,17 @@ class CheckpointRecoveryManager:
             if not checkpoint.get("can_resume_from"):
                 raise ValueError(f"Checkpoint {checkpoint_id} cannot be resumed from")
 
+            if checkpoint.get("message_hashes") is not None:
+                # Delta-chained checkpoint: replay from the nearest keyframe
+                chain = await db.get_checkpoint_chain(UUID(checkpoint_id))
+                hashes = [h for cp in chain for h in cp.get("message_hashes") or []]
+                messages = await db.get_checkpoint_messages(hashes)
+                conversation_history, tool_results_cache = replay_checkpoint_chain(chain, messages)
+            else:
+                # Legacy full snapshot
+                conversation_history = _load_json(checkpoint.get("conversation_history"), [])
+                tool_results_cache = _load_json(checkpoint.get("tool_results_cache"), {})
+
         # Build restore state
         restore_state = {
             "checkpoint_id": checkpoint_id,
@@ -281,7 +406,7 @@ class CheckpointRecoveryManager:
             "checkpoint_type": checkpoint["checkpoint_type"],
 
             # Conversation state
-            "conversation_history": checkpoint.get("conversation_history", []),
+            "conversation_history": conversation_history,
             "message_count": checkpoint.get("message_count", 0),
             "iteration_count": checkpoint.get("iteration_count", 0),
 
@@ -293,7 +418,7 @@ class CheckpointRecoveryManager:
             "blocked_tasks": checkpoint.get("blocked_tasks", []),
 
             # Context
-            "tool_results_cache": checkpoint.get("tool_results_cache", {}),
+            "tool_results_cache": tool_results_cache,
             "metrics": checkpoint.get("metrics_snapshot", {}),
 
             # File state
@@ -425,6 +550,15 @@ class CheckpointRecoveryManager:
 
 # Utility functions
 
+def _load_json(value: Any, default: Any) -> Any:
+    """JSONB column value (asyncpg returns JSONB as text unless a codec is set)."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
 async def get_resumable_sessions(project_id: Optional[str] = None) -> List[Dict]:
     """
     Get all sessions that can be resumed from checkpoints.
@@ -7,9 +7,12 @@ Supports local path copy and GitHub clone.
 
 Analysis is lightweight (file-system inspection only, no LLM cost).
 Deep understanding happens in Session 0 via the brownfield initializer prompt.
+It walks the tree once (see codebase_scan) and is cached by git commit SHA
+for clean checkouts, so re-importing the same commit skips the walk.
 """
 
 import asyncio
+import json
 import os
 import shutil
 import subprocess
@@ -17,6 +20,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Dict, List, Any, Set
 
+from server.agent.codebase_scan import scan_codebase
 from server.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -96,6 +100,12 @@ LANGUAGE_EXTENSIONS: Dict[str, str] = {
     '.svelte': 'svelte',
 }
 
+# Extensions counted towards the LOC estimate
+LOC_EXTENSIONS: Set[str] = set(LANGUAGE_EXTENSIONS) | {'.html', '.css', '.scss', '.sql', '.md'}
+
+# Bump when CodebaseAnalysis or the detection rules change (invalidates the cache)
+ANALYSIS_CACHE_VERSION = 1
+
 # Config file to framework mapping
 FRAMEWORK_INDICATORS: Dict[str, Optional[str]] = {
     'next.config.js': 'next.js',
@@ -158,6 +168,16 @@ class CodebaseImporter:
         '*.egg-info', '.cache', '.parcel-cache',
     }
 
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize the importer.
+
+        Args:
+            cache_dir: Analysis cache directory (default: .yokeflow/analysis-cache
+                next to the analyzed project, i.e. shared by the generations dir)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
     async def import_from_local(
         self, source_path: Path, target_dir: Path
     ) -> ImportResult:
@@ -190,32 +210,35 @@ class CodebaseImporter:
             )
 
         try:
-            def _should_exclude(name: str) -> bool:
-                return name in self.EXCLUDE_PATTERNS
+            ignore = shutil.ignore_patterns(*self.EXCLUDE_PATTERNS)
 
-            # Copy the directory tree
+            # Copy the directory tree, counting files and size as they are copied
             file_count = 0
             total_size = 0
 
-            for item in source_path.iterdir():
-                if _should_exclude(item.name):
+            def _copy(src, dst, *, follow_symlinks=True):
+                nonlocal file_count, total_size
+                copied = shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+                file_count += 1
+                total_size += os.path.getsize(copied)
+                return copied
+
+            items = list(source_path.iterdir())
+            excluded = ignore(str(source_path), [item.name for item in items])
+            for item in items:
+                if item.name in excluded:
                     continue
 
                 dest = target_dir / item.name
                 if item.is_dir():
                     shutil.copytree(
                         item, dest,
-                        ignore=shutil.ignore_patterns(*self.EXCLUDE_PATTERNS),
+                        ignore=ignore,
+                        copy_function=_copy,
                         dirs_exist_ok=True
                     )
                 else:
-                    shutil.copy2(item, dest)
-
-            # Count files and size
-            for f in target_dir.rglob('*'):
-                if f.is_file():
-                    file_count += 1
-                    total_size += f.stat().st_size
+                    _copy(item, dest)
 
             # Try to get commit SHA from source
             commit_sha = self._get_git_sha(source_path)
@@ -313,12 +336,12 @@ class CodebaseImporter:
                 shutil.rmtree(clone_dir)
 
             # Count files
-            file_count = 0
-            total_size = 0
-            for f in target_dir.rglob('*'):
-                if f.is_file() and '.git' not in f.parts:
-                    file_count += 1
-                    total_size += f.stat().st_size
+            scan = await asyncio.to_thread(
+                scan_codebase, target_dir, {'.git'},
+                use_gitignore=False, skip_hidden=False
+            )
+            file_count = scan.file_count
+            total_size = scan.total_size_bytes
 
             logger.info(
                 f"Cloned GitHub repo: {file_count} files, "
@@ -361,38 +384,48 @@ class CodebaseImporter:
 
         This is file-system level inspection only (fast, no LLM cost).
         The heavy understanding happens in Session 0 via Claude.
+
+        Clean git checkouts are cached by commit SHA.
         """
+        project_dir = Path(project_dir)
+
+        cache_path = await asyncio.to_thread(self._analysis_cache_path, project_dir)
+        if cache_path:
+            cached = await asyncio.to_thread(self._load_cached_analysis, cache_path)
+            if cached:
+                logger.info(f"Using cached codebase analysis for commit {cache_path.stem[:12]}")
+                return cached
+
+        analysis = await asyncio.to_thread(self._analyze, project_dir)
+
+        if cache_path:
+            await asyncio.to_thread(self._save_cached_analysis, cache_path, analysis)
+
+        logger.info(
+            f"Codebase analysis: {', '.join(analysis.languages[:3])} | "
+            f"{', '.join(analysis.frameworks[:3])} | "
+            f"{analysis.loc_estimate} LOC | "
+            f"tests: {analysis.test_framework or 'none'}"
+        )
+
+        return analysis
+
+    def _analyze(self, project_dir: Path) -> CodebaseAnalysis:
+        """Analyze a codebase (blocking; run in a thread)."""
         analysis = CodebaseAnalysis()
 
-        # Detect languages by file extension
-        lang_counts: Dict[str, int] = {}
-        loc_total = 0
-
-        for f in project_dir.rglob('*'):
-            if not f.is_file():
-                continue
-            # Skip hidden dirs and excluded dirs
-            parts = f.relative_to(project_dir).parts
-            if any(p.startswith('.') or p in CodebaseImporter.EXCLUDE_PATTERNS for p in parts):
-                continue
-
-            ext = f.suffix.lower()
-            if ext in LANGUAGE_EXTENSIONS:
-                lang = LANGUAGE_EXTENSIONS[ext]
-                lang_counts[lang] = lang_counts.get(lang, 0) + 1
-
-            # Rough LOC estimate (count lines in source files)
-            if ext in LANGUAGE_EXTENSIONS or ext in {'.html', '.css', '.scss', '.sql', '.md'}:
-                try:
-                    loc_total += sum(1 for _ in f.open(errors='ignore'))
-                except (OSError, UnicodeDecodeError):
-                    pass
+        # Detect languages by file extension and estimate LOC in one walk
+        scan = scan_codebase(
+            project_dir, self.EXCLUDE_PATTERNS,
+            language_extensions=LANGUAGE_EXTENSIONS,
+            loc_extensions=LOC_EXTENSIONS,
+        )
 
         # Sort languages by file count, take the most common ones
         analysis.languages = [
-            lang for lang, _ in sorted(lang_counts.items(), key=lambda x: -x[1])
+            lang for lang, _ in sorted(scan.language_counts.items(), key=lambda x: -x[1])
         ]
-        analysis.loc_estimate = loc_total
+        analysis.loc_estimate = scan.loc_total
 
         # Detect frameworks from config files
         frameworks = []
@@ -405,7 +438,6 @@ class CodebaseImporter:
         package_json = project_dir / 'package.json'
         if package_json.exists():
             try:
-                import json
                 pkg = json.loads(package_json.read_text())
                 deps = {}
                 deps.update(pkg.get('dependencies', {}))
@@ -552,15 +584,60 @@ class CodebaseImporter:
         # Build directory structure summary (top 2 levels)
         analysis.directory_structure_summary = self._build_directory_summary(project_dir)
 
-        logger.info(
-            f"Codebase analysis: {', '.join(analysis.languages[:3])} | "
-            f"{', '.join(analysis.frameworks[:3])} | "
-            f"{analysis.loc_estimate} LOC | "
-            f"tests: {analysis.test_framework or 'none'}"
-        )
-
         return analysis
 
+    def _analysis_cache_path(self, project_dir: Path) -> Optional[Path]:
+        """
+        Cache file for a project's analysis, or None if it cannot be cached.
+
+        Only the root of a git checkout with no uncommitted or untracked
+        changes is cached, so the commit SHA identifies the analyzed files.
+        """
+        if not (project_dir / '.git').exists():
+            return None
+        sha = self._get_git_sha(project_dir)
+        if not sha:
+            return None
+        try:
+            status = subprocess.run(
+                ['git', 'status', '--porcelain'],
+                cwd=str(project_dir),
+                capture_output=True, text=True, timeout=30
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+        if status.returncode != 0 or status.stdout.strip():
+            return None
+
+        cache_dir = self.cache_dir or project_dir.parent / '.yokeflow' / 'analysis-cache'
+        return cache_dir / f"{sha}.json"
+
+    def _load_cached_analysis(self, cache_path: Path) -> Optional[CodebaseAnalysis]:
+        """Load a cached analysis (None if missing, stale or unreadable)."""
+        try:
+            data = json.loads(cache_path.read_text())
+            if data.get('version') != ANALYSIS_CACHE_VERSION:
+                return None
+            return CodebaseAnalysis(**data['analysis'])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable analysis cache {cache_path}: {e}")
+            return None
+
+    def _save_cached_analysis(self, cache_path: Path, analysis: CodebaseAnalysis) -> None:
+        """Write an analysis to the cache (best-effort)."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({
+                'version': ANALYSIS_CACHE_VERSION,
+                'analysis': analysis.to_dict(),
+            }))
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write analysis cache {cache_path}: {e}")
+
     async def setup_brownfield_git(
         self, project_dir: Path, branch_name: Optional[str] = None
     ) -> str:
@@ -0,0 +1,249 @@
+"""
+Codebase Scanner
+================
+
+Single-pass, pruning file-system walk used by brownfield import and analysis.
+
+- os.scandir walk that skips excluded and .gitignore'd directories before
+  descending into them (node_modules, build output, ... are never listed)
+- File counts, sizes, per-language counts and LOC in the same pass; line
+  counting runs on a thread pool while the walk continues
+- Nested .gitignore files are honoured with git's precedence (deeper files
+  and later lines win). As in git, a negation cannot re-include a file
+  inside an ignored directory.
+"""
+
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Collection, Dict, List, Optional, Tuple
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+GITIGNORE_FILE = ".gitignore"
+
+# Files handed to a worker per line-counting task
+LOC_BATCH_SIZE = 64
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """One pattern from a .gitignore file."""
+    base: str                 # Directory of the .gitignore, relative to the scan root ('' for root)
+    regex: "re.Pattern[str]"  # Matches paths relative to base
+    negate: bool = False      # '!pattern'
+    dir_only: bool = False    # 'pattern/'
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.fullmatch(rel_path) is not None
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob to a regex ('*' and '?' do not cross '/', '**' does)."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_gitignore(text: str, base: str = "") -> List[IgnoreRule]:
+    """
+    Parse the contents of a .gitignore file.
+
+    Args:
+        text: File contents
+        base: Directory containing the file, relative to the scan root
+
+    Returns:
+        Rules in file order
+    """
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # A slash anywhere but the end anchors the pattern to the .gitignore's directory
+        anchored = "/" in line
+        regex = _translate(line.lstrip("/"))
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        rules.append(IgnoreRule(base, re.compile(regex), negate, dir_only))
+    return rules
+
+
+def is_ignored(rel_path: str, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+    """Check a path against .gitignore rules (the last matching rule wins)."""
+    for rule in reversed(rules):
+        if rule.matches(rel_path, is_dir):
+            return not rule.negate
+    return False
+
+
+def count_lines(path: str) -> int:
+    """Count lines in a file (a final line without a newline counts), 0 if unreadable."""
+    lines = 0
+    last = b"\n"
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                lines += chunk.count(b"\n")
+                last = chunk[-1:]
+    except OSError:
+        return 0
+    return lines + (last != b"\n")
+
+
+def _count_lines_batch(paths: List[str]) -> int:
+    return sum(count_lines(path) for path in paths)
+
+
+@dataclass
+class ScanResult:
+    """Totals from one walk of a codebase."""
+    file_count: int = 0
+    total_size_bytes: int = 0
+    language_counts: Dict[str, int] = field(default_factory=dict)  # language -> file count
+    loc_total: int = 0
+
+
+def scan_codebase(
+    root: Path,
+    exclude_patterns: Collection[str] = (),
+    *,
+    language_extensions: Optional[Dict[str, str]] = None,
+    loc_extensions: Collection[str] = (),
+    use_gitignore: bool = True,
+    skip_hidden: bool = True,
+    max_workers: Optional[int] = None,
+) -> ScanResult:
+    """
+    Walk a codebase once, pruning excluded directories, and total it up.
+
+    Args:
+        root: Directory to scan
+        exclude_patterns: File/directory names to skip (fnmatch wildcards allowed)
+        language_extensions: Lower-case extension -> language, for language_counts
+        loc_extensions: Lower-case extensions whose lines are counted
+        use_gitignore: Honour .gitignore files in the tree
+        skip_hidden: Skip files and directories starting with '.'
+        max_workers: Threads for line counting (default: ThreadPoolExecutor's)
+
+    Returns:
+        ScanResult for the files that were not excluded
+    """
+    root = Path(root)
+    language_extensions = language_extensions or {}
+    exact_excludes = {p for p in exclude_patterns if not any(ch in p for ch in "*?[")}
+    wildcard_excludes = [p for p in exclude_patterns if p not in exact_excludes]
+
+    def excluded(name: str) -> bool:
+        return name in exact_excludes or any(fnmatch(name, p) for p in wildcard_excludes)
+
+    result = ScanResult()
+    loc_futures: List[Future] = []
+    loc_batch: List[str] = []
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="codebase-scan") as pool:
+        stack: List[Tuple[str, str, List[IgnoreRule]]] = [(str(root), "", [])]
+        while stack:
+            directory, rel_dir, rules = stack.pop()
+
+            if use_gitignore:
+                gitignore = os.path.join(directory, GITIGNORE_FILE)
+                try:
+                    with open(gitignore, encoding="utf-8", errors="ignore") as f:
+                        rules = rules + parse_gitignore(f.read(), rel_dir)
+                except OSError:
+                    pass
+
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                logger.debug(f"Skipping unreadable directory {directory}: {e}")
+                continue
+
+            for entry in entries:
+                name = entry.name
+                if (skip_hidden and name.startswith(".")) or excluded(name):
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if rules and is_ignored(rel_path, is_dir, rules):
+                        continue
+                    if is_dir:
+                        stack.append((entry.path, rel_path, rules))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+
+                result.file_count += 1
+                result.total_size_bytes += size
+
+                ext = os.path.splitext(name)[1].lower()
+                language = language_extensions.get(ext)
+                if language:
+                    result.language_counts[language] = result.language_counts.get(language, 0) + 1
+                if ext in loc_extensions:
+                    loc_batch.append(entry.path)
+                    if len(loc_batch) >= LOC_BATCH_SIZE:
+                        loc_futures.append(pool.submit(_count_lines_batch, loc_batch))
+                        loc_batch = []
+
+        if loc_batch:
+            loc_futures.append(pool.submit(_count_lines_batch, loc_batch))
+        result.loc_total = sum(future.result() for future in loc_futures)
+
+    return result
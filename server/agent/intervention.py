@@ -12,10 +12,10 @@ import hashlib
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 from collections import defaultdict
-import aiohttp
 from pathlib import Path
 
 from server.database.connection import DatabaseManager
+from server.utils.http_clients import get_http_client
 from server.agent.quality_detector import QualityPatternDetector
 
 
@@ -235,31 +235,26 @@ class NotificationService:
         )
 
         try:
-            async with aiohttp.ClientSession() as session:
-                # Support different webhook formats
-                if "slack.com" in self.webhook_url:
-                    # Slack webhook format
-                    payload = {"text": message}
-                elif "discord.com" in self.webhook_url:
-                    # Discord webhook format
-                    payload = {"content": message}
-                else:
-                    # Generic webhook format
-                    payload = {
-                        "message": message,
-                        "session_id": session_id,
-                        "project": project_name,
-                        "blocker": blocker_info,
-                        "stats": retry_stats,
-                        "timestamp": datetime.now().isoformat()
-                    }
-
-                async with session.post(
-                    self.webhook_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    return response.status in [200, 201, 204]
+            # Support different webhook formats
+            if "slack.com" in self.webhook_url:
+                # Slack webhook format
+                payload = {"text": message}
+            elif "discord.com" in self.webhook_url:
+                # Discord webhook format
+                payload = {"content": message}
+            else:
+                # Generic webhook format
+                payload = {
+                    "message": message,
+                    "session_id": session_id,
+                    "project": project_name,
+                    "blocker": blocker_info,
+                    "stats": retry_stats,
+                    "timestamp": datetime.now().isoformat()
+                }
+
+            response = await get_http_client("webhooks").post(self.webhook_url, json=payload, timeout=10.0)
+            return response.status_code in [200, 201, 204]
 
         except Exception as e:
             print(f"Failed to send webhook notification: {e}")
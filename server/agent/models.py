@@ -59,3 +59,18 @@ class SessionInfo:
             "error_message": self.error_message,
             "metrics": self.metrics or {},
         }
+
+
+@dataclass
+class PreparedSession:
+    """
+    Setup of the next coding session, done while the loop waits between sessions.
+
+    Produced by AgentOrchestrator._prepare_coding_session in pipelined
+    auto-continue and consumed by the next start_session call.
+    """
+    project: Dict[str, Any]  # Project row
+    sandbox_type: str  # Project sandbox type ("docker", "e2b", "none")
+    sandbox: Any  # Started sandbox, container cleaned up (None once a session took it over)
+    prompt: str  # Coding prompt for the sandbox
+    prepared_seconds: float = 0.0  # Time the preparation took
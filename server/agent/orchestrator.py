@@ -18,6 +18,9 @@ Design Philosophy:
 """
 
 import asyncio
+import functools
+import socket
+import time
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Callable, Awaitable, TYPE_CHECKING
 from datetime import datetime
@@ -27,8 +30,9 @@ import os
 import asyncpg
 
 from server.client.claude import create_client
+from server.client.mcp_server import get_shared_mcp_server
 from server.database.connection import get_db, DatabaseManager, is_postgresql_configured
-from server.agent.models import SessionStatus, SessionType, SessionInfo
+from server.agent.models import SessionStatus, SessionType, SessionInfo, PreparedSession
 from server.quality.integration import QualityIntegration
 from server.utils.logging import get_logger, setup_structured_logging
 
@@ -41,7 +45,10 @@ from server.client.prompts import (
     copy_spec_to_project,
 )
 from server.agent.codebase_import import CodebaseImporter
+from server.agent.worktree import WorktreeManager
+from server.agent.scheduler import SessionScheduler, SessionDemand
 from server.utils.observability import SessionLogger, QuietOutputFilter, create_session_logger
+from server.utils.log_archive import archive_session_logs
 from server.agent.agent import run_agent_session, SessionManager
 from server.utils.config import Config
 from server.sandbox.manager import SandboxManager
@@ -62,6 +69,9 @@ if not any(isinstance(h.formatter, type(None)) for h in get_logger(__name__).han
 
 logger = get_logger(__name__)
 
+# Optional fields for list_projects(); progress is always included
+PROJECT_LIST_FIELDS = ("next_task", "active_sessions", "env")
+
 # Re-export models for backward compatibility
 __all__ = ['AgentOrchestrator', 'SessionInfo', 'SessionStatus', 'SessionType']
 
@@ -90,12 +100,23 @@ class AgentOrchestrator:
         # Quality system integration
         self.quality = QualityIntegration(self.config, event_callback)
 
+        # Admission control for sessions of all projects run by this orchestrator
+        self.scheduler = SessionScheduler.from_config(self.config, on_queue_update=event_callback)
+
         # Session managers for graceful shutdown
         self.session_managers: Dict[str, SessionManager] = {}
 
         # Session control flags (per-project)
         self.stop_after_current: Dict[str, bool] = {}  # project_id -> flag
 
+        # Global limit on concurrent parallel epic sessions (created lazily on the running loop)
+        self._parallel_slots: Optional[asyncio.Semaphore] = None
+        # .env status per project path, keyed by the files' mtimes
+        self._env_status_cache: Dict[str, Any] = {}
+        # Background work such as container prewarms and log compression
+        # (references keep the tasks alive)
+        self._background_tasks: set = set()
+
     # =========================================================================
     # Project Operations
     # =========================================================================
@@ -196,6 +217,8 @@ class AgentOrchestrator:
 
             await db.update_project_settings(project['id'], settings)
 
+            self._prewarm_sandbox(project_path, sandbox_type, SessionType.INITIALIZER)
+
             return project
 
     async def create_brownfield_project(
@@ -324,6 +347,8 @@ class AgentOrchestrator:
 
             await db.update_project_settings(project['id'], settings)
 
+            self._prewarm_sandbox(project_path, sandbox_type, SessionType.INITIALIZER, 'brownfield')
+
             logger.info(
                 f"Created brownfield project '{project_name}' from "
                 f"{'GitHub' if source_url else 'local'} source "
@@ -412,6 +437,56 @@ class AgentOrchestrator:
             logger.info(f"Rolled back brownfield project {project_id}")
             return True
 
+    def _sandbox_config(self, session_type: SessionType, project_type: str = 'greenfield') -> Dict[str, Any]:
+        """Build the sandbox configuration for a session."""
+        return {
+            "image": self.config.sandbox.docker_image,
+            "network": self.config.sandbox.docker_network,
+            "memory_limit": self.config.sandbox.docker_memory_limit,
+            "cpu_limit": self.config.sandbox.docker_cpu_limit,
+            "ports": self.config.sandbox.docker_ports,
+            "session_type": session_type.value,  # "initializer" or "coding"
+            "project_type": project_type,
+            "toolchain_image": self.config.sandbox.docker_toolchain_image,
+        }
+
+    def _prewarm_sandbox(
+        self,
+        project_path: Path,
+        sandbox_type: str,
+        session_type: SessionType,
+        project_type: str = 'greenfield'
+    ) -> None:
+        """
+        Create the project's Docker container in the background.
+
+        Builds the toolchain image if needed, so the first session does not
+        have to wait for it.
+        """
+        if sandbox_type != "docker" or not self.config.sandbox.docker_prewarm:
+            return
+
+        self._run_in_background(SandboxManager.prewarm_docker_container(
+            project_path, self._sandbox_config(session_type, project_type)
+        ))
+
+    def _run_in_background(self, coro) -> asyncio.Task:
+        """Start a fire-and-forget task, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def _archive_session_logs(self, session_logger: Optional[SessionLogger]) -> None:
+        """Compress a finished session's logs in the background."""
+        if session_logger is None or not self.config.project.compress_session_logs:
+            return
+        # Error paths skip finalize(), so buffered lines may still be pending
+        session_logger.close()
+        self._run_in_background(asyncio.to_thread(
+            archive_session_logs, session_logger.jsonl_file, session_logger.txt_file
+        ))
+
     async def get_project_info(self, project_id: UUID) -> Dict[str, Any]:
         """
         Get information about a project.
@@ -443,49 +518,102 @@ class AgentOrchestrator:
             active_session = await db.get_active_session(project_id)
             active_sessions = [active_session] if active_session else []
 
-            # Check environment configuration
-            env_file = project_path / ".env" if project_path else None
-            env_example = project_path / ".env.example" if project_path else None
-            has_env_file = env_file and env_file.exists()
-            has_env_example = env_example and env_example.exists()
-
-            # Check if .env.example actually has variables (not just empty file)
-            has_env_variables = False
-            if has_env_example and env_example:
-                try:
-                    content = env_example.read_text()
-                    # Count non-empty, non-comment lines
-                    lines = [line.strip() for line in content.splitlines()]
-                    var_lines = [line for line in lines if line and not line.startswith('#')]
-                    has_env_variables = len(var_lines) > 0
-                except Exception:
-                    # If we can't read the file, assume it has variables
-                    has_env_variables = True
-
-            # Determine if initialization is complete (Session 1 has created epics/tasks)
-            # Handle both old and new field names for compatibility
-            total_epics = progress.get("total_epics", 0) or progress.get("epics_total", 0)
-            is_initialized = total_epics > 0
-
-            # Determine if env configuration is needed
-            # Only flag if .env.example exists AND has actual variables
-            needs_env_config = (
-                is_initialized and
-                has_env_variables and
-                not project.get('env_configured', False)
-            )
-
             return {
                 **project,
-                "is_initialized": is_initialized,
+                **self._project_status(project, progress, self._get_env_status(project_path)),
                 "progress": progress,
                 "next_task": next_task,
                 "active_sessions": active_sessions,
-                "has_env_file": has_env_file,
-                "has_env_example": has_env_example,
-                "needs_env_config": needs_env_config,
             }
 
+    def _get_env_status(self, project_path: Path) -> Dict[str, bool]:
+        """
+        Check a project's .env / .env.example files.
+
+        Results are cached per project and reused until either file's mtime
+        changes, so listing many projects does not re-read every .env.example.
+
+        Args:
+            project_path: Project directory
+
+        Returns:
+            Dict with has_env_file, has_env_example and has_env_variables
+        """
+        env_file = project_path / ".env"
+        env_example = project_path / ".env.example"
+
+        def _mtime(path: Path) -> Optional[float]:
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return None
+
+        key = (_mtime(env_file), _mtime(env_example))
+        cached = self._env_status_cache.get(str(project_path))
+        if cached and cached[0] == key:
+            return cached[1]
+
+        has_env_file = key[0] is not None
+        has_env_example = key[1] is not None
+
+        # Check if .env.example actually has variables (not just empty file)
+        has_env_variables = False
+        if has_env_example:
+            try:
+                content = env_example.read_text()
+                # Count non-empty, non-comment lines
+                lines = [line.strip() for line in content.splitlines()]
+                var_lines = [line for line in lines if line and not line.startswith('#')]
+                has_env_variables = len(var_lines) > 0
+            except Exception:
+                # If we can't read the file, assume it has variables
+                has_env_variables = True
+
+        status = {
+            "has_env_file": has_env_file,
+            "has_env_example": has_env_example,
+            "has_env_variables": has_env_variables,
+        }
+        self._env_status_cache[str(project_path)] = (key, status)
+        return status
+
+    @staticmethod
+    def _project_status(
+        project: Dict[str, Any],
+        progress: Dict[str, Any],
+        env_status: Optional[Dict[str, bool]]
+    ) -> Dict[str, Any]:
+        """
+        Derive initialization and env-configuration flags for a project.
+
+        Args:
+            project: Project record
+            progress: Progress statistics from get_progress()
+            env_status: Result of _get_env_status(), or None to skip env flags
+
+        Returns:
+            Dict with is_initialized and, if env_status is given,
+            has_env_file, has_env_example and needs_env_config
+        """
+        # Determine if initialization is complete (Session 1 has created epics/tasks)
+        # Handle both old and new field names for compatibility
+        total_epics = progress.get("total_epics", 0) or progress.get("epics_total", 0)
+        status: Dict[str, Any] = {"is_initialized": total_epics > 0}
+
+        if env_status is not None:
+            # Determine if env configuration is needed
+            # Only flag if .env.example exists AND has actual variables
+            status.update({
+                "has_env_file": env_status["has_env_file"],
+                "has_env_example": env_status["has_env_example"],
+                "needs_env_config": (
+                    status["is_initialized"] and
+                    env_status["has_env_variables"] and
+                    not project.get('env_configured', False)
+                ),
+            })
+        return status
+
     async def get_project_by_name(self, project_name: str) -> Optional[Dict[str, Any]]:
         """
         Get project by name.
@@ -502,30 +630,68 @@ class AgentOrchestrator:
                 return await self.get_project_info(project['id'])
             return None
 
-    async def list_projects(self, user_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
+    async def list_projects(
+        self,
+        user_id: Optional[UUID] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        List all projects.
+        List projects with the same info as get_project_info().
+
+        Progress, next task and active sessions for the whole page are fetched
+        in a fixed number of queries instead of per project.
 
         Args:
             user_id: Optional user ID to filter projects
+            limit: Maximum number of projects (None = all)
+            offset: Number of projects to skip
+            fields: Optional fields to include, any of PROJECT_LIST_FIELDS
+                   (None = all). Progress is always included.
 
         Returns:
             List of project info dicts
         """
+        if fields is None:
+            fields = list(PROJECT_LIST_FIELDS)
+        unknown = set(fields) - set(PROJECT_LIST_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown project fields: {', '.join(sorted(unknown))}")
+
+        generations_dir = Path(self.config.project.default_generations_dir)
+
         async with DatabaseManager() as db:
-            projects = await db.list_projects(user_id=user_id)
+            projects = await db.list_projects_overview(
+                user_id=user_id,
+                limit=limit,
+                offset=offset,
+                include_next_task="next_task" in fields,
+                include_active_session="active_sessions" in fields,
+            )
 
-            # Enrich with progress info
-            enriched = []
-            for project in projects:
-                try:
-                    info = await self.get_project_info(project['id'])
-                    enriched.append(info)
-                except Exception as e:
-                    logger.warning(f"Could not get info for project {project['name']}: {e}")
-                    enriched.append(project)
+        enriched = []
+        for project in projects:
+            progress = project.pop("progress")
+            next_task = project.pop("next_task", None)
+            active_session = project.pop("active_session", None)
+
+            project_path = generations_dir / project['name']
+            project['local_path'] = str(project_path)
+            env_status = self._get_env_status(project_path) if "env" in fields else None
+
+            info = {
+                **project,
+                **self._project_status(project, progress, env_status),
+                "progress": progress,
+            }
+            if "next_task" in fields:
+                info["next_task"] = next_task
+            if "active_sessions" in fields:
+                info["active_sessions"] = [active_session] if active_session else []
+            enriched.append(info)
 
-            return enriched
+        return enriched
 
     # =========================================================================
     # Session Operations
@@ -536,6 +702,7 @@ class AgentOrchestrator:
         project_id: UUID,
         initializer_model: Optional[str] = None,
         progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        priority: int = 0,
     ) -> SessionInfo:
         """
         Run initialization session (Session 1) for a project.
@@ -550,6 +717,7 @@ class AgentOrchestrator:
             project_id: UUID of the project
             initializer_model: Model to use (defaults to config.models.initializer)
             progress_callback: Optional async callback for real-time progress updates
+            priority: Scheduler priority when sessions are queued (higher first)
 
         Returns:
             SessionInfo for the completed initialization session
@@ -581,7 +749,8 @@ class AgentOrchestrator:
             initializer_model=initializer_model,
             coding_model=None,  # Not needed for initialization
             max_iterations=None,  # Not applicable
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            priority=priority
         )
 
     async def start_coding_sessions(
@@ -590,6 +759,8 @@ class AgentOrchestrator:
         coding_model: Optional[str] = None,
         max_iterations: Optional[int] = 0,  # 0 = unlimited by default
         progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        parallel: bool = False,
+        priority: int = 0,
     ) -> SessionInfo:
         """
         Run coding sessions (Session 2+) for a project.
@@ -605,6 +776,9 @@ class AgentOrchestrator:
             coding_model: Model to use (defaults to config.models.coding)
             max_iterations: Maximum sessions to run (0 or None = unlimited)
             progress_callback: Optional async callback for real-time progress updates
+            parallel: Run independent epics concurrently in git worktrees
+                      (see _run_parallel_coding_sessions)
+            priority: Scheduler priority when sessions are queued (higher first)
 
         Returns:
             SessionInfo for the LAST completed session
@@ -644,163 +818,514 @@ class AgentOrchestrator:
         if max_iterations is None or max_iterations == 0:
             max_iterations = None  # Unlimited
 
+        if parallel:
+            worktrees = self._get_worktree_manager(project)
+            if await worktrees.is_available():
+                return await self._run_parallel_coding_sessions(
+                    project_id, worktrees, coding_model, max_iterations, progress_callback, priority
+                )
+            logger.warning(
+                f"Project '{project['name']}' is not a git repository with commits, "
+                "running coding sessions sequentially"
+            )
+
         # Auto-continue loop for coding sessions
         iteration = 0
         last_session = None
+        # Pipelined auto-continue: the next session's setup runs while this
+        # loop checks progress and waits out auto_continue_delay
+        prepare_task: Optional[asyncio.Task] = None
+        try:
+            while True:
+                # Check max_iterations
+                if max_iterations is not None and iteration >= max_iterations:
+                    logger.info(f"Reached max_iterations ({max_iterations}). Stopping.")
+                    break
 
-        while True:
-            # Check max_iterations
-            if max_iterations is not None and iteration >= max_iterations:
-                logger.info(f"Reached max_iterations ({max_iterations}). Stopping.")
-                break
+                # Check stop_after_current flag
+                project_id_str = str(project_id)
+                if self.stop_after_current.get(project_id_str, False):
+                    logger.info(f"Stop after current requested. Stopping.")
+                    # Clear flag
+                    self.stop_after_current[project_id_str] = False
+                    break
 
-            # Check stop_after_current flag
-            project_id_str = str(project_id)
-            if self.stop_after_current.get(project_id_str, False):
-                logger.info(f"Stop after current requested. Stopping.")
-                # Clear flag
-                self.stop_after_current[project_id_str] = False
-                break
+                # Check if project is already marked as complete
+                async with DatabaseManager() as db:
+                    project = await db.get_project(project_id)
+                    if project and project.get('completed_at'):
+                        logger.info(f"✅ Project already marked as complete (completed_at: {project['completed_at']}). Stopping auto-continue.")
+                        # Notify via callback
+                        if self.event_callback:
+                            await self.event_callback(project_id, "project_already_complete", {
+                                "completed_at": str(project['completed_at']),
+                                "message": "Project was already marked as complete"
+                            })
+                        break
 
-            # Check if project is already marked as complete
-            async with DatabaseManager() as db:
-                project = await db.get_project(project_id)
-                if project and project.get('completed_at'):
-                    logger.info(f"✅ Project already marked as complete (completed_at: {project['completed_at']}). Stopping auto-continue.")
-                    # Notify via callback
+                    # Also check if all epics are complete (for projects not yet marked complete)
+                    progress = await db.get_progress(project_id)
+                    if progress:
+                        completed_epics = progress.get('completed_epics', 0)
+                        total_epics = progress.get('total_epics', 0)
+                        logger.info(f"Auto-continue check: {completed_epics}/{total_epics} epics complete")
+                        if completed_epics == total_epics and total_epics > 0:
+                            logger.info(f"✅ All epics complete ({completed_epics}/{total_epics}). Stopping auto-continue.")
+                            # Notify via callback
+                            if self.event_callback:
+                                await self.event_callback(project_id, "all_epics_complete", {
+                                    "completed_epics": completed_epics,
+                                    "total_epics": total_epics,
+                                    "completed_tasks": progress.get('completed_tasks', 0),
+                                    "total_tasks": progress.get('total_tasks', 0)
+                                })
+                            break
+
+                iteration += 1
+
+                # Delay between sessions (except first)
+                if iteration > 1:
+                    delay = self.config.timing.auto_continue_delay
+                    logger.info(f"Auto-continue delay: {delay}s before session {iteration}")
+
+                    # Notify via callback about delay
                     if self.event_callback:
-                        await self.event_callback(project_id, "project_already_complete", {
-                            "completed_at": str(project['completed_at']),
-                            "message": "Project was already marked as complete"
+                        await self.event_callback(project_id, "auto_continue_delay", {
+                            "delay": delay,
+                            "next_iteration": iteration
                         })
+
+                    await asyncio.sleep(delay)
+
+                prepared = None
+                if prepare_task is not None:
+                    prepared = await prepare_task
+                    prepare_task = None
+
+                # Run single coding session
+                last_session = await self.start_session(
+                    project_id=project_id,
+                    initializer_model=None,  # Not needed
+                    coding_model=coding_model,
+                    max_iterations=None,  # Don't pass to individual session
+                    progress_callback=progress_callback,
+                    priority=priority,
+                    prepared=prepared
+                )
+
+                # Check if session failed or was blocked
+                if last_session.status in [SessionStatus.ERROR, SessionStatus.INTERRUPTED, SessionStatus.BLOCKED]:
+                    logger.info(f"Session ended with status {last_session.status}. Stopping auto-continue.")
+                    if last_session.status == SessionStatus.BLOCKED:
+                        logger.info("⚠️ Epic test intervention required. Auto-continue stopped.")
                     break
 
-                # Also check if all epics are complete (for projects not yet marked complete)
-                progress = await db.get_progress(project_id)
-                if progress:
-                    completed_epics = progress.get('completed_epics', 0)
-                    total_epics = progress.get('total_epics', 0)
-                    logger.info(f"Auto-continue check: {completed_epics}/{total_epics} epics complete")
-                    if completed_epics == total_epics and total_epics > 0:
-                        logger.info(f"✅ All epics complete ({completed_epics}/{total_epics}). Stopping auto-continue.")
+                # Check if project is complete (all tasks done)
+                async with DatabaseManager() as db:
+                    progress = await db.get_progress(project_id)
+                    total_tasks = progress.get('total_tasks', 0)
+                    completed_tasks = progress.get('completed_tasks', 0)
+
+                    if total_tasks > 0 and completed_tasks >= total_tasks:
+                        logger.info(f"Project complete! All {total_tasks} tasks done.")
+
+                        # Mark project as complete in database
+                        await db.mark_project_complete(project_id)
+                        # logger.info("✅ Project marked as complete in database")
+
+                        # NOTE: Project Completion Review (Phase 7) is disabled for now
+                        # Current implementation compares spec to epics/tasks/tests (the plan),
+                        # not the actual working implementation. This is more useful as a
+                        # post-initialization check rather than a final completion check.
+                        # See YOKEFLOW_FUTURE_PLAN.md for plans to enhance this feature.
+                        #
+                        # To manually run a completion review, use the API endpoint:
+                        # POST /api/projects/{project_id}/completion-review
+                        #
+                        # try:
+                        #     logger.info("Triggering project completion review...")
+                        #     from server.quality.completion_analyzer import CompletionAnalyzer
+                        #
+                        #     analyzer = CompletionAnalyzer(use_semantic_matching=True)
+                        #     review = await analyzer.analyze_completion(project_id, db)
+                        #
+                        #     # Store in database
+                        #     review_id = await db.store_completion_review(project_id, review)
+                        #
+                        #     logger.info(
+                        #         f"Completion review finished: {review['recommendation'].upper()} "
+                        #         f"(score={review['overall_score']}, coverage={review['coverage_percentage']:.1f}%)"
+                        #     )
+                        #
+                        #     # Notify via callback
+                        #     if self.event_callback:
+                        #         await self.event_callback(project_id, "completion_review_complete", {
+                        #             "review_id": str(review_id),
+                        #             "score": review['overall_score'],
+                        #             "recommendation": review['recommendation'],
+                        #             "coverage_percentage": review['coverage_percentage']
+                        #         })
+                        #
+                        # except Exception as e:
+                        #     logger.error(f"Failed to generate completion review (non-fatal): {e}", exc_info=True)
+                        #     # Don't fail project completion if review fails
+
+                        # Stop Docker container to free up ports
+                        # This is best-effort - don't fail if container doesn't exist or can't be stopped
+                        try:
+                            from server.sandbox.manager import SandboxManager
+                            project = await db.get_project(project_id)
+                            if project and project.get('sandbox_type') == 'docker':
+                                project_name = project.get('name')
+                                logger.info(f"Stopping Docker container for completed project: {project_name}")
+                                stopped = await asyncio.to_thread(SandboxManager.stop_docker_container, project_name)
+                                #if stopped:
+                                    #logger.info(f"✅ Docker container stopped successfully")
+                                #lse:
+                                    #logger.info(f"Docker container was not running or doesn't exist")
+                        except Exception as e:
+                            logger.warning(f"Failed to stop Docker container (non-fatal): {e}")
+
                         # Notify via callback
                         if self.event_callback:
-                            await self.event_callback(project_id, "all_epics_complete", {
-                                "completed_epics": completed_epics,
-                                "total_epics": total_epics,
-                                "completed_tasks": progress.get('completed_tasks', 0),
-                                "total_tasks": progress.get('total_tasks', 0)
+                            await self.event_callback(project_id, "project_complete", {
+                                "total_tasks": total_tasks,
+                                "completed_tasks": completed_tasks
                             })
                         break
 
-            iteration += 1
+                # Set up the next session while the loop checks and waits
+                if (
+                    self.config.timing.pipeline_sessions
+                    and (max_iterations is None or iteration < max_iterations)
+                    and not self.stop_after_current.get(project_id_str, False)
+                ):
+                    prepare_task = asyncio.create_task(self._prepare_coding_session(project_id))
 
-            # Delay between sessions (except first)
-            if iteration > 1:
-                delay = self.config.timing.auto_continue_delay
-                logger.info(f"Auto-continue delay: {delay}s before session {iteration}")
+        finally:
+            if prepare_task is not None:
+                await self._discard_prepared_session(prepare_task)
 
-                # Notify via callback about delay
-                if self.event_callback:
-                    await self.event_callback(project_id, "auto_continue_delay", {
-                        "delay": delay,
-                        "next_iteration": iteration
-                    })
+        return last_session
 
-                await asyncio.sleep(delay)
+    # =========================================================================
+    # Pipelined Session Setup
+    # =========================================================================
 
-            # Run single coding session
-            last_session = await self.start_session(
-                project_id=project_id,
-                initializer_model=None,  # Not needed
-                coding_model=coding_model,
-                max_iterations=None,  # Don't pass to individual session
-                progress_callback=progress_callback
-            )
+    async def _prepare_coding_session(self, project_id: UUID) -> Optional[PreparedSession]:
+        """
+        Set up the next coding session ahead of time (timing.pipeline_sessions).
 
-            # Check if session failed or was blocked
-            if last_session.status in [SessionStatus.ERROR, SessionStatus.INTERRUPTED, SessionStatus.BLOCKED]:
-                logger.info(f"Session ended with status {last_session.status}. Stopping auto-continue.")
-                if last_session.status == SessionStatus.BLOCKED:
-                    logger.info("⚠️ Epic test intervention required. Auto-continue stopped.")
-                break
+        Runs while the auto-continue loop checks progress and waits out
+        auto_continue_delay: stale session cleanup, project lookup, sandbox
+        start (container reuse and process cleanup) and prompt loading. The
+        previous session has ended, so cleaning its container is safe.
+
+        Best-effort: on failure the session sets itself up as usual.
 
-            # Check if project is complete (all tasks done)
+        Returns:
+            PreparedSession for start_session, or None
+        """
+        started = time.monotonic()
+        sandbox = None
+        try:
+            await self.cleanup_stale_sessions()
             async with DatabaseManager() as db:
-                progress = await db.get_progress(project_id)
-                total_tasks = progress.get('total_tasks', 0)
-                completed_tasks = progress.get('completed_tasks', 0)
-
-                if total_tasks > 0 and completed_tasks >= total_tasks:
-                    logger.info(f"Project complete! All {total_tasks} tasks done.")
-
-                    # Mark project as complete in database
-                    await db.mark_project_complete(project_id)
-                    # logger.info("✅ Project marked as complete in database")
-
-                    # NOTE: Project Completion Review (Phase 7) is disabled for now
-                    # Current implementation compares spec to epics/tasks/tests (the plan),
-                    # not the actual working implementation. This is more useful as a
-                    # post-initialization check rather than a final completion check.
-                    # See YOKEFLOW_FUTURE_PLAN.md for plans to enhance this feature.
-                    #
-                    # To manually run a completion review, use the API endpoint:
-                    # POST /api/projects/{project_id}/completion-review
-                    #
-                    # try:
-                    #     logger.info("Triggering project completion review...")
-                    #     from server.quality.completion_analyzer import CompletionAnalyzer
-                    #
-                    #     analyzer = CompletionAnalyzer(use_semantic_matching=True)
-                    #     review = await analyzer.analyze_completion(project_id, db)
-                    #
-                    #     # Store in database
-                    #     review_id = await db.store_completion_review(project_id, review)
-                    #
-                    #     logger.info(
-                    #         f"Completion review finished: {review['recommendation'].upper()} "
-                    #         f"(score={review['overall_score']}, coverage={review['coverage_percentage']:.1f}%)"
-                    #     )
-                    #
-                    #     # Notify via callback
-                    #     if self.event_callback:
-                    #         await self.event_callback(project_id, "completion_review_complete", {
-                    #             "review_id": str(review_id),
-                    #             "score": review['overall_score'],
-                    #             "recommendation": review['recommendation'],
-                    #             "coverage_percentage": review['coverage_percentage']
-                    #         })
-                    #
-                    # except Exception as e:
-                    #     logger.error(f"Failed to generate completion review (non-fatal): {e}", exc_info=True)
-                    #     # Don't fail project completion if review fails
-
-                    # Stop Docker container to free up ports
-                    # This is best-effort - don't fail if container doesn't exist or can't be stopped
-                    try:
-                        from server.sandbox.manager import SandboxManager
-                        project = await db.get_project(project_id)
-                        if project and project.get('sandbox_type') == 'docker':
-                            project_name = project.get('name')
-                            logger.info(f"Stopping Docker container for completed project: {project_name}")
-                            stopped = SandboxManager.stop_docker_container(project_name)
-                            #if stopped:
-                                #logger.info(f"✅ Docker container stopped successfully")
-                            #lse:
-                                #logger.info(f"Docker container was not running or doesn't exist")
-                    except Exception as e:
-                        logger.warning(f"Failed to stop Docker container (non-fatal): {e}")
+                project = await db.get_project(project_id)
+            if not project or not project.get('local_path'):
+                return None
 
-                    # Notify via callback
-                    if self.event_callback:
-                        await self.event_callback(project_id, "project_complete", {
-                            "total_tasks": total_tasks,
-                            "completed_tasks": completed_tasks
-                        })
+            project_type = project.get('project_type', 'greenfield')
+            sandbox_type = self._project_sandbox_type(project)
+            sandbox = SandboxManager.create_sandbox(
+                sandbox_type=sandbox_type,
+                project_dir=Path(project['local_path']),
+                config=self._sandbox_config(SessionType.CODING, project_type)
+            )
+            # Image builds are not bounded by the startup timeout
+            await sandbox.prepare()
+            await asyncio.wait_for(sandbox.start(), timeout=self.config.timing.sandbox_startup_timeout)
+
+            from server.sandbox.manager import DockerSandbox
+            prompt = self._coding_prompt(project_type, "docker" if isinstance(sandbox, DockerSandbox) else "local")
+
+            elapsed = time.monotonic() - started
+            logger.info(f"Prepared next session for project {project['name']} in {elapsed:.1f}s")
+            return PreparedSession(
+                project=project,
+                sandbox_type=sandbox_type,
+                sandbox=sandbox,
+                prompt=prompt,
+                prepared_seconds=elapsed,
+            )
+        except asyncio.CancelledError:
+            if sandbox is not None:
+                await self._stop_sandbox_quietly(sandbox)
+            raise
+        except Exception as e:
+            logger.warning(f"Could not prepare next session ahead of time (it will set up itself): {e}")
+            if sandbox is not None:
+                await self._stop_sandbox_quietly(sandbox)
+            return None
+
+    async def _discard_prepared_session(self, prepare_task: asyncio.Task) -> None:
+        """Stop the sandbox of a preparation the loop ended without using."""
+        if not prepare_task.done():
+            prepare_task.cancel()
+        try:
+            prepared = await prepare_task
+        except asyncio.CancelledError:
+            return
+        if prepared is not None and prepared.sandbox is not None:
+            await self._stop_sandbox_quietly(prepared.sandbox)
+
+    @staticmethod
+    async def _stop_sandbox_quietly(sandbox) -> None:
+        try:
+            await sandbox.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping prepared sandbox: {e}")
+
+    def _project_sandbox_type(self, project: Dict[str, Any]) -> str:
+        """Sandbox type from the project's metadata settings (config default if unset)."""
+        project_metadata = project.get('metadata', {})
+        if isinstance(project_metadata, str):
+            import json
+            project_metadata = json.loads(project_metadata)
+        return project_metadata.get('settings', {}).get('sandbox_type') or self.config.sandbox.type
+
+    @staticmethod
+    def _coding_prompt(project_type: str, sandbox_type: str) -> str:
+        """Coding session prompt for a project and sandbox type."""
+        base_prompt = get_coding_prompt(sandbox_type=sandbox_type)
+        if project_type == 'brownfield':
+            preamble = get_brownfield_coding_preamble()
+            return f"{preamble}\n\n{base_prompt}"
+        return base_prompt
+
+    # =========================================================================
+    # Parallel Epic Sessions
+    # =========================================================================
+
+    def _get_worktree_manager(self, project: Dict[str, Any]) -> WorktreeManager:
+        """Build the worktree manager for a project's parallel epic sessions."""
+        generations_dir = Path(self.config.project.default_generations_dir)
+        project_path = Path(project.get('local_path') or generations_dir / project['name'])
+        return WorktreeManager(project_path, generations_dir / self.config.parallel.worktrees_dir)
+
+    def _get_parallel_slots(self) -> asyncio.Semaphore:
+        """Semaphore bounding parallel epic sessions across all projects."""
+        if self._parallel_slots is None:
+            self._parallel_slots = asyncio.Semaphore(max(1, self.config.parallel.max_sessions_global))
+        return self._parallel_slots
+
+    async def _run_parallel_coding_sessions(
+        self,
+        project_id: UUID,
+        worktrees: WorktreeManager,
+        coding_model: str,
+        max_iterations: Optional[int],
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        priority: int = 0,
+    ) -> Optional[SessionInfo]:
+        """
+        Run coding sessions for independent epics concurrently.
+
+        Each session leases one epic (claim_next_epic), runs in its own git
+        worktree and sandbox, and is merged back into the project when it ends.
+        New epics are leased as slots free up, bounded by
+        parallel.max_sessions_per_project for this project and
+        parallel.max_sessions_global across all projects.
+
+        Args:
+            project_id: UUID of the project
+            worktrees: Worktree manager for the project
+            coding_model: Model to use for coding sessions
+            max_iterations: Maximum sessions to start (None = unlimited)
+            progress_callback: Optional async callback for real-time progress updates
+            priority: Scheduler priority when sessions are queued (higher first)
+
+        Returns:
+            SessionInfo for the LAST finished session (None if no epic was claimable)
+        """
+        project_id_str = str(project_id)
+        per_project_limit = max(1, self.config.parallel.max_sessions_per_project)
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{project_id_str}"
+        merge_lock = asyncio.Lock()
+
+        running: Dict[asyncio.Task, int] = {}  # task -> epic_id
+        skipped_epics: List[int] = []  # Epics with merge conflicts or worktree failures
+        started = 0
+        stop_leasing = False
+        last_session = None
+
+        while True:
+            if self.stop_after_current.get(project_id_str, False):
+                logger.info("Stop after current requested. Waiting for running epic sessions.")
+                self.stop_after_current[project_id_str] = False
+                stop_leasing = True
+
+            # Fill free slots with newly leased epics
+            while not stop_leasing and len(running) < per_project_limit:
+                if max_iterations is not None and started >= max_iterations:
+                    logger.info(f"Reached max_iterations ({max_iterations}). No new epic sessions.")
+                    stop_leasing = True
+                    break
+
+                async with DatabaseManager() as db:
+                    # Never re-lease an epic this loop is already running, even if its
+                    # lease was reclaimed while the session waited for a slot
+                    epic = await db.claim_next_epic(
+                        project_id, worker_id,
+                        exclude_epic_ids=skipped_epics + list(running.values())
+                    )
+                if not epic:
                     break
 
+                epic_id = epic['id']
+                try:
+                    await worktrees.create(epic_id)
+                except Exception as e:
+                    logger.error(f"Could not create worktree for epic {epic_id}: {e}")
+                    skipped_epics.append(epic_id)
+                    async with DatabaseManager() as db:
+                        await db.release_epic_lease(epic_id, worker_id)
+                    continue
+
+                started += 1
+                logger.info(f"Starting parallel session for epic {epic_id} ({epic['name']})")
+                if self.event_callback:
+                    await self.event_callback(project_id, "epic_session_starting", {
+                        "epic_id": epic_id,
+                        "epic_name": epic['name'],
+                        "running": len(running) + 1
+                    })
+
+                task = asyncio.create_task(self._run_epic_session(
+                    project_id, epic_id, worktrees, worker_id, merge_lock,
+                    coding_model, progress_callback, priority
+                ))
+                running[task] = epic_id
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                epic_id = running.pop(task)
+                session, merged = task.result()
+                if not merged:
+                    skipped_epics.append(epic_id)
+                if session is None:
+                    continue
+                last_session = session
+                if session.status in [SessionStatus.ERROR, SessionStatus.INTERRUPTED, SessionStatus.BLOCKED]:
+                    logger.info(
+                        f"Epic {epic_id} session ended with status {session.status}. "
+                        "No new epic sessions will be started."
+                    )
+                    stop_leasing = True
+
+        # Check if project is complete (all tasks done)
+        async with DatabaseManager() as db:
+            progress = await db.get_progress(project_id)
+            total_tasks = progress.get('total_tasks', 0)
+            completed_tasks = progress.get('completed_tasks', 0)
+
+            if total_tasks > 0 and completed_tasks >= total_tasks:
+                logger.info(f"Project complete! All {total_tasks} tasks done.")
+                await db.mark_project_complete(project_id)
+
+                if self.event_callback:
+                    await self.event_callback(project_id, "project_complete", {
+                        "total_tasks": total_tasks,
+                        "completed_tasks": completed_tasks
+                    })
+
         return last_session
 
+    async def _run_epic_session(
+        self,
+        project_id: UUID,
+        epic_id: int,
+        worktrees: WorktreeManager,
+        worker_id: str,
+        merge_lock: asyncio.Lock,
+        coding_model: str,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        priority: int = 0,
+    ) -> tuple[Optional[SessionInfo], bool]:
+        """
+        Run one epic-scoped session, then merge its worktree and release the lease.
+
+        Returns:
+            (SessionInfo or None if the session could not start, whether the merge succeeded)
+        """
+        session = None
+        merged = False
+        worktree_path = worktrees.worktree_path(epic_id)
+        # Keep the lease fresh while queued for a slot and while the session runs
+        renewal = asyncio.create_task(self._renew_epic_lease(epic_id, worker_id))
+
+        try:
+            async with self._get_parallel_slots():
+                session = await self.start_session(
+                    project_id=project_id,
+                    coding_model=coding_model,
+                    progress_callback=progress_callback,
+                    epic_id=epic_id,
+                    worktree_path=worktree_path,
+                    priority=priority,
+                )
+        except Exception as e:
+            logger.error(f"Parallel session for epic {epic_id} failed to run: {e}", exc_info=True)
+        finally:
+            renewal.cancel()
+
+            # Merges touch the main checkout, so serialize them per project
+            async with merge_lock:
+                try:
+                    merged = await worktrees.merge(epic_id)
+                    if merged:
+                        await worktrees.remove(epic_id)
+                except Exception as e:
+                    logger.error(f"Failed to merge worktree for epic {epic_id}: {e}")
+
+            if merged:
+                # The epic's sandbox container was bound to the removed worktree (best-effort)
+                try:
+                    await asyncio.to_thread(SandboxManager.delete_docker_container, worktree_path.name)
+                except Exception as e:
+                    logger.debug(f"No sandbox container removed for epic {epic_id}: {e}")
+
+            # Don't let a failed release escape task.result() and abort the parent
+            # loop while sibling sessions keep running (cleanup reclaims the lease)
+            try:
+                async with DatabaseManager() as db:
+                    await db.release_epic_lease(epic_id, worker_id)
+            except Exception as e:
+                logger.error(f"Failed to release lease for epic {epic_id}: {e}")
+
+            if self.event_callback:
+                await self.event_callback(project_id, "epic_merged" if merged else "epic_merge_conflict", {
+                    "epic_id": epic_id,
+                    "branch": worktrees.branch_name(epic_id),
+                    "worktree_path": None if merged else str(worktree_path)
+                })
+
+        return session, merged
+
+    async def _renew_epic_lease(self, epic_id: int, worker_id: str, interval: float = 60.0) -> None:
+        """Renew an epic lease every interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with DatabaseManager() as db:
+                    if not await db.renew_epic_lease(epic_id, worker_id):
+                        logger.warning(f"Lease for epic {epic_id} is no longer held by {worker_id}")
+            except Exception as e:
+                logger.warning(f"Failed to renew lease for epic {epic_id}: {e}")
+
     async def start_session(
         self,
         project_id: UUID,
@@ -809,11 +1334,16 @@ class AgentOrchestrator:
         max_iterations: Optional[int] = None,
         progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
         resume_context: Optional[Dict[str, Any]] = None,
+        epic_id: Optional[int] = None,
+        worktree_path: Optional[Path] = None,
+        priority: int = 0,
+        prepared: Optional[PreparedSession] = None,
     ) -> SessionInfo:
         """
         Start an agent session for a project.
 
         This is the main entry point for running the agent. It handles:
+        - Waiting for a scheduler slot (see SessionScheduler)
         - Determining session type (initializer vs coding)
         - Creating appropriate client and logger
         - Running the session
@@ -826,6 +1356,11 @@ class AgentOrchestrator:
             max_iterations: Maximum iterations for this invocation (None = unlimited)
             progress_callback: Optional async callback for real-time progress updates.
                              Called with event dict on each tool use/result.
+            epic_id: Scope a coding session to one leased epic (parallel sessions)
+            worktree_path: Git worktree the epic session works in (logs stay in the project)
+            priority: Scheduler priority when sessions are queued (higher first)
+            prepared: Setup done ahead of time by _prepare_coding_session
+                      (pipelined auto-continue)
 
         Returns:
             SessionInfo object with session details
@@ -833,19 +1368,79 @@ class AgentOrchestrator:
         Raises:
             ValueError: If project doesn't exist or model not provided
         """
+        try:
+            demand = await self._session_demand(project_id)
+            label = f"epic {epic_id} session" if epic_id is not None else "session"
+            async with self.scheduler.slot(project_id, demand, priority=priority, label=label):
+                return await self._run_session(
+                    project_id=project_id,
+                    initializer_model=initializer_model,
+                    coding_model=coding_model,
+                    max_iterations=max_iterations,
+                    progress_callback=progress_callback,
+                    resume_context=resume_context,
+                    epic_id=epic_id,
+                    worktree_path=worktree_path,
+                    prepared=prepared,
+                )
+        finally:
+            # The session failed before taking over the prepared sandbox
+            if prepared is not None and prepared.sandbox is not None:
+                await self._stop_sandbox_quietly(prepared.sandbox)
+
+    async def _session_demand(self, project_id: UUID) -> SessionDemand:
+        """Resources a session of this project reserves in the scheduler."""
+        async with DatabaseManager() as db:
+            project = await db.get_project(project_id)
+        if not project:
+            raise ValueError(f"Project not found: {project_id}")
+        return SessionScheduler.demand_for(self._project_sandbox_type(project), self.config.sandbox)
+
+    async def _shared_mcp_url(self) -> Optional[str]:
+        """
+        Endpoint of the host's shared MCP task manager (mcp.mode: shared).
+
+        Returns:
+            URL, or None to start a stdio server for the session (stdio mode,
+            or the shared server can't be started)
+        """
+        if self.config.mcp.mode != "shared":
+            return None
+        try:
+            return await get_shared_mcp_server(self.config).ensure_running()
+        except Exception as e:
+            logger.warning(f"Shared MCP server unavailable, using a per-session server: {e}")
+            return None
+
+    async def _run_session(
+        self,
+        project_id: UUID,
+        initializer_model: Optional[str] = None,
+        coding_model: Optional[str] = None,
+        max_iterations: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        resume_context: Optional[Dict[str, Any]] = None,
+        epic_id: Optional[int] = None,
+        worktree_path: Optional[Path] = None,
+        prepared: Optional[PreparedSession] = None,
+    ) -> SessionInfo:
+        """Run a session once the scheduler admitted it (see start_session)."""
         # Cleanup any stale sessions before starting (handles ungraceful shutdowns)
         # This is especially important for CLI usage where the API's periodic cleanup isn't running
-        await self.cleanup_stale_sessions()
+        # (a prepared session did this while the previous session wrapped up)
+        if prepared is None:
+            await self.cleanup_stale_sessions()
 
         async with DatabaseManager() as db:
             # Get project info
-            project = await db.get_project(project_id)
+            project = prepared.project if prepared is not None else await db.get_project(project_id)
             if not project:
                 raise ValueError(f"Project not found: {project_id}")
 
             # CONCURRENCY CHECK: Prevent creating a new session while another is running
             # This prevents phantom sessions from double-clicks or rapid API calls
-            active_session = await db.get_active_session(project_id)
+            # Parallel epic sessions are bounded by _run_parallel_coding_sessions instead
+            active_session = await db.get_active_session(project_id) if epic_id is None else None
             if active_session:
                 raise ValueError(
                     f"Cannot start new session: Session {active_session['session_number']} "
@@ -857,16 +1452,7 @@ class AgentOrchestrator:
             local_path = project.get('local_path', '')
 
             # Get sandbox type from project metadata (not global config)
-            project_metadata = project.get('metadata', {})
-            if isinstance(project_metadata, str):
-                import json
-                project_metadata = json.loads(project_metadata)
-
-            # Extract sandbox_type from metadata, default to config if not found
-            project_sandbox_type = project_metadata.get('settings', {}).get('sandbox_type')
-            if not project_sandbox_type:
-                project_sandbox_type = self.config.sandbox.type
-                logger.warning(f"No sandbox_type in project metadata, using config default: {project_sandbox_type}")
+            project_sandbox_type = self._project_sandbox_type(project)
 
             # Ensure project path is valid and exists
             if not local_path or local_path == '':
@@ -882,6 +1468,9 @@ class AgentOrchestrator:
                 if not project_path.exists():
                     project_path.mkdir(parents=True, exist_ok=True)
 
+            # Sandbox and agent work in the epic's worktree for parallel sessions
+            work_path = Path(worktree_path) if worktree_path is not None else project_path
+
             # Determine session type
             epics = await db.list_epics(project_id)
             is_initializer = len(epics) == 0
@@ -894,24 +1483,23 @@ class AgentOrchestrator:
             session_type = SessionType.INITIALIZER if is_initializer else SessionType.CODING
             current_model = initializer_model if is_initializer else coding_model
 
-            # Get next session number
-            session_number = await db.get_next_session_number(project_id)
-
-            # Create session in database with unique constraint protection
+            # Create session in database; the number is allocated inside the insert
+            # so parallel epic sessions can't race on it
             try:
                 session = await db.create_session(
                     project_id=project_id,
-                    session_number=session_number,
+                    session_number=None,
                     session_type=session_type.value,
                     model=current_model,
                     max_iterations=max_iterations,
+                    epic_id=epic_id,
                 )
             except asyncpg.UniqueViolationError as e:
                 # Race condition: another session with same number was created concurrently
                 # This can happen with rapid double-clicks or simultaneous API calls
                 raise ValueError(
-                    f"Session {session_number} already exists for this project. "
-                    f"Another session may have started concurrently. Please try again."
+                    "Session number already exists for this project. "
+                    "Another session may have started concurrently. Please try again."
                 ) from e
 
             session_id = session['id']
@@ -939,30 +1527,34 @@ class AgentOrchestrator:
             self.session_managers[str(session_id)] = session_manager
 
             # Create sandbox using project-specific sandbox type
-            sandbox_config = {
-                "image": self.config.sandbox.docker_image,
-                "network": self.config.sandbox.docker_network,
-                "memory_limit": self.config.sandbox.docker_memory_limit,
-                "cpu_limit": self.config.sandbox.docker_cpu_limit,
-                "ports": self.config.sandbox.docker_ports,
-                "session_type": session_type.value,  # "initializer" or "coding"
-                "project_type": project.get('project_type', 'greenfield'),
-            }
-            #logger.info(f"Creating {project_sandbox_type} sandbox for project {project_name}")
-            sandbox = SandboxManager.create_sandbox(
-                sandbox_type=project_sandbox_type,  # Use project-specific, not global config
-                project_dir=project_path,
-                config=sandbox_config
-            )
+            sandbox_config = self._sandbox_config(session_type, project.get('project_type', 'greenfield'))
+            # A prepared sandbox was started (and its container cleaned) ahead of time
+            use_prepared = prepared is not None and not is_initializer and worktree_path is None
+            if use_prepared:
+                sandbox, prepared.sandbox = prepared.sandbox, None  # Stopped with this session now
+            else:
+                #logger.info(f"Creating {project_sandbox_type} sandbox for project {project_name}")
+                sandbox = SandboxManager.create_sandbox(
+                    sandbox_type=project_sandbox_type,  # Use project-specific, not global config
+                    project_dir=work_path,
+                    config=sandbox_config
+                )
+            session_logger = None
 
             try:
                 # Start sandbox with timeout
                 # Docker sandbox setup can hang during package installation
                 sandbox_timeout = self.config.timing.sandbox_startup_timeout
-                logger.info(f"Starting {project_sandbox_type} sandbox (timeout: {sandbox_timeout}s)")
+                if use_prepared:
+                    logger.info(f"Using {project_sandbox_type} sandbox prepared in {prepared.prepared_seconds:.1f}s")
+                else:
+                    logger.info(f"Starting {project_sandbox_type} sandbox (timeout: {sandbox_timeout}s)")
 
                 try:
-                    await asyncio.wait_for(sandbox.start(), timeout=sandbox_timeout)
+                    if not use_prepared:
+                        # Image builds are not bounded by the startup timeout
+                        await sandbox.prepare()
+                        await asyncio.wait_for(sandbox.start(), timeout=sandbox_timeout)
                 except asyncio.TimeoutError:
                     logger.error(f"Sandbox failed to start within {sandbox_timeout}s - likely hung during package installation")
                     # Clean up the hung sandbox
@@ -1023,6 +1615,9 @@ class AgentOrchestrator:
                     sandbox_type=sandbox_type,
                     event_callback=logger_event_callback
                 )
+                # Stream output of sandbox commands run during the session into the logs
+                if isinstance(sandbox, DockerSandbox):
+                    sandbox.output_callback = session_logger.log_sandbox_output
                 # Add session and project IDs for intervention system
                 session_logger.session_id = str(session_id)
                 session_logger.project_id = str(project_id)
@@ -1042,12 +1637,20 @@ class AgentOrchestrator:
                     })
 
                 # Create client (pass project_id and docker_container for MCP task-manager)
-                client = create_client(
-                    project_path,
+                mcp_url = await self._shared_mcp_url()
+                # Initializer retries recreate the client with the same scope and leases
+                new_client = functools.partial(
+                    create_client,
+                    work_path,
                     current_model,
                     project_id=str(project_id),
-                    docker_container=docker_container
+                    docker_container=docker_container,
+                    epic_id=epic_id,
+                    worker_id=str(session_id),
+                    lease_ttl=self.config.timing.task_lease_ttl,
+                    mcp_url=mcp_url
                 )
+                client = new_client()
 
                 # Get prompt based on session type, sandbox, and project type
                 project_type = project.get('project_type', 'greenfield')
@@ -1077,13 +1680,17 @@ class AgentOrchestrator:
                     base_prompt = get_coding_prompt(sandbox_type=sandbox_type)
                     resume_prompt = resume_context.get("resume_prompt", "")
                     prompt = f"{base_prompt}\n\n{resume_prompt}"
+                elif use_prepared:
+                    prompt = prepared.prompt
                 else:
-                    base_prompt = get_coding_prompt(sandbox_type=sandbox_type)
-                    if project_type == 'brownfield':
-                        preamble = get_brownfield_coding_preamble()
-                        prompt = f"{preamble}\n\n{base_prompt}"
-                    else:
-                        prompt = base_prompt
+                    prompt = self._coding_prompt(project_type, sandbox_type)
+
+                if epic_id is not None:
+                    prompt = (
+                        f"EPIC SCOPE: This is a parallel session restricted to epic {epic_id}. "
+                        f"get_next_task only returns tasks from this epic - do not work on other epics. "
+                        f"Commit your work to the current git branch before the session ends.\n\n{prompt}"
+                    )
 
                 # Start heartbeat task to prevent false-positive stale detection
                 heartbeat_task = None
@@ -1092,7 +1699,10 @@ class AgentOrchestrator:
                     try:
                         while True:
                             await asyncio.sleep(60)  # Send heartbeat every 60 seconds
-                            await db.update_session_heartbeat(session_id)
+                            # Also renews task leases held by this session
+                            await db.update_session_heartbeat(
+                                session_id, lease_ttl=self.config.timing.task_lease_ttl
+                            )
                             logger.debug(f"Sent heartbeat for session {session_id}")
                     except asyncio.CancelledError:
                         logger.debug("Heartbeat task cancelled")
@@ -1176,12 +1786,7 @@ class AgentOrchestrator:
                                             })
 
                                         # Recreate client for retry (the old one might be in a bad state)
-                                        client = create_client(
-                                            project_path,
-                                            current_model,
-                                            project_id=str(project_id),
-                                            docker_container=docker_container
-                                        )
+                                        client = new_client()
                                         await asyncio.sleep(5)  # Brief pause before retry
                                         continue
                                     else:
@@ -1215,12 +1820,7 @@ class AgentOrchestrator:
                             logger.warning(f"Session failed with error: {e}, retrying...")
                             await asyncio.sleep(5)
                             # Recreate client for retry
-                            client = create_client(
-                                project_path,
-                                current_model,
-                                project_id=str(project_id),
-                                docker_container=docker_container
-                            )
+                            client = new_client()
                             continue
                         else:
                             raise  # Re-raise if final attempt or not initializer
@@ -1386,6 +1986,9 @@ class AgentOrchestrator:
                 if str(session_id) in self.session_managers:
                     del self.session_managers[str(session_id)]
 
+                # Session logs are final now; compress them
+                self._archive_session_logs(session_logger)
+
             return session_info
 
     async def stop_session(self, session_id: UUID, reason: str = "User requested stop") -> bool:
@@ -1548,7 +2151,7 @@ class AgentOrchestrator:
 
             # Delete Docker container if it exists (best effort - don't fail if error)
             try:
-                deleted = SandboxManager.delete_docker_container(project_name)
+                deleted = await asyncio.to_thread(SandboxManager.delete_docker_container, project_name)
                 if deleted:
                     logger.info(f"Successfully deleted Docker container for project {project_name}")
                 else:
@@ -0,0 +1,361 @@
+"""
+Session Scheduler
+=================
+
+Admission control in front of every agent session this process runs.
+
+Each session holds a Docker sandbox, a Claude SDK client and an MCP task
+manager process until it ends. Without a global view, starting sessions for
+many projects at once oversubscribes the host. The scheduler admits a
+session only while the process stays within:
+
+- max_sessions concurrent sessions
+- a memory budget and a CPU budget; a session's demand comes from the
+  sandbox limits (docker_memory_limit / docker_cpu_limit) of its sandbox
+  type, so sandbox-less sessions only count toward max_sessions
+
+Sessions that don't fit wait in a queue ordered by:
+
+1. priority (higher first)
+2. fewest sessions already running for the project
+3. project admitted least recently (round-robin between projects)
+4. arrival order
+
+The head of the queue is never bypassed by a smaller session behind it, so
+large sessions can't starve. A session larger than the whole budget is
+admitted when nothing else is running. Waiters are told their queue
+position through a callback whenever it changes.
+
+The scheduler is per process: the API in runner.mode inline, or each
+session worker process in runner.mode worker.
+"""
+
+import asyncio
+import itertools
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (project_id, event_type, data) - same signature as the orchestrator's event_callback
+QueueCallback = Callable[[Any, str, Dict[str, Any]], Awaitable[None]]
+
+_MEMORY_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+_MEMORY_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([bkmgt]?)b?\s*$", re.IGNORECASE)
+
+
+def parse_memory(value: Any) -> int:
+    """
+    Parse a Docker-style memory size ("2g", "512m", "1024") into bytes.
+
+    Raises:
+        ValueError: If the value is not a size
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _MEMORY_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid memory size: {value}")
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2).lower()])
+
+
+def host_memory_bytes() -> Optional[int]:
+    """Total physical memory of the host (None if unknown)."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def resolve_budget(value: Any, auto: Callable[[], Optional[float]], parse: Callable[[Any], float]) -> Optional[float]:
+    """
+    Turn a configured budget into a number.
+
+    Args:
+        value: "auto" (host capacity), empty / 0 / None (unlimited) or a size
+        auto: Returns the host capacity
+        parse: Parses an explicit size
+
+    Returns:
+        Budget, or None for unlimited (also when the value is invalid)
+    """
+    if value in (None, "", 0, "0"):
+        return None
+    if str(value).lower() == "auto":
+        return auto()
+    try:
+        return parse(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid scheduler budget {value!r} (no limit)")
+        return None
+
+
+@dataclass
+class SessionDemand:
+    """Resources one session holds while it runs."""
+    memory: int = 0  # Bytes
+    cpus: float = 0.0
+
+
+@dataclass
+class _Waiter:
+    project_id: str
+    demand: SessionDemand
+    priority: int
+    seq: int
+    label: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+    future: Optional[asyncio.Future] = None
+    reported_position: Optional[int] = None  # Last position sent to clients
+
+
+class SessionScheduler:
+    """Admits sessions within session/memory/CPU limits with fair queuing."""
+
+    def __init__(
+        self,
+        max_sessions: int = 0,
+        memory_budget: Optional[int] = None,
+        cpu_budget: Optional[float] = None,
+        on_queue_update: Optional[QueueCallback] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_sessions: Concurrent sessions (0 = unlimited)
+            memory_budget: Bytes of sandbox memory (None = unlimited)
+            cpu_budget: Sandbox CPUs (None = unlimited)
+            on_queue_update: Coroutine function (project_id, event_type, data)
+                for session_queued / session_admitted events
+        """
+        self.max_sessions = max_sessions
+        self.memory_budget = memory_budget
+        self.cpu_budget = cpu_budget
+        self.on_queue_update = on_queue_update
+
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._memory_in_use = 0
+        self._cpus_in_use = 0.0
+        self._running_by_project: Dict[str, int] = {}
+        self._last_admitted: Dict[str, int] = {}  # project -> admission counter
+        self._admissions = itertools.count(1)
+        self.admitted = 0
+        self.queued = 0
+        self.total_wait_seconds = 0.0
+
+    @classmethod
+    def from_config(cls, config, on_queue_update: Optional[QueueCallback] = None) -> "SessionScheduler":
+        """Build a scheduler from Config.scheduler."""
+        settings = config.scheduler
+        return cls(
+            max_sessions=int(settings.max_sessions or 0),
+            memory_budget=resolve_budget(settings.memory_budget, host_memory_bytes, parse_memory),
+            cpu_budget=resolve_budget(settings.cpu_budget, os.cpu_count, float),
+            on_queue_update=on_queue_update,
+        )
+
+    @staticmethod
+    def demand_for(sandbox_type: str, sandbox_config) -> SessionDemand:
+        """
+        Resources a session of a sandbox type holds.
+
+        Args:
+            sandbox_type: "docker", "e2b", "none", ...
+            sandbox_config: Config.sandbox (docker_memory_limit, docker_cpu_limit)
+        """
+        if sandbox_type != "docker":
+            return SessionDemand()  # Remote or no sandbox: nothing reserved on this host
+        try:
+            return SessionDemand(
+                memory=parse_memory(sandbox_config.docker_memory_limit),
+                cpus=float(sandbox_config.docker_cpu_limit),
+            )
+        except ValueError as e:
+            logger.warning(f"Cannot size docker sandbox for scheduling: {e}")
+            return SessionDemand()
+
+    # -------------------------------------------------------------------------
+    # Admission
+    # -------------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        project_id: Any,
+        demand: Optional[SessionDemand] = None,
+        priority: int = 0,
+        label: str = "session",
+    ):
+        """
+        Hold a session slot for the duration of the block (waits if full).
+
+        Args:
+            project_id: Project the session belongs to
+            demand: Resources the session holds
+            priority: Higher runs first
+            label: Description for logs and events
+        """
+        demand = demand or SessionDemand()
+        await self.acquire(str(project_id), demand, priority, label)
+        try:
+            yield
+        finally:
+            self.release(str(project_id), demand)
+
+    async def acquire(self, project_id: str, demand: SessionDemand, priority: int = 0, label: str = "session") -> None:
+        waiter = _Waiter(project_id, demand, priority, next(self._seq), label)
+        waiter.future = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._dispatch()
+        if waiter.future.done():
+            return
+
+        self.queued += 1
+        position = self._waiters.index(waiter) + 1
+        logger.info(f"Queued {label} for project {project_id} (position {position} of {len(self._waiters)})")
+        try:
+            await self._publish_positions()
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(project_id, demand)  # Admitted just as we were cancelled
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._dispatch()
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        self.total_wait_seconds += waited
+        logger.info(f"Admitted {label} for project {project_id} after {waited:.1f}s in queue")
+        await self._notify(project_id, "session_admitted", {
+            "waited_seconds": round(waited, 1),
+            "running": self._running,
+        })
+        await self._publish_positions()
+
+    def release(self, project_id: str, demand: SessionDemand) -> None:
+        self._running -= 1
+        self._memory_in_use -= demand.memory
+        self._cpus_in_use -= demand.cpus
+        remaining = self._running_by_project.get(project_id, 1) - 1
+        if remaining > 0:
+            self._running_by_project[project_id] = remaining
+        else:
+            self._running_by_project.pop(project_id, None)
+        self._dispatch()
+        if self._waiters:
+            self._schedule_publish()
+
+    def _fits(self, demand: SessionDemand) -> bool:
+        if self._running == 0:
+            return True  # Always let one session run, even if it exceeds the budget
+        if self.max_sessions and self._running >= self.max_sessions:
+            return False
+        if self.memory_budget is not None and self._memory_in_use + demand.memory > self.memory_budget:
+            return False
+        if self.cpu_budget is not None and self._cpus_in_use + demand.cpus > self.cpu_budget + 1e-9:
+            return False
+        return True
+
+    def _order_key(self, waiter: _Waiter):
+        return (
+            -waiter.priority,
+            self._running_by_project.get(waiter.project_id, 0),
+            self._last_admitted.get(waiter.project_id, 0),
+            waiter.seq,
+        )
+
+    def _dispatch(self) -> None:
+        """Admit waiters from the head of the queue while they fit."""
+        while self._waiters:
+            self._waiters.sort(key=self._order_key)
+            head = self._waiters[0]
+            if not self._fits(head.demand):
+                break
+            self._waiters.pop(0)
+            self._running += 1
+            self._memory_in_use += head.demand.memory
+            self._cpus_in_use += head.demand.cpus
+            self._running_by_project[head.project_id] = self._running_by_project.get(head.project_id, 0) + 1
+            self._last_admitted[head.project_id] = next(self._admissions)
+            self.admitted += 1
+            if not head.future.done():
+                head.future.set_result(None)
+
+    # -------------------------------------------------------------------------
+    # Queue position reporting
+    # -------------------------------------------------------------------------
+
+    def _schedule_publish(self) -> None:
+        try:
+            asyncio.get_running_loop().create_task(self._publish_positions())
+        except RuntimeError:
+            pass  # No running loop (release during interpreter shutdown)
+
+    async def _publish_positions(self) -> None:
+        """Tell every waiter whose position changed where it stands."""
+        total = len(self._waiters)
+        for position, waiter in enumerate(list(self._waiters), start=1):
+            if waiter.reported_position == position:
+                continue
+            waiter.reported_position = position
+            await self._notify(waiter.project_id, "session_queued", {
+                "position": position,
+                "queue_length": total,
+                "priority": waiter.priority,
+                "running": self._running,
+                "label": waiter.label,
+            })
+
+    async def _notify(self, project_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        if self.on_queue_update is None:
+            return
+        try:
+            await self.on_queue_update(project_id, event_type, data)
+        except Exception as e:
+            logger.error(f"Failed to report {event_type} for project {project_id}: {e}")
+
+    # -------------------------------------------------------------------------
+    # Stats
+    # -------------------------------------------------------------------------
+
+    def queue_position(self, project_id: Any) -> Optional[int]:
+        """1-based position of a project's first waiting session (None if not queued)."""
+        for position, waiter in enumerate(sorted(self._waiters, key=self._order_key), start=1):
+            if waiter.project_id == str(project_id):
+                return position
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "running": self._running,
+            "queued": len(self._waiters),
+            "max_sessions": self.max_sessions,
+            "memory_in_use": self._memory_in_use,
+            "memory_budget": self.memory_budget,
+            "cpus_in_use": round(self._cpus_in_use, 2),
+            "cpu_budget": self.cpu_budget,
+            "running_by_project": dict(self._running_by_project),
+            "queue": [
+                {
+                    "project_id": w.project_id,
+                    "priority": w.priority,
+                    "label": w.label,
+                    "waiting_seconds": round(now - w.enqueued_at, 1),
+                }
+                for w in sorted(self._waiters, key=self._order_key)
+            ],
+            "total_admitted": self.admitted,
+            "total_queued": self.queued,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.queued, 1) if self.queued else 0.0,
+        }
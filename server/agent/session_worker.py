@@ -0,0 +1,370 @@
+"""
+Session Worker
+==============
+
+Runs initialization and coding runs outside the API process.
+
+With ``runner.mode: worker`` the API queues runs in the session_jobs table
+instead of starting them on its own event loop. One or more session worker
+processes claim those jobs and run them with their own AgentOrchestrator, so
+the Claude SDK message loop, log writes, docker calls and quality analysis
+never compete with /api/* requests and WebSocket delivery, and running
+sessions survive an API restart.
+
+- Jobs are claimed with FOR UPDATE SKIP LOCKED (any number of workers)
+- The worker renews its leases every poll_interval; a worker that dies
+  stops renewing, and its jobs are failed once the lease expires (its
+  sessions are marked interrupted by the usual stale-session cleanup)
+- Stop / stop-after-current requests from the API are read from the job
+  row on each renewal and applied to the local orchestrator
+- Events go to the API through the Postgres event bus (LISTEN/NOTIFY)
+
+Usage:
+    python -m server.agent.session_worker [--concurrency N] [--worker-id NAME]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+Notifier = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+# Event sent when a run finishes, and when it fails
+COMPLETE_EVENTS = {"initialize": "initialization_complete", "coding": "coding_sessions_complete"}
+ERROR_EVENTS = {"initialize": "initialization_error", "coding": "coding_sessions_error"}
+
+
+async def run_session_job(
+    orchestrator,
+    kind: str,
+    project_id: UUID,
+    params: Dict[str, Any],
+    notify: Notifier,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run an initialization or coding run and report it to the project's clients.
+
+    Used by the API (runner.mode: inline) and by session workers alike.
+
+    Args:
+        orchestrator: AgentOrchestrator to run the sessions with
+        kind: 'initialize' or 'coding'
+        project_id: Project UUID
+        params: initializer_model, or coding_model / max_iterations / parallel;
+            optional scheduler priority
+        notify: Coroutine function (project_id, event) for WebSocket events
+
+    Returns:
+        Last session as a dict (None if no coding session ran)
+
+    Raises:
+        Whatever the orchestrator raised, after the error event was sent
+    """
+    project_id_str = str(project_id)
+
+    async def progress_update(event: Dict[str, Any]):
+        """Broadcast progress events to connected WebSocket clients."""
+        await notify(project_id_str, {
+            "type": "progress",
+            "event": event
+        })
+
+    try:
+        if kind == "initialize":
+            session = await orchestrator.start_initialization(
+                project_id=project_id,
+                initializer_model=params.get("initializer_model"),
+                progress_callback=progress_update,
+                priority=params.get("priority", 0)
+            )
+            result = session.to_dict()
+            await notify(project_id_str, {
+                "type": COMPLETE_EVENTS[kind],
+                "session": result
+            })
+        elif kind == "coding":
+            last_session = await orchestrator.start_coding_sessions(
+                project_id=project_id,
+                coding_model=params.get("coding_model"),
+                max_iterations=params.get("max_iterations", 0),
+                progress_callback=progress_update,
+                parallel=params.get("parallel", False),
+                priority=params.get("priority", 0)
+            )
+            result = last_session.to_dict() if last_session else None
+            await notify(project_id_str, {
+                "type": COMPLETE_EVENTS[kind],
+                "last_session": result
+            })
+        else:
+            raise ValueError(f"Unknown session job kind: {kind}")
+        return result
+
+    except Exception as e:
+        logger.error(f"{kind.capitalize()} run failed for project {project_id_str}: {e}")
+        await notify(project_id_str, {
+            "type": ERROR_EVENTS.get(kind, "session_error"),
+            "error": str(e)
+        })
+        raise
+
+
+class SessionWorker:
+    """Claims session jobs and runs them with a local orchestrator."""
+
+    def __init__(
+        self,
+        db_provider: Callable[[], Awaitable[Any]],
+        orchestrator,
+        notify: Notifier,
+        concurrency: int = 2,
+        poll_interval: float = 2.0,
+        lease_ttl: int = 60,
+        worker_id: Optional[str] = None,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            db_provider: Coroutine function returning the TaskDatabase
+            orchestrator: AgentOrchestrator that runs the sessions
+            notify: Coroutine function (project_id, event) for WebSocket events
+            concurrency: Runs this worker executes at once
+            poll_interval: Seconds between queue checks and lease renewals
+            lease_ttl: Seconds a job stays leased without a renewal
+            worker_id: Lease owner name (defaults to host and PID)
+        """
+        self._db_provider = db_provider
+        self.orchestrator = orchestrator
+        self._notify = notify
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.lease_ttl = max(lease_ttl, int(poll_interval * 3))
+        self.worker_id = worker_id or f"session-worker-{socket.gethostname()}-{os.getpid()}"
+
+        self._jobs: Dict[UUID, asyncio.Task] = {}
+        self._job_projects: Dict[UUID, UUID] = {}
+        self._stop_after_current: Dict[UUID, bool] = {}
+        self._stopped_sessions: Dict[UUID, UUID] = {}  # job_id -> session already stopped
+        self._loops: list = []
+        self._running = False
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._loops = [
+            asyncio.create_task(self._claim_loop()),
+            asyncio.create_task(self._heartbeat_loop()),
+        ]
+        logger.info(f"Session worker {self.worker_id} started (concurrency {self.concurrency})")
+
+    async def stop(self) -> None:
+        """
+        Stop claiming, interrupt running sessions and wait for the runs to end.
+        """
+        self._running = False
+        for task in self._loops:
+            task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+
+        for session_id in list(self.orchestrator.session_managers):
+            try:
+                await self.orchestrator.stop_session(UUID(session_id), reason="Session worker shut down")
+            except Exception as e:
+                logger.error(f"Failed to stop session {session_id}: {e}")
+        for task in list(self._jobs.values()):
+            task.cancel()
+        await asyncio.gather(*self._jobs.values(), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "concurrency": self.concurrency,
+            "running_jobs": len(self._jobs),
+            "projects": [str(p) for p in self._job_projects.values()],
+        }
+
+    # -------------------------------------------------------------------------
+    # Claiming and running
+    # -------------------------------------------------------------------------
+
+    async def _claim_loop(self) -> None:
+        while self._running:
+            job = None
+            if len(self._jobs) < self.concurrency:
+                try:
+                    db = await self._db_provider()
+                    job = await db.claim_session_job(self.worker_id, self.lease_ttl)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Failed to claim a session job: {e}")
+
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            logger.info(f"Claimed {job['kind']} job {job['id']} for project {job['project_id']}")
+            self._job_projects[job["id"]] = job["project_id"]
+            self._jobs[job["id"]] = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        error = None
+        result = None
+        try:
+            result = await run_session_job(
+                self.orchestrator, job["kind"], job["project_id"], job["params"] or {}, self._notify
+            )
+        except asyncio.CancelledError:
+            error = "Session worker shut down"
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        finally:
+            self._jobs.pop(job["id"], None)
+            self._job_projects.pop(job["id"], None)
+            self._stop_after_current.pop(job["id"], None)
+            self._stopped_sessions.pop(job["id"], None)
+            try:
+                db = await self._db_provider()
+                await db.finish_session_job(job["id"], error=error, result=result)
+            except Exception as e:
+                logger.error(f"Failed to record end of session job {job['id']}: {e}")
+
+    # -------------------------------------------------------------------------
+    # Lease renewal and stop requests
+    # -------------------------------------------------------------------------
+
+    async def _heartbeat_loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.heartbeat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Session worker heartbeat failed: {e}")
+
+    async def heartbeat(self) -> None:
+        """Renew this worker's leases, apply stop requests, expire dead workers' jobs."""
+        db = await self._db_provider()
+        for row in await db.renew_session_jobs(self.worker_id, self.lease_ttl):
+            await self._apply_controls(row)
+        expired = await db.expire_session_jobs()
+        if expired:
+            logger.warning(f"Failed {expired} session job(s) abandoned by another worker")
+
+    async def _apply_controls(self, row: Dict[str, Any]) -> None:
+        job_id = row["id"]
+        project_id = row["project_id"]
+
+        stop_after_current = bool(row["stop_after_current"])
+        if self._stop_after_current.get(job_id, False) != stop_after_current:
+            self._stop_after_current[job_id] = stop_after_current
+            self.orchestrator.set_stop_after_current(project_id, stop=stop_after_current)
+
+        session_id = row["stop_session_id"]
+        if (
+            row["stop_requested"] and session_id and job_id in self._jobs
+            and self._stopped_sessions.get(job_id) != session_id
+        ):
+            self._stopped_sessions[job_id] = session_id
+            stopped = await self.orchestrator.stop_session(session_id, reason="User requested immediate stop")
+            if stopped:
+                await self._notify(str(project_id), {
+                    "type": "session_stopped",
+                    "session_id": str(session_id),
+                    "timestamp": datetime.now().isoformat()
+                })
+
+
+async def _main(concurrency: Optional[int], worker_id: Optional[str]) -> None:
+    from server.agent.orchestrator import AgentOrchestrator
+    from server.client.mcp_server import get_shared_mcp_server
+    from server.utils.http_clients import close_http_clients
+    from server.api.event_bus import create_event_bus
+    from server.api.event_coalescer import EventCoalescer
+    from server.database.connection import close_db, get_database_url, get_db, is_postgresql_configured
+    from server.utils.config import Config
+
+    if not is_postgresql_configured():
+        raise SystemExit("Session workers need PostgreSQL (set DATABASE_URL)")
+
+    config = Config.load_default()
+
+    # Events always go through Postgres: the API is a different process
+    event_bus = create_event_bus(
+        "postgres",
+        get_database_url(),
+        channel=config.events.channel,
+        queue_size=config.events.publish_queue_size,
+    )
+    await event_bus.start()
+    coalescer = EventCoalescer(event_bus.publish, interval=config.events.snapshot_interval)
+
+    async def orchestrator_event_callback(project_id: UUID, event_type: str, data: Dict[str, Any]):
+        await coalescer.submit(str(project_id), {"type": event_type, **data})
+
+    worker = SessionWorker(
+        get_db,
+        AgentOrchestrator(verbose=False, event_callback=orchestrator_event_callback),
+        coalescer.submit,
+        concurrency=concurrency or config.runner.worker_concurrency,
+        poll_interval=config.runner.poll_interval,
+        lease_ttl=config.runner.lease_ttl,
+        worker_id=worker_id,
+    )
+
+    shutdown = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, shutdown.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    # Adopt the host's shared MCP task manager, or start it if none is running
+    shared_mcp = get_shared_mcp_server(config) if config.mcp.mode == "shared" else None
+    if shared_mcp is not None:
+        await shared_mcp.start()
+
+    await worker.start()
+    try:
+        await shutdown.wait()
+    finally:
+        logger.info("Session worker shutting down...")
+        await worker.stop()
+        if shared_mcp is not None:
+            await shared_mcp.stop()
+        await close_http_clients()
+        await coalescer.close()
+        await event_bus.stop()
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run YokeFlow agent sessions queued by the API")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Runs executed at once (default: runner.worker_concurrency)")
+    parser.add_argument("--worker-id", default=None, help="Lease owner name (default: host and PID)")
+    args = parser.parse_args()
+
+    # Same working directory as the API (generations/, logs/, .yokeflow.yaml)
+    os.chdir(Path(__file__).parent.parent.parent)
+    asyncio.run(_main(args.concurrency, args.worker_id))
+
+
+if __name__ == "__main__":
+    main()
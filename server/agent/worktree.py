@@ -0,0 +1,154 @@
+"""
+Epic Worktrees
+==============
+
+Git worktree management for parallel epic sessions.
+
+Each parallel coding session works on one epic in its own git worktree
+(branch ``yokeflow/epic-<id>``), so concurrent sessions never touch the same
+working tree. When a session ends its branch is merged back into the
+project's checked-out branch with ``--no-ff``. On a merge conflict the merge
+is aborted and the worktree/branch are left in place for manual resolution.
+"""
+
+import asyncio
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+GIT_TIMEOUT = 120  # seconds
+
+
+class WorktreeManager:
+    """Creates, merges and removes per-epic git worktrees for one project."""
+
+    def __init__(self, project_path: Path, worktrees_root: Path):
+        """
+        Args:
+            project_path: Main project directory (must be a git repository)
+            worktrees_root: Directory that holds the per-epic worktrees
+        """
+        self.project_path = Path(project_path)
+        self.worktrees_root = Path(worktrees_root)
+
+    def branch_name(self, epic_id: int) -> str:
+        """Branch used by the worktree for an epic."""
+        return f"yokeflow/epic-{epic_id}"
+
+    def worktree_path(self, epic_id: int) -> Path:
+        """Worktree directory for an epic."""
+        return self.worktrees_root / f"{self.project_path.name}--epic-{epic_id}"
+
+    async def _git(self, args: List[str], cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+        """Run a git command without blocking the event loop."""
+        return await asyncio.to_thread(
+            subprocess.run,
+            ['git', *args],
+            cwd=str(cwd or self.project_path),
+            capture_output=True, text=True, timeout=GIT_TIMEOUT
+        )
+
+    async def is_available(self) -> bool:
+        """
+        Check that the project can host worktrees.
+
+        Returns:
+            True if the project is a git repository with at least one commit
+        """
+        if not (self.project_path / '.git').exists():
+            return False
+        result = await self._git(['rev-parse', '--verify', '--quiet', 'HEAD'])
+        return result.returncode == 0
+
+    async def create(self, epic_id: int) -> Path:
+        """
+        Create (or reuse) the worktree for an epic.
+
+        An existing worktree is reused so that an epic whose previous merge
+        conflicted continues on top of its own branch.
+
+        Args:
+            epic_id: Epic ID
+
+        Returns:
+            Path to the worktree
+
+        Raises:
+            RuntimeError: If git fails to create the worktree
+        """
+        path = self.worktree_path(epic_id)
+        if path.exists():
+            return path
+
+        self.worktrees_root.mkdir(parents=True, exist_ok=True)
+        branch = self.branch_name(epic_id)
+
+        branch_exists = await self._git(['rev-parse', '--verify', '--quiet', f"refs/heads/{branch}"])
+        if branch_exists.returncode == 0:
+            args = ['worktree', 'add', str(path), branch]
+        else:
+            args = ['worktree', 'add', '-b', branch, str(path), 'HEAD']
+
+        result = await self._git(args)
+        if result.returncode != 0:
+            raise RuntimeError(f"git worktree add failed for epic {epic_id}: {result.stderr.strip()}")
+
+        logger.info(f"Created worktree for epic {epic_id} at {path}")
+        return path
+
+    async def merge(self, epic_id: int) -> bool:
+        """
+        Commit any leftover changes in the epic worktree and merge its branch back.
+
+        Args:
+            epic_id: Epic ID
+
+        Returns:
+            True if the branch merged cleanly, False on conflict (merge is aborted)
+        """
+        path = self.worktree_path(epic_id)
+        branch = self.branch_name(epic_id)
+
+        if path.exists():
+            await self._git(['add', '-A'], cwd=path)
+            # Fails harmlessly with "nothing to commit" when the agent committed everything
+            await self._git(
+                ['commit', '-m', f"YokeFlow: work in progress for epic {epic_id}"],
+                cwd=path
+            )
+            # Never merge (and later remove) a worktree whose changes could not be committed
+            status = await self._git(['status', '--porcelain'], cwd=path)
+            if status.returncode != 0 or status.stdout.strip():
+                logger.warning(f"Uncommitted changes remain in {path}, skipping merge of {branch}")
+                return False
+
+        result = await self._git(['merge', '--no-ff', '--no-edit', branch])
+        if result.returncode != 0:
+            await self._git(['merge', '--abort'])
+            logger.warning(
+                f"Merge of {branch} failed, keeping worktree for manual resolution: "
+                f"{(result.stdout + result.stderr).strip()}"
+            )
+            return False
+
+        logger.info(f"Merged {branch} into {self.project_path.name}")
+        return True
+
+    async def remove(self, epic_id: int) -> None:
+        """
+        Remove the worktree and branch for an epic.
+
+        Args:
+            epic_id: Epic ID
+        """
+        path = self.worktree_path(epic_id)
+        if path.exists():
+            result = await self._git(['worktree', 'remove', '--force', str(path)])
+            if result.returncode != 0:
+                logger.warning(f"Failed to remove worktree {path}: {result.stderr.strip()}")
+        await self._git(['worktree', 'prune'])
+        await self._git(['branch', '-D', self.branch_name(epic_id)])
@@ -73,9 +73,21 @@ if leaked_api_key:
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from server.agent.orchestrator import AgentOrchestrator, SessionInfo, SessionStatus, SessionType
-from server.database.connection import DatabaseManager, is_postgresql_configured, get_db
+from server.agent.session_worker import run_session_job
+from server.database.connection import DatabaseManager, is_postgresql_configured, get_db, get_database_url
+from server.api.event_bus import create_event_bus
+from server.api.event_coalescer import EventCoalescer
+from server.quality.review_queue import ReviewQueue
+from server.client.mcp_server import get_shared_mcp_server
+from server.utils.http_clients import close_http_clients, get_http_registry
+from server.api.websocket_manager import ConnectionManager
 from server.utils.config import Config
 from server.utils.reset import reset_project
+from server.utils.log_archive import (
+    glob_logs, logical_log_path, open_log, open_log_seekable,
+    read_log_text, resolve_log_path,
+)
+from server.utils.log_index import SessionLogIndex
 from server.api.routes.prompt_improvements import router as prompt_improvements_router
 from server.api.routes.remote import router as remote_router, init_remote_control
 from server.api.routes.knowledge import router as knowledge_router, init_knowledge
@@ -285,6 +297,23 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to initialize Telegram remote control: {e}")
 
+    # Start delivering events from other API workers
+    try:
+        await event_bus.start()
+    except Exception as e:
+        logger.error(f"Failed to start event bus: {e}")
+
+    # Start the deep review workers
+    if is_postgresql_configured():
+        try:
+            await review_queue.start()
+        except Exception as e:
+            logger.error(f"Failed to start review queue: {e}")
+
+    # Shared MCP task manager for inline sessions (session workers run their own)
+    if config.mcp.mode == "shared" and config.runner.mode == "inline":
+        await get_shared_mcp_server(config).start()
+
     # Initialize knowledge layer
     try:
         init_knowledge()
@@ -305,6 +334,21 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error stopping Telegram adapter: {e}")
 
+    # Stop review workers (in-flight jobs are re-queued when their lease expires)
+    await review_queue.stop()
+
+    # Stop the shared MCP task manager (only if this process started it)
+    if config.mcp.mode == "shared" and config.runner.mode == "inline":
+        await get_shared_mcp_server(config).stop()
+
+    # Close pooled outbound HTTP connections
+    await close_http_clients()
+
+    # Stop the event bus and WebSocket writers
+    await event_coalescer.close()
+    await event_bus.stop()
+    await connection_manager.close_all()
+
     # Cancel periodic cleanup task
     if cleanup_task:
         cleanup_task.cancel()
@@ -369,13 +413,54 @@ app.include_router(knowledge_router)
 # Load configuration
 config = Config.load_default()
 
-# Active WebSocket connections (project_id -> list of WebSockets)
-active_connections: Dict[str, List[WebSocket]] = {}
+# This worker's WebSocket clients, each with its own bounded send queue
+connection_manager = ConnectionManager(
+    queue_size=config.events.client_queue_size,
+    send_timeout=config.events.client_send_timeout,
+    coalesce_types=config.events.coalesce_types,
+)
+
+# Event bus carrying notify_project_update() events to every API worker
+# (and from session workers, which always publish through Postgres)
+event_bus = create_event_bus(
+    "postgres" if config.runner.mode == "worker" else config.events.backend,
+    get_database_url() if is_postgresql_configured() else None,
+    channel=config.events.channel,
+    queue_size=config.events.publish_queue_size,
+)
+
+# Merges tool-use bursts into periodic snapshots before they reach the event bus
+event_coalescer = EventCoalescer(event_bus.publish, interval=config.events.snapshot_interval)
+
+# Bounded worker pool for deep reviews triggered through the API
+review_queue = ReviewQueue(
+    get_db,
+    publish=event_coalescer.submit,
+    generations_dir=config.project.default_generations_dir,
+    workers=config.review.queue_workers,
+    model_limits=config.review.queue_model_limits,
+    max_attempts=config.review.queue_max_attempts,
+    retry_delay=config.review.queue_retry_delay,
+    job_timeout=config.review.queue_job_timeout,
+    poll_interval=config.review.queue_poll_interval,
+)
 
 # Background tasks for running sessions
 running_sessions: Dict[str, asyncio.Task] = {}
 
 
+async def _queue_session_job(project_uuid: UUID, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Queue a run for the session workers (runner.mode: worker)."""
+    db = await get_db()
+    job = await db.enqueue_session_job(project_uuid, kind, params)
+    if job is None:
+        raise HTTPException(
+            status_code=409,
+            detail="A run is already queued or in progress for this project"
+        )
+    return job
+
+
 # Helper function to convert datetime fields
 
 # JSONB fields that asyncpg returns as strings (no JSON codec registered on pool)
@@ -434,7 +519,8 @@ async def cleanup_orphaned_sessions(db: Any) -> int:
     On startup, we detect any sessions still marked as 'running' and
     immediately mark them as 'interrupted'. This provides fast UX feedback
     (within seconds of restart) rather than waiting 10+ minutes for the
-    stale session cleanup.
+    stale session cleanup. Sessions of projects whose run is held by a live
+    session worker (runner.mode: worker) are left alone.
 
     Returns:
         Number of sessions cleaned up
@@ -450,6 +536,10 @@ async def cleanup_orphaned_sessions(db: Any) -> int:
                 interruption_reason = 'Server was restarted while session was running'
             WHERE status = 'running'
               AND ended_at IS NULL
+              AND project_id NOT IN (
+                  SELECT project_id FROM session_jobs
+                  WHERE status = 'running' AND lease_expires_at > NOW()
+              )
             """
         )
 
@@ -505,9 +595,26 @@ async def health_check():
         }
         overall_status = "unhealthy"
 
-    # Check MCP server (quick check if build exists)
+    # Check MCP server (shared: health endpoint, stdio: quick check if build exists)
     mcp_path = Path(__file__).parent.parent.parent / "mcp-task-manager" / "dist"
-    if mcp_path.exists():
+    if config.mcp.mode == "shared":
+        shared_mcp = get_shared_mcp_server(config)
+        mcp_health = await shared_mcp.health_check()
+        if mcp_health is not None:
+            checks["mcp_server"] = {
+                "status": "healthy",
+                "message": f"Shared server: {mcp_health.get('sessions', 0)} session(s) connected",
+                **shared_mcp.get_stats()
+            }
+        else:
+            checks["mcp_server"] = {
+                "status": "degraded",
+                "message": "Shared server not responding (sessions fall back to per-session servers)",
+                **shared_mcp.get_stats()
+            }
+            if overall_status == "healthy":
+                overall_status = "degraded"
+    elif mcp_path.exists():
         checks["mcp_server"] = {
             "status": "healthy",
             "message": "Build exists"
@@ -573,6 +680,57 @@ async def health_check():
             "message": "Orchestrator not initialized"
         }
 
+    # Query cache hit/miss metrics (informational, never affects status)
+    if is_postgresql_configured():
+        try:
+            db = await get_db()
+            cache_stats = db.get_cache_stats()
+            if cache_stats is not None:
+                checks["query_cache"] = {
+                    "status": "healthy" if cache_stats["listener_connected"] else "degraded",
+                    "message": "Invalidation listener connected" if cache_stats["listener_connected"]
+                    else "Invalidation listener disconnected (TTL expiry only)",
+                    **cache_stats
+                }
+
+            # Connection pool telemetry (informational)
+            pool_stats = db.get_pool_stats()
+            if pool_stats is not None:
+                saturated = pool_stats["size"] >= pool_stats["max_size"] and pool_stats["idle"] == 0
+                checks["database_pool"] = {
+                    "status": "degraded" if saturated else "healthy",
+                    "message": f"{pool_stats['in_use']} of {pool_stats['max_size']} connections in use",
+                    **pool_stats
+                }
+        except Exception:
+            pass
+
+    # WebSocket clients of this worker (informational, doesn't affect overall status)
+    ws_stats = connection_manager.get_stats()
+    checks["websockets"] = {
+        "status": "healthy",
+        "message": f"{ws_stats['connections']} client(s) connected",
+        **ws_stats,
+        "events": event_coalescer.get_stats()
+    }
+
+    # Pooled outbound HTTP clients (informational)
+    http_stats = get_http_registry().get_stats()
+    checks["http_clients"] = {
+        "status": "healthy",
+        "message": f"{http_stats['clients']} pooled client(s)",
+        **http_stats
+    }
+
+    # Session admission in this process (informational; workers schedule their own)
+    if config.runner.mode == "inline":
+        scheduler_stats = orchestrator.scheduler.get_stats()
+        checks["scheduler"] = {
+            "status": "healthy",
+            "message": f"{scheduler_stats['running']} session(s) running, {scheduler_stats['queued']} queued",
+            **scheduler_stats
+        }
+
     return {
         "status": overall_status,
         "timestamp": datetime.now().isoformat(),
@@ -622,6 +780,20 @@ async def get_info(current_user: dict = Depends(get_current_user)):
     }
 
 
+@app.get("/api/scheduler")
+async def get_scheduler_status():
+    """
+    Session scheduler usage and queue of this API process.
+
+    In runner.mode worker each session worker schedules its own sessions,
+    so this only shows sessions run by the API (resumed sessions).
+    """
+    return {
+        "mode": config.runner.mode,
+        **orchestrator.scheduler.get_stats()
+    }
+
+
 @app.post("/api/admin/cleanup-orphaned-sessions")
 async def trigger_orphaned_session_cleanup(current_user: dict = Depends(get_current_user)):
     """
@@ -928,11 +1100,31 @@ def normalize_progress_fields(progress: Dict[str, Any]) -> Dict[str, Any]:
 # Project Endpoints
 # =============================================================================
 
-@app.get("/api/projects", response_model=List[ProjectResponse])
-async def list_projects(current_user: dict = Depends(get_current_user)):
-    """List all projects."""
+# Unset fields are omitted so fields the client didn't select (fields=) aren't
+# reported with misleading defaults like has_env_file=False or next_task=None
+@app.get("/api/projects", response_model=List[ProjectResponse], response_model_exclude_unset=True)
+async def list_projects(
+    limit: Optional[int] = None,
+    offset: int = 0,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    List all projects.
+
+    Query parameters:
+    - limit: Maximum number of projects (default: all)
+    - offset: Number of projects to skip (default 0)
+    - fields: Comma-separated optional fields to include
+      (next_task, active_sessions, env; default: all). Progress is always included.
+    """
+    if (limit is not None and limit < 1) or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be >= 1 and offset >= 0")
+
+    field_list = [f.strip() for f in fields.split(',') if f.strip()] if fields is not None else None
+
     try:
-        projects = await orchestrator.list_projects()
+        projects = await orchestrator.list_projects(limit=limit, offset=offset, fields=field_list)
 
         # Convert UUIDs and datetimes for JSON serialization
         # Also extract sandbox_type from metadata for easier frontend access
@@ -961,6 +1153,8 @@ async def list_projects(current_user: dict = Depends(get_current_user)):
             response_projects.append(project_dict)
 
         return response_projects
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to list projects: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1258,7 +1452,7 @@ async def get_container_status(project_id: str):
                 }
 
             # Get container status
-            status = SandboxManager.get_docker_container_status(project_name)
+            status = await asyncio.to_thread(SandboxManager.get_docker_container_status, project_name)
 
             if status:
                 return {
@@ -1307,7 +1501,7 @@ async def start_container(project_id: str):
                 )
 
             # Start the container
-            started = SandboxManager.start_docker_container(project_name)
+            started = await asyncio.to_thread(SandboxManager.start_docker_container, project_name)
 
             if started:
                 return {"message": f"Container started successfully", "started": True}
@@ -1347,7 +1541,7 @@ async def stop_container(project_id: str):
                 )
 
             # Stop the container
-            stopped = SandboxManager.stop_docker_container(project_name)
+            stopped = await asyncio.to_thread(SandboxManager.stop_docker_container, project_name)
 
             if stopped:
                 return {"message": "Container stopped successfully", "stopped": True}
@@ -1387,7 +1581,7 @@ async def delete_container(project_id: str):
                 )
 
             # Delete the container
-            deleted = SandboxManager.delete_docker_container(project_name)
+            deleted = await asyncio.to_thread(SandboxManager.delete_docker_container, project_name)
 
             if deleted:
                 return {"message": "Container deleted successfully", "deleted": True}
@@ -2126,6 +2320,7 @@ async def reset_project_endpoint(project_id: str):
 async def initialize_project(
     project_id: str,
     initializer_model: Optional[str] = None,
+    priority: int = 0,
     background_tasks: BackgroundTasks = None
 ):
     """
@@ -2140,6 +2335,7 @@ async def initialize_project(
     Args:
         project_id: UUID of the project
         initializer_model: Model to use (optional, defaults to config)
+        priority: Scheduler priority if sessions are queued (higher first, default 0)
 
     Returns:
         SessionResponse with session details
@@ -2152,39 +2348,24 @@ async def initialize_project(
     try:
         project_uuid = UUID(project_id)
 
-        # Start initialization session asynchronously
-        async def run_initialization():
-            try:
-                # Create progress callback for real-time WebSocket updates
-                async def progress_update(event: Dict[str, Any]):
-                    """Broadcast progress events to connected WebSocket clients."""
-                    await notify_project_update(str(project_uuid), {
-                        "type": "progress",
-                        "event": event
-                    })
+        params = {"initializer_model": initializer_model, "priority": priority}
+        job_id = None
 
-                session = await orchestrator.start_initialization(
-                    project_id=project_uuid,
-                    initializer_model=initializer_model,
-                    progress_callback=progress_update
-                )
-
-                # Send WebSocket notification
-                await notify_project_update(str(project_uuid), {
-                    "type": "initialization_complete",
-                    "session": session.to_dict()
-                })
-
-            except Exception as e:
-                logger.error(f"Initialization failed: {e}")
-                await notify_project_update(str(project_uuid), {
-                    "type": "initialization_error",
-                    "error": str(e)
-                })
+        if config.runner.mode == "worker":
+            # A session worker process runs it (see server/agent/session_worker.py)
+            job = await _queue_session_job(project_uuid, "initialize", params)
+            job_id = str(job['id'])
+        else:
+            # Start initialization session asynchronously
+            async def run_initialization():
+                try:
+                    await run_session_job(orchestrator, "initialize", project_uuid, params, notify_project_update)
+                except Exception:
+                    pass  # Logged and reported to clients by run_session_job
 
-        # Run in background
-        task = asyncio.create_task(run_initialization())
-        running_sessions[project_id] = task
+            # Run in background
+            task = asyncio.create_task(run_initialization())
+            running_sessions[project_id] = task
 
         return {
             "session_id": "pending",  # Will be set once session starts
@@ -2194,9 +2375,12 @@ async def initialize_project(
             "model": initializer_model or config.models.initializer,
             "status": "pending",
             "created_at": datetime.now().isoformat(),
-            "message": "Initialization started"
+            "job_id": job_id,
+            "message": "Initialization queued" if job_id else "Initialization started"
         }
 
+    except HTTPException:
+        raise
     except ValueError as e:
         if "already initialized" in str(e):
             raise HTTPException(status_code=400, detail=str(e))
@@ -2209,6 +2393,26 @@ async def initialize_project(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _wait_for_session_job_end(db, project_id: UUID) -> bool:
+    """
+    Wait until a project's session job has ended after a stop request (runner.mode: worker).
+
+    Jobs of workers that died are failed once their lease expires, so the wait
+    is bounded by the lease TTL plus one worker poll.
+
+    Returns:
+        True if the job ended, False on timeout
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + config.runner.lease_ttl + 2 * config.runner.poll_interval
+    while await db.get_active_session_job(project_id):
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(config.runner.poll_interval)
+        await db.expire_session_jobs()
+    return True
+
+
 @app.post("/api/projects/{project_id}/initialize/cancel")
 async def cancel_initialization(
     project_id: str,
@@ -2261,7 +2465,16 @@ async def cancel_initialization(
             session_id = init_session['id']
 
             # Stop the session (interrupt it)
-            await orchestrator.stop_session(session_id)
+            stopped = await orchestrator.stop_session(session_id)
+            if not stopped and config.runner.mode == "worker":
+                if await db.request_session_job_stop(project_uuid, session_id=session_id):
+                    # The worker only sees the stop at its next heartbeat; don't tear
+                    # the project down while its initializer is still writing to it
+                    if not await _wait_for_session_job_end(db, project_uuid):
+                        raise HTTPException(
+                            status_code=504,
+                            detail="Session worker did not acknowledge the stop yet. Try again shortly."
+                        )
 
             # Clean up database: Remove all epics, tasks, tests
             # Use acquire() to get a connection for raw SQL
@@ -2303,6 +2516,8 @@ async def start_coding_sessions(
     project_id: str,
     coding_model: Optional[str] = None,
     max_iterations: Optional[int] = 0,  # 0 = unlimited
+    parallel: Optional[bool] = None,
+    priority: int = 0,
     background_tasks: BackgroundTasks = None
 ):
     """
@@ -2318,6 +2533,8 @@ async def start_coding_sessions(
         project_id: UUID of the project
         coding_model: Model to use (optional, defaults to config)
         max_iterations: Maximum sessions to run (0 or None = unlimited)
+        parallel: Run independent epics concurrently (defaults to config.parallel.enabled)
+        priority: Scheduler priority if sessions are queued (higher first, default 0)
 
     Returns:
         SessionResponse with initial session details
@@ -2329,41 +2546,31 @@ async def start_coding_sessions(
     """
     try:
         project_uuid = UUID(project_id)
+        run_parallel = config.parallel.enabled if parallel is None else parallel
 
-        # Start coding sessions asynchronously
-        async def run_coding():
-            try:
-                # Create progress callback for real-time WebSocket updates
-                async def progress_update(event: Dict[str, Any]):
-                    """Broadcast progress events to connected WebSocket clients."""
-                    await notify_project_update(str(project_uuid), {
-                        "type": "progress",
-                        "event": event
-                    })
-
-                last_session = await orchestrator.start_coding_sessions(
-                    project_id=project_uuid,
-                    coding_model=coding_model,
-                    max_iterations=max_iterations,
-                    progress_callback=progress_update
-                )
-
-                # Send WebSocket notification about completion
-                await notify_project_update(str(project_uuid), {
-                    "type": "coding_sessions_complete",
-                    "last_session": last_session.to_dict()
-                })
+        params = {
+            "coding_model": coding_model,
+            "max_iterations": max_iterations,
+            "parallel": run_parallel,
+            "priority": priority,
+        }
+        job_id = None
 
-            except Exception as e:
-                logger.error(f"Coding sessions failed: {e}")
-                await notify_project_update(str(project_uuid), {
-                    "type": "coding_sessions_error",
-                    "error": str(e)
-                })
+        if config.runner.mode == "worker":
+            # A session worker process runs them (see server/agent/session_worker.py)
+            job = await _queue_session_job(project_uuid, "coding", params)
+            job_id = str(job['id'])
+        else:
+            # Start coding sessions asynchronously
+            async def run_coding():
+                try:
+                    await run_session_job(orchestrator, "coding", project_uuid, params, notify_project_update)
+                except Exception:
+                    pass  # Logged and reported to clients by run_session_job
 
-        # Run in background
-        task = asyncio.create_task(run_coding())
-        running_sessions[project_id] = task
+            # Run in background
+            task = asyncio.create_task(run_coding())
+            running_sessions[project_id] = task
 
         return {
             "session_id": "pending",  # Will be set once session starts
@@ -2374,9 +2581,12 @@ async def start_coding_sessions(
             "status": "pending",
             "created_at": datetime.now().isoformat(),
             "max_iterations": max_iterations,
-            "message": f"Coding sessions starting (max: {max_iterations or 'unlimited'})"
+            "job_id": job_id,
+            "message": f"Coding sessions {'queued' if job_id else 'starting'} (max: {max_iterations or 'unlimited'})"
         }
 
+    except HTTPException:
+        raise
     except ValueError as e:
         if "not initialized" in str(e):
             raise HTTPException(status_code=400, detail=str(e))
@@ -2611,8 +2821,14 @@ async def stop_session(project_id: str, session_id: str):
 
         if stopped:
             return {"status": "stopped", "message": "Session stopped successfully"}
-        else:
-            return {"status": "not_running", "message": "Session was not running"}
+
+        # Not running in this process: ask the session worker running it
+        if config.runner.mode == "worker":
+            db = await get_db()
+            if await db.request_session_job_stop(UUID(project_id), session_id=session_uuid):
+                return {"status": "stopping", "message": "Stop requested from the session worker"}
+
+        return {"status": "not_running", "message": "Session was not running"}
 
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid session ID format")
@@ -2621,25 +2837,59 @@ async def stop_session(project_id: str, session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _parse_log_time(value: Optional[str], name: str) -> Optional[float]:
+    """Parse an ISO timestamp query parameter into epoch seconds."""
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} timestamp: {value}")
+
+
+def _stream_file(path: Path, chunk_size: int = 64 * 1024):
+    """Yield a (possibly compressed) log file in chunks (for StreamingResponse)."""
+    with open_log(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def _parse_event_filter(event: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated event type filter."""
+    if not event:
+        return None
+    return [e.strip() for e in event.split(',') if e.strip()] or None
+
+
 @app.get("/api/sessions/{session_id}/logs")
 async def get_session_logs(
     session_id: str,
     offset: int = 0,
     limit: int = 100,
-    level: Optional[str] = None
+    level: Optional[str] = None,
+    event: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
 ):
     """
     Get session logs in structured format.
 
     Args:
         session_id: UUID of the session
-        offset: Number of log entries to skip (for pagination)
+        offset: Line number to start from (for pagination)
         limit: Maximum number of log entries to return (max 1000)
         level: Filter by log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        event: Comma-separated event types to include (e.g. tool_use,tool_result)
+        since: Only entries at or after this ISO timestamp
+        until: Only entries at or before this ISO timestamp
 
     Returns:
         JSON array of log entries
     """
+    events = _parse_event_filter(event)
+    since_ts = _parse_log_time(since, "since")
+    until_ts = _parse_log_time(until, "until")
+
     try:
         session_uuid = UUID(session_id)
 
@@ -2666,8 +2916,8 @@ async def get_session_logs(
             project_dir = generations_dir / project_name
             logs_dir = project_dir / "logs"
 
-            # Find log file for this session (format: session_NNN_*.jsonl)
-            log_files = list(logs_dir.glob(f"session_{session_number:03d}_*.jsonl")) if logs_dir.exists() else []
+            # Find log file for this session (format: session_NNN_*.jsonl[.gz])
+            log_files = glob_logs(logs_dir, f"session_{session_number:03d}_*.jsonl") if logs_dir.exists() else []
 
             if not log_files:
                 # No logs found yet, return empty array
@@ -2676,29 +2926,30 @@ async def get_session_logs(
             # Read the most recent log file for this session
             log_file = sorted(log_files)[-1]
 
-            logs = []
-            try:
-                with open(log_file, 'r') as f:
-                    for line_num, line in enumerate(f):
-                        if line_num < offset:
-                            continue
-                        if len(logs) >= min(limit, 1000):  # Cap at 1000 entries
-                            break
+            def read_logs() -> List[Dict[str, Any]]:
+                # Seek through the sidecar index instead of scanning from line 0
+                index = SessionLogIndex.ensure(log_file)
+                max_entries = min(limit, 1000)  # Cap at 1000 entries
+                logs = []
+                for _, line in index.iter_lines(offset=offset, events=events, since=since_ts, until=until_ts):
+                    try:
+                        log_entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Skip malformed lines
+                        continue
+                    # Filter by level if specified
+                    if level and log_entry.get('level', '').upper() != level.upper():
+                        continue
+                    logs.append(log_entry)
+                    if len(logs) >= max_entries:
+                        break
+                return logs
 
-                        try:
-                            log_entry = json.loads(line)
-                            # Filter by level if specified
-                            if level and log_entry.get('level', '').upper() != level.upper():
-                                continue
-                            logs.append(log_entry)
-                        except json.JSONDecodeError:
-                            # Skip malformed lines
-                            continue
+            try:
+                return await asyncio.to_thread(read_logs)
             except FileNotFoundError:
                 return []
 
-            return logs
-
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid session ID format")
     except Exception as e:
@@ -2830,6 +3081,9 @@ async def stop_after_current_session(project_id: str):
     try:
         project_uuid = UUID(project_id)
         orchestrator.set_stop_after_current(project_uuid, stop=True)
+        if config.runner.mode == "worker":
+            db = await get_db()
+            await db.request_session_job_stop(project_uuid, stop_after_current=True)
 
         return {
             "status": "set",
@@ -2849,6 +3103,9 @@ async def cancel_stop_after_current(project_id: str):
     try:
         project_uuid = UUID(project_id)
         orchestrator.set_stop_after_current(project_uuid, stop=False)
+        if config.runner.mode == "worker":
+            db = await get_db()
+            await db.request_session_job_stop(project_uuid, stop_after_current=False)
 
         return {
             "status": "cleared",
@@ -2867,22 +3124,29 @@ async def cancel_stop_after_current(project_id: str):
 # =============================================================================
 
 async def notify_project_update(project_id: str, data: Dict[str, Any]):
-    """Send update to all WebSocket connections for a project."""
-    if project_id in active_connections:
-        disconnected = []
-        for websocket in active_connections[project_id]:
-            try:
-                await websocket.send_json(data)
-            except Exception:
-                disconnected.append(websocket)
+    """Send update to all WebSocket connections for a project, on every API worker."""
+    await event_coalescer.submit(project_id, data)
+
+
+@app.get("/api/projects/{project_id}/event-metrics")
+async def get_event_metrics(project_id: str):
+    """
+    Get real-time event rates for a project (this API worker only).
+
+    Returns:
+        Events received from sessions vs. published to WebSocket clients,
+        per-second rates over the last minute and counts by event type
+    """
+    stats = event_coalescer.get_project_stats(project_id)
+    return {
+        "project_id": project_id,
+        "snapshot_interval": event_coalescer.interval,
+        "websocket_clients": connection_manager.connection_count(project_id),
+        **(stats or {"received": 0, "published": 0, "coalesced": 0}),
+    }
 
-        # Remove disconnected websockets
-        for ws in disconnected:
-            active_connections[project_id].remove(ws)
 
-        # Clean up empty lists
-        if not active_connections[project_id]:
-            del active_connections[project_id]
+event_bus.subscribe(connection_manager.broadcast)
 
 
 @app.websocket("/api/ws/{project_id}")
@@ -2890,28 +3154,16 @@ async def websocket_endpoint(websocket: WebSocket, project_id: str):
     """WebSocket endpoint for real-time project updates."""
     await websocket.accept()
 
-    # Add to active connections
-    if project_id not in active_connections:
-        active_connections[project_id] = []
-    active_connections[project_id].append(websocket)
+    # Add to active connections; all sends go through the client's queue
+    client = connection_manager.connect(project_id, websocket)
 
     try:
         # Send initial connection message
-        try:
-            await websocket.send_json({
-                "type": "connected",
-                "project_id": project_id,
-                "timestamp": datetime.now().isoformat()
-            })
-        except (WebSocketDisconnect, RuntimeError) as e:
-            # Client disconnected before we could send initial message
-            logger.debug(f"WebSocket disconnected during initial message: {e}")
-            # Clean up connection
-            if project_id in active_connections and websocket in active_connections[project_id]:
-                active_connections[project_id].remove(websocket)
-                if not active_connections[project_id]:
-                    del active_connections[project_id]
-            return
+        client.send({
+            "type": "connected",
+            "project_id": project_id,
+            "timestamp": datetime.now().isoformat()
+        })
 
         # Send initial state with progress
         try:
@@ -2948,21 +3200,12 @@ async def websocket_endpoint(websocket: WebSocket, project_id: str):
 
                     is_initialized = metadata.get('is_initialized', False)
 
-                    await websocket.send_json({
+                    client.send({
                         "type": "initial_state",
                         "progress": progress,
                         "is_initialized": is_initialized
                     })
-                    logger.debug(f"Sent initial state to WebSocket client for project {project_id}")
-        except (WebSocketDisconnect, RuntimeError) as e:
-            # Client disconnected before we could send initial state
-            logger.debug(f"WebSocket disconnected during initial state: {e}")
-            # Clean up connection
-            if project_id in active_connections and websocket in active_connections[project_id]:
-                active_connections[project_id].remove(websocket)
-                if not active_connections[project_id]:
-                    del active_connections[project_id]
-            return
+                    logger.debug(f"Queued initial state for WebSocket client of project {project_id}")
         except Exception as e:
             logger.error(f"Failed to send initial state: {e}", exc_info=True)
             # Don't fail the whole connection, just log the error
@@ -2975,17 +3218,14 @@ async def websocket_endpoint(websocket: WebSocket, project_id: str):
 
                 # Echo back or handle commands
                 if data == "ping":
-                    await websocket.send_text("pong")
+                    client.enqueue("pong")
             except (WebSocketDisconnect, RuntimeError):
-                # Connection closed normally
+                # Connection closed normally (or by the writer for a slow client)
                 break
 
-    except WebSocketDisconnect:
+    finally:
         # Remove from active connections
-        if project_id in active_connections:
-            active_connections[project_id].remove(websocket)
-            if not active_connections[project_id]:
-                del active_connections[project_id]
+        await connection_manager.disconnect(client)
 
 
 # =============================================================================
@@ -3007,33 +3247,25 @@ async def list_logs(project_id: str):
         if not logs_path.exists():
             return []
 
-        # Find all session log files
+        # Find all session log files (finished logs may be compressed;
+        # filenames are always the uncompressed name)
         log_files = []
-        for log_file in sorted(logs_path.glob("session_*.txt")):
-            # Parse session number from filename
-            parts = log_file.stem.split('_')
-            if len(parts) >= 2 and parts[1].isdigit():
-                session_num = int(parts[1])
-                log_files.append({
-                    "filename": log_file.name,
-                    "session_number": session_num,
-                    "type": "human",
-                    "size": log_file.stat().st_size,
-                    "modified": datetime.fromtimestamp(log_file.stat().st_mtime).isoformat()
-                })
-
-        # Also find JSONL logs
-        for log_file in sorted(logs_path.glob("session_*.jsonl")):
-            parts = log_file.stem.split('_')
-            if len(parts) >= 2 and parts[1].isdigit():
-                session_num = int(parts[1])
-                log_files.append({
-                    "filename": log_file.name,
-                    "session_number": session_num,
-                    "type": "events",
-                    "size": log_file.stat().st_size,
-                    "modified": datetime.fromtimestamp(log_file.stat().st_mtime).isoformat()
-                })
+        for pattern, log_type in (("session_*.txt", "human"), ("session_*.jsonl", "events")):
+            for log_file in glob_logs(logs_path, pattern):
+                # Parse session number from filename
+                parts = log_file.stem.split('_')
+                stored = resolve_log_path(log_file)
+                if stored and len(parts) >= 2 and parts[1].isdigit():
+                    session_num = int(parts[1])
+                    stat = stored.stat()
+                    log_files.append({
+                        "filename": log_file.name,
+                        "session_number": session_num,
+                        "type": log_type,
+                        "size": stat.st_size,
+                        "compressed": stored != log_file,
+                        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    })
 
         return log_files
 
@@ -3043,7 +3275,13 @@ async def list_logs(project_id: str):
 
 
 @app.get("/api/projects/{project_id}/logs/human/{filename}")
-async def get_human_log(project_id: str, filename: str):
+async def get_human_log(
+    project_id: str,
+    filename: str,
+    offset: Optional[int] = None,
+    limit: Optional[int] = None,
+    stream: bool = False
+):
     """
     Get human-readable log file content.
 
@@ -3052,6 +3290,10 @@ async def get_human_log(project_id: str, filename: str):
     - Session number prefix: session_027
 
     If prefix is provided, finds the matching log file.
+
+    Query parameters:
+    - offset/limit: Return only this byte range (response adds size and next_offset)
+    - stream: Stream the file as chunked text/plain instead of a JSON body
     """
     try:
         project_uuid = UUID(project_id)
@@ -3067,27 +3309,51 @@ async def get_human_log(project_id: str, filename: str):
 
         logs_dir = project_path / "logs"
 
-        # Try exact filename first
-        log_path = logs_dir / filename
+        # Try exact filename first (logs are addressed by their uncompressed name)
+        log_path = logical_log_path(logs_dir / filename)
 
         # If not found and filename looks like a session prefix (e.g., "session_027")
         # find the matching log file
-        if not log_path.exists() and filename.startswith("session_"):
-            # Look for files matching the pattern: session_NNN_*.txt
+        if not resolve_log_path(log_path) and filename.startswith("session_"):
+            # Look for files matching the pattern: session_NNN_*.txt[.gz]
             pattern = f"{filename}_*.txt"
-            matching_files = list(logs_dir.glob(pattern))
+            matching_files = glob_logs(logs_dir, pattern)
 
             if matching_files:
                 # Use the first match (should only be one)
                 log_path = matching_files[0]
-                filename = log_path.name  # Update filename to actual file
             else:
                 raise HTTPException(status_code=404, detail=f"Log file not found for {filename}")
 
-        if not log_path.exists():
+        if not resolve_log_path(log_path):
             raise HTTPException(status_code=404, detail="Log file not found")
+        filename = log_path.name  # Update filename to actual file
+
+        if stream:
+            return StreamingResponse(_stream_file(log_path), media_type="text/plain; charset=utf-8")
+
+        if offset is not None or limit is not None:
+            start = max(offset or 0, 0)
 
-        content = log_path.read_text()
+            def read_range():
+                # Offsets are into the uncompressed log
+                f, size = open_log_seekable(log_path)
+                with f:
+                    f.seek(start)
+                    data = f.read(limit) if limit is not None else f.read()
+                return data, size
+
+            data, size = await asyncio.to_thread(read_range)
+            end = start + len(data)
+            return {
+                "content": data.decode("utf-8", "replace"),
+                "filename": filename,
+                "offset": start,
+                "next_offset": end if end < size else None,
+                "size": size,
+            }
+
+        content = await asyncio.to_thread(read_log_text, log_path)
         return {"content": content, "filename": filename}
 
     except Exception as e:
@@ -3096,7 +3362,16 @@ async def get_human_log(project_id: str, filename: str):
 
 
 @app.get("/api/projects/{project_id}/logs/events/{filename}")
-async def get_events_log(project_id: str, filename: str):
+async def get_events_log(
+    project_id: str,
+    filename: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    event: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    stream: bool = False
+):
     """
     Get JSONL events log file content.
 
@@ -3105,8 +3380,17 @@ async def get_events_log(project_id: str, filename: str):
     - Session number prefix: session_027
 
     If prefix is provided, finds the matching log file.
+
+    Query parameters (served from the sidecar offset index):
+    - offset: Line number to start from
+    - limit: Maximum number of lines
+    - event: Comma-separated event types to include
+    - since/until: ISO timestamp range
+    - stream: Stream matching lines as chunked application/x-ndjson
     """
-    import json
+    events = _parse_event_filter(event)
+    since_ts = _parse_log_time(since, "since")
+    until_ts = _parse_log_time(until, "until")
 
     try:
         project_uuid = UUID(project_id)
@@ -3122,29 +3406,62 @@ async def get_events_log(project_id: str, filename: str):
 
         logs_dir = project_path / "logs"
 
-        # Try exact filename first
-        log_path = logs_dir / filename
+        # Try exact filename first (logs are addressed by their uncompressed name)
+        log_path = logical_log_path(logs_dir / filename)
 
         # If not found and filename looks like a session prefix (e.g., "session_027")
         # find the matching log file
-        if not log_path.exists() and filename.startswith("session_"):
-            # Look for files matching the pattern: session_NNN_*.jsonl
+        if not resolve_log_path(log_path) and filename.startswith("session_"):
+            # Look for files matching the pattern: session_NNN_*.jsonl[.gz]
             pattern = f"{filename}_*.jsonl"
-            matching_files = list(logs_dir.glob(pattern))
+            matching_files = glob_logs(logs_dir, pattern)
 
             if matching_files:
                 # Use the first match (should only be one)
                 log_path = matching_files[0]
-                filename = log_path.name  # Update filename to actual file
             else:
                 raise HTTPException(status_code=404, detail=f"Log file not found for {filename}")
 
-        if not log_path.exists():
+        if not resolve_log_path(log_path):
             raise HTTPException(status_code=404, detail="Log file not found")
+        filename = log_path.name  # Update filename to actual file
+
+        filtered = offset > 0 or limit is not None or events or since_ts is not None or until_ts is not None
+
+        if stream:
+            def stream_lines():
+                index = SessionLogIndex.ensure(log_path)
+                for _, line in index.iter_lines(offset=offset, limit=limit, events=events,
+                                                since=since_ts, until=until_ts):
+                    yield line + "\n"
+
+            # Sync generators are iterated in Starlette's threadpool
+            return StreamingResponse(stream_lines(), media_type="application/x-ndjson")
+
+        if filtered:
+            def read_page():
+                index = SessionLogIndex.ensure(log_path)
+                # One extra line tells us whether there is a next page
+                page = list(index.iter_lines(
+                    offset=offset,
+                    limit=limit + 1 if limit is not None else None,
+                    events=events, since=since_ts, until=until_ts
+                ))
+                has_more = limit is not None and len(page) > limit
+                page = page[:limit] if limit is not None else page
+                return page, has_more, index.total_lines()
+
+            page, has_more, total_lines = await asyncio.to_thread(read_page)
+            return {
+                "content": "".join(line + "\n" for _, line in page),
+                "filename": filename,
+                "offset": offset,
+                "next_offset": page[-1][0] + 1 if has_more else None,
+                "total_lines": total_lines,
+            }
 
         # Return raw JSONL content as text (don't parse)
-        with open(log_path, 'r') as f:
-            content = f.read()
+        content = await asyncio.to_thread(read_log_text, log_path)
 
         return {"content": content, "filename": filename}
 
@@ -3338,14 +3655,13 @@ async def get_project_review_stats(project_id: str):
 async def trigger_deep_review(
     project_id: str,
     session_id: str,
-    background_tasks: BackgroundTasks,
     model: Optional[str] = None
 ):
     """
     Manually trigger a deep review for a specific session.
 
     This allows testing the review system without waiting for automatic triggers.
-    The review runs in the background and results are stored in the database.
+    The review is queued for the review workers and results are stored in the database.
 
     Args:
         project_id: UUID of the project
@@ -3356,8 +3672,6 @@ async def trigger_deep_review(
         Confirmation that review was triggered
     """
     try:
-        from server.quality.reviews import run_deep_review
-
         project_uuid = UUID(project_id)
         session_uuid = UUID(session_id)
 
@@ -3407,25 +3721,19 @@ async def trigger_deep_review(
         if not model:
             model = config.models.coding  # Use coding model (Sonnet) for reviews
 
-        # Run review in background
-        async def _run_review_task():
-            try:
-                # logger.info(f"Starting manual deep review for session {session_uuid} (project: {project_name}, session {session_number})")
-                result = await run_deep_review(
-                    session_id=session_uuid,
-                    project_path=project_path,
-                    model=model
-                )
-                # logger.info(f"Deep review completed: {result['check_id']} (rating: {result['overall_rating']}/10)")
-            except Exception as e:
-                logger.error(f"Deep review failed for session {session_uuid}: {e}", exc_info=True)
-
-        # Add to background tasks
-        background_tasks.add_task(_run_review_task)
+        # Queue the review (skipped if this session already has one queued or running)
+        jobs = await review_queue.enqueue(
+            project_uuid,
+            [{"id": session_uuid, "session_number": session_number}],
+            model=model
+        )
 
-        message = "Deep review triggered successfully"
-        if is_rereview:
-            message = f"Re-review triggered (existing review will be updated)"
+        if not jobs:
+            message = "Deep review already queued or running for this session"
+        elif is_rereview:
+            message = "Re-review queued (existing review will be updated)"
+        else:
+            message = "Deep review queued successfully"
 
         return {
             "message": message,
@@ -3433,7 +3741,8 @@ async def trigger_deep_review(
             "session_id": session_id,
             "session_number": session_number,
             "model": model,
-            "status": "running",
+            "status": "queued" if jobs else "in_progress",
+            "job_id": str(jobs[0]['id']) if jobs else None,
             "is_rereview": is_rereview
         }
 
@@ -3449,22 +3758,23 @@ async def trigger_deep_review(
 @app.post("/api/projects/{project_id}/trigger-reviews")
 async def trigger_bulk_reviews(
     project_id: str,
-    background_tasks: BackgroundTasks,
     request: dict
 ):
     """
     Trigger deep reviews for multiple sessions in a project.
 
+    Reviews are queued for the review workers (see review.queue_* settings);
+    sessions that already have a review queued or running are skipped.
+
     Request body:
     {
         "mode": "all" | "unreviewed" | "last_n" | "range",
         "last_n": 5,  // for "last_n" mode
-        "session_ids": ["uuid1", "uuid2"]  // for "range" mode
+        "session_ids": ["uuid1", "uuid2"],  // for "range" mode
+        "model": "..."  // optional review model
     }
     """
     try:
-        from server.quality.reviews import run_deep_review
-
         project_uuid = UUID(project_id)
         mode = request.get('mode', 'unreviewed')
 
@@ -3478,8 +3788,6 @@ async def trigger_bulk_reviews(
             if not project:
                 raise HTTPException(status_code=404, detail="Project not found")
 
-            project_name = project['name']
-
             # Build query based on mode
             if mode == 'all':
                 query = """
@@ -3543,68 +3851,22 @@ async def trigger_bulk_reviews(
                     "sessions_triggered": 0
                 }
 
-        # Get project path
-        config = Config.load_default()
-        project_path = Path(config.project.default_generations_dir) / project_name
+        # Queue reviews; sessions already queued or running are skipped
+        jobs = await review_queue.enqueue(project_uuid, sessions, model=request.get('model'))
+        skipped_count = len(sessions) - len(jobs)
 
-        # Trigger reviews for each session
-        triggered_count = 0
-        for session in sessions:
-            session_uuid = session['id']
-            session_number = session['session_number']
-
-            async def _run_review_task(sid: UUID, snum: int):
-                """Background task to run the review."""
-                try:
-                    # Send WebSocket notification for starting review
-                    await notify_project_update(project_id, {
-                        "type": "deep_review_started",
-                        "session_id": str(sid),
-                        "session_number": snum,
-                        "project_id": project_id,
-                        "timestamp": datetime.now().isoformat(),
-                        "message": f"Starting deep review for session {snum}"
-                    })
-
-                    await run_deep_review(
-                        session_id=sid,
-                        project_path=project_path
-                    )
-                    # logger.info(f"Completed deep review for session {snum}")
-
-                    # Send WebSocket notification for completed review
-                    await notify_project_update(project_id, {
-                        "type": "deep_review_completed",
-                        "session_id": str(sid),
-                        "session_number": snum,
-                        "project_id": project_id,
-                        "timestamp": datetime.now().isoformat(),
-                        "message": f"Deep review completed for session {snum}"
-                    })
-
-                except Exception as e:
-                    logger.error(f"Failed to run deep review for session {snum}: {e}", exc_info=True)
-
-                    # Send WebSocket notification for failed review
-                    await notify_project_update(project_id, {
-                        "type": "deep_review_failed",
-                        "session_id": str(sid),
-                        "session_number": snum,
-                        "project_id": project_id,
-                        "timestamp": datetime.now().isoformat(),
-                        "message": f"Deep review failed for session {snum}",
-                        "error": str(e)
-                    })
-
-            background_tasks.add_task(_run_review_task, session_uuid, session_number)
-            triggered_count += 1
+        message = f"Queued {len(jobs)} deep review(s)"
+        if skipped_count:
+            message += f" ({skipped_count} already queued or running)"
 
         return {
-            "message": f"Triggered {triggered_count} deep review(s)",
+            "message": message,
             "project_id": project_id,
             "mode": mode,
-            "sessions_triggered": triggered_count,
-            "status": "running"
+            "sessions_triggered": len(jobs),
+            "sessions_skipped": skipped_count,
+            "job_ids": [str(job['id']) for job in jobs],
+            "status": "queued"
         }
 
     except HTTPException:
@@ -3616,6 +3878,54 @@ async def trigger_bulk_reviews(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/projects/{project_id}/review-jobs")
+async def list_review_jobs(project_id: str, limit: int = 200):
+    """
+    Get a project's deep review jobs (newest first) with counts by status.
+
+    Returns:
+        Jobs, counts (queued/running/completed/failed/cancelled) and this
+        API worker's review pool stats
+    """
+    try:
+        project_uuid = UUID(project_id)
+        db = await get_db()
+        jobs = await db.list_review_jobs(project_uuid, limit=limit)
+        counts = await db.get_review_job_counts(project_uuid)
+        return {
+            "project_id": project_id,
+            "counts": counts,
+            "jobs": [convert_datetimes_to_str(job) for job in jobs],
+            "workers": review_queue.get_stats()
+        }
+
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid project ID format")
+    except Exception as e:
+        logger.error(f"Failed to list review jobs for project {project_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.delete("/api/projects/{project_id}/review-jobs")
+async def cancel_review_jobs(project_id: str):
+    """Cancel a project's queued deep reviews (reviews already running finish)."""
+    try:
+        project_uuid = UUID(project_id)
+        db = await get_db()
+        cancelled = await db.cancel_review_jobs(project_uuid)
+        return {
+            "message": f"Cancelled {cancelled} queued deep review(s)",
+            "project_id": project_id,
+            "cancelled": cancelled
+        }
+
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid project ID format")
+    except Exception as e:
+        logger.error(f"Failed to cancel review jobs for project {project_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # =============================================================================
 # Intervention Management Endpoints
 # =============================================================================
@@ -3705,11 +4015,11 @@ async def resume_paused_session(
         # Schedule the session to be resumed in the background
         async def resume_in_background():
             try:
-                orchestrator = AgentOrchestrator()
                 # Start a new coding session with the resume context
+                # (shared orchestrator, so it goes through the session scheduler)
                 session_info = await orchestrator.start_session(
                     project_id=resume_context["project_id"],
-                    session_type=SessionType.CODING,
+                    coding_model=config.models.coding,
                     resume_context=resume_context
                 )
                 logger.info(f"Resumed session {session_info.session_id} for project {resume_context['project_id']}")
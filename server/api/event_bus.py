@@ -0,0 +1,300 @@
+"""
+Event Bus
+=========
+
+Delivers project events (session started, progress, tool use, ...) to the
+WebSocket clients of every API worker.
+
+notify_project_update() publishes to the bus; each worker subscribes once
+and fans events out to its own WebSocket connections.
+
+- InMemoryEventBus: delivers in-process only (single API worker)
+- PostgresEventBus: also publishes with pg_notify and LISTENs on one
+  connection per worker, so events reach clients connected to any worker.
+  Needs nothing beyond the existing database.
+
+Events are always delivered to the local subscriber first (even while the
+database is unreachable); a worker ignores its own notifications.
+"""
+
+import asyncio
+import json
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+EventHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+DEFAULT_CHANNEL = "yokeflow_events"
+
+# NOTIFY payloads must be shorter than 8000 bytes; leave room for the header
+MAX_CHUNK_CHARS = 7800
+
+# Incomplete chunked messages older than this many newer messages are dropped
+MAX_PARTIAL_MESSAGES = 256
+
+
+class EventBus(ABC):
+    """Publishes project events and delivers them to the local subscriber."""
+
+    def __init__(self):
+        self._handler: Optional[EventHandler] = None
+
+    def subscribe(self, handler: EventHandler) -> None:
+        """
+        Set the local subscriber.
+
+        Args:
+            handler: Coroutine function (project_id, event) that sends the
+                event to this worker's WebSocket clients
+        """
+        self._handler = handler
+
+    async def _deliver(self, project_id: str, data: Dict[str, Any]) -> None:
+        if self._handler is None:
+            return
+        try:
+            await self._handler(project_id, data)
+        except Exception as e:
+            logger.error(f"Event handler failed for project {project_id}: {e}")
+
+    async def start(self) -> None:
+        """Start background work (no-op by default)."""
+
+    async def stop(self) -> None:
+        """Stop background work (no-op by default)."""
+
+    @abstractmethod
+    async def publish(self, project_id: str, data: Dict[str, Any]) -> None:
+        """
+        Publish an event for a project.
+
+        Args:
+            project_id: Project ID (string)
+            data: JSON-serializable event
+        """
+
+
+class InMemoryEventBus(EventBus):
+    """Delivers events to this process only."""
+
+    async def publish(self, project_id: str, data: Dict[str, Any]) -> None:
+        await self._deliver(project_id, data)
+
+
+def encode_event(origin: str, project_id: str, data: Dict[str, Any], max_chunk: int = MAX_CHUNK_CHARS) -> list:
+    """
+    Encode an event as one or more NOTIFY payloads.
+
+    Each payload is ``<origin>:<message id>:<index>:<count>:<chunk>``; the
+    JSON is ASCII-only, so characters and bytes coincide when splitting.
+
+    Args:
+        origin: Publishing worker's ID
+        project_id: Project ID
+        data: Event
+        max_chunk: Maximum JSON characters per payload
+
+    Returns:
+        List of payload strings
+    """
+    body = json.dumps({"project_id": project_id, "data": data}, ensure_ascii=True, default=str)
+    message_id = uuid.uuid4().hex[:12]
+    chunks = [body[i:i + max_chunk] for i in range(0, len(body), max_chunk)] or [""]
+    return [f"{origin}:{message_id}:{i}:{len(chunks)}:{chunk}" for i, chunk in enumerate(chunks)]
+
+
+class EventDecoder:
+    """Reassembles NOTIFY payloads produced by encode_event()."""
+
+    def __init__(self):
+        self._partial: Dict[str, list] = {}  # message key -> chunks
+
+    def feed(self, payload: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Add a payload.
+
+        Returns:
+            (origin, project_id, event) once a message is complete, else None
+        """
+        try:
+            origin, message_id, index, count, chunk = payload.split(":", 4)
+            index, count = int(index), int(count)
+        except ValueError:
+            logger.warning(f"Ignoring malformed event notification: {payload[:100]}")
+            return None
+
+        if count == 1:
+            body = chunk
+        else:
+            key = f"{origin}:{message_id}"
+            parts = self._partial.setdefault(key, [None] * count)
+            parts[index] = chunk
+            if any(part is None for part in parts):
+                while len(self._partial) > MAX_PARTIAL_MESSAGES:
+                    self._partial.pop(next(iter(self._partial)))
+                return None
+            del self._partial[key]
+            body = "".join(parts)
+
+        try:
+            message = json.loads(body)
+            return origin, message["project_id"], message["data"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring undecodable event notification")
+            return None
+
+
+class PostgresEventBus(EventBus):
+    """
+    Fans events out across API workers with Postgres LISTEN/NOTIFY.
+
+    publish() delivers locally, then queues the event for a background task
+    that sends it with pg_notify on a dedicated connection (one at a time, so
+    other workers see this worker's events in order). A second connection
+    LISTENs and delivers other workers' events locally. Both reconnect with
+    backoff; events published while the database is unreachable only reach
+    local clients.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[Any]],
+        channel: str = DEFAULT_CHANNEL,
+        queue_size: int = 10000,
+    ):
+        """
+        Initialize the bus.
+
+        Args:
+            connect: Coroutine function returning a new asyncpg connection
+            channel: NOTIFY channel
+            queue_size: Events waiting to be published before the oldest are dropped
+        """
+        super().__init__()
+        self._connect = connect
+        self.channel = channel
+        self.origin = uuid.uuid4().hex[:12]
+        self._queue: "asyncio.Queue[Tuple[str, Dict[str, Any]]]" = asyncio.Queue(maxsize=queue_size)
+        self._decoder = EventDecoder()
+        self._tasks: list = []
+        self._listen_conn = None
+        self._publish_conn = None
+        self.dropped = 0
+
+    async def publish(self, project_id: str, data: Dict[str, Any]) -> None:
+        await self._deliver(project_id, data)
+        if not self._tasks:
+            return  # Not started: local delivery only
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logger.warning(f"Event publish queue full; dropped {self.dropped} event(s) so far")
+        self._queue.put_nowait((project_id, data))
+
+    async def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._listen_loop()),
+                asyncio.create_task(self._publish_loop()),
+            ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        for conn in (self._listen_conn, self._publish_conn):
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        self._listen_conn = self._publish_conn = None
+
+    # =========================================================================
+    # Receiving
+    # =========================================================================
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        decoded = self._decoder.feed(payload)
+        if decoded is None:
+            return
+        origin, project_id, data = decoded
+        if origin == self.origin:
+            return  # Already delivered locally by publish()
+        asyncio.get_running_loop().create_task(self._deliver(project_id, data))
+
+    async def _listen_loop(self) -> None:
+        delay = 1.0
+        while True:
+            lost = asyncio.Event()
+            try:
+                self._listen_conn = await self._connect()
+                self._listen_conn.add_termination_listener(lambda conn: lost.set())
+                await self._listen_conn.add_listener(self.channel, self._on_notification)
+                logger.info(f"Listening for events on {self.channel}")
+                delay = 1.0
+                await lost.wait()
+                logger.warning("Event bus listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event bus listener failed: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
+    # =========================================================================
+    # Publishing
+    # =========================================================================
+
+    async def _publish_loop(self) -> None:
+        delay = 1.0
+        while True:
+            project_id, data = await self._queue.get()
+            payloads = encode_event(self.origin, project_id, data)
+            try:
+                if self._publish_conn is None or self._publish_conn.is_closed():
+                    self._publish_conn = await self._connect()
+                # One transaction: the chunks of a message arrive together and in order
+                async with self._publish_conn.transaction():
+                    await self._publish_conn.executemany(
+                        "SELECT pg_notify($1, $2)",
+                        [(self.channel, payload) for payload in payloads]
+                    )
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to publish event for project {project_id}: {e}")
+                self._publish_conn = None
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+
+
+def create_event_bus(backend: str, connection_url: Optional[str] = None, **kwargs) -> EventBus:
+    """
+    Create the event bus for a backend name.
+
+    Args:
+        backend: "memory" or "postgres"
+        connection_url: PostgreSQL URL (postgres backend)
+        **kwargs: Passed to PostgresEventBus (channel, queue_size)
+
+    Returns:
+        EventBus instance (falls back to in-memory if postgres is not usable)
+    """
+    if backend == "postgres":
+        if connection_url:
+            import asyncpg
+            return PostgresEventBus(lambda: asyncpg.connect(connection_url), **kwargs)
+        logger.warning("Event bus backend 'postgres' needs DATABASE_URL; using in-memory events")
+    elif backend != "memory":
+        logger.warning(f"Unknown event bus backend '{backend}'; using in-memory events")
+    return InMemoryEventBus()
@@ -0,0 +1,219 @@
+"""
+Event Coalescer
+===============
+
+Rate-shapes the project event stream before it reaches the event bus.
+
+During tool-heavy bursts a session emits a WebSocket event per tool use and
+tool result (from both SessionLogger and the agent's progress callback). The
+UI only re-counts these, so count-type events are merged per project and
+emitted as a snapshot at most once per interval:
+
+- tool_use: the newest event per session wins (it carries the running tool_count)
+- progress/tool_use, progress/tool_result: merged into one event whose
+  "count" is the number of events it replaces (and "error_count" for results)
+
+Every other event (task_updated, session_complete, assistant_message, ...)
+is a state transition and passes through immediately, after flushing the
+project's pending snapshot so clients see events in order.
+
+Per-project event rates (received vs. published) are kept for the API.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+Publisher = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+DEFAULT_SNAPSHOT_INTERVAL = 0.5
+
+# Window over which event rates are reported
+RATE_WINDOW_SECONDS = 60
+
+# Nested "progress" event types merged into a counted snapshot
+COUNTED_PROGRESS_TYPES = ("tool_use", "tool_result")
+
+
+class RateWindow:
+    """Counts events in one-second buckets over a sliding window."""
+
+    def __init__(self, window: int = RATE_WINDOW_SECONDS):
+        self.window = window
+        self._buckets: Deque[List[int]] = deque()  # [second, count]
+
+    def add(self, now: Optional[float] = None) -> None:
+        second = int(time.monotonic() if now is None else now)
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += 1
+        else:
+            self._buckets.append([second, 1])
+        self._expire(second)
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Events per second over the window."""
+        self._expire(int(time.monotonic() if now is None else now))
+        return sum(count for _, count in self._buckets) / self.window
+
+    def _expire(self, second: int) -> None:
+        while self._buckets and self._buckets[0][0] <= second - self.window:
+            self._buckets.popleft()
+
+
+class ProjectEventStats:
+    """Event counters and rates for one project."""
+
+    def __init__(self):
+        self.received = 0
+        self.published = 0
+        self.coalesced = 0
+        self.by_type: Dict[str, int] = {}
+        self.received_rate = RateWindow()
+        self.published_rate = RateWindow()
+        self.last_event_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "received_per_second": round(self.received_rate.rate(), 2),
+            "published_per_second": round(self.published_rate.rate(), 2),
+            "by_type": dict(self.by_type),
+            "last_event_at": self.last_event_at,
+        }
+
+
+class EventCoalescer:
+    """Merges count-type events into periodic per-project snapshots."""
+
+    def __init__(self, publish: Publisher, interval: float = DEFAULT_SNAPSHOT_INTERVAL):
+        """
+        Initialize the coalescer.
+
+        Args:
+            publish: Coroutine function (project_id, event) the shaped stream goes to
+            interval: Minimum seconds between snapshots per project (0 disables coalescing)
+        """
+        self._publish = publish
+        self.interval = interval
+        self._pending: Dict[str, Dict[Tuple[str, Any], Dict[str, Any]]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._last_flush: Dict[str, float] = {}
+        self._stats: Dict[str, ProjectEventStats] = {}
+
+    @staticmethod
+    def _coalesce_key(data: Dict[str, Any]) -> Optional[Tuple[str, Any]]:
+        event_type = data.get("type")
+        if event_type == "tool_use":
+            return ("tool_use", data.get("session_id"))
+        if event_type == "progress":
+            event = data.get("event")
+            if isinstance(event, dict) and event.get("type") in COUNTED_PROGRESS_TYPES:
+                return ("progress", event["type"])
+        return None
+
+    @staticmethod
+    def _merge(previous: Optional[Dict[str, Any]], data: Dict[str, Any]) -> Dict[str, Any]:
+        if data.get("type") != "progress":
+            return data  # Newest snapshot wins
+
+        event = dict(data["event"])
+        count = event.get("count", 1)
+        error_count = event.get("error_count", 1 if event.get("is_error") else 0)
+        if previous is not None:
+            count += previous["event"]["count"]
+            error_count += previous["event"].get("error_count", 0)
+        event["count"] = count
+        if event["type"] == "tool_result":
+            event["error_count"] = error_count
+        return {**data, "event": event}
+
+    async def submit(self, project_id: str, data: Dict[str, Any]) -> None:
+        """
+        Accept an event, publishing it now or merging it into the next snapshot.
+
+        Args:
+            project_id: Project ID (string)
+            data: JSON-serializable event
+        """
+        now = time.monotonic()
+        stats = self._stats.setdefault(project_id, ProjectEventStats())
+        stats.received += 1
+        stats.received_rate.add(now)
+        stats.last_event_at = time.time()
+        event_type = str(data.get("type"))
+        stats.by_type[event_type] = stats.by_type.get(event_type, 0) + 1
+
+        key = self._coalesce_key(data) if self.interval > 0 else None
+        if key is None:
+            await self.flush(project_id)
+            await self._emit(project_id, data)
+            return
+
+        pending = self._pending.setdefault(project_id, {})
+        if key in pending:
+            stats.coalesced += 1
+        pending[key] = self._merge(pending.get(key), data)
+
+        if project_id not in self._timers:
+            delay = self._last_flush.get(project_id, 0.0) + self.interval - now
+            if delay <= 0:
+                await self.flush(project_id)
+            else:
+                self._timers[project_id] = asyncio.create_task(self._flush_later(project_id, delay))
+
+    async def _flush_later(self, project_id: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.flush(project_id)
+
+    async def flush(self, project_id: str) -> None:
+        """Publish a project's pending snapshot now."""
+        timer = self._timers.pop(project_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+        pending = self._pending.pop(project_id, None)
+        if not pending:
+            return
+        self._last_flush[project_id] = time.monotonic()
+        for data in pending.values():
+            await self._emit(project_id, data)
+
+    async def _emit(self, project_id: str, data: Dict[str, Any]) -> None:
+        stats = self._stats.get(project_id)
+        if stats is not None:
+            stats.published += 1
+            stats.published_rate.add()
+        try:
+            await self._publish(project_id, data)
+        except Exception as e:
+            logger.error(f"Failed to publish event for project {project_id}: {e}")
+
+    async def close(self) -> None:
+        """Publish every pending snapshot (on shutdown)."""
+        for project_id in list(self._pending):
+            await self.flush(project_id)
+
+    def get_project_stats(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Event counters and rates for a project, or None if it has sent no events."""
+        stats = self._stats.get(project_id)
+        return stats.to_dict() if stats is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals and rates across all projects."""
+        projects = list(self._stats.values())
+        return {
+            "snapshot_interval": self.interval,
+            "projects": len(projects),
+            "received": sum(s.received for s in projects),
+            "published": sum(s.published for s in projects),
+            "coalesced": sum(s.coalesced for s in projects),
+            "received_per_second": round(sum(s.received_rate.rate() for s in projects), 2),
+            "published_per_second": round(sum(s.published_rate.rate() for s in projects), 2),
+        }
@@ -0,0 +1,266 @@
+"""
+WebSocket Connection Manager
+============================
+
+Tracks this worker's WebSocket clients and broadcasts project events to them
+without letting one slow client hold up the others.
+
+Each client has a bounded outbound queue drained by its own writer task, so
+broadcast() only serializes the event once and enqueues it - it never awaits
+a send. When a client falls behind:
+
+- Events of a coalescing type (e.g. tool_use, whose payload carries running
+  totals) replace the same session's still-queued event of that type
+- Otherwise, once the queue is full the oldest queued event is dropped
+- A send that takes longer than the send timeout disconnects the client
+  (the web UI reconnects and receives a fresh initial_state)
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Set, Tuple
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CLIENT_QUEUE_SIZE = 256
+DEFAULT_SEND_TIMEOUT = 10.0
+DEFAULT_COALESCE_TYPES = ("tool_use", "progress_update")
+
+# Close code sent to clients disconnected for falling behind ("Try Again Later")
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+def serialize_event(data: Dict[str, Any]) -> str:
+    """Serialize an event the way WebSocket.send_json() does."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class ClientConnection:
+    """A WebSocket client with a bounded outbound queue and a writer task."""
+
+    def __init__(
+        self,
+        websocket,
+        project_id: str,
+        queue_size: int = DEFAULT_CLIENT_QUEUE_SIZE,
+        send_timeout: float = DEFAULT_SEND_TIMEOUT,
+        on_close: Optional[Callable[["ClientConnection"], None]] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            websocket: Accepted Starlette WebSocket
+            project_id: Project the client is subscribed to
+            queue_size: Messages queued before the oldest are dropped
+            send_timeout: Seconds a single send may take before disconnecting
+            on_close: Called once if the writer gives up on the client
+        """
+        self.websocket = websocket
+        self.project_id = project_id
+        self.queue_size = max(1, queue_size)
+        self.send_timeout = send_timeout
+        self._on_close = on_close
+        self._pending: Deque[Tuple[Optional[Tuple[str, Any]], str]] = deque()
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def start(self) -> None:
+        """Start the writer task."""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    @property
+    def pending(self) -> int:
+        """Number of queued messages."""
+        return len(self._pending)
+
+    def send(self, data: Dict[str, Any]) -> None:
+        """Queue an event for this client only."""
+        self.enqueue(serialize_event(data))
+
+    def enqueue(self, text: str, coalesce_key: Optional[Tuple[str, Any]] = None) -> None:
+        """
+        Queue a serialized message without waiting for it to be sent.
+
+        Args:
+            text: Message text
+            coalesce_key: If set, a queued message with the same key is replaced
+        """
+        if self.closed:
+            return
+
+        if coalesce_key is not None:
+            for i, (key, _) in enumerate(self._pending):
+                if key == coalesce_key:
+                    del self._pending[i]
+                    self.coalesced += 1
+                    break
+
+        if len(self._pending) >= self.queue_size:
+            self._pending.popleft()
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logger.warning(
+                    f"WebSocket client for project {self.project_id} is falling behind; "
+                    f"dropped {self.dropped} message(s) so far"
+                )
+
+        self._pending.append((coalesce_key, text))
+        self._ready.set()
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                while not self._pending:
+                    self._ready.clear()
+                    await self._ready.wait()
+                _, text = self._pending.popleft()
+                await asyncio.wait_for(self.websocket.send_text(text), timeout=self.send_timeout)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"WebSocket client for project {self.project_id} did not accept a message "
+                f"within {self.send_timeout}s; disconnecting"
+            )
+            await self._abort(SLOW_CLIENT_CLOSE_CODE)
+        except Exception as e:
+            # Client went away; the endpoint's receive loop notices too
+            logger.debug(f"WebSocket send failed for project {self.project_id}: {e}")
+            await self._abort(None)
+
+    async def _abort(self, close_code: Optional[int]) -> None:
+        self.closed = True
+        self._pending.clear()
+        if self._on_close:
+            self._on_close(self)
+        if close_code is not None:
+            try:
+                await asyncio.wait_for(self.websocket.close(code=close_code), timeout=1.0)
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        """Stop the writer task, discarding queued messages."""
+        self.closed = True
+        self._pending.clear()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+        self._writer = None
+
+
+class ConnectionManager:
+    """Broadcasts project events to this worker's WebSocket clients."""
+
+    def __init__(
+        self,
+        queue_size: int = DEFAULT_CLIENT_QUEUE_SIZE,
+        send_timeout: float = DEFAULT_SEND_TIMEOUT,
+        coalesce_types: Iterable[str] = DEFAULT_COALESCE_TYPES,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            queue_size: Per-client outbound queue size
+            send_timeout: Seconds a single send may take before the client is disconnected
+            coalesce_types: Event types whose queued predecessor is replaced by the newest event
+        """
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.coalesce_types = set(coalesce_types)
+        self._clients: Dict[str, Set[ClientConnection]] = {}
+        self.broadcasts = 0
+
+    def connect(self, project_id: str, websocket) -> ClientConnection:
+        """
+        Register an accepted WebSocket and start its writer.
+
+        Returns:
+            The client, for sending it initial messages and disconnecting it later
+        """
+        client = ClientConnection(
+            websocket,
+            project_id,
+            queue_size=self.queue_size,
+            send_timeout=self.send_timeout,
+            on_close=self._remove,
+        )
+        self._clients.setdefault(project_id, set()).add(client)
+        client.start()
+        return client
+
+    async def disconnect(self, client: ClientConnection) -> None:
+        """Unregister a client and stop its writer."""
+        self._remove(client)
+        await client.close()
+
+    def _remove(self, client: ClientConnection) -> None:
+        clients = self._clients.get(client.project_id)
+        if clients is not None:
+            clients.discard(client)
+            if not clients:
+                del self._clients[client.project_id]
+
+    async def broadcast(self, project_id: str, data: Dict[str, Any]) -> int:
+        """
+        Queue an event for every client of a project.
+
+        The event is serialized once; nothing here waits on a client.
+
+        Args:
+            project_id: Project ID (string)
+            data: JSON-serializable event
+
+        Returns:
+            Number of clients the event was queued for
+        """
+        clients = self._clients.get(project_id)
+        if not clients:
+            return 0
+
+        text = serialize_event(data)
+        event_type = data.get("type")
+        coalesce_key = (event_type, data.get("session_id")) if event_type in self.coalesce_types else None
+        for client in list(clients):
+            client.enqueue(text, coalesce_key)
+        self.broadcasts += 1
+        return len(clients)
+
+    def connection_count(self, project_id: Optional[str] = None) -> int:
+        """Number of connected clients, for one project or overall."""
+        if project_id is not None:
+            return len(self._clients.get(project_id, ()))
+        return sum(len(clients) for clients in self._clients.values())
+
+    async def close_all(self) -> None:
+        """Disconnect every client's writer (on shutdown)."""
+        for clients in list(self._clients.values()):
+            for client in list(clients):
+                await self.disconnect(client)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection and queue statistics."""
+        clients = [client for group in self._clients.values() for client in group]
+        return {
+            "projects": len(self._clients),
+            "connections": len(clients),
+            "broadcasts": self.broadcasts,
+            "queued": sum(client.pending for client in clients),
+            "max_queued": max((client.pending for client in clients), default=0),
+            "dropped": sum(client.dropped for client in clients),
+            "coalesced": sum(client.coalesced for client in clients),
+        }
@@ -13,11 +13,14 @@ from pathlib import Path
 from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient, HookMatcher
 
 from server.utils.security import bash_security_hook
+from server.client.mcp_server import scope_headers, shared_mcp_auth_headers
 from server.sandbox.hooks import set_active_sandbox, clear_active_sandbox
 from server.utils.auth import get_oauth_token
+from server.utils.config import Config
 
 
-def get_mcp_env(project_dir: Path, project_id: str = None, docker_container: str = None) -> dict:
+def get_mcp_env(project_dir: Path, project_id: str = None, docker_container: str = None, epic_id: int = None,
+                worker_id: str = None, lease_ttl: int = None) -> dict:
     """
     Get environment variables for MCP task-manager server.
 
@@ -25,6 +28,9 @@ def get_mcp_env(project_dir: Path, project_id: str = None, docker_container: str
         project_dir: Project directory path
         project_id: UUID of the project in the database (optional, will be generated if not provided)
         docker_container: Docker container name for bash_docker tool (optional)
+        epic_id: Restrict get_next_task to this epic (parallel epic sessions, optional)
+        worker_id: Lease tasks returned by get_next_task to this worker (optional)
+        lease_ttl: Task lease duration in seconds (optional, used with worker_id)
     """
     import os
     import uuid
@@ -45,7 +51,9 @@ def get_mcp_env(project_dir: Path, project_id: str = None, docker_container: str
 
     env = {
         "DATABASE_URL": database_url,
-        "PROJECT_ID": project_id
+        "PROJECT_ID": project_id,
+        # Each session runs its own MCP server process, so its pool stays small
+        "DB_POOL_MAX": str(Config.load_default().database.mcp_pool_max_size)
     }
 
     # Add Docker container name if provided (for bash_docker tool)
@@ -53,10 +61,20 @@ def get_mcp_env(project_dir: Path, project_id: str = None, docker_container: str
         env["DOCKER_CONTAINER_NAME"] = docker_container
         print(f"[DEBUG] MCP task-manager configured for Docker sandbox: {docker_container}")
 
+    # Scope task selection to a single epic for parallel sessions
+    if epic_id is not None:
+        env["EPIC_ID"] = str(epic_id)
+
+    # Claim tasks with a lease so concurrent sessions never get the same task
+    if worker_id:
+        env["WORKER_ID"] = worker_id
+        if lease_ttl:
+            env["TASK_LEASE_TTL"] = str(lease_ttl)
+
     return env
 
 
-def create_client(project_dir: Path, model: str, project_id: str = None, docker_container: str = None, use_docker_playwright: bool = True) -> ClaudeSDKClient:
+def create_client(project_dir: Path, model: str, project_id: str = None, docker_container: str = None, use_docker_playwright: bool = True, epic_id: int = None, worker_id: str = None, lease_ttl: int = None, mcp_url: str = None) -> ClaudeSDKClient:
     """
     Create a Claude Agent SDK client with multi-layered security.
 
@@ -66,6 +84,11 @@ def create_client(project_dir: Path, model: str, project_id: str = None, docker_
         project_id: UUID of the project in the database (optional)
         docker_container: Docker container name for sandbox execution (optional)
         use_docker_playwright: If True and docker_container is set, skip external Playwright MCP
+        epic_id: Scope the task-manager MCP server to one epic (parallel sessions)
+        worker_id: Worker ID for task leases taken by get_next_task (usually the session ID)
+        lease_ttl: Task lease duration in seconds
+        mcp_url: Shared task-manager server endpoint (mcp.mode: shared); None starts
+            a stdio server process for this client
 
     Returns:
         Configured ClaudeSDKClient
@@ -115,24 +138,34 @@ def create_client(project_dir: Path, model: str, project_id: str = None, docker_
     # Path is relative to yokeflow root (3 levels up from this file)
     # /Users/jeff/code/yokeflow2/server/client/claude.py -> /Users/jeff/code/yokeflow2
     mcp_server_path = Path(__file__).parent.parent.parent / "mcp-task-manager" / "dist" / "index.js"
-    if not mcp_server_path.exists():
+    if not mcp_url and not mcp_server_path.exists():
         raise FileNotFoundError(
             f"MCP task manager server not found at {mcp_server_path}. "
             f"Run 'cd mcp-task-manager && npm install && npm run build' to build it."
         )
 
     # Configure MCP servers
-    mcp_env = get_mcp_env(project_dir, project_id, docker_container)
-    print(f"[DEBUG] MCP server path: {mcp_server_path.absolute()}")
-    print(f"[DEBUG] MCP environment: DATABASE_URL={mcp_env.get('DATABASE_URL', 'NOT SET')}, PROJECT_ID={mcp_env.get('PROJECT_ID', 'NOT SET')}")
-
-    mcp_servers = {
-        "task-manager": {
-            "command": "node",
-            "args": [str(mcp_server_path.absolute())],  # Ensure absolute path
-            "env": mcp_env
+    mcp_env = get_mcp_env(project_dir, project_id, docker_container, epic_id, worker_id, lease_ttl)
+    if mcp_url:
+        # Shared server: the session's scope travels as headers instead of env vars
+        print(f"[DEBUG] MCP shared server: {mcp_url}, PROJECT_ID={mcp_env.get('PROJECT_ID', 'NOT SET')}")
+        mcp_servers = {
+            "task-manager": {
+                "type": "http",
+                "url": mcp_url,
+                "headers": {**scope_headers(mcp_env), **shared_mcp_auth_headers()}
+            }
+        }
+    else:
+        print(f"[DEBUG] MCP server path: {mcp_server_path.absolute()}")
+        print(f"[DEBUG] MCP environment: DATABASE_URL={mcp_env.get('DATABASE_URL', 'NOT SET')}, PROJECT_ID={mcp_env.get('PROJECT_ID', 'NOT SET')}")
+        mcp_servers = {
+            "task-manager": {
+                "command": "node",
+                "args": [str(mcp_server_path.absolute())],  # Ensure absolute path
+                "env": mcp_env
+            }
         }
-    }
 
     # Only add external Playwright MCP if NOT using Docker with Playwright support
     # When using Docker, Playwright runs inside the container via bash_docker
@@ -0,0 +1,423 @@
+"""
+Shared MCP Task Manager Server
+==============================
+
+With ``mcp.mode: shared`` one long-lived task-manager server per host serves
+every agent session over MCP Streamable HTTP (MCP_TRANSPORT=http in
+mcp-task-manager), instead of a stdio ``node dist/index.js`` process, with
+its own Postgres pool, per Claude client.
+
+- start() adopts a server already answering on mcp.host:mcp.port (started by
+  another API or session worker process on this host) or spawns one
+- ensure_running() is called before each session's client is created and
+  restarts the server if its health check fails
+- A monitor task health-checks it every mcp.health_interval seconds
+- Sessions pass their scope (project, epic, worker, lease TTL, container) as
+  request headers; see scope_headers()
+- Every request must carry the per-run shared secret the server was spawned
+  with (Authorization: Bearer); it is kept in the server's state directory
+  (owner-only permissions) so adopting processes can read it
+- Each process using the server keeps a lease file in the state directory;
+  stop() only terminates the server when no other live process holds a lease,
+  even if this process did not spawn it
+
+Usage:
+    server = get_shared_mcp_server(config)
+    await server.start()
+    url = await server.ensure_running()
+    ...
+    await server.stop()
+"""
+
+import asyncio
+import os
+import secrets
+import signal
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from server.utils.http_clients import get_http_client
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+MCP_SERVER_PATH = Path(__file__).parent.parent.parent / "mcp-task-manager" / "dist" / "index.js"
+
+# Header carrying each stdio environment variable that scopes a session
+SCOPE_HEADERS = {
+    "PROJECT_ID": "X-Project-Id",
+    "EPIC_ID": "X-Epic-Id",
+    "WORKER_ID": "X-Worker-Id",
+    "TASK_LEASE_TTL": "X-Task-Lease-Ttl",
+    "DOCKER_CONTAINER_NAME": "X-Docker-Container",
+}
+
+# A successful health check is trusted this long before ensure_running() checks again
+HEALTHY_FOR_SECONDS = 5.0
+
+# Environment variable carrying the shared secret to the spawned server
+SECRET_ENV = "MCP_SHARED_SECRET"
+
+
+def scope_headers(mcp_env: Dict[str, str]) -> Dict[str, str]:
+    """
+    Turn a session's stdio environment (see get_mcp_env) into shared-server headers.
+    """
+    return {header: mcp_env[name] for name, header in SCOPE_HEADERS.items() if mcp_env.get(name)}
+
+
+class SharedMcpServer:
+    """Starts, health-checks and restarts the host-wide task-manager server."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        pool_max_size: int = 10,
+        startup_timeout: float = 20.0,
+        health_interval: float = 30.0,
+        server_path: Path = MCP_SERVER_PATH,
+        log_path: Optional[Path] = None,
+        state_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            host: Interface the server listens on
+            port: Port the server listens on
+            pool_max_size: Postgres pool size shared by all sessions
+            startup_timeout: Seconds to wait for a spawned server to become healthy
+            health_interval: Seconds between background health checks
+            server_path: Built mcp-task-manager entry point
+            log_path: File for the server's stderr (default: logs/mcp-task-manager.log)
+            state_dir: Shared secret, server PID and adopter leases
+                (default: logs/mcp-task-manager-<port>/)
+        """
+        self.host = host
+        self.port = port
+        self.pool_max_size = pool_max_size
+        self.startup_timeout = startup_timeout
+        self.health_interval = health_interval
+        self.server_path = server_path
+        self.log_path = log_path or Path("logs") / "mcp-task-manager.log"
+        self.state_dir = state_dir or self.log_path.parent / f"mcp-task-manager-{port}"
+        # Adopter leases not refreshed for this long belong to dead processes
+        self.lease_expiry = max(3 * health_interval, 60.0)
+
+        self._process: Optional[subprocess.Popen] = None
+        self._log_file = None
+        self._lock = asyncio.Lock()
+        self._monitor: Optional[asyncio.Task] = None
+        self._last_healthy = 0.0
+        self.last_health: Optional[Dict[str, Any]] = None
+        self.restarts = 0
+
+    @classmethod
+    def from_config(cls, config) -> "SharedMcpServer":
+        """Build the manager from Config.mcp."""
+        settings = config.mcp
+        return cls(
+            host=settings.host,
+            port=settings.port,
+            pool_max_size=settings.pool_max_size,
+            startup_timeout=settings.startup_timeout,
+            health_interval=settings.health_interval,
+        )
+
+    @property
+    def url(self) -> str:
+        """MCP endpoint for the sessions' client configuration."""
+        return f"http://{self.host}:{self.port}/mcp"
+
+    @property
+    def owned(self) -> bool:
+        """Whether this process spawned the running server."""
+        return self._process is not None and self._process.poll() is None
+
+    async def start(self) -> None:
+        """Adopt or spawn the server and start health monitoring (failures are logged)."""
+        self._renew_lease()
+        try:
+            await self.ensure_running()
+        except Exception as e:
+            logger.error(f"Failed to start shared MCP server: {e}")
+        if self._monitor is None:
+            self._monitor = asyncio.create_task(self._monitor_loop())
+
+    async def stop(self) -> None:
+        """
+        Stop monitoring and release this process's lease.
+
+        The server is terminated only if no other live process (API or session
+        worker) still holds a lease on it; otherwise it is left running for them.
+        """
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+        self._release_lease()
+        async with self._lock:
+            others = self._live_adopters()
+            if others:
+                if self.owned:
+                    logger.info(
+                        f"Leaving shared MCP server running for {len(others)} other process(es) "
+                        f"(PIDs {', '.join(map(str, others))})"
+                    )
+                self._detach()
+                return
+            await self._terminate()
+            await self._terminate_adopted()
+
+    def auth_headers(self) -> Dict[str, str]:
+        """Authorization header for the running server (empty if no secret is known)."""
+        secret = self._read_state("secret")
+        return {"Authorization": f"Bearer {secret}"} if secret else {}
+
+    async def ensure_running(self) -> str:
+        """
+        Make sure a healthy server is answering.
+
+        Returns:
+            MCP endpoint URL
+
+        Raises:
+            RuntimeError: If the server can't be started
+        """
+        if time.monotonic() - self._last_healthy < HEALTHY_FOR_SECONDS:
+            return self.url
+        async with self._lock:
+            if await self.health_check() is None:
+                await self._spawn()
+        return self.url
+
+    async def health_check(self) -> Optional[Dict[str, Any]]:
+        """
+        Query GET /health.
+
+        Returns:
+            Health payload (sessions, pool usage), or None if unhealthy/unreachable
+        """
+        try:
+            client = get_http_client(
+                "mcp-task-manager", base_url=f"http://{self.host}:{self.port}", timeout=2.0
+            )
+            response = await client.get("/health", headers=self.auth_headers())
+            if response.status_code == 200:
+                self.last_health = response.json()
+                self._last_healthy = time.monotonic()
+                return self.last_health
+            logger.warning(f"Shared MCP server unhealthy: HTTP {response.status_code} {response.text[:200]}")
+        except (httpx.HTTPError, ValueError):
+            pass
+        self._last_healthy = 0.0
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "owned": self.owned,
+            "pid": self._process.pid if self.owned else None,
+            "restarts": self.restarts,
+            "health": self.last_health,
+        }
+
+    # -------------------------------------------------------------------------
+    # Process management
+    # -------------------------------------------------------------------------
+
+    async def _spawn(self) -> None:
+        if not self.server_path.exists():
+            raise RuntimeError(
+                f"MCP task manager server not found at {self.server_path}. "
+                f"Run 'cd mcp-task-manager && npm install && npm run build' to build it."
+            )
+        database_url = os.getenv("DATABASE_URL")
+        if not database_url:
+            raise RuntimeError("DATABASE_URL environment variable is required")
+
+        if self._process is not None:
+            self.restarts += 1
+            logger.warning(f"Restarting shared MCP server (restart {self.restarts})")
+        await self._terminate()
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._log_file = open(self.log_path, "ab")
+        # A fresh secret per run: clients that adopted an older server re-read it
+        secret = secrets.token_urlsafe(32)
+        self._write_state("secret", secret)
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "MCP_TRANSPORT": "http",
+            "MCP_HOST": self.host,
+            "MCP_PORT": str(self.port),
+            "DB_POOL_MAX": str(self.pool_max_size),
+            SECRET_ENV: secret,
+        }
+        # Popen rather than an asyncio subprocess: the server may outlive this
+        # process (other adopters still use it), and its own session keeps a
+        # Ctrl+C on our terminal from reaching it
+        self._process = await asyncio.to_thread(
+            subprocess.Popen,
+            ["node", str(self.server_path.absolute())],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=self._log_file,
+            stderr=self._log_file,
+            start_new_session=True,
+        )
+        self._write_state("server.pid", str(self._process.pid))
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                code = self._process.returncode
+                await self._terminate()
+                raise RuntimeError(f"Shared MCP server exited with code {code} (see {self.log_path})")
+            if await self.health_check() is not None:
+                logger.info(f"Shared MCP server started at {self.url} (PID {self._process.pid})")
+                return
+            await asyncio.sleep(0.2)
+
+        await self._terminate()
+        raise RuntimeError(f"Shared MCP server not healthy within {self.startup_timeout:g}s (see {self.log_path})")
+
+    async def _terminate(self) -> None:
+        process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                await asyncio.to_thread(process.wait, 5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                await asyncio.to_thread(process.wait)
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        self._last_healthy = 0.0
+
+    def _detach(self) -> None:
+        """Forget an owned server without stopping it (another adopter uses it)."""
+        self._process = None
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        self._last_healthy = 0.0
+
+    async def _terminate_adopted(self) -> None:
+        """Stop a server spawned by another, since exited, process (last adopter out)."""
+        pid = self._read_state("server.pid")
+        if not pid or await self.health_check() is None:
+            return
+        try:
+            os.kill(int(pid), signal.SIGTERM)
+            logger.info(f"Stopped shared MCP server (PID {pid}) as its last user")
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not stop shared MCP server PID {pid}: {e}")
+        self._last_healthy = 0.0
+
+    # -------------------------------------------------------------------------
+    # State directory (secret, server PID, adopter leases)
+    # -------------------------------------------------------------------------
+
+    @property
+    def _leases_dir(self) -> Path:
+        return self.state_dir / "adopters"
+
+    def _write_state(self, name: str, value: str) -> None:
+        self.state_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        path = self.state_dir / name
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(value)
+
+    def _read_state(self, name: str) -> Optional[str]:
+        try:
+            return (self.state_dir / name).read_text().strip() or None
+        except OSError:
+            return None
+
+    def _renew_lease(self) -> None:
+        try:
+            self._leases_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            (self._leases_dir / str(os.getpid())).touch()
+        except OSError as e:
+            logger.warning(f"Could not renew shared MCP server lease: {e}")
+
+    def _release_lease(self) -> None:
+        try:
+            (self._leases_dir / str(os.getpid())).unlink()
+        except OSError:
+            pass
+
+    def _live_adopters(self) -> List[int]:
+        """PIDs of other processes holding a fresh lease (stale leases are removed)."""
+        live = []
+        try:
+            leases = list(self._leases_dir.iterdir())
+        except OSError:
+            return live
+        now = time.time()
+        for lease in leases:
+            try:
+                pid = int(lease.name)
+                fresh = now - lease.stat().st_mtime < self.lease_expiry
+            except (OSError, ValueError):
+                continue
+            if pid == os.getpid():
+                continue
+            if fresh and _pid_alive(pid):
+                live.append(pid)
+            else:
+                lease.unlink(missing_ok=True)
+        return live
+
+    async def _monitor_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            self._renew_lease()
+            if await self.health_check() is not None:
+                continue
+            logger.warning(f"Shared MCP server at {self.url} failed its health check")
+            try:
+                await self.ensure_running()
+            except Exception as e:
+                logger.error(f"Failed to restart shared MCP server: {e}")
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process exists (always True where that can't be probed safely)."""
+    if os.name == "nt":
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows; rely on lease freshness
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_shared_server: Optional[SharedMcpServer] = None
+
+
+def get_shared_mcp_server(config) -> SharedMcpServer:
+    """The process-wide shared server manager (created on first use)."""
+    global _shared_server
+    if _shared_server is None:
+        _shared_server = SharedMcpServer.from_config(config)
+    return _shared_server
+
+
+def shared_mcp_auth_headers() -> Dict[str, str]:
+    """Authorization header for sessions of this process's shared server (empty if none)."""
+    if _shared_server is None:
+        return {}
+    return _shared_server.auth_headers()
@@ -0,0 +1,310 @@
+"""
+Read-Through Query Cache
+========================
+
+In-process cache for the hot, rarely-changing TaskDatabase lookups
+(get_project, get_active_session, get_progress), which are called on almost
+every API request, WebSocket connect and orchestrator loop iteration.
+
+- Entries expire after a per-cache TTL, bounding staleness if a change
+  notification is ever missed
+- TaskDatabase write methods invalidate the affected entries directly
+- Triggers on projects, sessions and project_progress (Migration 028) send
+  ``pg_notify('yokeflow_cache_invalidation', '<kind>:<project_id>')`` for
+  every change, whichever process or connection made it (API, orchestrator,
+  MCP task manager); CacheInvalidationListener applies these so several API
+  processes stay coherent
+- Concurrent misses for the same key share one query, and a result read
+  before an invalidation is never stored after it
+
+Usage:
+    cache = ReadThroughCache("project", ttl=30.0)
+    project = await cache.get(project_id, lambda: load_project(project_id))
+    cache.invalidate(project_id)
+"""
+
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Postgres NOTIFY channel used by the Migration 028 triggers
+INVALIDATION_CHANNEL = "yokeflow_cache_invalidation"
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one cache."""
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ReadThroughCache(Generic[V]):
+    """TTL cache that loads missing entries through an async loader."""
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            name: Cache name (used in stats)
+            ttl: Seconds an entry stays fresh (0 disables the cache)
+            max_entries: Least recently used entries beyond this are evicted
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0  # Bumped by clear()
+        self._key_generations: Dict[Hashable, int] = {}  # Bumped by invalidate(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        """
+        Get a value, loading it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function returning the current value
+
+        Returns:
+            A copy of the cached or loaded value (callers may mutate it)
+        """
+        if self.ttl <= 0:
+            return await loader()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return copy.deepcopy(value)
+            del self._entries[key]
+
+        self.stats.misses += 1
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        generation = (self._generation, self._key_generations.get(key, 0))
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; waiters re-raise it
+            raise
+        else:
+            future.set_result(value)
+            # Don't store a value that was read before an invalidation
+            if generation == (self._generation, self._key_generations.get(key, 0)):
+                self._store(key, value)
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+        return copy.deepcopy(value)
+
+    def _store(self, key: Hashable, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop one entry (and any load of it that is in flight)."""
+        self._entries.pop(key, None)
+        self._pending.pop(key, None)
+        self._key_generations[key] = self._key_generations.get(key, 0) + 1
+        self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._pending.clear()
+        self._key_generations.clear()
+        self._generation += 1
+        self.stats.invalidations += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Stats for monitoring."""
+        return {
+            "name": self.name,
+            "ttl_seconds": self.ttl,
+            "entries": len(self._entries),
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_rate": round(self.stats.hit_rate, 4),
+            "invalidations": self.stats.invalidations,
+            "evictions": self.stats.evictions,
+        }
+
+
+class QueryCache:
+    """The TaskDatabase read-through caches, keyed by project ID."""
+
+    def __init__(
+        self,
+        project_ttl: float = 30.0,
+        active_session_ttl: float = 5.0,
+        progress_ttl: float = 5.0,
+    ):
+        self.project: ReadThroughCache[Optional[Dict[str, Any]]] = ReadThroughCache("project", project_ttl)
+        self.active_session: ReadThroughCache[Optional[Dict[str, Any]]] = ReadThroughCache(
+            "active_session", active_session_ttl
+        )
+        self.progress: ReadThroughCache[Dict[str, Any]] = ReadThroughCache("progress", progress_ttl)
+        self.notifications_received = 0
+
+    @property
+    def caches(self) -> tuple:
+        return (self.project, self.active_session, self.progress)
+
+    def invalidate_project(self, project_id: Any) -> None:
+        """Drop everything cached for a project."""
+        key = str(project_id)
+        for cache in self.caches:
+            cache.invalidate(key)
+
+    def clear(self) -> None:
+        """Drop everything."""
+        for cache in self.caches:
+            cache.clear()
+
+    def handle_notification(self, payload: str) -> None:
+        """
+        Apply a change notification from the Migration 028 triggers.
+
+        Args:
+            payload: "<kind>:<project_id>" with kind project, session or progress
+        """
+        self.notifications_received += 1
+        kind, _, project_id = payload.partition(":")
+        if not project_id:
+            self.clear()
+        elif kind == "session":
+            self.active_session.invalidate(project_id)
+        elif kind == "progress":
+            self.progress.invalidate(project_id)
+        else:
+            # Project rows feed all three (e.g. get_progress includes the name)
+            self.invalidate_project(project_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Stats for all caches."""
+        return {
+            "notifications_received": self.notifications_received,
+            "caches": {cache.name: cache.get_stats() for cache in self.caches},
+        }
+
+
+class CacheInvalidationListener:
+    """
+    LISTENs for change notifications on a dedicated connection.
+
+    If the connection is lost, the caches are cleared (notifications may have
+    been missed) and the listener reconnects with backoff; until then the
+    TTLs bound staleness.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[Any]],
+        cache: QueryCache,
+        channel: str = INVALIDATION_CHANNEL,
+    ):
+        """
+        Initialize the listener.
+
+        Args:
+            connect: Coroutine function returning a new asyncpg connection
+            cache: Caches to invalidate
+            channel: NOTIFY channel
+        """
+        self._connect = connect
+        self.cache = cache
+        self.channel = channel
+        self._conn = None
+        self._task: Optional[asyncio.Task] = None
+        self._lost: Optional[asyncio.Event] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    def start(self) -> None:
+        """Start listening in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close()
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        self.cache.handle_notification(payload)
+
+    def _on_termination(self, connection) -> None:
+        if self._lost:
+            self._lost.set()
+
+    async def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close()
+            except Exception:
+                conn.terminate()
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                self._lost = asyncio.Event()
+                self._conn = await self._connect()
+                self._conn.add_termination_listener(self._on_termination)
+                await self._conn.add_listener(self.channel, self._on_notification)
+                # Changes made while we were not listening were missed
+                self.cache.clear()
+                logger.info(f"Listening for cache invalidations on {self.channel}")
+                delay = 1.0
+                await self._lost.wait()
+                logger.warning("Cache invalidation listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed: {e}")
+            await self._close()
+            self.cache.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60.0)
@@ -0,0 +1,132 @@
+"""
+Connection Pool Telemetry
+=========================
+
+Counters and histograms for TaskDatabase's asyncpg pool:
+
+- acquire wait time (how long callers queue for a connection)
+- connections in use when a connection is acquired
+- query duration, with slow queries logged through PerformanceLogger
+
+Query timings come from asyncpg's query logger (registered on every pooled
+connection), so no query call sites need to change.
+"""
+
+import bisect
+from typing import Any, Dict, Optional, Sequence
+
+from server.utils.logging import PerformanceLogger
+
+# Millisecond buckets for acquire wait and query duration
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Longest query text included in slow-query logs
+MAX_LOGGED_QUERY_CHARS = 500
+
+
+class Histogram:
+    """Fixed-bucket histogram (upper bounds inclusive; one overflow bucket)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if self.count == 0:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{b:g}" for b in self.buckets] + ["overflow"]
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 2) if self.count else None,
+            "max": round(self.max, 2),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class PoolTelemetry:
+    """Records pool and query metrics for one TaskDatabase."""
+
+    def __init__(self, max_size: int, slow_query_ms: float = 500.0):
+        """
+        Initialize telemetry.
+
+        Args:
+            max_size: Pool maximum size (sets the in-use histogram buckets)
+            slow_query_ms: Queries slower than this are logged (0 disables)
+        """
+        self.slow_query_ms = slow_query_ms
+        self.acquire_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.in_use = Histogram(range(1, max(max_size, 1) + 1))
+        self.query_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.acquire_errors = 0
+        self.query_errors = 0
+        self.slow_queries = 0
+        self.current_in_use = 0
+
+    def record_acquire(self, wait_ms: float) -> None:
+        """Record a successful acquire (call before the connection is used)."""
+        self.current_in_use += 1
+        self.acquire_wait_ms.observe(wait_ms)
+        self.in_use.observe(self.current_in_use)
+
+    def record_release(self) -> None:
+        self.current_in_use = max(0, self.current_in_use - 1)
+
+    def log_query(self, record) -> None:
+        """
+        asyncpg query logger callback (Connection.add_query_logger).
+
+        Args:
+            record: asyncpg LoggedQuery (query, args, elapsed seconds, exception, ...)
+        """
+        elapsed_ms = record.elapsed * 1000
+        self.query_ms.observe(elapsed_ms)
+        if record.exception is not None:
+            self.query_errors += 1
+        if self.slow_query_ms and elapsed_ms >= self.slow_query_ms:
+            self.slow_queries += 1
+            PerformanceLogger.record(
+                "db_query",
+                elapsed_ms,
+                {
+                    "query": " ".join(record.query.split())[:MAX_LOGGED_QUERY_CHARS],
+                    "arg_count": len(record.args or ()),
+                },
+                error=record.exception,
+                slow_threshold_ms=self.slow_query_ms,
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "in_use": self.current_in_use,
+            "acquire_errors": self.acquire_errors,
+            "query_errors": self.query_errors,
+            "slow_queries": self.slow_queries,
+            "slow_query_ms": self.slow_query_ms,
+            "acquire_wait_ms": self.acquire_wait_ms.snapshot(),
+            "in_use_at_acquire": self.in_use.snapshot(),
+            "query_ms": self.query_ms.snapshot(),
+        }
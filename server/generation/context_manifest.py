@@ -4,35 +4,112 @@ Context Manifest Generator
 
 Generates intelligent manifests for context files with AI-powered summaries
 to enable efficient loading strategies.
+
+Summaries are generated concurrently (at most max_concurrency LLM calls at a
+time) and cached on disk by content hash and model, so re-uploading a file -
+or uploading the same file to another project - does not call the LLM again.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from server.generation.spec_generator import SpecGenerator
+from server.generation.spec_generator import SpecGenerator, truncate_summary
 from server.generation.context_manager import ContextFile, LoadingStrategy
 from server.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Maximum concurrent summary requests per manifest
+DEFAULT_SUMMARY_CONCURRENCY = 5
+
+# Length passed to generate_summary for per-file summaries
+FILE_SUMMARY_LENGTH = 200
+
+# File types summarized by the LLM (others get a basic local summary)
+AI_SUMMARY_FILE_TYPES = ("documentation", "config", "database")
+
+
+class SummaryCache:
+    """Persistent cache of file summaries keyed by content hash and model.
+
+    One small JSON file per entry, written atomically, so concurrent
+    manifests (and projects) can share the cache directory safely.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries (created on first write)
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def key(content_hash: str, model: str, max_length: int) -> str:
+        """Cache key for a summary of some content by a model."""
+        return hashlib.sha256(f"{model}:{max_length}:{content_hash}".encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached summary, or None."""
+        try:
+            return json.loads(self._entry_path(key).read_text())["summary"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, summary: str, **metadata: Any) -> None:
+        """Store a summary (best-effort)."""
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({
+                "summary": summary,
+                "created_at": datetime.utcnow().isoformat(),
+                **metadata
+            }))
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not write summary cache entry {path}: {e}")
+
 
 class ContextManifest:
     """Generate and manage context file manifests with AI summaries."""
 
-    def __init__(self, project_dir: Path, spec_generator: Optional[SpecGenerator] = None):
+    def __init__(
+        self,
+        project_dir: Path,
+        spec_generator: Optional[SpecGenerator] = None,
+        cache_dir: Optional[Path] = None,
+        max_concurrency: int = DEFAULT_SUMMARY_CONCURRENCY
+    ):
         """Initialize the manifest generator.
 
         Args:
             project_dir: Project directory path
             spec_generator: Optional SpecGenerator instance for summaries
+            cache_dir: Summary cache directory (default: shared by all projects
+                in the generations directory)
+            max_concurrency: Maximum concurrent summary requests
         """
         self.project_dir = Path(project_dir)
         self.context_dir = self.project_dir / ".yokeflow" / "context"
         self.spec_generator = spec_generator or SpecGenerator()
         self.manifest_path = self.context_dir / "manifest.json"
+        self.summary_cache = SummaryCache(
+            cache_dir or self.project_dir.parent / ".yokeflow" / "summary-cache"
+        )
+        self.max_concurrency = max(max_concurrency, 1)
+        self._summary_slots = asyncio.Semaphore(self.max_concurrency)
+        self._pending_summaries: Dict[str, asyncio.Future] = {}  # cache key -> in-flight summary
 
     async def generate_manifest(
         self,
@@ -67,9 +144,10 @@ class ContextManifest:
             }
         }
 
-        # Process each file
-        for context_file in context_files:
-            file_entry = await self._process_file(context_file)
+        # Summarize files concurrently; identical contents share one request
+        file_entries = await asyncio.gather(*(self._process_file(f) for f in context_files))
+
+        for context_file, file_entry in zip(context_files, file_entries):
             manifest["files"].append(file_entry)
 
             # Update categories
@@ -105,13 +183,11 @@ class ContextManifest:
         # Try to load and summarize the file
         try:
             file_path = self.project_dir / context_file.path
-            if file_path.exists():
-                content = file_path.read_text(errors='ignore')[:2000]  # First 2000 chars
-
+            content = await asyncio.to_thread(self._read_preview, file_path)
+            if content is not None:
                 # Generate AI summary for important files
-                if context_file.file_type in ["documentation", "config", "database"]:
-                    summary = await self.spec_generator.generate_summary(content, max_length=200)
-                    file_entry["summary"] = summary
+                if context_file.file_type in AI_SUMMARY_FILE_TYPES:
+                    file_entry["summary"] = await self._summarize(context_file, content)
                 else:
                     # Basic summary for other files
                     file_entry["summary"] = self._generate_basic_summary(context_file.name, content)
@@ -125,6 +201,63 @@ class ContextManifest:
 
         return file_entry
 
+    @staticmethod
+    def _read_preview(file_path: Path) -> Optional[str]:
+        """First 2000 characters of a file, or None if it does not exist."""
+        if not file_path.exists():
+            return None
+        with open(file_path, errors='ignore') as f:
+            return f.read(2000)
+
+    async def _summarize(self, context_file: ContextFile, content: str) -> str:
+        """AI summary of a file, from the cache when its content was seen before.
+
+        Args:
+            context_file: File being summarized (content_hash is the cache key)
+            content: Content preview to summarize
+
+        Returns:
+            Summary string
+        """
+        model = self.spec_generator.summary_model
+        key = SummaryCache.key(context_file.content_hash, model, FILE_SUMMARY_LENGTH)
+
+        cached = await asyncio.to_thread(self.summary_cache.get, key)
+        if cached is not None:
+            return cached
+
+        # Another file with the same content is being summarized
+        pending = self._pending_summaries.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_summaries[key] = future
+        try:
+            try:
+                async with self._summary_slots:
+                    summary = await self.spec_generator.generate_summary(
+                        content, max_length=FILE_SUMMARY_LENGTH, fallback=False
+                    )
+            except Exception:
+                # The truncated content is not a real summary, so it is not cached
+                summary = truncate_summary(content, FILE_SUMMARY_LENGTH)
+            else:
+                if summary:
+                    await asyncio.to_thread(
+                        self.summary_cache.set, key, summary,
+                        model=model, content_hash=context_file.content_hash
+                    )
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; waiters re-raise it
+            raise
+        else:
+            future.set_result(summary)
+        finally:
+            self._pending_summaries.pop(key, None)
+        return summary
+
     def _generate_basic_summary(self, filename: str, content: str) -> str:
         """Generate a basic summary without AI.
 
@@ -31,6 +31,11 @@ load_dotenv(dotenv_path=_env_file)
 logger = get_logger(__name__)
 
 
+def truncate_summary(content: str, max_length: int) -> str:
+    """Stand-in summary used when the LLM call fails: the content, truncated."""
+    return content[:max_length] + "..." if len(content) > max_length else content
+
+
 class SpecGenerator:
     """Generate application specifications using Claude AI."""
 
@@ -105,6 +110,11 @@ Please incorporate insights from these context files into the specification wher
         if hasattr(self.config, 'generation') and hasattr(self.config.generation, 'model'):
             self.model = self.config.generation.model
 
+        # Use Haiku for summaries (cheaper)
+        self.summary_model = "claude-3-haiku-20240307"
+        if hasattr(self.config, 'generation') and hasattr(self.config.generation, 'summary_model'):
+            self.summary_model = self.config.generation.summary_model
+
     def _ensure_client(self):
         """Ensure the Anthropic client is initialized."""
         if not self.client:
@@ -293,21 +303,19 @@ Return ONLY the updated markdown content."""
             logger.error(f"Error enhancing specification: {str(e)}")
             raise
 
-    async def generate_summary(self, content: str, max_length: int = 500) -> str:
+    async def generate_summary(self, content: str, max_length: int = 500, fallback: bool = True) -> str:
         """Generate a concise summary of content.
 
         Args:
             content: Content to summarize
             max_length: Maximum length of summary
+            fallback: On API errors, return the truncated content instead of raising
 
         Returns:
             Concise summary
         """
         self._ensure_client()
 
-        # Use Haiku for summaries (cheaper)
-        summary_model = self.config.get("generation.summary_model", "claude-3-haiku-20240307")
-
         prompt = f"""Summarize the following content in {max_length} characters or less.
 Focus on the key technical details and purpose.
 
@@ -318,7 +326,7 @@ Return ONLY the summary, no explanations."""
 
         try:
             response = await self.client.messages.create(
-                model=summary_model,
+                model=self.summary_model,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=200,
                 temperature=0.5
@@ -326,5 +334,7 @@ Return ONLY the summary, no explanations."""
             return response.content[0].text
         except Exception as e:
             logger.error(f"Error generating summary: {str(e)}")
+            if not fallback:
+                raise
             # Fallback to simple truncation
-            return content[:max_length] + "..." if len(content) > max_length else content
\ No newline at end of file
+            return truncate_summary(content, max_length)
\ No newline at end of file
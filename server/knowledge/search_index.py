@@ -0,0 +1,309 @@
+"""
+Vault Search Index
+==================
+
+Persistent inverted index over the notes of one vault, used by
+VaultManager.search instead of reading every note on every query.
+
+- Postings: term -> {note path: term frequency}, scored with BM25
+- Optional prefix search ("auth" matches "authentication")
+- Incremental refresh: notes are re-read only when their mtime, size or
+  inode changed; the vault is re-scanned at most every refresh_interval
+  seconds, and VaultManager.write_note/delete_note update it immediately
+- Persisted as JSON in ``<vault>/.yokeflow/search-index.json`` so a new
+  process starts warm and only re-reads notes changed in the meantime
+
+Hidden directories (.obsidian, .trash, .git, ...) are not indexed.
+"""
+
+import bisect
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_DIR = ".yokeflow"
+INDEX_FILE = "search-index.json"
+INDEX_VERSION = 1
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens of a text."""
+    return TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class IndexedNote:
+    """Index entry for one note."""
+    mtime_ns: int
+    size: int
+    ino: int
+    length: int  # Number of tokens
+    terms: Dict[str, int] = field(default_factory=dict)  # term -> frequency
+
+    def matches_stat(self, st: os.stat_result) -> bool:
+        """Check if the note is unchanged since it was indexed."""
+        return (self.mtime_ns, self.size, self.ino) == (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class VaultSearchIndex:
+    """BM25 inverted index over the Markdown notes in a vault."""
+
+    def __init__(
+        self,
+        vault_path: Path,
+        index_path: Optional[Path] = None,
+        refresh_interval: float = 5.0,
+    ):
+        """
+        Initialize the index (loading the persisted copy lazily).
+
+        Args:
+            vault_path: Vault root
+            index_path: Where to persist the index (default: <vault>/.yokeflow/search-index.json)
+            refresh_interval: Minimum seconds between scans of the vault for changes
+        """
+        self.vault_path = Path(vault_path)
+        self.index_path = Path(index_path) if index_path else self.vault_path / INDEX_DIR / INDEX_FILE
+        self.refresh_interval = refresh_interval
+
+        self.notes: Dict[str, IndexedNote] = {}  # note path -> entry
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {note path -> frequency}
+        self._total_length = 0
+        self._vocabulary: Optional[List[str]] = None  # Sorted terms, for prefix search
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dirty = False
+        self._last_refresh: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    # =========================================================================
+    # Maintenance
+    # =========================================================================
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Bring the index up to date with the vault.
+
+        Args:
+            force: Scan even if the last scan was within refresh_interval
+
+        Returns:
+            Number of notes added, updated or removed
+        """
+        with self._lock:
+            self._ensure_loaded()
+
+            now = time.monotonic()
+            if not force and self._last_refresh is not None and now - self._last_refresh < self.refresh_interval:
+                return 0
+            self._last_refresh = now
+
+            changed = 0
+            current = dict(self._scan())
+            for note_path in [p for p in self.notes if p not in current]:
+                self._remove(note_path)
+                changed += 1
+            for note_path, st in current.items():
+                entry = self.notes.get(note_path)
+                if entry is None or not entry.matches_stat(st):
+                    if self._add(note_path, st):
+                        changed += 1
+
+            self.save()
+            return changed
+
+    def update(self, note_path: str) -> None:
+        """(Re)index one note after it was written."""
+        with self._lock:
+            self._ensure_loaded()
+            full_path = self.vault_path / note_path
+            try:
+                st = full_path.stat()
+            except FileNotFoundError:
+                self._remove(note_path)
+                return
+            self._add(note_path, st)
+
+    def remove(self, note_path: str) -> None:
+        """Drop one note from the index after it was deleted."""
+        with self._lock:
+            self._ensure_loaded()
+            self._remove(note_path)
+
+    def save(self) -> None:
+        """Persist the index if it changed (best-effort)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": INDEX_VERSION,
+                "notes": {
+                    path: [entry.mtime_ns, entry.size, entry.ino, entry.length, entry.terms]
+                    for path, entry in self.notes.items()
+                },
+            }
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.index_path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+                tmp_path.replace(self.index_path)
+                self._dirty = False
+            except OSError as e:
+                # Read-only vault: the in-memory index still works
+                logger.warning(
+                    f"Failed to save vault search index {self.index_path}: {e}",
+                    extra={"path": str(self.index_path)}
+                )
+
+    # =========================================================================
+    # Search
+    # =========================================================================
+
+    def search(self, query: str, prefix: bool = False) -> List[Tuple[str, float]]:
+        """
+        Score notes against a query with BM25.
+
+        Args:
+            query: Free-text query (any term may match)
+            prefix: Treat each query term as a prefix
+
+        Returns:
+            (note path, score) pairs, best first
+        """
+        with self._lock:
+            self._ensure_loaded()
+            n_notes = len(self.notes)
+            if not n_notes:
+                return []
+            avg_length = self._total_length / n_notes or 1.0
+
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                for match in self._expand(term, prefix):
+                    postings = self._postings[match]
+                    idf = math.log(1 + (n_notes - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for note_path, freq in postings.items():
+                        length = self.notes[note_path].length
+                        norm = freq + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                        scores[note_path] = scores.get(note_path, 0.0) + idf * freq * (BM25_K1 + 1) / norm
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def _expand(self, term: str, prefix: bool) -> List[str]:
+        """Indexed terms a query term matches."""
+        if not prefix:
+            return [term] if term in self._postings else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\U0010ffff")
+        return self._vocabulary[start:end]
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _scan(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (note path, stat) for every Markdown note, skipping hidden directories."""
+        stack = [self.vault_path]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif entry.name.endswith(".md") and entry.is_file():
+                            yield str(Path(entry.path).relative_to(self.vault_path)), entry.stat()
+            except OSError:
+                continue
+
+    def _add(self, note_path: str, st: os.stat_result) -> bool:
+        """Index a note from disk, replacing any previous entry."""
+        try:
+            text = (self.vault_path / note_path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            self._remove(note_path)
+            return False
+
+        self._remove(note_path)
+        tokens = tokenize(text)
+        entry = IndexedNote(
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            ino=st.st_ino,
+            length=len(tokens),
+            terms=dict(Counter(tokens)),
+        )
+        self._insert(note_path, entry)
+        self._dirty = True
+        return True
+
+    def _insert(self, note_path: str, entry: IndexedNote) -> None:
+        self.notes[note_path] = entry
+        self._total_length += entry.length
+        for term, freq in entry.terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary = None
+            postings[note_path] = freq
+
+    def _remove(self, note_path: str) -> None:
+        entry = self.notes.pop(note_path, None)
+        if entry is None:
+            return
+        self._total_length -= entry.length
+        for term in entry.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(note_path, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+        self._dirty = True
+
+    def _ensure_loaded(self) -> None:
+        """Load the persisted index once (a missing or stale file means a full build on refresh)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION:
+                return
+            for note_path, (mtime_ns, size, ino, length, terms) in data["notes"].items():
+                self._insert(note_path, IndexedNote(mtime_ns, size, ino, length, terms))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(
+                f"Ignoring unreadable vault search index {self.index_path}: {e}",
+                extra={"path": str(self.index_path)}
+            )
+            self.notes.clear()
+            self._postings.clear()
+            self._total_length = 0
@@ -6,7 +6,7 @@ Manage and query Obsidian vaults for YokeFlow knowledge integration.
 
 Features:
 - List notes in a vault
-- Search notes by content
+- Search notes by content (BM25 over a persistent inverted index)
 - Read/write notes
 - Find related notes via links
 """
@@ -19,6 +19,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 import fnmatch
 
+from server.knowledge.search_index import VaultSearchIndex, tokenize
 from server.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -76,9 +77,10 @@ class VaultManager:
 
         # Cache for vault indexes
         self._index: Dict[str, Dict[str, Note]] = {}  # vault_path -> {note_path -> Note}
+        self._search_indexes: Dict[str, VaultSearchIndex] = {}  # vault_path -> search index
 
         if self.vault_path:
-            logger.info("knowledge.vault.initialized", path=self.vault_path)
+            logger.info("knowledge.vault.initialized", extra={"path": self.vault_path})
 
     def _get_vault_path(self, vault_type: str = "default") -> Optional[Path]:
         """Get the vault path based on type."""
@@ -108,7 +110,7 @@ class VaultManager:
         """
         vault_path = self._get_vault_path(vault_type)
         if not vault_path or not vault_path.exists():
-            logger.warning("knowledge.vault.not_found", vault_type=vault_type)
+            logger.warning("knowledge.vault.not_found", extra={"vault_type": vault_type})
             return []
 
         notes = []
@@ -122,14 +124,18 @@ class VaultManager:
                 except Exception as e:
                     logger.warning(
                         "knowledge.vault.read_error",
-                        file=str(md_file),
-                        error=str(e)
+                        extra={
+                            "file": str(md_file),
+                            "error": str(e)
+                        }
                     )
 
         logger.info(
             "knowledge.vault.listed",
-            vault_type=vault_type,
-            count=len(notes)
+            extra={
+                "vault_type": vault_type,
+                "count": len(notes)
+            }
         )
         return notes
 
@@ -161,8 +167,10 @@ class VaultManager:
         except Exception as e:
             logger.error(
                 "knowledge.vault.get_note_error",
-                path=note_path,
-                error=str(e)
+                extra={
+                    "path": note_path,
+                    "error": str(e)
+                }
             )
             return None
 
@@ -171,16 +179,21 @@ class VaultManager:
         query: str,
         vault_type: str = "default",
         case_sensitive: bool = False,
-        limit: int = 20
+        limit: int = 20,
+        prefix: bool = False
     ) -> List[SearchResult]:
         """
         Search notes by content.
 
+        Notes are ranked with BM25 over the vault's search index; a note
+        matches if it contains any query term.
+
         Args:
             query: Search query
             vault_type: 'default', 'personal', or 'agents'
-            case_sensitive: Whether search is case-sensitive
+            case_sensitive: Only return notes containing the query terms with matching case
             limit: Maximum results to return
+            prefix: Match query terms as prefixes ("auth" finds "authentication")
 
         Returns:
             List of SearchResult objects
@@ -189,56 +202,88 @@ class VaultManager:
         if not vault_path or not vault_path.exists():
             return []
 
-        results = []
-        query_lower = query.lower() if not case_sensitive else query
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
 
-        for md_file in vault_path.rglob("*.md"):
-            if not md_file.is_file():
+        index = self._get_search_index(vault_path)
+        index.refresh()
+
+        results = []
+        for note_path, score in index.search(query, prefix=prefix):
+            note = self._get_cached_note(vault_path, note_path)
+            if note is None:
                 continue
 
-            try:
-                note = self._read_note(md_file, vault_path)
-                content_lower = note.content.lower() if not case_sensitive else note.content
-
-                # Simple text search
-                if query_lower in content_lower:
-                    # Find matching snippets
-                    matches = []
-                    lines = note.content.split("\n")
-                    for line in lines:
-                        line_check = line.lower() if not case_sensitive else line
-                        if query_lower in line_check:
-                            matches.append(line.strip())
-
-                    # Calculate simple score based on match count
-                    score = len(matches) / max(len(note.content.split()), 1)
-
-                    results.append(SearchResult(
-                        note=note,
-                        score=score,
-                        matches=matches[:5]  # Limit matches
-                    ))
-
-            except Exception as e:
-                logger.warning(
-                    "knowledge.vault.search_error",
-                    file=str(md_file),
-                    error=str(e)
-                )
+            matches = self._matching_lines(note.content, query, terms, case_sensitive, prefix)
+            if case_sensitive and not matches:
+                continue
 
-        # Sort by score and limit
-        results.sort(key=lambda r: r.score, reverse=True)
-        results = results[:limit]
+            results.append(SearchResult(
+                note=note,
+                score=score,
+                matches=matches[:5]  # Limit matches
+            ))
+            if len(results) >= limit:
+                break
 
         logger.info(
             "knowledge.vault.search",
-            vault_type=vault_type,
-            query=query,
-            results=len(results)
+            extra={
+                "vault_type": vault_type,
+                "query": query,
+                "results": len(results)
+            }
         )
 
         return results
 
+    def _get_search_index(self, vault_path: Path) -> VaultSearchIndex:
+        """Get (or create) the search index for a vault."""
+        key = str(vault_path)
+        if key not in self._search_indexes:
+            self._search_indexes[key] = VaultSearchIndex(vault_path)
+        return self._search_indexes[key]
+
+    def _get_cached_note(self, vault_path: Path, note_path: str) -> Optional[Note]:
+        """Read a note, reusing the parsed copy while the file is unchanged."""
+        cache = self._index.setdefault(str(vault_path), {})
+        full_path = vault_path / note_path
+        try:
+            mtime = datetime.fromtimestamp(full_path.stat().st_mtime)
+            cached = cache.get(note_path)
+            if cached is not None and cached.modified_at == mtime:
+                return cached
+            note = self._read_note(full_path, vault_path)
+        except (OSError, UnicodeDecodeError):
+            cache.pop(note_path, None)
+            return None
+        cache[note_path] = note
+        return note
+
+    @staticmethod
+    def _matching_lines(
+        content: str,
+        query: str,
+        terms: List[str],
+        case_sensitive: bool,
+        prefix: bool
+    ) -> List[str]:
+        """Lines of a note containing query terms (snippets for a search result)."""
+        needles = re.findall(r"\w+", query) if case_sensitive else terms
+
+        matches = []
+        for line in content.split("\n"):
+            line_check = line if case_sensitive else line.lower()
+            words = set(re.findall(r"\w+", line_check))
+            if prefix:
+                found = any(w.startswith(n) for n in needles for w in words)
+            else:
+                found = any(n in words for n in needles)
+            if found:
+                matches.append(line.strip())
+        return matches
+
     def find_related(
         self,
         note_path: str,
@@ -289,8 +334,10 @@ class VaultManager:
 
         logger.info(
             "knowledge.vault.find_related",
-            note_path=note_path,
-            related_count=len(related)
+            extra={
+                "note_path": note_path,
+                "related_count": len(related)
+            }
         )
 
         return related
@@ -334,17 +381,22 @@ class VaultManager:
 
         try:
             full_path.write_text(full_content, encoding="utf-8")
+            self._update_search_index(vault_path, full_path)
             logger.info(
                 "knowledge.vault.wrote_note",
-                path=note_path,
-                vault_type=vault_type
+                extra={
+                    "path": note_path,
+                    "vault_type": vault_type
+                }
             )
             return True
         except Exception as e:
             logger.error(
                 "knowledge.vault.write_error",
-                path=note_path,
-                error=str(e)
+                extra={
+                    "path": note_path,
+                    "error": str(e)
+                }
             )
             return False
 
@@ -372,21 +424,36 @@ class VaultManager:
         try:
             if full_path.exists():
                 full_path.unlink()
+                self._update_search_index(vault_path, full_path)
                 logger.info(
                     "knowledge.vault.deleted_note",
-                    path=note_path,
-                    vault_type=vault_type
+                    extra={
+                        "path": note_path,
+                        "vault_type": vault_type
+                    }
                 )
                 return True
         except Exception as e:
             logger.error(
                 "knowledge.vault.delete_error",
-                path=note_path,
-                error=str(e)
+                extra={
+                    "path": note_path,
+                    "error": str(e)
+                }
             )
 
         return False
 
+    def _update_search_index(self, vault_path: Path, full_path: Path) -> None:
+        """Apply a written or deleted note to the vault's search index."""
+        try:
+            note_path = str(full_path.relative_to(vault_path))
+        except ValueError:
+            return  # Outside the vault
+        self._index.get(str(vault_path), {}).pop(note_path, None)
+        if str(vault_path) in self._search_indexes:
+            self._search_indexes[str(vault_path)].update(note_path)
+
     def _read_note(self, full_path: Path, vault_path: Path) -> Note:
         """Read and parse a note file."""
         content = full_path.read_text(encoding="utf-8")
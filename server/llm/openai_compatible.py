@@ -6,12 +6,16 @@ Client for OpenAI-compatible APIs (LMStudio, llama.cpp, etc.).
 
 Both LMStudio and llama.cpp expose OpenAI-compatible APIs, allowing
 us to use a single client implementation for both.
+
+Requests go through the pooled keep-alive client for the server's base URL
+(see server/utils/http_clients.py), shared by every instance.
 """
 
 import httpx
 from typing import Optional, AsyncIterator, Any, Dict, List
 from dataclasses import dataclass
 
+from server.utils.http_clients import get_http_client
 from server.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -57,10 +61,16 @@ class OpenAICompatibleClient:
 
         logger.info(
             "llm.openai_compatible.initialized",
-            base_url=self.base_url,
-            model=self.model
+            extra={
+                "base_url": self.base_url,
+                "model": self.model
+            }
         )
 
+    def _http(self) -> httpx.AsyncClient:
+        """Pooled HTTP client for this server."""
+        return get_http_client(f"llm:{self.base_url}", base_url=self.base_url, timeout=self.timeout)
+
     async def _make_request(
         self,
         endpoint: str,
@@ -82,10 +92,9 @@ class OpenAICompatibleClient:
             "Content-Type": "application/json",
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await self._http().post(url, json=payload, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
 
     async def _stream_request(
         self,
@@ -109,16 +118,15 @@ class OpenAICompatibleClient:
         }
         payload["stream"] = True
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            async with client.stream("POST", url, json=payload, headers=headers) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data = line[6:]  # Remove "data: " prefix
-                        if data == "[DONE]":
-                            break
-                        import json
-                        yield json.loads(data)
+        async with self._http().stream("POST", url, json=payload, headers=headers, timeout=self.timeout) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    data = line[6:]  # Remove "data: " prefix
+                    if data == "[DONE]":
+                        break
+                    import json
+                    yield json.loads(data)
 
     async def complete(
         self,
@@ -158,9 +166,11 @@ class OpenAICompatibleClient:
 
         logger.debug(
             "llm.openai_compatible.complete.started",
-            model=self.model,
-            prompt_length=len(prompt),
-            max_tokens=max_tokens
+            extra={
+                "model": self.model,
+                "prompt_length": len(prompt),
+                "max_tokens": max_tokens
+            }
         )
 
         try:
@@ -169,8 +179,10 @@ class OpenAICompatibleClient:
 
             logger.info(
                 "llm.openai_compatible.complete.success",
-                model=self.model,
-                response_length=len(content)
+                extra={
+                    "model": self.model,
+                    "response_length": len(content)
+                }
             )
 
             return content
@@ -178,8 +190,10 @@ class OpenAICompatibleClient:
         except httpx.HTTPError as e:
             logger.error(
                 "llm.openai_compatible.complete.failed",
-                error=str(e),
-                model=self.model
+                extra={
+                    "error": str(e),
+                    "model": self.model
+                }
             )
             raise
 
@@ -221,8 +235,10 @@ class OpenAICompatibleClient:
 
         logger.debug(
             "llm.openai_compatible.stream.started",
-            model=self.model,
-            prompt_length=len(prompt)
+            extra={
+                "model": self.model,
+                "prompt_length": len(prompt)
+            }
         )
 
         try:
@@ -237,7 +253,9 @@ class OpenAICompatibleClient:
         except httpx.HTTPError as e:
             logger.error(
                 "llm.openai_compatible.stream.failed",
-                error=str(e)
+                extra={
+                    "error": str(e)
+                }
             )
             raise
 
@@ -279,15 +297,16 @@ class OpenAICompatibleClient:
             True if healthy, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                # Try to get models list (most OpenAI-compatible servers support this)
-                response = await client.get(f"{self.base_url}/models")
-                return response.status_code == 200
+            # Try to get models list (most OpenAI-compatible servers support this)
+            response = await self._http().get(f"{self.base_url}/models", timeout=5.0)
+            return response.status_code == 200
         except Exception as e:
             logger.warning(
                 "llm.openai_compatible.health_check.failed",
-                error=str(e),
-                base_url=self.base_url
+                extra={
+                    "error": str(e),
+                    "base_url": self.base_url
+                }
             )
             return False
 
@@ -299,14 +318,15 @@ class OpenAICompatibleClient:
             List of model names
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/models")
-                response.raise_for_status()
-                data = response.json()
-                return [m["id"] for m in data.get("data", [])]
+            response = await self._http().get(f"{self.base_url}/models", timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+            return [m["id"] for m in data.get("data", [])]
         except Exception as e:
             logger.warning(
                 "llm.openai_compatible.list_models.failed",
-                error=str(e)
+                extra={
+                    "error": str(e)
+                }
             )
             return []
@@ -9,12 +9,15 @@ Routing Rules:
 - Agents (Local) Vault: Claude (with agent models)
 - Generated Projects: Claude (default)
 - Fallback/Backup: LMStudio
+
+The environment config and the provider clients are created once and reused
+by every request (local providers share pooled keep-alive HTTP connections).
 """
 
 import os
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Any, AsyncIterator
+from typing import Optional, Any, AsyncIterator, Dict, Tuple
 from dataclasses import dataclass
 
 from server.utils.logging import get_logger
@@ -66,6 +69,50 @@ class LLMConfig:
         )
 
 
+_default_config: Optional[LLMConfig] = None
+_provider_clients: Dict[Tuple[LLMProvider, str, str], Any] = {}
+
+
+def get_llm_config() -> LLMConfig:
+    """LLM configuration from the environment (read once per process)."""
+    global _default_config
+    if _default_config is None:
+        _default_config = LLMConfig.from_env()
+    return _default_config
+
+
+def get_provider_client(provider: LLMProvider, config: LLMConfig) -> Any:
+    """
+    Client for a provider, created on first use and reused afterwards.
+
+    Args:
+        provider: Provider to call
+        config: LLM configuration (endpoint, model, API key)
+
+    Returns:
+        ClaudeClient or OpenAICompatibleClient
+    """
+    if provider == LLMProvider.CLAUDE:
+        key = (provider, config.claude_api_key or "", "")
+    elif provider == LLMProvider.LMSTUDIO:
+        key = (provider, config.lmstudio_api_base, config.lmstudio_model)
+    elif provider == LLMProvider.LLAMACPP:
+        key = (provider, config.llamacpp_api_base, "local")
+    else:
+        raise ValueError(f"Unknown provider: {provider}")
+
+    client = _provider_clients.get(key)
+    if client is None:
+        if provider == LLMProvider.CLAUDE:
+            from server.llm.claude_client import ClaudeClient
+            client = ClaudeClient(api_key=config.claude_api_key)
+        else:
+            from server.llm.openai_compatible import OpenAICompatibleClient
+            client = OpenAICompatibleClient(base_url=key[1], model=key[2])
+        _provider_clients[key] = client
+    return client
+
+
 def get_provider_for_vault(
     vault_path: Optional[str],
     config: Optional[LLMConfig] = None
@@ -86,7 +133,7 @@ def get_provider_for_vault(
         LLMProvider to use for this vault
     """
     if config is None:
-        config = LLMConfig.from_env()
+        config = get_llm_config()
 
     if vault_path is None:
         return config.default_provider
@@ -100,9 +147,11 @@ def get_provider_for_vault(
         if str(vault_path_normalized).startswith(str(personal_path)):
             logger.info(
                 "llm.routing.personal_vault",
-                vault_path=vault_path,
-                provider="lmstudio",
-                reason="Privacy - Personal Vault must use local LLM"
+                extra={
+                    "vault_path": vault_path,
+                    "provider": "lmstudio",
+                    "reason": "Privacy - Personal Vault must use local LLM"
+                }
             )
             return LLMProvider.LMSTUDIO
 
@@ -112,17 +161,21 @@ def get_provider_for_vault(
         if str(vault_path_normalized).startswith(str(agents_path)):
             logger.info(
                 "llm.routing.agents_vault",
-                vault_path=vault_path,
-                provider="claude",
-                reason="Quality - Agents Vault uses Claude with agent models"
+                extra={
+                    "vault_path": vault_path,
+                    "provider": "claude",
+                    "reason": "Quality - Agents Vault uses Claude with agent models"
+                }
             )
             return LLMProvider.CLAUDE
 
     # Default to configured provider
     logger.debug(
         "llm.routing.default",
-        vault_path=vault_path,
-        provider=config.default_provider.value
+        extra={
+            "vault_path": vault_path,
+            "provider": config.default_provider.value
+        }
     )
     return config.default_provider
 
@@ -138,7 +191,7 @@ def get_default_provider(config: Optional[LLMConfig] = None) -> LLMProvider:
         Default LLMProvider
     """
     if config is None:
-        config = LLMConfig.from_env()
+        config = get_llm_config()
     return config.default_provider
 
 
@@ -165,7 +218,7 @@ def get_provider_for_task(
         LLMProvider to use for this task
     """
     if config is None:
-        config = LLMConfig.from_env()
+        config = get_llm_config()
 
     # Vault queries must respect vault routing rules
     if task_type == "vault_query" and vault_path:
@@ -207,41 +260,22 @@ async def route_request(
         Response from the LLM provider
     """
     if config is None:
-        config = LLMConfig.from_env()
+        config = get_llm_config()
 
     provider = get_provider_for_task(task_type, vault_path, config)
 
     logger.info(
         "llm.request.routed",
-        provider=provider.value,
-        task_type=task_type,
-        vault_path=vault_path,
-        prompt_length=len(prompt)
+        extra={
+            "provider": provider.value,
+            "task_type": task_type,
+            "vault_path": vault_path,
+            "prompt_length": len(prompt)
+        }
     )
 
-    if provider == LLMProvider.CLAUDE:
-        from server.llm.claude_client import ClaudeClient
-        client = ClaudeClient(api_key=config.claude_api_key)
-        return await client.complete(prompt, **kwargs)
-
-    elif provider == LLMProvider.LMSTUDIO:
-        from server.llm.openai_compatible import OpenAICompatibleClient
-        client = OpenAICompatibleClient(
-            base_url=config.lmstudio_api_base,
-            model=config.lmstudio_model
-        )
-        return await client.complete(prompt, **kwargs)
-
-    elif provider == LLMProvider.LLAMACPP:
-        from server.llm.openai_compatible import OpenAICompatibleClient
-        client = OpenAICompatibleClient(
-            base_url=config.llamacpp_api_base,
-            model="local"
-        )
-        return await client.complete(prompt, **kwargs)
-
-    else:
-        raise ValueError(f"Unknown provider: {provider}")
+    client = get_provider_client(provider, config)
+    return await client.complete(prompt, **kwargs)
 
 
 async def stream_request(
@@ -265,37 +299,19 @@ async def stream_request(
         Chunks of the response
     """
     if config is None:
-        config = LLMConfig.from_env()
+        config = get_llm_config()
 
     provider = get_provider_for_task(task_type, vault_path, config)
 
     logger.info(
         "llm.stream.routed",
-        provider=provider.value,
-        task_type=task_type,
-        vault_path=vault_path
+        extra={
+            "provider": provider.value,
+            "task_type": task_type,
+            "vault_path": vault_path
+        }
     )
 
-    if provider == LLMProvider.CLAUDE:
-        from server.llm.claude_client import ClaudeClient
-        client = ClaudeClient(api_key=config.claude_api_key)
-        async for chunk in client.stream(prompt, **kwargs):
-            yield chunk
-
-    elif provider == LLMProvider.LMSTUDIO:
-        from server.llm.openai_compatible import OpenAICompatibleClient
-        client = OpenAICompatibleClient(
-            base_url=config.lmstudio_api_base,
-            model=config.lmstudio_model
-        )
-        async for chunk in client.stream(prompt, **kwargs):
-            yield chunk
-
-    elif provider == LLMProvider.LLAMACPP:
-        from server.llm.openai_compatible import OpenAICompatibleClient
-        client = OpenAICompatibleClient(
-            base_url=config.llamacpp_api_base,
-            model="local"
-        )
-        async for chunk in client.stream(prompt, **kwargs):
-            yield chunk
+    client = get_provider_client(provider, config)
+    async for chunk in client.stream(prompt, **kwargs):
+        yield chunk
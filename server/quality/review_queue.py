@@ -0,0 +1,330 @@
+"""
+Deep Review Job Queue
+=====================
+
+Runs API-triggered deep reviews from the persistent review_jobs table with a
+bounded worker pool, instead of one background task per session.
+
+- Enqueueing skips sessions that already have a queued or running job
+- A fixed number of workers per API process claim jobs with
+  FOR UPDATE SKIP LOCKED, optionally capped per review model
+- Failed reviews are retried with exponential backoff up to max_attempts;
+  a missing project directory fails the job immediately
+- Jobs leased by a worker that died are re-queued once the lease expires
+- Progress is published per project (deep_review_queued / started /
+  completed / retrying / failed) for the WebSocket clients
+
+Usage:
+    queue = ReviewQueue(get_db, publish=notify_project_update)
+    await queue.start()
+    await queue.enqueue(project_id, sessions, model=None)
+    ...
+    await queue.stop()
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+Publisher = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+# Limit key for jobs queued without an explicit model
+DEFAULT_MODEL_KEY = "default"
+
+# Extra lease time beyond the job timeout before a job counts as abandoned
+LEASE_MARGIN_SECONDS = 60
+
+# How often expired leases are reclaimed
+REAP_INTERVAL_SECONDS = 60
+
+
+class ReviewQueue:
+    """Bounded worker pool over the review_jobs table."""
+
+    def __init__(
+        self,
+        db_provider: Callable[[], Awaitable[Any]],
+        run_review: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None,
+        publish: Optional[Publisher] = None,
+        generations_dir: str = "generations",
+        workers: int = 2,
+        model_limits: Optional[Dict[str, int]] = None,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+        job_timeout: float = 900,
+        poll_interval: float = 5.0,
+        worker_id: Optional[str] = None,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            db_provider: Coroutine function returning the TaskDatabase
+            run_review: Coroutine function (session_id, project_path, model) -> review result
+                (default: run_deep_review)
+            publish: Coroutine function (project_id, event) for progress events
+            generations_dir: Directory holding project directories
+            workers: Reviews run concurrently by this process
+            model_limits: Max concurrent reviews per model ("default" = no explicit model)
+            max_attempts: Attempts before a failing job is marked failed
+            retry_delay: Seconds before the first retry (doubles each attempt)
+            job_timeout: Seconds a single review may run
+            poll_interval: Seconds between checks for jobs queued elsewhere
+            worker_id: Lease owner name (defaults to host and PID)
+        """
+        self._db_provider = db_provider
+        self._run_review = run_review
+        self._publish = publish
+        self.generations_dir = Path(generations_dir)
+        self.workers = max(1, workers)
+        self.model_limits = dict(model_limits or {})
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.job_timeout = job_timeout
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"reviews-{socket.gethostname()}-{os.getpid()}"
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._claim_lock = asyncio.Lock()
+        self._running_by_model: Counter = Counter()
+        self._running = False
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+
+    @staticmethod
+    def model_key(model: Optional[str]) -> str:
+        return model or DEFAULT_MODEL_KEY
+
+    async def start(self) -> None:
+        """Reclaim abandoned jobs and start the workers."""
+        if self._running:
+            return
+        self._running = True
+        await self._reap()
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._reaper()))
+        logger.info(f"Review queue started with {self.workers} worker(s) as {self.worker_id}")
+
+    async def stop(self) -> None:
+        """
+        Stop the workers.
+
+        Reviews in progress are cancelled; their jobs stay 'running' until the
+        lease expires and are then re-queued by whichever process is up.
+        """
+        self._running = False
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(
+        self,
+        project_id: UUID,
+        sessions: List[Dict[str, Any]],
+        model: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Queue deep reviews for sessions.
+
+        Args:
+            project_id: Project UUID
+            sessions: Dicts (or records) with 'id' and 'session_number'
+            model: Review model (None = run_deep_review default)
+
+        Returns:
+            Created jobs; sessions already queued or running are skipped
+        """
+        db = await self._db_provider()
+        jobs = await db.enqueue_review_jobs(
+            project_id,
+            [{"id": s["id"], "session_number": s["session_number"]} for s in sessions],
+            model=model,
+            max_attempts=self.max_attempts,
+        )
+        for job in jobs:
+            await self._notify(job, "deep_review_queued", f"Deep review queued for session {job['session_number']}")
+        if jobs:
+            self._wakeup.set()
+        return jobs
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "workers": self.workers,
+            "running": sum(self._running_by_model.values()),
+            "running_by_model": dict(self._running_by_model),
+            "model_limits": self.model_limits,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+        }
+
+    # -------------------------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------------------------
+
+    def _saturated_models(self) -> List[str]:
+        return [
+            model for model, limit in self.model_limits.items()
+            if self._running_by_model[model] >= limit
+        ]
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        # Serialized so two local workers can't both take the last slot of a model
+        async with self._claim_lock:
+            db = await self._db_provider()
+            job = await db.claim_review_job(
+                self.worker_id,
+                int(self.job_timeout + LEASE_MARGIN_SECONDS),
+                exclude_models=self._saturated_models(),
+            )
+            if job:
+                self._running_by_model[self.model_key(job.get("model"))] += 1
+            return job
+
+    async def _worker(self, index: int) -> None:
+        while self._running:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Review worker {index} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            try:
+                await self._run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Job state couldn't be recorded; the lease expiry re-queues it
+                logger.error(f"Review worker {index} failed on job {job['id']}: {e}", exc_info=True)
+            finally:
+                key = self.model_key(job.get("model"))
+                self._running_by_model[key] -= 1
+                if self._running_by_model[key] <= 0:
+                    del self._running_by_model[key]
+                # A model slot opened up; let idle workers look again
+                self._wakeup.set()
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        session_number = job["session_number"]
+        await self._notify(job, "deep_review_started", f"Starting deep review for session {session_number}")
+
+        db = await self._db_provider()
+        project_path = self.generations_dir / job["project_name"]
+        try:
+            if not project_path.exists():
+                raise FileNotFoundError(f"Project directory not found: {project_path}")
+            run_review = self._run_review
+            if run_review is None:
+                # Imported lazily: pulls in the Claude SDK
+                from server.quality.reviews import run_deep_review as run_review
+            result = await asyncio.wait_for(
+                run_review(
+                    session_id=job["session_id"],
+                    project_path=project_path,
+                    model=job.get("model"),
+                ),
+                timeout=self.job_timeout,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if isinstance(e, asyncio.TimeoutError):
+                error = f"Review timed out after {self.job_timeout:g}s"
+            # Missing logs or project directories won't appear on retry
+            retry_delay = None if isinstance(e, FileNotFoundError) else self._backoff(job["attempts"])
+            updated = await db.fail_review_job(job["id"], error, retry_delay)
+            if updated and updated["status"] == "queued":
+                self.retried += 1
+                logger.warning(
+                    f"Deep review for session {session_number} failed (attempt {job['attempts']}), "
+                    f"retrying in {retry_delay:g}s: {error}"
+                )
+                await self._notify(
+                    job, "deep_review_retrying",
+                    f"Deep review for session {session_number} failed, retrying in {retry_delay:g}s",
+                    error=error, retry_in=retry_delay,
+                )
+            else:
+                self.failed += 1
+                logger.error(f"Deep review failed for session {session_number}: {error}")
+                await self._notify(
+                    job, "deep_review_failed",
+                    f"Deep review failed for session {session_number}",
+                    error=error,
+                )
+            return
+
+        summary = {
+            "check_id": result.get("check_id"),
+            "overall_rating": result.get("overall_rating"),
+        }
+        await db.complete_review_job(job["id"], summary)
+        self.completed += 1
+        await self._notify(
+            job, "deep_review_completed",
+            f"Deep review completed for session {session_number}",
+            rating=summary["overall_rating"],
+        )
+
+    def _backoff(self, attempts: int) -> float:
+        return self.retry_delay * (2 ** max(0, attempts - 1))
+
+    async def _reap(self) -> None:
+        try:
+            db = await self._db_provider()
+            count = await db.requeue_expired_review_jobs()
+            if count:
+                logger.info(f"Re-queued {count} abandoned deep review job(s)")
+                self._wakeup.set()
+        except Exception as e:
+            logger.error(f"Failed to reclaim expired review jobs: {e}")
+
+    async def _reaper(self) -> None:
+        while self._running:
+            await asyncio.sleep(REAP_INTERVAL_SECONDS)
+            await self._reap()
+
+    async def _notify(self, job: Dict[str, Any], event_type: str, message: str, **extra) -> None:
+        if self._publish is None:
+            return
+        project_id = str(job["project_id"])
+        try:
+            await self._publish(project_id, {
+                "type": event_type,
+                "job_id": str(job["id"]),
+                "session_id": str(job["session_id"]),
+                "session_number": job["session_number"],
+                "project_id": project_id,
+                "attempt": job.get("attempts", 0),
+                "timestamp": datetime.now().isoformat(),
+                "message": message,
+                **extra,
+            })
+        except Exception as e:
+            logger.error(f"Failed to publish {event_type} for project {project_id}: {e}")
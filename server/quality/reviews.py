@@ -41,6 +41,7 @@ from collections import defaultdict
 from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions
 
 from server.database.connection import DatabaseManager
+from server.utils.log_archive import glob_logs
 
 
 logger = logging.getLogger(__name__)
@@ -169,8 +170,9 @@ async def run_deep_review(
     jsonl_pattern = f"session_{session_number:03d}_*.jsonl"
     txt_pattern = f"session_{session_number:03d}_*.txt"
 
-    jsonl_files = list(logs_dir.glob(jsonl_pattern))
-    txt_files = list(logs_dir.glob(txt_pattern))
+    # Finished logs may have been compressed (session_NNN_*.jsonl.gz)
+    jsonl_files = glob_logs(logs_dir, jsonl_pattern)
+    txt_files = glob_logs(logs_dir, txt_pattern)
 
     if not jsonl_files:
         raise FileNotFoundError(f"No JSONL log found for session {session_number}")
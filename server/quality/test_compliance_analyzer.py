@@ -29,6 +29,8 @@ from datetime import datetime
 from uuid import UUID
 import logging
 
+from server.utils.log_archive import open_log
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,8 +88,8 @@ class TestComplianceAnalyzer:
         }
 
     def _load_events(self):
-        """Load and parse JSONL events."""
-        with open(self.jsonl_path, 'r') as f:
+        """Load and parse JSONL events (plain or compressed log)."""
+        with open_log(self.jsonl_path, 'rt') as f:
             for line in f:
                 if not line.strip():
                     continue
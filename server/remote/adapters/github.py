@@ -24,6 +24,7 @@ from server.remote.adapters.base import (
     MessageType,
     SendResult,
 )
+from server.utils.http_clients import get_http_client, get_http_registry
 from server.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -74,19 +75,29 @@ class GitHubAdapter(IPlatformAdapter):
     def platform_name(self) -> str:
         return "github"
 
+    @property
+    def _client_name(self) -> str:
+        """Registry name of this adapter's client.
+
+        Default headers are fixed when the pooled client is created, so each
+        token gets its own client (keyed by a hash, never the token itself).
+        """
+        token_hash = hashlib.sha256((self.token or "").encode()).hexdigest()[:16]
+        return f"github:{token_hash}"
+
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None or self._client.is_closed:
-            headers = {
-                "Authorization": f"Bearer {self.token}",
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "YokeFlow-Remote-Control",
-            }
-            self._client = httpx.AsyncClient(
-                base_url=self.API_BASE,
-                headers=headers,
-                timeout=30.0
-            )
+        """Get the pooled keep-alive HTTP client for the GitHub API."""
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "YokeFlow-Remote-Control",
+        }
+        self._client = get_http_client(
+            self._client_name,
+            base_url=self.API_BASE,
+            headers=headers,
+            timeout=30.0
+        )
         return self._client
 
     async def start(self) -> None:
@@ -133,8 +144,8 @@ class GitHubAdapter(IPlatformAdapter):
         """Stop the adapter and clean up resources."""
         self._running = False
 
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
+        if self._client is not None:
+            await get_http_registry().close(self._client_name)
             self._client = None
 
         logger.info("remote.github.stopped")
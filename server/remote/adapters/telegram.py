@@ -24,6 +24,7 @@ from server.remote.adapters.base import (
     MessageType,
     SendResult,
 )
+from server.utils.http_clients import get_http_client, get_http_registry
 from server.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -81,9 +82,8 @@ class TelegramAdapter(IPlatformAdapter):
         return f"{self.API_BASE}{self.bot_token}/{method}"
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=60.0)
+        """Get the pooled keep-alive HTTP client for the Bot API."""
+        self._client = get_http_client("telegram", base_url="https://api.telegram.org", timeout=60.0)
         return self._client
 
     async def start(self) -> None:
@@ -122,8 +122,8 @@ class TelegramAdapter(IPlatformAdapter):
                 pass
             self._poll_task = None
 
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
+        if self._client is not None:
+            await get_http_registry().close("telegram")
             self._client = None
 
         logger.info("remote.telegram.stopped")
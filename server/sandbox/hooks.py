@@ -13,12 +13,15 @@ tool when a Docker sandbox is active.
 """
 
 import logging
+from contextvars import ContextVar
 from typing import Optional, Any
 
 logger = logging.getLogger(__name__)
 
-# Global sandbox instance (set by orchestrator before running agent session)
-_active_sandbox: Optional[Any] = None
+# Sandbox instance for the current session (set by orchestrator before running agent session).
+# A ContextVar keeps concurrent sessions (parallel epics, multiple projects) from
+# overwriting each other, since every asyncio task runs in its own context copy.
+_active_sandbox: ContextVar[Optional[Any]] = ContextVar("active_sandbox", default=None)
 
 
 def set_active_sandbox(sandbox):
@@ -29,18 +32,16 @@ def set_active_sandbox(sandbox):
     The sandbox manages the Docker container lifecycle, but command
     execution goes through the MCP bash_docker tool.
     """
-    global _active_sandbox
-    _active_sandbox = sandbox
+    _active_sandbox.set(sandbox)
     logger.debug(f"Active sandbox set: {type(sandbox).__name__}")
 
 
 def clear_active_sandbox():
     """Clear the active sandbox after session ends."""
-    global _active_sandbox
-    _active_sandbox = None
+    _active_sandbox.set(None)
     logger.debug("Active sandbox cleared")
 
 
 def get_active_sandbox():
     """Get the currently active sandbox instance."""
-    return _active_sandbox
+    return _active_sandbox.get()
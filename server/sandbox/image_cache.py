@@ -0,0 +1,136 @@
+"""
+Sandbox Toolchain Image Cache
+=============================
+
+Builds the sandbox toolchain (git, build tools, Python, Node.js, pnpm, ...)
+into a local Docker image once, instead of installing it with apt/npm inside
+every freshly created container.
+
+The image tag is derived from a content hash of the toolchain spec (base image
+plus install commands), so changing either produces a new tag and a rebuild,
+while every later container starts from the cached image in seconds. Each
+install command is its own layer, so editing the last command only rebuilds
+the last layer.
+
+All functions here block on the Docker daemon; call them via asyncio.to_thread.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Repository for cached toolchain images (tag = toolchain hash)
+TOOLCHAIN_IMAGE_REPO = "yokeflow-toolchain"
+
+# Label set on images built here (and on containers prewarmed from them)
+TOOLCHAIN_HASH_LABEL = "yokeflow.toolchain.hash"
+
+# Toolchain installed on top of the configured sandbox image
+# Added procps for process management (ps, pkill, pgrep)
+# Added lsof for port management
+# Added jq for JSON processing
+# Install Node.js via NodeSource repository for latest version
+TOOLCHAIN_SETUP_COMMANDS: List[str] = [
+    "apt-get update -qq",
+    "apt-get install -y -qq git curl build-essential python3 python3-pip procps lsof jq sqlite3",
+    # Install Node.js 20.x (includes npm)
+    "curl -fsSL https://deb.nodesource.com/setup_20.x | bash -",
+    "apt-get install -y -qq nodejs",
+    # Now npm is available, install pnpm globally
+    "npm install -g pnpm",  # Install pnpm package manager
+]
+
+# One lock per tag so concurrent sessions wait for a single build
+_build_locks: Dict[str, threading.Lock] = {}
+_build_locks_guard = threading.Lock()
+
+
+def toolchain_hash(base_image: str, commands: Sequence[str] = TOOLCHAIN_SETUP_COMMANDS) -> str:
+    """
+    Content hash of a toolchain spec.
+
+    Args:
+        base_image: Image the toolchain is installed on
+        commands: Install commands, in order
+
+    Returns:
+        First 16 hex chars of the SHA-256 of the spec
+    """
+    spec = json.dumps({"base_image": base_image, "commands": list(commands)}, sort_keys=True)
+    return hashlib.sha256(spec.encode()).hexdigest()[:16]
+
+
+def toolchain_image_tag(base_image: str, commands: Sequence[str] = TOOLCHAIN_SETUP_COMMANDS) -> str:
+    """Image tag for a toolchain spec, e.g. ``yokeflow-toolchain:3f2a...``."""
+    return f"{TOOLCHAIN_IMAGE_REPO}:{toolchain_hash(base_image, commands)}"
+
+
+def render_dockerfile(base_image: str, commands: Sequence[str] = TOOLCHAIN_SETUP_COMMANDS) -> str:
+    """
+    Render the Dockerfile for a toolchain spec (one layer per command).
+
+    Args:
+        base_image: Image the toolchain is installed on
+        commands: Install commands, in order
+
+    Returns:
+        Dockerfile contents
+    """
+    lines = [f"FROM {base_image}", "ENV DEBIAN_FRONTEND=noninteractive"]
+    lines.extend(f"RUN {command}" for command in commands)
+    lines.append('CMD ["sleep", "infinity"]')
+    return "\n".join(lines) + "\n"
+
+
+def _build_lock(tag: str) -> threading.Lock:
+    with _build_locks_guard:
+        return _build_locks.setdefault(tag, threading.Lock())
+
+
+def ensure_toolchain_image(
+    client: Any,
+    base_image: str,
+    commands: Sequence[str] = TOOLCHAIN_SETUP_COMMANDS
+) -> Optional[str]:
+    """
+    Return the cached toolchain image for a spec, building it if missing.
+
+    Args:
+        client: Docker client
+        base_image: Image the toolchain is installed on
+        commands: Install commands, in order
+
+    Returns:
+        Image tag, or None if the build failed (callers fall back to
+        installing the toolchain in the container)
+    """
+    import docker
+
+    tag = toolchain_image_tag(base_image, commands)
+
+    with _build_lock(tag):
+        try:
+            client.images.get(tag)
+            return tag
+        except docker.errors.ImageNotFound:
+            pass
+
+        logger.info(f"Building sandbox toolchain image {tag} from {base_image} (one-time, may take several minutes)")
+        try:
+            client.images.build(
+                fileobj=io.BytesIO(render_dockerfile(base_image, commands).encode()),
+                tag=tag,
+                rm=True,
+                labels={TOOLCHAIN_HASH_LABEL: tag.split(":", 1)[1]},
+            )
+        except Exception as e:
+            logger.warning(f"Failed to build toolchain image {tag}, falling back to per-container setup: {e}")
+            return None
+
+        logger.info(f"Built sandbox toolchain image {tag}")
+        return tag
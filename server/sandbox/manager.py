@@ -39,16 +39,91 @@ This architecture avoids SDK limitations with hooks and provides clean separatio
 between container lifecycle management (this module) and command execution (MCP).
 """
 
+import asyncio
+import codecs
 import os
 import subprocess
 import tempfile
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 import logging
 
+from server.sandbox.image_cache import (
+    TOOLCHAIN_HASH_LABEL,
+    TOOLCHAIN_SETUP_COMMANDS,
+    ensure_toolchain_image,
+)
+
 logger = logging.getLogger(__name__)
 
+# Label on containers created ahead of a project's first session (see DockerSandbox.prewarm)
+PREWARMED_LABEL = "yokeflow.prewarmed"
+
+# Seconds between SIGTERM and SIGKILL when a command exceeds its timeout
+EXEC_KILL_GRACE = 5
+# Extra seconds the host waits for a timed-out exec stream to close on its own
+EXEC_STREAM_GRACE = 10
+# Per-command timeout for container setup (apt-get, NodeSource, npm)
+SETUP_COMMAND_TIMEOUT = 120
+# Exit codes of coreutils `timeout` (TERM'd / KILL'd). Commands can exit with
+# these on their own, so they only mean a timeout once the timeout has elapsed.
+TIMEOUT_EXIT_CODES = (124, 137)
+# Seconds between "still building" log lines while the toolchain image builds
+IMAGE_BUILD_LOG_INTERVAL = 30
+
+# Called with (stream, text) for each chunk of command output; stream is "stdout" or "stderr"
+OutputCallback = Callable[[str, str], None]
+
+_docker_client: Optional[Any] = None
+_docker_client_lock = threading.Lock()
+
+
+def get_docker_client():
+    """
+    Get the process-wide Docker client, creating it on first use.
+
+    The socket path is detected from ``docker context inspect`` (handles custom
+    paths, e.g. home on external SSD) with a fallback to ``docker.from_env()``.
+    The client keeps its own connection pool, so one instance is shared by all
+    sandboxes and container management calls instead of reconnecting each time.
+
+    This is blocking; call it via ``asyncio.to_thread`` from async code.
+    """
+    global _docker_client
+    import docker
+    import json
+
+    with _docker_client_lock:
+        if _docker_client is None:
+            result = subprocess.run(['docker', 'context', 'inspect'],
+                                    capture_output=True, text=True, timeout=5)
+
+            if result.returncode == 0:
+                context = json.loads(result.stdout)[0]
+                socket_path = context['Endpoints']['docker']['Host']
+                logger.info(f"Using Docker socket: {socket_path}")
+                _docker_client = docker.DockerClient(base_url=socket_path)
+            else:
+                # Fallback to from_env()
+                logger.info("Using docker.from_env() for client")
+                _docker_client = docker.from_env()
+
+        return _docker_client
+
+
+def reset_docker_client() -> None:
+    """Drop the shared Docker client (e.g. after the daemon restarted)."""
+    global _docker_client
+    with _docker_client_lock:
+        if _docker_client is not None:
+            try:
+                _docker_client.close()
+            except Exception:
+                pass
+        _docker_client = None
+
 
 class Sandbox(ABC):
     """
@@ -69,6 +144,14 @@ class Sandbox(ABC):
         self.config = config or {}
         self.is_running = False
 
+    async def prepare(self) -> None:
+        """
+        Do slow one-time setup ahead of start().
+
+        Callers run this outside the startup timeout. No-op by default.
+        """
+        pass
+
     @abstractmethod
     async def start(self) -> None:
         """Start the sandbox environment."""
@@ -180,7 +263,9 @@ class DockerSandbox(Sandbox):
         super().__init__(project_dir, config)
         self.container_id: Optional[str] = None
         self.container_name: Optional[str] = None
-        self.client: Optional[Any] = None  # Docker client (reused across commands)
+        self.client: Optional[Any] = None  # Shared Docker client (see get_docker_client)
+        # Receives streamed command output, e.g. SessionLogger.log_sandbox_output
+        self.output_callback: Optional[OutputCallback] = None
 
         # Docker configuration
         self.image = self.config.get("image", "yokeflow-playwright:latest")
@@ -189,6 +274,11 @@ class DockerSandbox(Sandbox):
         self.cpu_limit = self.config.get("cpu_limit", "2.0")
         self.port_mappings = self.config.get("ports", [])
         self.session_type = self.config.get("session_type", "coding")  # "initializer" or "coding"
+        # Start from the cached toolchain image instead of installing it per container
+        self.use_toolchain_image = self.config.get("toolchain_image", True)
+        # Result of ensure_toolchain_image, set once prepare() has run
+        self._toolchain_image: Optional[str] = None
+        self._toolchain_prepared = False
 
     def _get_host_project_path(self) -> str:
         """
@@ -209,25 +299,10 @@ class DockerSandbox(Sandbox):
     async def start(self) -> None:
         """Create and start Docker container (with reuse for coding sessions)."""
         import docker
-        import os
-        import subprocess
-        import json
 
         try:
-            # Detect Docker socket path from docker context
-            # This handles custom paths (e.g., home on external SSD)
-            result = subprocess.run(['docker', 'context', 'inspect'],
-                                  capture_output=True, text=True, timeout=5)
-
-            if result.returncode == 0:
-                context = json.loads(result.stdout)[0]
-                socket_path = context['Endpoints']['docker']['Host']
-                logger.info(f"Using Docker socket: {socket_path}")
-                self.client = docker.DockerClient(base_url=socket_path)
-            else:
-                # Fallback to from_env()
-                logger.info("Using docker.from_env() for client")
-                self.client = docker.from_env()
+            # All docker-py calls block, so they run in worker threads
+            self.client = await asyncio.to_thread(get_docker_client)
 
             # Generate unique container name
             self.container_name = f"yokeflow-{self.project_dir.name}"
@@ -235,11 +310,22 @@ class DockerSandbox(Sandbox):
             # Container reuse strategy: Reuse for coding sessions, recreate for initializer
             existing_container = None
             try:
-                existing_container = self.client.containers.get(self.container_name)
+                existing_container = await asyncio.to_thread(self.client.containers.get, self.container_name)
                 # logger.info(f"Found existing container: {self.container_name}")
             except docker.errors.NotFound:
                 logger.info(f"No existing container found for: {self.container_name}")
 
+            # A prewarmed container was created for this project but never started:
+            # it is a clean slate for any session type, so claim it
+            if existing_container and self._is_unclaimed_prewarm(existing_container):
+                await asyncio.to_thread(existing_container.start)
+                self.container_id = existing_container.id
+                self.is_running = True
+                logger.info(f"DockerSandbox claimed prewarmed container: {self.container_name}")
+                if TOOLCHAIN_HASH_LABEL not in (existing_container.labels or {}):
+                    await self._setup_container()
+                return
+
             # Decide whether to reuse or recreate
             if self.session_type == "initializer" and existing_container:
                 project_type = self.config.get("project_type", "greenfield")
@@ -251,14 +337,14 @@ class DockerSandbox(Sandbox):
                         await self._cleanup_container()
                         return
                     else:
-                        existing_container.start()
+                        await asyncio.to_thread(existing_container.start)
                         self.container_id = existing_container.id
                         self.is_running = True
                         await self._cleanup_container()
                         return
                 else:
                     # Greenfield: always recreate for clean slate
-                    existing_container.remove(force=True)
+                    await asyncio.to_thread(existing_container.remove, force=True)
                     existing_container = None
             elif self.session_type == "coding" and existing_container:
                 # Reuse for coding sessions if running, restart if stopped
@@ -272,7 +358,7 @@ class DockerSandbox(Sandbox):
                     return  # Container ready, skip creation
                 else:
                     # logger.info("Coding session: Restarting stopped container")
-                    existing_container.start()
+                    await asyncio.to_thread(existing_container.start)
                     self.container_id = existing_container.id
                     self.is_running = True
 
@@ -280,117 +366,242 @@ class DockerSandbox(Sandbox):
                     await self._cleanup_container()
                     return  # Container ready, skip creation
 
-            # Parse port mappings from config
-            # Format: ["3001:3001", "5173:5173"] -> {'3001/tcp': 3001, '5173/tcp': 5173}
-            # Kill orphaned processes from previous sessions, then bind ports
-            port_bindings = {}
-            if hasattr(self, 'port_mappings') and self.port_mappings:
-                for port_mapping in self.port_mappings:
-                    if ':' in port_mapping:
-                        container_port, host_port = port_mapping.split(':')
-
-                        # Check if port is available
-                        import socket
-                        try:
-                            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                                s.bind(('', int(host_port)))
-                                # Port is available, add to bindings
-                                port_bindings[f'{container_port}/tcp'] = int(host_port)
-                        except OSError:
-                            # Port in use - try to kill orphaned processes from this project
-                            logger.warning(f"Port {host_port} already in use, attempting to free it...")
-                            try:
-                                import subprocess
-                                # Find process using the port
-                                result = subprocess.run(['lsof', '-ti', f':{host_port}'],
-                                                      capture_output=True, text=True, timeout=5)
-                                if result.returncode == 0 and result.stdout.strip():
-                                    pids = result.stdout.strip().split('\n')
-                                    for pid in pids:
-                                        # Verify it's related to this project directory
-                                        check_cwd = subprocess.run(['lsof', '-p', pid],
-                                                                 capture_output=True, text=True, timeout=5)
-                                        if str(self.project_dir) in check_cwd.stdout:
-                                            # It's from this project, safe to kill
-                                            subprocess.run(['kill', pid], timeout=5)
-                                            logger.info(f"Killed orphaned process {pid} from previous session")
-                                            # Try binding again
-                                            try:
-                                                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                                                    s.bind(('', int(host_port)))
-                                                    port_bindings[f'{container_port}/tcp'] = int(host_port)
-                                                    logger.info(f"Port {host_port} freed and bound successfully")
-                                            except OSError:
-                                                logger.warning(f"Port {host_port} still in use after cleanup, skipping")
-                                        else:
-                                            logger.warning(f"Port {host_port} in use by unrelated process, skipping")
-                                else:
-                                    logger.warning(f"Could not identify process using port {host_port}, skipping")
-                            except Exception as e:
-                                logger.warning(f"Failed to free port {host_port}: {e}")
-
-                if port_bindings:
-                    logger.info(f"Port forwarding enabled: {port_bindings}")
-                else:
-                    logger.warning("No ports available for forwarding - Playwright testing may be limited")
+            image, needs_setup = await self._resolve_image()
+
+            # Port checks may kill orphaned processes, keep them off the event loop
+            port_bindings = await asyncio.to_thread(self._resolve_port_bindings)
 
             # Create container with project directory mounted
-            container = self.client.containers.run(
-                self.image,
-                command="sleep infinity",  # Keep container running
-                name=self.container_name,
-                detach=True,
-                network=self.network,
-                mem_limit=self.memory_limit,
-                nano_cpus=int(float(self.cpu_limit) * 1e9),
-                ports=port_bindings if port_bindings else None,
-                volumes={
-                    self._get_host_project_path(): {
-                        "bind": "/workspace",
-                        "mode": "rw"
-                    }
-                },
-                working_dir="/workspace",
-                # Prevent environment leakage - start with minimal environment
-                environment={
-                    "HOME": "/root",
-                    "PATH": "/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin",
-                }
-            )
+            try:
+                container = await asyncio.to_thread(
+                    self.client.containers.run,
+                    image,
+                    detach=True,
+                    **self._container_options(port_bindings)
+                )
+            except docker.errors.APIError as e:
+                if e.status_code != 409:
+                    raise
+                # A background prewarm created the same-named container meanwhile
+                await self._adopt_conflicting_container()
+                return
 
             self.container_id = container.id
             self.is_running = True
 
             logger.info(f"DockerSandbox started: {self.container_name} (ID: {self.container_id[:12]})")
 
-            # Install basic dependencies in container
-            await self._setup_container()
-            logger.info(f"DockerSandbox installed: {self.container_name} (ID: {self.container_id[:12]})")
+            if needs_setup:
+                # Install basic dependencies in container
+                await self._setup_container()
+                logger.info(f"DockerSandbox installed: {self.container_name} (ID: {self.container_id[:12]})")
 
         except Exception as e:
             logger.error(f"Failed to start Docker sandbox: {e}")
             raise RuntimeError(f"Failed to start Docker sandbox: {e}")
 
+    async def _adopt_conflicting_container(self) -> None:
+        """Take over the container that won a name conflict in start()."""
+        container = await asyncio.to_thread(self.client.containers.get, self.container_name)
+        labels = container.labels or {}
+        if container.status != "running":
+            await asyncio.to_thread(container.start)
+        self.container_id = container.id
+        self.is_running = True
+        logger.info(f"DockerSandbox adopted concurrently created container: {self.container_name}")
+        if TOOLCHAIN_HASH_LABEL not in labels:
+            await self._setup_container()
+
+    async def prewarm(self) -> bool:
+        """
+        Create this project's container ahead of its first session, without starting it.
+
+        The container is created from the toolchain image with the project
+        mounted, so start() only has to start it. Bind mounts are fixed at
+        creation, which is why prewarmed containers are per project.
+
+        Returns:
+            True if a container was created, False if one already exists
+        """
+        import docker
+
+        self.client = await asyncio.to_thread(get_docker_client)
+        self.container_name = f"yokeflow-{self.project_dir.name}"
+
+        try:
+            await asyncio.to_thread(self.client.containers.get, self.container_name)
+            return False
+        except docker.errors.NotFound:
+            pass
+
+        image, needs_setup = await self._resolve_image()
+        port_bindings = await asyncio.to_thread(self._resolve_port_bindings)
+
+        labels = {PREWARMED_LABEL: "true"}
+        if not needs_setup:
+            labels[TOOLCHAIN_HASH_LABEL] = image.split(":", 1)[1]
+
+        try:
+            await asyncio.to_thread(
+                self.client.containers.create,
+                image,
+                labels=labels,
+                **self._container_options(port_bindings)
+            )
+        except docker.errors.APIError as e:
+            if e.status_code != 409:
+                raise
+            # A session started (and created the container) while we were preparing
+            return False
+        logger.info(f"Prewarmed Docker container {self.container_name} from {image}")
+        return True
+
+    @staticmethod
+    def _is_unclaimed_prewarm(container: Any) -> bool:
+        """Check if a container was prewarmed and has never been started."""
+        labels = container.labels or {}
+        return labels.get(PREWARMED_LABEL) == "true" and container.status == "created"
+
+    async def _resolve_image(self) -> tuple:
+        """
+        Pick the image for a new container.
+
+        Returns:
+            (image, needs_setup): the cached toolchain image and False, or the
+            configured image and True if the toolchain must be installed in the
+            container (cache disabled or build failed)
+        """
+        if self.use_toolchain_image:
+            await self.prepare()
+            if self._toolchain_image:
+                return self._toolchain_image, False
+        return self.image, True
+
+    async def prepare(self) -> None:
+        """
+        Build the cached toolchain image if it is missing.
+
+        A cold build takes minutes, longer than sandbox_startup_timeout, so
+        sessions call this before the timed start(). The outcome is kept, and
+        start() does not build again (or retry a failed build).
+        """
+        if not self.use_toolchain_image or self._toolchain_prepared:
+            return
+        if self.client is None:
+            self.client = await asyncio.to_thread(get_docker_client)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        build = asyncio.ensure_future(asyncio.to_thread(ensure_toolchain_image, self.client, self.image))
+        while True:
+            done, _ = await asyncio.wait({build}, timeout=IMAGE_BUILD_LOG_INTERVAL)
+            if done:
+                break
+            logger.info(
+                f"Still building sandbox toolchain image for {self.project_dir.name} "
+                f"({loop.time() - started:.0f}s elapsed)"
+            )
+
+        self._toolchain_image = build.result()
+        self._toolchain_prepared = True
+
+    def _container_options(self, port_bindings: Dict[str, int]) -> Dict[str, Any]:
+        """Keyword arguments shared by containers.run() and containers.create()."""
+        return {
+            "command": "sleep infinity",  # Keep container running
+            "name": self.container_name,
+            "network": self.network,
+            "mem_limit": self.memory_limit,
+            "nano_cpus": int(float(self.cpu_limit) * 1e9),
+            "ports": port_bindings if port_bindings else None,
+            "volumes": {
+                self._get_host_project_path(): {
+                    "bind": "/workspace",
+                    "mode": "rw"
+                }
+            },
+            "working_dir": "/workspace",
+            # Prevent environment leakage - start with minimal environment
+            "environment": {
+                "HOME": "/root",
+                "PATH": "/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin",
+            }
+        }
+
+    def _resolve_port_bindings(self) -> Dict[str, int]:
+        """
+        Build docker port bindings from the configured port mappings.
+
+        Blocking (binds test sockets, runs lsof/kill); call via asyncio.to_thread.
+
+        Returns:
+            Dict like {'3001/tcp': 3001} for the host ports that are available
+        """
+        # Parse port mappings from config
+        # Format: ["3001:3001", "5173:5173"] -> {'3001/tcp': 3001, '5173/tcp': 5173}
+        # Kill orphaned processes from previous sessions, then bind ports
+        port_bindings = {}
+        if hasattr(self, 'port_mappings') and self.port_mappings:
+            for port_mapping in self.port_mappings:
+                if ':' in port_mapping:
+                    container_port, host_port = port_mapping.split(':')
+
+                    # Check if port is available
+                    import socket
+                    try:
+                        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                            s.bind(('', int(host_port)))
+                            # Port is available, add to bindings
+                            port_bindings[f'{container_port}/tcp'] = int(host_port)
+                    except OSError:
+                        # Port in use - try to kill orphaned processes from this project
+                        logger.warning(f"Port {host_port} already in use, attempting to free it...")
+                        try:
+                            # Find process using the port
+                            result = subprocess.run(['lsof', '-ti', f':{host_port}'],
+                                                  capture_output=True, text=True, timeout=5)
+                            if result.returncode == 0 and result.stdout.strip():
+                                pids = result.stdout.strip().split('\n')
+                                for pid in pids:
+                                    # Verify it's related to this project directory
+                                    check_cwd = subprocess.run(['lsof', '-p', pid],
+                                                             capture_output=True, text=True, timeout=5)
+                                    if str(self.project_dir) in check_cwd.stdout:
+                                        # It's from this project, safe to kill
+                                        subprocess.run(['kill', pid], timeout=5)
+                                        logger.info(f"Killed orphaned process {pid} from previous session")
+                                        # Try binding again
+                                        try:
+                                            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                                                s.bind(('', int(host_port)))
+                                                port_bindings[f'{container_port}/tcp'] = int(host_port)
+                                                logger.info(f"Port {host_port} freed and bound successfully")
+                                        except OSError:
+                                            logger.warning(f"Port {host_port} still in use after cleanup, skipping")
+                                    else:
+                                        logger.warning(f"Port {host_port} in use by unrelated process, skipping")
+                            else:
+                                logger.warning(f"Could not identify process using port {host_port}, skipping")
+                        except Exception as e:
+                            logger.warning(f"Failed to free port {host_port}: {e}")
+
+            if port_bindings:
+                logger.info(f"Port forwarding enabled: {port_bindings}")
+            else:
+                logger.warning("No ports available for forwarding - Playwright testing may be limited")
+
+        return port_bindings
+
     async def _setup_container(self) -> None:
-        """Install basic dependencies in the container."""
-        # Install common dependencies (git, curl, etc.)
-        # Added procps for process management (ps, pkill, pgrep)
-        # Added lsof for port management
-        # Added jq for JSON processing
-        # Install Node.js via NodeSource repository for latest version
-        setup_commands = [
-            "apt-get update -qq",
-            "apt-get install -y -qq git curl build-essential python3 python3-pip procps lsof jq sqlite3",
-            # Install Node.js 20.x (includes npm)
-            "curl -fsSL https://deb.nodesource.com/setup_20.x | bash -",
-            "apt-get install -y -qq nodejs",
-            # Now npm is available, install pnpm globally
-            "npm install -g pnpm",  # Install pnpm package manager
-        ]
+        """
+        Install basic dependencies in the container.
 
-        for cmd in setup_commands:
+        Only used when the cached toolchain image is unavailable; normally the
+        same commands are baked into the image (see image_cache).
+        """
+        for cmd in TOOLCHAIN_SETUP_COMMANDS:
             logger.info(f"Docker installing {cmd}")
-            result = await self.execute_command(cmd, timeout=120)
+            result = await self.execute_command(cmd, timeout=SETUP_COMMAND_TIMEOUT)
             if result["returncode"] != 0:
                 logger.warning(f"Setup command failed: {cmd}\n{result['stderr']}")
 
@@ -461,22 +672,48 @@ class DockerSandbox(Sandbox):
             self.is_running = False
             self.container_id = None
             self.client = None
+            self.output_callback = None
 
     async def is_healthy(self) -> bool:
         """Check if container is healthy and ready."""
         if not self.container_id or not self.client:
             return False
 
-        try:
+        def _status() -> str:
             container = self.client.containers.get(self.container_id)
             container.reload()
-            return container.status == 'running'
+            return container.status
+
+        try:
+            return await asyncio.to_thread(_status) == 'running'
         except Exception as e:
             logger.debug(f"Container health check failed: {e}")
             return False
 
-    async def execute_command(self, command: str, timeout: Optional[int] = None) -> Dict[str, Any]:
-        """Execute command in Docker container."""
+    async def execute_command(
+        self,
+        command: str,
+        timeout: Optional[int] = None,
+        output_callback: Optional[OutputCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute command in Docker container without blocking the event loop.
+
+        The exec runs through the low-level Docker API in a worker thread and
+        its output is streamed back chunk by chunk. A timeout is enforced inside
+        the container with coreutils ``timeout`` (SIGTERM, then SIGKILL after
+        EXEC_KILL_GRACE seconds), so the process is actually killed; the host
+        additionally stops waiting if the stream has not closed shortly after.
+
+        Args:
+            command: Shell command to run in /workspace
+            timeout: Optional timeout in seconds
+            output_callback: Called with (stream, text) for each output chunk.
+                Defaults to self.output_callback.
+
+        Returns:
+            Dict with keys: stdout, stderr, returncode (-1 on timeout or error)
+        """
         if not self.container_id or not self.client:
             raise RuntimeError("Docker sandbox not started")
 
@@ -484,20 +721,105 @@ class DockerSandbox(Sandbox):
         if not await self.is_healthy():
             raise RuntimeError("Container is not healthy")
 
-        try:
-            container = self.client.containers.get(self.container_id)
+        callback = output_callback or self.output_callback
+
+        # Escape single quotes in the command
+        escaped_command = command.replace("'", "'\\''")
+        shell_command = f"sh -c '{escaped_command}'"
+        if timeout:
+            shell_command = f"timeout -k {EXEC_KILL_GRACE} {int(timeout)} {shell_command}"
 
-            # Execute command in container
-            # Escape single quotes in the command
-            escaped_command = command.replace("'", "'\\''")
-            exit_code, output = container.exec_run(
-                f"sh -c '{escaped_command}'",
-                workdir="/workspace",
-                demux=True,  # Separate stdout/stderr
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stream_holder: Dict[str, Any] = {}
+        api = self.client.api
+
+        def _pump(exec_id: str) -> None:
+            """Read the demuxed exec stream in a worker thread."""
+            try:
+                stream = api.exec_start(exec_id, stream=True, demux=True)
+                stream_holder["stream"] = stream
+                for chunk in stream:
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        stdout_parts: list = []
+        stderr_parts: list = []
+        decoders = {
+            "stdout": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            "stderr": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        }
+
+        def _emit(stream_name: str, data: Optional[bytes], final: bool = False) -> None:
+            text = decoders[stream_name].decode(data or b"", final=final)
+            if not text:
+                return
+            (stdout_parts if stream_name == "stdout" else stderr_parts).append(text)
+            if callback:
+                try:
+                    callback(stream_name, text)
+                except Exception as e:
+                    # Don't let logging errors break command execution
+                    logger.debug(f"Sandbox output callback failed: {e}")
+
+        try:
+            exec_info = await asyncio.to_thread(
+                api.exec_create, self.container_id, shell_command, workdir="/workspace"
             )
+            exec_id = exec_info["Id"]
+            started = loop.time()
+            pump = loop.run_in_executor(None, _pump, exec_id)
+
+            deadline = loop.time() + timeout + EXEC_KILL_GRACE + EXEC_STREAM_GRACE if timeout else None
+            host_timed_out = False
+            while True:
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    host_timed_out = True
+                    stream = stream_holder.get("stream")
+                    if stream is not None and hasattr(stream, "close"):
+                        # Unblocks the reader thread
+                        await asyncio.to_thread(stream.close)
+                    break
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                stdout_chunk, stderr_chunk = item
+                _emit("stdout", stdout_chunk)
+                _emit("stderr", stderr_chunk)
+
+            _emit("stdout", None, final=True)
+            _emit("stderr", None, final=True)
+            stdout = "".join(stdout_parts)
+            stderr = "".join(stderr_parts)
+
+            if host_timed_out:
+                logger.warning(f"Docker exec did not finish within {timeout}s: {command[:100]}")
+                pump.cancel()
+                return {
+                    "stdout": stdout,
+                    "stderr": stderr + f"Command timed out after {timeout} seconds",
+                    "returncode": -1,
+                }
 
-            stdout = output[0].decode() if output[0] else ""
-            stderr = output[1].decode() if output[1] else ""
+            await pump
+            inspect = await asyncio.to_thread(api.exec_inspect, exec_id)
+            exit_code = inspect.get("ExitCode")
+
+            # `timeout` can only have fired if the command ran that long; a quick
+            # exit with 124/137 is the command's own status
+            if timeout and exit_code in TIMEOUT_EXIT_CODES and loop.time() - started >= timeout:
+                return {
+                    "stdout": stdout,
+                    "stderr": stderr + f"Command timed out after {timeout} seconds",
+                    "returncode": -1,
+                }
 
             return {
                 "stdout": stdout,
@@ -584,6 +906,26 @@ class SandboxManager:
                 f"Valid options: 'none', 'docker', 'e2b'"
             )
 
+    @staticmethod
+    async def prewarm_docker_container(project_dir: Path, config: Dict[str, Any] = None) -> bool:
+        """
+        Create a project's Docker container in advance so its first session starts instantly.
+
+        Best-effort: failures are logged and the session creates the container itself.
+
+        Args:
+            project_dir: Path to project directory
+            config: Docker sandbox configuration (same as create_sandbox)
+
+        Returns:
+            True if a container was prewarmed
+        """
+        try:
+            return await DockerSandbox(project_dir, config).prewarm()
+        except Exception as e:
+            logger.warning(f"Failed to prewarm Docker container for {project_dir.name}: {e}")
+            return False
+
     @staticmethod
     def stop_docker_container(project_name: str) -> bool:
         """
@@ -599,23 +941,9 @@ class SandboxManager:
             Exception: If Docker operation fails
         """
         import docker
-        import subprocess
-        import json
 
         try:
-            # Detect Docker socket path from docker context
-            result = subprocess.run(['docker', 'context', 'inspect'],
-                                  capture_output=True, text=True, timeout=5)
-
-            if result.returncode == 0:
-                context = json.loads(result.stdout)[0]
-                socket_path = context['Endpoints']['docker']['Host']
-                logger.debug(f"Using Docker socket: {socket_path}")
-                client = docker.DockerClient(base_url=socket_path)
-            else:
-                # Fallback to from_env()
-                logger.debug("Using Docker from environment")
-                client = docker.from_env()
+            client = get_docker_client()
 
             # Generate container name (same format as DockerSandbox.start())
             container_name = f"yokeflow-{project_name}"
@@ -656,23 +984,9 @@ class SandboxManager:
             Exception: If Docker operation fails
         """
         import docker
-        import subprocess
-        import json
 
         try:
-            # Detect Docker socket path from docker context
-            result = subprocess.run(['docker', 'context', 'inspect'],
-                                  capture_output=True, text=True, timeout=5)
-
-            if result.returncode == 0:
-                context = json.loads(result.stdout)[0]
-                socket_path = context['Endpoints']['docker']['Host']
-                logger.debug(f"Using Docker socket: {socket_path}")
-                client = docker.DockerClient(base_url=socket_path)
-            else:
-                # Fallback to from_env()
-                logger.debug("Using Docker from environment")
-                client = docker.from_env()
+            client = get_docker_client()
 
             # Generate container name (same format as DockerSandbox.start())
             container_name = f"yokeflow-{project_name}"
@@ -710,20 +1024,9 @@ class SandboxManager:
             Dict with container info (name, status, ports) or None if container doesn't exist
         """
         import docker
-        import subprocess
-        import json
 
         try:
-            # Detect Docker socket path from docker context
-            result = subprocess.run(['docker', 'context', 'inspect'],
-                                  capture_output=True, text=True, timeout=5)
-
-            if result.returncode == 0:
-                context = json.loads(result.stdout)[0]
-                socket_path = context['Endpoints']['docker']['Host']
-                client = docker.DockerClient(base_url=socket_path)
-            else:
-                client = docker.from_env()
+            client = get_docker_client()
 
             # Generate container name
             container_name = f"yokeflow-{project_name}"
@@ -759,23 +1062,9 @@ class SandboxManager:
             Exception: If Docker operation fails
         """
         import docker
-        import subprocess
-        import json
 
         try:
-            # Detect Docker socket path from docker context
-            result = subprocess.run(['docker', 'context', 'inspect'],
-                                  capture_output=True, text=True, timeout=5)
-
-            if result.returncode == 0:
-                context = json.loads(result.stdout)[0]
-                socket_path = context['Endpoints']['docker']['Host']
-                logger.debug(f"Using Docker socket: {socket_path}")
-                client = docker.DockerClient(base_url=socket_path)
-            else:
-                # Fallback to from_env()
-                logger.debug("Using Docker from environment")
-                client = docker.from_env()
+            client = get_docker_client()
 
             # Generate container name (same format as DockerSandbox.start())
             container_name = f"yokeflow-{project_name}"
@@ -19,6 +19,7 @@ from uuid import UUID
 import logging
 
 from server.database.connection import DatabaseManager
+from server.utils.log_archive import logical_log_path, open_log
 
 logger = logging.getLogger(__name__)
 
@@ -190,9 +191,9 @@ class InitializationCanceller:
             True if this is an initializer session log
         """
         try:
-            # For JSONL files, check for session_type in first few lines
-            if log_file.suffix == '.jsonl':
-                with open(log_file, 'r') as f:
+            # For JSONL files (plain or compressed), check for session_type in first few lines
+            if logical_log_path(log_file).suffix == '.jsonl':
+                with open_log(log_file, 'rt') as f:
                     for _ in range(10):  # Check first 10 lines
                         line = f.readline()
                         if not line:
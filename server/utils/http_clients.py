@@ -0,0 +1,250 @@
+"""
+Shared HTTP Clients
+===================
+
+Process-wide registry of pooled httpx.AsyncClient instances for outbound
+HTTP: local LLM servers (LM Studio, llama.cpp), the Telegram and GitHub
+adapters and notification webhooks.
+
+Creating an AsyncClient per request opens a new TCP (and TLS) connection
+every time. Clients from the registry are created once per name and keep
+connections alive between requests:
+
+- Limits from the ``http`` config section (max_connections,
+  max_keepalive_connections, keepalive_expiry), with per-host overrides in
+  http.host_limits (these only apply to clients created with a base_url;
+  the "webhooks" client posts to arbitrary URLs and uses the defaults)
+- Optional HTTP/2 (http.http2, needs the ``h2`` package)
+- Request and error counts plus connection pool usage per client
+  (get_stats(), reported by /api/health)
+
+Timeouts are per client and can be overridden per request.
+
+Usage:
+    client = get_http_client("llm:http://localhost:1234/v1", base_url="http://localhost:1234/v1")
+    response = await client.post("/chat/completions", json=payload, timeout=300.0)
+
+    await close_http_clients()  # On shutdown
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@dataclass
+class _Entry:
+    client: httpx.AsyncClient
+    loop: Optional[asyncio.AbstractEventLoop]
+    host: str
+    requests: int = 0
+    errors: int = 0  # Responses with status >= 500
+
+
+class HttpClientRegistry:
+    """Creates and reuses one pooled AsyncClient per name."""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        host_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Connections per client
+            max_keepalive_connections: Idle connections kept open per client
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Negotiate HTTP/2 where the server supports it
+            host_limits: Host -> max_connections for clients with that base URL host
+                (clients without a base_url always use max_connections)
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.host_limits = dict(host_limits or {})
+        self.http2 = http2
+        if http2 and not _http2_available():
+            logger.warning("http.http2 is enabled but the h2 package is not installed (using HTTP/1.1)")
+            self.http2 = False
+
+        self._clients: Dict[str, _Entry] = {}
+        self.clients_created = 0
+
+    @classmethod
+    def from_config(cls, config) -> "HttpClientRegistry":
+        """Build a registry from Config.http."""
+        settings = config.http
+        return cls(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+            http2=settings.http2,
+            host_limits=settings.host_limits,
+        )
+
+    def _limits(self, host: str) -> httpx.Limits:
+        max_connections = self.host_limits.get(host, self.max_connections)
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(self.max_keepalive_connections, max_connections),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def get(
+        self,
+        name: str,
+        base_url: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0,
+    ) -> httpx.AsyncClient:
+        """
+        Get the pooled client for a name, creating it on first use.
+
+        The base_url, headers and timeout only apply when the client is
+        created; use a different name for different settings.
+
+        Args:
+            name: Registry key (e.g. "telegram", "llm:<base_url>")
+            base_url: Base URL for relative request paths
+            headers: Default headers
+            timeout: Default timeout in seconds
+
+        Returns:
+            Shared AsyncClient (do not close it; see close())
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        entry = self._clients.get(name)
+        if entry is not None and not entry.client.is_closed:
+            if entry.loop is None or loop is None or entry.loop is loop:
+                return entry.client
+            # Connections are bound to the event loop that opened them
+            logger.debug(f"HTTP client {name} was created on another event loop, replacing it")
+            self._discard(name, entry)
+
+        host = urlsplit(base_url).hostname or ""
+        entry = _Entry(client=None, loop=loop, host=host)  # type: ignore[arg-type]
+
+        async def count(response: httpx.Response) -> None:
+            entry.requests += 1
+            if response.status_code >= 500:
+                entry.errors += 1
+
+        entry.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=self._limits(host),
+            http2=self.http2,
+            event_hooks={"response": [count]},
+        )
+        self._clients[name] = entry
+        self.clients_created += 1
+        return entry.client
+
+    @staticmethod
+    def _discard(name: str, entry: _Entry) -> None:
+        """Close a replaced client on the event loop that owns its connections."""
+        owner = entry.loop
+        if owner is None or owner.is_closed():
+            # The loop is gone and took its connections with it
+            return
+
+        def log_failure(future) -> None:
+            if not future.cancelled() and future.exception() is not None:
+                logger.debug(f"Failed to close replaced HTTP client {name}: {future.exception()}")
+
+        asyncio.run_coroutine_threadsafe(entry.client.aclose(), owner).add_done_callback(log_failure)
+
+    async def close(self, name: str) -> None:
+        """Close one client (the next get() creates a new one)."""
+        entry = self._clients.pop(name, None)
+        if entry is not None and not entry.client.is_closed:
+            await entry.client.aclose()
+
+    async def close_all(self) -> None:
+        """Close every client."""
+        for name in list(self._clients):
+            try:
+                await self.close(name)
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP client {name}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        clients = {}
+        for name, entry in self._clients.items():
+            clients[name] = {
+                "host": entry.host or None,
+                "requests": entry.requests,
+                "errors": entry.errors,
+                **_pool_stats(entry.client),
+            }
+        return {
+            "clients": len(self._clients),
+            "clients_created": self.clients_created,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "pools": clients,
+        }
+
+
+def _pool_stats(client: httpx.AsyncClient) -> Dict[str, int]:
+    """Open/idle connections of a client's pool (empty if the transport doesn't expose them)."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return {}
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {"connections": len(connections), "idle": idle, "in_use": len(connections) - idle}
+
+
+_registry: Optional[HttpClientRegistry] = None
+
+
+def get_http_registry() -> HttpClientRegistry:
+    """The process-wide registry (created from the default config on first use)."""
+    global _registry
+    if _registry is None:
+        from server.utils.config import Config
+        _registry = HttpClientRegistry.from_config(Config.load_default())
+    return _registry
+
+
+def get_http_client(
+    name: str,
+    base_url: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 30.0,
+) -> httpx.AsyncClient:
+    """Shortcut for get_http_registry().get(...)."""
+    return get_http_registry().get(name, base_url=base_url, headers=headers, timeout=timeout)
+
+
+async def close_http_clients() -> None:
+    """Close all pooled clients (call on shutdown)."""
+    if _registry is not None:
+        await _registry.close_all()
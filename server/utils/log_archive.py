@@ -0,0 +1,285 @@
+"""
+Session Log Archive
+===================
+
+Compresses finished session logs and lets every reader open them transparently.
+
+A finished ``session_NNN_TIMESTAMP.jsonl`` / ``.txt`` is replaced by
+``<name>.gz``. The file is written as a sequence of independent gzip members
+("frames") of about FRAME_BYTES of whole lines each - still a standard gzip
+file for ``zcat``/``gzip.open`` - plus a ``<name>.frames`` sidecar mapping
+each frame's compressed offset to its uncompressed offset. Seeking to an
+uncompressed offset (as the log offset index does) decompresses at most one
+frame instead of the whole file.
+
+Readers should use the helpers here with the *logical* (uncompressed) path:
+``resolve_log_path``, ``glob_logs``, ``open_log``, ``read_log_text`` and
+``open_log_seekable``. Plain files win if both exist, which keeps readers
+correct while a log is being compressed.
+"""
+
+import bisect
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+from server.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+COMPRESSED_SUFFIX = ".gz"
+FRAMES_SUFFIX = ".frames"
+FRAME_BYTES = 1024 * 1024  # Uncompressed bytes per gzip member
+COMPRESS_LEVEL = 6
+
+
+def compressed_path_for(path: Path) -> Path:
+    """Compressed file for a logical log path (``x.jsonl`` -> ``x.jsonl.gz``)."""
+    return Path(str(path) + COMPRESSED_SUFFIX)
+
+
+def frames_path_for(path: Path) -> Path:
+    """Frame table sidecar for a logical log path (``x.jsonl`` -> ``x.jsonl.frames``)."""
+    return Path(str(path) + FRAMES_SUFFIX)
+
+
+def logical_log_path(path: Path) -> Path:
+    """Logical (uncompressed) path for a plain or compressed log file."""
+    path = Path(path)
+    if path.name.endswith(COMPRESSED_SUFFIX):
+        return path.with_name(path.name[:-len(COMPRESSED_SUFFIX)])
+    return path
+
+
+def resolve_log_path(path: Path) -> Optional[Path]:
+    """
+    Find the file that holds a log.
+
+    Args:
+        path: Logical or compressed log path
+
+    Returns:
+        The plain file if it exists, else the compressed one, else None
+    """
+    path = logical_log_path(path)
+    if path.exists():
+        return path
+    compressed = compressed_path_for(path)
+    if compressed.exists():
+        return compressed
+    return None
+
+
+def glob_logs(logs_dir: Path, pattern: str) -> List[Path]:
+    """
+    Glob plain and compressed logs, returning sorted logical paths.
+
+    Args:
+        logs_dir: Directory to search
+        pattern: Glob for the logical name, e.g. ``session_001_*.jsonl``
+    """
+    logs_dir = Path(logs_dir)
+    found = set(logs_dir.glob(pattern))
+    found.update(logical_log_path(p) for p in logs_dir.glob(pattern + COMPRESSED_SUFFIX))
+    return sorted(found)
+
+
+def open_log(path: Path, mode: str = "rt") -> IO:
+    """
+    Open a log for sequential reading, decompressing if needed.
+
+    Args:
+        path: Logical or compressed log path
+        mode: "rt" (text, UTF-8) or "rb"
+
+    Raises:
+        FileNotFoundError: If neither the plain nor the compressed file exists
+    """
+    resolved = resolve_log_path(path)
+    if resolved is None:
+        raise FileNotFoundError(f"Log not found: {path}")
+    encoding = "utf-8" if "b" not in mode else None
+    if resolved.name.endswith(COMPRESSED_SUFFIX):
+        return gzip.open(resolved, mode, encoding=encoding)
+    return open(resolved, mode, encoding=encoding)
+
+
+def read_log_text(path: Path) -> str:
+    """Read a whole log as text, decompressing if needed."""
+    with open_log(path, "rt") as f:
+        return f.read()
+
+
+class FramedGzipReader:
+    """
+    Random-access reader for a framed gzip log.
+
+    Supports the subset of the binary file API the log readers use:
+    seek() to an uncompressed offset, read(), readline() and line iteration.
+    """
+
+    def __init__(self, path: Path, frames: List[Tuple[int, int]], size: int):
+        self._raw = open(path, "rb")
+        self._compressed_offsets = [c for c, _ in frames]
+        self._uncompressed_offsets = [u for _, u in frames]
+        self.size = size
+        self._stream: Optional[gzip.GzipFile] = None
+        self._pos = 0
+        self._restart(0)
+
+    def _frame_of(self, offset: int) -> int:
+        return max(bisect.bisect_right(self._uncompressed_offsets, offset) - 1, 0)
+
+    def _restart(self, frame: int) -> None:
+        self._raw.seek(self._compressed_offsets[frame])
+        # GzipFile reads on into the following members as needed
+        self._stream = gzip.GzipFile(fileobj=self._raw, mode="rb")
+        self._pos = self._uncompressed_offsets[frame]
+
+    def seek(self, offset: int) -> int:
+        """Seek to an uncompressed offset."""
+        frame = self._frame_of(offset)
+        # Forward seeks within the current frame skip ahead instead of restarting it
+        if not (self._pos <= offset and frame == self._frame_of(self._pos)):
+            self._restart(frame)
+        while self._pos < offset:
+            chunk = self._stream.read(min(offset - self._pos, 1024 * 1024))
+            if not chunk:
+                break
+            self._pos += len(chunk)
+        return offset
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self._pos += len(data)
+        return data
+
+    def readline(self) -> bytes:
+        line = self._stream.readline()
+        self._pos += len(line)
+        return line
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.readline, b"")
+
+    def close(self) -> None:
+        self._raw.close()
+
+    def __enter__(self) -> "FramedGzipReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _load_frames(path: Path) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """Frame table and uncompressed size for a logical log path (single frame if no sidecar)."""
+    try:
+        data = json.loads(frames_path_for(path).read_text())
+        return [tuple(frame) for frame in data["frames"]], data["size"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return [(0, 0)], None
+
+
+def open_log_seekable(path: Path) -> Tuple[Union[IO[bytes], FramedGzipReader], int]:
+    """
+    Open a log for random access by uncompressed byte offset.
+
+    Args:
+        path: Logical or compressed log path
+
+    Returns:
+        (binary file-like object, uncompressed size)
+
+    Raises:
+        FileNotFoundError: If the log does not exist
+    """
+    resolved = resolve_log_path(path)
+    if resolved is None:
+        raise FileNotFoundError(f"Log not found: {path}")
+    if not resolved.name.endswith(COMPRESSED_SUFFIX):
+        return open(resolved, "rb"), resolved.stat().st_size
+
+    logical = logical_log_path(resolved)
+    frames, size = _load_frames(logical)
+    if size is None:
+        # Compressed without a frame table (e.g. by hand): one decompression to size it
+        with gzip.open(resolved, "rb") as f:
+            size = sum(len(chunk) for chunk in iter(lambda: f.read(1024 * 1024), b""))
+    return FramedGzipReader(resolved, frames, size), size
+
+
+def compress_log(path: Path, frame_bytes: int = FRAME_BYTES) -> Optional[Path]:
+    """
+    Replace a plain log with its framed gzip version.
+
+    The compressed file and frame table are fully written before the plain
+    file is removed, so concurrent readers always find a complete log.
+
+    Args:
+        path: Plain log file
+        frame_bytes: Uncompressed bytes per frame (frames end on line boundaries)
+
+    Returns:
+        Path of the compressed file, or None if there was nothing to compress
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    compressed = compressed_path_for(path)
+    tmp = compressed.with_name(compressed.name + ".tmp")
+    frames: List[Tuple[int, int]] = []
+    uncompressed_offset = 0
+
+    with open(path, "rb") as src, open(tmp, "wb") as dst:
+        buffer: List[bytes] = []
+        buffered = 0
+
+        def write_frame() -> None:
+            nonlocal buffered, uncompressed_offset
+            frames.append((dst.tell(), uncompressed_offset))
+            data = b"".join(buffer)
+            dst.write(gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+            uncompressed_offset += len(data)
+            buffer.clear()
+            buffered = 0
+
+        for line in src:
+            buffer.append(line)
+            buffered += len(line)
+            if buffered >= frame_bytes:
+                write_frame()
+        if buffer or not frames:
+            write_frame()
+
+        dst.flush()
+        os.fsync(dst.fileno())
+
+    tmp.replace(compressed)
+    frames_path_for(path).write_text(json.dumps({"frames": frames, "size": uncompressed_offset}))
+    path.unlink()
+    return compressed
+
+
+def archive_session_logs(*paths: Path) -> List[Path]:
+    """
+    Compress finished session logs (best-effort).
+
+    Args:
+        paths: Plain log files (e.g. SessionLogger.jsonl_file and txt_file)
+
+    Returns:
+        Compressed files that were written
+    """
+    written = []
+    for path in paths:
+        try:
+            compressed = compress_log(path)
+            if compressed:
+                written.append(compressed)
+        except Exception as e:
+            logger.warning(f"Failed to compress session log {path}: {e}")
+    return written
@@ -0,0 +1,238 @@
+"""
+Session Log Index
+=================
+
+Sidecar offset index for session JSONL logs, so log APIs can seek instead of
+reading from the start of multi-megabyte files.
+
+For ``session_NNN_TIMESTAMP.jsonl`` the index is ``session_NNN_TIMESTAMP.idx``
+with one fixed-width ASCII record per JSONL line:
+
+    <byte offset: 16 hex> <epoch timestamp: 17 chars> <event type: 24 chars>\\n
+
+Record N therefore lives at byte N * RECORD_SIZE, which makes "line N" a
+single seek. Event types and timestamps let readers filter without parsing the
+JSON; timestamps only increase, so time ranges are found by binary search.
+
+SessionLogger writes the index as it logs. Logs from before the index existed
+get one built on first read (see SessionLogIndex.ensure). Offsets are always
+into the uncompressed log, so the index keeps working after the log is
+compressed (see server.utils.log_archive).
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Tuple
+
+from server.utils.log_archive import logical_log_path, open_log, open_log_seekable, resolve_log_path
+
+INDEX_SUFFIX = ".idx"
+EVENT_WIDTH = 24
+RECORD_SIZE = 16 + 1 + 17 + 1 + EVENT_WIDTH + 1
+
+
+def index_path_for(jsonl_path: Path) -> Path:
+    """Sidecar index path for a JSONL log (plain or compressed)."""
+    return logical_log_path(Path(jsonl_path)).with_suffix(INDEX_SUFFIX)
+
+
+def format_index_record(offset: int, timestamp: float, event: str) -> str:
+    """
+    Format one fixed-width index record.
+
+    Args:
+        offset: Byte offset of the line in the JSONL file
+        timestamp: Event time (epoch seconds)
+        event: Event type (truncated/padded to EVENT_WIDTH ASCII chars)
+
+    Returns:
+        Record string of exactly RECORD_SIZE characters
+    """
+    event_field = (event or "").encode("ascii", "replace").decode()[:EVENT_WIDTH]
+    return f"{offset:016x} {timestamp:017.6f} {event_field:<{EVENT_WIDTH}}\n"
+
+
+def parse_index_record(record: str) -> Tuple[int, float, str]:
+    """Parse a record from format_index_record() into (offset, timestamp, event)."""
+    return int(record[0:16], 16), float(record[17:34]), record[35:35 + EVENT_WIDTH].rstrip()
+
+
+def event_timestamp(data: dict) -> float:
+    """Epoch timestamp of a log event (its ISO 'timestamp' field, 0.0 if missing)."""
+    try:
+        return datetime.fromisoformat(data["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+class SessionLogIndex:
+    """Reads a JSONL session log through its sidecar index."""
+
+    def __init__(self, jsonl_path: Path):
+        self.jsonl_path = logical_log_path(Path(jsonl_path))
+        self.index_path = index_path_for(self.jsonl_path)
+
+    @classmethod
+    def ensure(cls, jsonl_path: Path) -> "SessionLogIndex":
+        """
+        Open the index for a log, building it first if it does not exist.
+
+        Args:
+            jsonl_path: JSONL session log
+
+        Returns:
+            SessionLogIndex
+        """
+        index = cls(jsonl_path)
+        if not index.index_path.exists() and resolve_log_path(index.jsonl_path):
+            index.build()
+        return index
+
+    def build(self) -> int:
+        """
+        (Re)build the index by scanning the JSONL file once.
+
+        Returns:
+            Number of indexed lines
+        """
+        count = 0
+        tmp_path = self.index_path.with_suffix(INDEX_SUFFIX + ".tmp")
+        with open_log(self.jsonl_path, "rb") as log, open(tmp_path, "w", encoding="ascii") as out:
+            offset = 0
+            for raw in log:
+                if not raw.endswith(b"\n"):
+                    break  # Partial last line; indexed once complete
+                event, timestamp = _event_fields(raw)
+                out.write(format_index_record(offset, timestamp, event))
+                offset += len(raw)
+                count += 1
+        tmp_path.replace(self.index_path)
+        return count
+
+    def __len__(self) -> int:
+        """Number of complete index records."""
+        try:
+            return self.index_path.stat().st_size // RECORD_SIZE
+        except FileNotFoundError:
+            return 0
+
+    def record(self, line: int) -> Tuple[int, float, str]:
+        """Index record (offset, timestamp, event) for a line number."""
+        with open(self.index_path, "r", encoding="ascii") as f:
+            f.seek(line * RECORD_SIZE)
+            return parse_index_record(f.read(RECORD_SIZE))
+
+    def first_line_at(self, since: float) -> int:
+        """Binary search for the first line with timestamp >= since."""
+        lo, hi = 0, len(self)
+        with open(self.index_path, "r", encoding="ascii") as f:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                f.seek(mid * RECORD_SIZE)
+                if parse_index_record(f.read(RECORD_SIZE))[1] < since:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        return lo
+
+    def iter_lines(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        events: Optional[Sequence[str]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (line number, raw JSON line) for matching log lines.
+
+        Lines past the end of the index (log still being written, or index
+        behind after a crash) are read sequentially and filtered by parsing.
+
+        Args:
+            offset: First line number to consider
+            limit: Maximum number of lines to yield
+            events: Only these event types
+            since: Only events at or after this epoch timestamp
+            until: Only events at or before this epoch timestamp
+        """
+        if limit is not None and limit <= 0:
+            return
+        event_set = set(events) if events else None
+
+        def matches(event: str, timestamp: float) -> bool:
+            return (event_set is None or event in event_set) and (since is None or timestamp >= since)
+
+        indexed = len(self)
+        start = offset
+        if since is not None and indexed:
+            start = max(start, self.first_line_at(since))
+
+        yielded = 0
+        log, log_size = open_log_seekable(self.jsonl_path)
+        with log:
+
+            if start < indexed:
+                with open(self.index_path, "r", encoding="ascii") as idx:
+                    idx.seek(start * RECORD_SIZE)
+                    for line in range(start, indexed):
+                        line_offset, timestamp, event = parse_index_record(idx.read(RECORD_SIZE))
+                        if line_offset >= log_size:
+                            # Index flushed ahead of the log
+                            indexed = line
+                            break
+                        if until is not None and timestamp > until:
+                            return
+                        if matches(event, timestamp):
+                            log.seek(line_offset)
+                            raw = log.readline()
+                            if not raw.endswith(b"\n"):
+                                return  # Line still being written
+                            yield line, raw.decode("utf-8", "replace").rstrip("\n")
+                            yielded += 1
+                            if limit is not None and yielded >= limit:
+                                return
+
+            # Unindexed tail
+            for line, raw in self._tail(log, indexed):
+                if line < start:
+                    continue
+                event, timestamp = _event_fields(raw)
+                if until is not None and timestamp > until:
+                    return
+                if matches(event, timestamp):
+                    yield line, raw.decode("utf-8", "replace").rstrip("\n")
+                    yielded += 1
+                    if limit is not None and yielded >= limit:
+                        return
+
+    def total_lines(self) -> int:
+        """Number of complete lines in the log (indexed plus unindexed tail)."""
+        indexed = len(self)
+        log, _ = open_log_seekable(self.jsonl_path)
+        with log:
+            return indexed + sum(1 for _ in self._tail(log, indexed))
+
+    def _tail(self, log, indexed: int) -> Iterator[Tuple[int, bytes]]:
+        """Complete lines after the first `indexed` lines, with their line numbers."""
+        if indexed:
+            log.seek(self.record(indexed - 1)[0])
+            log.readline()
+        else:
+            log.seek(0)
+        line = indexed
+        for raw in log:
+            if not raw.endswith(b"\n"):
+                break  # Partial line still being written
+            yield line, raw
+            line += 1
+
+
+def _event_fields(raw: bytes) -> Tuple[str, float]:
+    """Event type and timestamp of a raw JSONL line."""
+    try:
+        data = json.loads(raw)
+        return str(data.get("event", "")), event_timestamp(data)
+    except (ValueError, AttributeError):
+        return "", 0.0
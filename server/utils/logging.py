@@ -212,11 +212,20 @@ class PerformanceLogger:
     Usage:
         with PerformanceLogger("database_query", {"query_type": "select"}):
             result = await db.fetch(...)
+
+        # For durations measured elsewhere (e.g. asyncpg's query logger)
+        PerformanceLogger.record("db_query", elapsed_ms, {"query": sql})
     """
 
-    def __init__(self, operation: str, context: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        operation: str,
+        context: Optional[Dict[str, Any]] = None,
+        slow_threshold_ms: float = 1000.0
+    ):
         self.operation = operation
         self.context = context or {}
+        self.slow_threshold_ms = slow_threshold_ms
         self.start_time = 0.0
         self.logger = logging.getLogger(f"performance.{operation}")
 
@@ -226,27 +235,51 @@ class PerformanceLogger:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         duration_ms = (time.time() - self.start_time) * 1000
+        self.record(
+            self.operation, duration_ms, self.context,
+            error=exc_val if exc_type else None,
+            slow_threshold_ms=self.slow_threshold_ms
+        )
 
+    @staticmethod
+    def record(
+        operation: str,
+        duration_ms: float,
+        context: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+        slow_threshold_ms: float = 1000.0
+    ) -> None:
+        """
+        Log a completed operation.
+
+        Args:
+            operation: Operation name (logger "performance.<operation>")
+            duration_ms: How long it took
+            context: Extra structured fields
+            error: Exception the operation failed with, if any
+            slow_threshold_ms: Warn at or above this duration
+        """
+        perf_logger = logging.getLogger(f"performance.{operation}")
         log_extra = {
-            "operation": self.operation,
+            "operation": operation,
             "duration_ms": round(duration_ms, 2),
-            **self.context
+            **(context or {})
         }
 
-        if exc_type:
-            log_extra["error"] = str(exc_val)
-            self.logger.error(
-                f"{self.operation} failed after {duration_ms:.2f}ms",
+        if error is not None:
+            log_extra["error"] = str(error)
+            perf_logger.error(
+                f"{operation} failed after {duration_ms:.2f}ms",
                 extra=log_extra
             )
-        elif duration_ms > 1000:  # Warn if > 1 second
-            self.logger.warning(
-                f"{self.operation} took {duration_ms:.2f}ms",
+        elif duration_ms >= slow_threshold_ms:
+            perf_logger.warning(
+                f"{operation} took {duration_ms:.2f}ms",
                 extra=log_extra
             )
         else:
-            self.logger.debug(
-                f"{self.operation} completed in {duration_ms:.2f}ms",
+            perf_logger.debug(
+                f"{operation} completed in {duration_ms:.2f}ms",
                 extra=log_extra
             )
 
@@ -6,7 +6,6 @@ Supports webhook, email, and SMS notifications for interventions.
 """
 
 import asyncio
-import aiohttp
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -15,6 +14,8 @@ from datetime import datetime
 import json
 import os
 
+from server.utils.http_clients import get_http_client
+
 
 class MultiChannelNotificationService:
     """Enhanced notification service with multiple channel support."""
@@ -170,13 +171,8 @@ class MultiChannelNotificationService:
             }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    return response.status in [200, 201, 204]
+            response = await get_http_client("webhooks").post(url, json=payload, timeout=10.0)
+            return response.status_code in [200, 201, 204]
         except Exception as e:
             print(f"Webhook notification failed: {e}")
             return False
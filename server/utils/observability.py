@@ -19,11 +19,153 @@ Each session gets its own log files for easy debugging and analysis.
 import os
 import json
 import time
+import atexit
+import threading
+import weakref
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List, IO
 
 from server.utils.metrics_collector import MetricsCollector
+from server.utils.log_index import event_timestamp, format_index_record, index_path_for
+
+
+# Buffered log writer tuning
+LOG_FLUSH_INTERVAL = 0.5            # seconds between background flushes
+LOG_FLUSH_BYTES = 64 * 1024         # wake the writer early once this much is buffered
+LOG_MAX_BUFFER_BYTES = 1024 * 1024  # flush inline (backpressure) beyond this
+LOG_WRITER_IDLE_ROUNDS = 120        # background thread exits after this many empty flushes
+
+
+class BufferedLogWriter:
+    """
+    Append-only writer for a session's log files.
+
+    Writes go to an in-memory buffer and are drained to long-lived file
+    handles by a background thread, every LOG_FLUSH_INTERVAL seconds or as
+    soon as LOG_FLUSH_BYTES are pending. If the buffer grows past
+    LOG_MAX_BUFFER_BYTES the caller flushes inline, so memory stays bounded.
+
+    Locks are re-entrant because SessionManager's signal handler can call
+    flush() on the main thread while it is inside write().
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        flush_bytes: int = LOG_FLUSH_BYTES,
+        max_buffer_bytes: int = LOG_MAX_BUFFER_BYTES
+    ):
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.max_buffer_bytes = max_buffer_bytes
+
+        self._buffer_lock = threading.RLock()  # guards _buffers/_pending_bytes
+        self._io_lock = threading.RLock()      # serializes flushes, keeps write order
+        self._buffers: Dict[Path, List[str]] = {}
+        self._pending_bytes = 0
+        self._handles: Dict[Path, IO[str]] = {}
+
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        _open_writers.add(self)
+
+    def write(self, path: Path, text: str) -> None:
+        """Buffer text to be appended to a file."""
+        with self._buffer_lock:
+            self._buffers.setdefault(path, []).append(text)
+            self._pending_bytes += len(text)
+            pending = self._pending_bytes
+            if self._thread is None or not self._thread.is_alive():
+                self._start_thread()
+
+        if pending >= self.max_buffer_bytes:
+            # Writer fell behind - apply backpressure
+            self.flush()
+        elif pending >= self.flush_bytes:
+            self._wakeup.set()
+
+    def flush(self, durable: bool = False) -> None:
+        """
+        Write all buffered text to the files.
+
+        Args:
+            durable: Also fsync the files so the data survives a crash
+        """
+        with self._io_lock:
+            with self._buffer_lock:
+                buffers, self._buffers = self._buffers, {}
+                self._pending_bytes = 0
+
+            for path, chunks in buffers.items():
+                handle = self._handles.get(path)
+                if handle is None:
+                    handle = self._handles[path] = open(path, "a", encoding="utf-8")
+                handle.write("".join(chunks))
+
+            for handle in self._handles.values():
+                handle.flush()
+                if durable:
+                    os.fsync(handle.fileno())
+
+    def close(self) -> None:
+        """Flush durably, stop the background thread and close the files."""
+        with self._buffer_lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        self._wakeup.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.flush_interval * 4)
+
+        with self._io_lock:
+            self.flush(durable=True)
+            for handle in self._handles.values():
+                handle.close()
+            self._handles = {}
+
+    def _start_thread(self) -> None:
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="session-log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        idle_rounds = 0
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopping:
+                break
+
+            with self._buffer_lock:
+                idle = not self._buffers
+                if idle and idle_rounds >= LOG_WRITER_IDLE_ROUNDS:
+                    # Nothing logged for a while (e.g. session cancelled without
+                    # finalize): exit, write() starts a new thread when needed
+                    if self._thread is threading.current_thread():
+                        self._thread = None
+                    return
+            idle_rounds = idle_rounds + 1 if idle else 0
+
+            try:
+                self.flush()
+            except Exception:
+                # Keep buffering; the next flush (or close) retries
+                pass
+
+
+# Writers still holding buffered data at interpreter exit are flushed by atexit
+_open_writers: "weakref.WeakSet[BufferedLogWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_writers() -> None:
+    for writer in list(_open_writers):
+        try:
+            writer.flush(durable=True)
+        except Exception:
+            pass
 
 
 def format_duration(seconds: float) -> str:
@@ -79,6 +221,9 @@ class SessionLogger:
 
         self.jsonl_file = self.log_dir / f"{base_name}.jsonl"
         self.txt_file = self.log_dir / f"{base_name}.txt"
+        # Sidecar offset index for seeking/filtering the JSONL log (see log_index)
+        self.index_file = index_path_for(self.jsonl_file)
+        self._jsonl_offset = 0
 
         self.session_number = session_number
         self.session_type = session_type
@@ -106,6 +251,9 @@ class SessionLogger:
         # Track tool execution times for long-running detection
         self.tool_start_times = {}  # tool_use_id -> timestamp
 
+        # Buffered writes to long-lived handles (see BufferedLogWriter)
+        self._writer = BufferedLogWriter()
+
         # Initialize files
         self._init_files()
 
@@ -124,28 +272,47 @@ class SessionLogger:
         self._write_jsonl(session_data)
 
         # TXT: Write human-readable header
-        with open(self.txt_file, "w") as f:
-            f.write("=" * 80 + "\n")
-            f.write(f"AUTONOMOUS CODING AGENT - SESSION {self.session_number}\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Session Type: {self.session_type.upper()}\n")
-            if self.model:
-                f.write(f"Model: {self.model}\n")
-            if self.prompt_file:
-                f.write(f"Prompt File: {self.prompt_file}\n")
-            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
+        header = "=" * 80 + "\n"
+        header += f"AUTONOMOUS CODING AGENT - SESSION {self.session_number}\n"
+        header += "=" * 80 + "\n"
+        header += f"Session Type: {self.session_type.upper()}\n"
+        if self.model:
+            header += f"Model: {self.model}\n"
+        if self.prompt_file:
+            header += f"Prompt File: {self.prompt_file}\n"
+        header += f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        header += "=" * 80 + "\n\n"
+        self._write_txt(header)
+
+        # Session start is visible on disk right away
+        self._writer.flush()
 
     def _write_jsonl(self, data: dict):
-        """Write a line to the JSONL log file."""
-        with open(self.jsonl_file, "a") as f:
-            json.dump(data, f)
-            f.write("\n")
+        """Write a line to the JSONL log file and its index record."""
+        line = json.dumps(data) + "\n"
+        self._writer.write(self.jsonl_file, line)
+        self._writer.write(
+            self.index_file,
+            format_index_record(self._jsonl_offset, event_timestamp(data), data.get("event", ""))
+        )
+        self._jsonl_offset += len(line.encode("utf-8"))
 
     def _write_txt(self, text: str):
         """Write text to the human-readable log file."""
-        with open(self.txt_file, "a") as f:
-            f.write(text)
+        self._writer.write(self.txt_file, text)
+
+    def flush(self, durable: bool = True):
+        """
+        Write buffered log lines to disk.
+
+        Args:
+            durable: Also fsync the log files (default True)
+        """
+        self._writer.flush(durable=durable)
+
+    def close(self):
+        """Flush durably and release the log file handles."""
+        self._writer.close()
 
     def _emit_event(self, event_type: str, data: dict):
         """
@@ -357,6 +524,23 @@ class SessionLogger:
         self._write_txt(f"[System: {subtype}]\n")
         self._write_txt(message + "\n\n")
 
+    def log_sandbox_output(self, stream: str, text: str):
+        """
+        Log a chunk of output from a sandbox command as it streams in.
+
+        Args:
+            stream: "stdout" or "stderr"
+            text: Output chunk (may contain partial lines)
+        """
+        self._write_jsonl({
+            "event": "sandbox_output",
+            "timestamp": datetime.now().isoformat(),
+            "stream": stream,
+            "text": text
+        })
+
+        self._write_txt(text)
+
     def log_error(self, error: Exception):
         """Log an error that occurred during the session."""
         self._write_jsonl({
@@ -453,6 +637,9 @@ class SessionLogger:
 
         self._write_txt("=" * 80 + "\n")
 
+        # Flush durably and release the file handles (reopened if logging continues)
+        self.close()
+
         # Note: Session summary is now stored in PostgreSQL database
         # by orchestrator.py
         return session_summary
@@ -31,6 +31,7 @@ from typing import Dict, Any, Optional, Tuple
 from uuid import UUID
 
 from server.database.connection import DatabaseManager
+from server.utils.log_archive import archive_session_logs, glob_logs
 
 
 class ProjectResetter:
@@ -131,12 +132,14 @@ class ProjectResetter:
         except Exception:
             state["git_commits"] = 0
 
-        # Count coding session logs (not session_000)
+        # Count coding session logs (not session_000). Only the primary logs
+        # count (plain or compressed), not their .idx/.frames sidecars.
         if self.logs_dir.exists():
             logs = [
                 f
-                for f in self.logs_dir.glob("session_*")
-                if f.is_file() and not f.name.startswith("session_000")
+                for pattern in ("session_*.jsonl", "session_*.txt")
+                for f in glob_logs(self.logs_dir, pattern)
+                if not f.name.startswith("session_000")
             ]
             state["coding_logs"] = len(logs)
 
@@ -370,7 +373,8 @@ class ProjectResetter:
         Archive coding session logs to logs/old_attempts/.
 
         Preserves Session 0 (initialization) log.
-        Moves all other session logs to archive with timestamp.
+        Moves all other session logs to archive with timestamp, compressing
+        any that are still uncompressed.
 
         Returns:
             Tuple of (success, error_message, archive_path)
@@ -399,6 +403,8 @@ class ProjectResetter:
             for log_file in logs_to_archive:
                 dest = archive_dir / log_file.name
                 shutil.move(str(log_file), str(dest))
+                if dest.suffix in ('.jsonl', '.txt'):
+                    archive_session_logs(dest)
 
             # Note: sessions_summary.jsonl has been removed from the codebase
             # All session metrics are now stored in PostgreSQL database
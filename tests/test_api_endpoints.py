@@ -179,6 +179,38 @@ class TestProjectEndpoints:
             assert data[0]['name'] == 'project1'
             assert data[1]['name'] == 'project2'
 
+    def test_list_projects_omits_unselected_fields(self, client):
+        """Test that fields= listings don't report defaults for fields never loaded."""
+        with patch('server.api.app.orchestrator') as mock_orchestrator:
+            mock_orchestrator.list_projects = AsyncMock(return_value=[
+                {
+                    'id': str(uuid4()),
+                    'name': 'project1',
+                    'created_at': datetime.now(),
+                    'is_initialized': True,
+                    'progress': {'epics': 3, 'tasks': 10},
+                    'next_task': None,
+                    'metadata': {}
+                }
+            ])
+
+            response = client.get("/api/projects?fields=next_task")
+            assert response.status_code == 200
+            project = response.json()[0]
+            assert 'next_task' in project
+            assert 'has_env_file' not in project
+            assert 'needs_env_config' not in project
+            assert 'active_sessions' not in project
+            mock_orchestrator.list_projects.assert_awaited_once_with(limit=None, offset=0, fields=['next_task'])
+
+    def test_list_projects_unexpected_error_returns_500(self, client):
+        """Test that orchestrator failures are logged and mapped to 500."""
+        with patch('server.api.app.orchestrator') as mock_orchestrator:
+            mock_orchestrator.list_projects = AsyncMock(side_effect=RuntimeError("db down"))
+
+            response = client.get("/api/projects")
+            assert response.status_code == 500
+
     def test_create_project(self, client):
         """Test creating a new project."""
         project_id = uuid4()
@@ -389,6 +421,37 @@ class TestSessionEndpoints:
                 assert response.status_code == 200
 
 
+class TestCancelInitializationWorkerMode:
+    """Test waiting for a session worker to stop before cancelling initialization."""
+
+    @pytest.mark.asyncio
+    async def test_waits_until_job_ends(self):
+        from server.api.app import _wait_for_session_job_end
+
+        mock_db = AsyncMock()
+        mock_db.get_active_session_job = AsyncMock(side_effect=[{'id': uuid4()}, {'id': uuid4()}, None])
+
+        with patch('server.api.app.config') as mock_config:
+            mock_config.runner.lease_ttl = 5
+            mock_config.runner.poll_interval = 0.01
+            assert await _wait_for_session_job_end(mock_db, uuid4()) is True
+
+        assert mock_db.get_active_session_job.await_count == 3
+        assert mock_db.expire_session_jobs.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_times_out_without_acknowledgement(self):
+        from server.api.app import _wait_for_session_job_end
+
+        mock_db = AsyncMock()
+        mock_db.get_active_session_job = AsyncMock(return_value={'id': uuid4()})
+
+        with patch('server.api.app.config') as mock_config:
+            mock_config.runner.lease_ttl = 0
+            mock_config.runner.poll_interval = 0.01
+            assert await _wait_for_session_job_end(mock_db, uuid4()) is False
+
+
 class TestProgressEndpoints:
     """Test progress and status endpoints."""
 
@@ -50,7 +50,8 @@ class TestCreateBrownfieldProject:
                     docker_network="bridge",
                     docker_memory_limit="2g",
                     docker_cpu_limit=2.0,
-                    docker_ports=[]
+                    docker_ports=[],
+                    docker_prewarm=False
                 ),
                 brownfield=MagicMock(
                     default_feature_branch_prefix="yokeflow/"
@@ -294,7 +295,8 @@ class TestRollbackBrownfieldChanges:
                     docker_network="bridge",
                     docker_memory_limit="2g",
                     docker_cpu_limit=2.0,
-                    docker_ports=[]
+                    docker_ports=[],
+                    docker_prewarm=False
                 ),
                 brownfield=MagicMock(
                     default_feature_branch_prefix="yokeflow/"
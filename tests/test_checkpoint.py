@@ -19,8 +19,11 @@ from datetime import datetime
 from server.agent.checkpoint import (
     CheckpointManager,
     CheckpointRecoveryManager,
+    conversation_hash,
     get_resumable_sessions,
-    get_checkpoint_recovery_history
+    get_checkpoint_recovery_history,
+    message_hash,
+    replay_checkpoint_chain
 )
 
 
@@ -574,5 +577,137 @@ class TestUtilityFunctions:
             assert result == history
 
 
+
+class FakeCheckpointStore:
+    """In-memory stand-in for the checkpoint tables."""
+
+    def __init__(self):
+        self.rows = {}
+        self.messages = {}
+
+    async def create_checkpoint(self, **kwargs):
+        checkpoint_id = uuid4()
+        self.messages.update(kwargs.get("messages") or {})
+        self.rows[checkpoint_id] = {
+            "id": checkpoint_id,
+            "checkpoint_number": len(self.rows) + 1,
+            "created_at": datetime.now(),
+            "can_resume_from": True,
+            "invalidated": False,
+            **{k: v for k, v in kwargs.items() if k != "messages"},
+        }
+        return checkpoint_id
+
+    async def get_checkpoint(self, checkpoint_id):
+        return self.rows.get(checkpoint_id)
+
+    async def get_checkpoint_chain(self, checkpoint_id):
+        chain = [self.rows[checkpoint_id]]
+        while not chain[-1]["is_keyframe"]:
+            chain.append(self.rows[chain[-1]["parent_checkpoint_id"]])
+        return list(reversed(chain))
+
+    async def get_checkpoint_messages(self, hashes):
+        return {h: self.messages[h] for h in hashes if h in self.messages}
+
+
+class TestDeltaCheckpoints:
+    """Test delta-chained, content-addressed checkpoints."""
+
+    @pytest.fixture
+    def store(self):
+        store = FakeCheckpointStore()
+        with patch('server.agent.checkpoint.DatabaseManager') as MockDB:
+            MockDB.return_value.__aenter__.return_value = store
+            yield store
+
+    @staticmethod
+    def _conversation(n):
+        return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"} for i in range(n)]
+
+    @pytest.mark.asyncio
+    async def test_only_appended_messages_are_stored(self, store):
+        manager = CheckpointManager(str(uuid4()), str(uuid4()))
+
+        first = await manager.create_checkpoint("task_completion", self._conversation(4))
+        second = await manager.create_checkpoint("task_completion", self._conversation(6))
+
+        assert store.rows[first]["is_keyframe"] is True
+        assert len(store.rows[first]["message_hashes"]) == 4
+        delta = store.rows[second]
+        assert delta["is_keyframe"] is False
+        assert delta["parent_checkpoint_id"] == first
+        assert delta["base_message_count"] == 4
+        assert len(delta["message_hashes"]) == 2
+        assert len(store.messages) == 6
+
+    @pytest.mark.asyncio
+    async def test_keyframe_interval(self, store):
+        manager = CheckpointManager(str(uuid4()), str(uuid4()), keyframe_interval=3)
+
+        ids = [await manager.create_checkpoint("task_completion", self._conversation(n)) for n in range(1, 8)]
+
+        assert [store.rows[i]["is_keyframe"] for i in ids] == [True, False, False, True, False, False, True]
+        # Keyframes list every message but only send the ones not stored yet
+        assert len(store.rows[ids[3]]["message_hashes"]) == 4
+        assert len(store.messages) == 7
+
+    @pytest.mark.asyncio
+    async def test_rewritten_history_forces_keyframe(self, store):
+        manager = CheckpointManager(str(uuid4()), str(uuid4()))
+        await manager.create_checkpoint("task_completion", self._conversation(4))
+
+        compacted = [{"role": "user", "content": "summary"}] + self._conversation(6)[4:]
+        checkpoint_id = await manager.create_checkpoint("task_completion", compacted)
+
+        assert store.rows[checkpoint_id]["is_keyframe"] is True
+        assert store.rows[checkpoint_id]["parent_checkpoint_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_tool_results_delta(self, store):
+        manager = CheckpointManager(str(uuid4()), str(uuid4()))
+        await manager.create_checkpoint("task_completion", self._conversation(1), tool_results_cache={"a": 1, "b": 2})
+
+        checkpoint_id = await manager.create_checkpoint(
+            "task_completion", self._conversation(2), tool_results_cache={"a": 1, "c": 3}
+        )
+
+        assert store.rows[checkpoint_id]["tool_results_cache"] == {"c": 3}
+        assert store.rows[checkpoint_id]["tool_results_removed"] == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_restore_replays_chain(self, store):
+        manager = CheckpointManager(str(uuid4()), str(uuid4()), keyframe_interval=4)
+        checkpoint_id = None
+        for n in range(1, 7):
+            checkpoint_id = await manager.create_checkpoint(
+                "task_completion", self._conversation(n), tool_results_cache={"last": n}
+            )
+
+        state = await CheckpointRecoveryManager().restore_from_checkpoint(str(checkpoint_id))
+
+        assert state["conversation_history"] == self._conversation(6)
+        assert state["tool_results_cache"] == {"last": 6}
+
+    def test_replay_detects_missing_messages(self):
+        hashes = [message_hash({"content": "x"})]
+        chain = [{
+            "id": uuid4(), "is_keyframe": True, "base_message_count": 0,
+            "message_hashes": hashes, "conversation_hash": conversation_hash(hashes),
+        }]
+
+        with pytest.raises(ValueError, match="missing"):
+            replay_checkpoint_chain(chain, {})
+
+    def test_replay_detects_broken_chain(self):
+        chain = [
+            {"id": uuid4(), "is_keyframe": True, "base_message_count": 0, "message_hashes": ["a"]},
+            {"id": uuid4(), "is_keyframe": False, "base_message_count": 2, "message_hashes": ["b"]},
+        ]
+
+        with pytest.raises(ValueError, match="inherited messages"):
+            replay_checkpoint_chain(chain, {"a": {}, "b": {}})
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
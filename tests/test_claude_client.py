@@ -244,6 +244,31 @@ class TestClaudeClient:
             assert "MCP task manager server not found" in str(excinfo.value)
             assert "npm install && npm run build" in str(excinfo.value)
 
+    def test_create_client_shared_mcp_server(self, setup_environment, mock_oauth_token, mock_load_dotenv, mock_claude_sdk):
+        """Test that a shared server URL replaces the stdio task-manager process."""
+        project_dir = setup_environment
+
+        create_client(
+            project_dir=project_dir,
+            model="claude-3-sonnet-20241022",
+            project_id="test-uuid",
+            docker_container="test-container",
+            epic_id=7,
+            worker_id="session-1",
+            mcp_url="http://127.0.0.1:8765/mcp"
+        )
+
+        task_manager = mock_claude_sdk.call_args.kwargs['options'].mcp_servers["task-manager"]
+        assert task_manager["type"] == "http"
+        assert task_manager["url"] == "http://127.0.0.1:8765/mcp"
+        assert task_manager["headers"] == {
+            "X-Project-Id": "test-uuid",
+            "X-Epic-Id": "7",
+            "X-Worker-Id": "session-1",
+            "X-Docker-Container": "test-container",
+        }
+        assert "command" not in task_manager
+
     def test_create_client_hooks_configured(self, setup_environment, mock_oauth_token, mock_load_dotenv, mock_claude_sdk):
         """Test that security hooks are properly configured."""
         project_dir = setup_environment
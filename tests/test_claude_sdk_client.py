@@ -59,6 +59,24 @@ class TestMCPEnvironment:
             assert "DOCKER_CONTAINER_NAME" in env
             assert env["DOCKER_CONTAINER_NAME"] == docker_container
 
+    def test_get_mcp_env_with_epic_and_worker(self):
+        """Test MCP environment scoped to an epic with task leasing."""
+        from server.client.claude import get_mcp_env
+        project_dir = Path("/test/project")
+
+        with patch.dict(os.environ, {"DATABASE_URL": "postgresql://test"}):
+            env = get_mcp_env(project_dir, project_id="p1", epic_id=4, worker_id="session-1", lease_ttl=120)
+
+            assert env["EPIC_ID"] == "4"
+            assert env["WORKER_ID"] == "session-1"
+            assert env["TASK_LEASE_TTL"] == "120"
+
+        with patch.dict(os.environ, {"DATABASE_URL": "postgresql://test"}):
+            env = get_mcp_env(project_dir, project_id="p1")
+
+            assert "EPIC_ID" not in env
+            assert "WORKER_ID" not in env
+
     def test_get_mcp_env_missing_database_url(self):
         """Test MCP environment fails without DATABASE_URL."""
         project_dir = Path("/test/project")
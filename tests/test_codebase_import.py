@@ -7,6 +7,7 @@ Tests for server/agent/codebase_import.py covering:
 - GitHub import (success mock, invalid URL)
 - Codebase analysis (languages, frameworks, tests, CI, empty dir)
 - Git branch setup
+- Pruning walker (.gitignore, excludes, LOC) and analysis cache
 """
 
 import asyncio
@@ -27,6 +28,7 @@ from server.agent.codebase_import import (
     LANGUAGE_EXTENSIONS,
     FRAMEWORK_INDICATORS,
 )
+from server.agent.codebase_scan import count_lines, is_ignored, parse_gitignore, scan_codebase
 
 
 # Path to the fixture
@@ -327,3 +329,81 @@ class TestGitBranchSetup:
         )
 
         assert branch == "yokeflow/feature-x"
+
+
+@pytest.mark.unit
+class TestCodebaseScan:
+    """Tests for the pruning codebase walker."""
+
+    def test_gitignore_rules(self):
+        """Test gitignore pattern semantics."""
+        rules = parse_gitignore(
+            "# comment\n*.log\n!keep.log\n/build\nout/\ndocs/**/*.tmp\n", base=""
+        )
+
+        assert is_ignored("debug.log", False, rules)
+        assert is_ignored("src/debug.log", False, rules)
+        assert not is_ignored("src/keep.log", False, rules)
+        assert is_ignored("build", True, rules)
+        assert not is_ignored("src/build", True, rules)  # Anchored to the root
+        assert is_ignored("src/out", True, rules)
+        assert not is_ignored("out", False, rules)  # Directory-only
+        assert is_ignored("docs/a/b/c.tmp", False, rules)
+        assert not is_ignored("docs/a/c.txt", False, rules)
+
+    def test_scan_prunes_ignored_and_excluded(self, tmp_path):
+        """Test .gitignore (including nested) and wildcard excludes are honoured."""
+        (tmp_path / ".gitignore").write_text("generated/\n*.min.js\n")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("a = 1\nb = 2\n")
+        (tmp_path / "src" / "lib.min.js").write_text("x")
+        (tmp_path / "src" / ".gitignore").write_text("local.py\n")
+        (tmp_path / "src" / "local.py").write_text("c = 3\n")
+        (tmp_path / "generated").mkdir()
+        (tmp_path / "generated" / "big.py").write_text("d = 4\n")
+        (tmp_path / "pkg.egg-info").mkdir()
+        (tmp_path / "pkg.egg-info" / "meta.py").write_text("e = 5\n")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text("f")
+
+        scan = scan_codebase(
+            tmp_path, CodebaseImporter.EXCLUDE_PATTERNS,
+            language_extensions=LANGUAGE_EXTENSIONS, loc_extensions={'.py'}
+        )
+
+        assert scan.file_count == 1
+        assert scan.language_counts == {'python': 1}
+        assert scan.loc_total == 2
+
+    def test_count_lines_without_trailing_newline(self, tmp_path):
+        """Test the last line counts even without a newline."""
+        path = tmp_path / "a.py"
+        path.write_text("one\ntwo")
+
+        assert count_lines(str(path)) == 2
+
+    @pytest.mark.asyncio
+    async def test_analysis_cached_by_commit(self, tmp_path):
+        """Test clean checkouts reuse the analysis for their commit SHA."""
+        project_dir = tmp_path / "project"
+        shutil.copytree(FIXTURE_DIR, project_dir)
+        subprocess.run(['git', 'init', '-q'], cwd=project_dir, check=True)
+        subprocess.run(['git', 'add', '.'], cwd=project_dir, check=True)
+        subprocess.run(
+            ['git', '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'init'],
+            cwd=project_dir, check=True
+        )
+        importer = CodebaseImporter(cache_dir=tmp_path / "cache")
+
+        first = await importer.analyze_codebase(project_dir)
+        with patch("server.agent.codebase_import.scan_codebase") as mock_scan:
+            second = await importer.analyze_codebase(project_dir)
+
+        mock_scan.assert_not_called()
+        assert second.to_dict() == first.to_dict()
+        assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+
+        # Uncommitted changes are not served from the cache
+        (project_dir / "extra.py").write_text("x = 1\n")
+        third = await importer.analyze_codebase(project_dir)
+        assert "python" in third.languages
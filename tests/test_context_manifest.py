@@ -0,0 +1,147 @@
+"""
+Tests for concurrent, cached context manifest summaries.
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+
+from server.generation.context_manager import ContextFile, LoadingStrategy
+from server.generation.context_manifest import ContextManifest
+from server.generation.spec_generator import truncate_summary
+
+
+class FakeSpecGenerator:
+    """SpecGenerator stand-in that records summary calls."""
+
+    summary_model = "test-haiku"
+    model = "test-sonnet"
+
+    def __init__(self, delay: float = 0.01, fail: bool = False, summary: str = None):
+        self.delay = delay
+        self.fail = fail
+        self.summary = summary
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_summary(self, content: str, max_length: int = 500, fallback: bool = True) -> str:
+        self.calls.append(content)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.fail:
+            if not fallback:
+                raise RuntimeError("API error")
+            return truncate_summary(content, max_length)
+        return self.summary or f"Summary of {content.splitlines()[0]}"
+
+
+def _context_file(project_dir, name, content):
+    path = project_dir / ".yokeflow" / "context" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return ContextFile(
+        name=name,
+        path=str(path.relative_to(project_dir)),
+        size=len(content),
+        content_hash=hashlib.sha256(content.encode()).hexdigest(),
+        file_type="documentation",
+    )
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    path = tmp_path / "project"
+    path.mkdir()
+    return path
+
+
+async def _generate(project_dir, generator, files, **kwargs):
+    kwargs.setdefault("cache_dir", project_dir.parent / "cache")
+    manifest = ContextManifest(project_dir, spec_generator=generator, **kwargs)
+    strategy = LoadingStrategy("load_all", "small context", sum(f.size for f in files), len(files))
+    return await manifest.generate_manifest(files, strategy, "test-project")
+
+
+class TestManifestSummaries:
+    """Test summary concurrency, caching and de-duplication."""
+
+    async def test_concurrency_is_bounded(self, project_dir):
+        files = [_context_file(project_dir, f"doc{i}.md", f"# Doc {i}\n") for i in range(8)]
+        generator = FakeSpecGenerator()
+
+        manifest = await _generate(project_dir, generator, files, max_concurrency=3)
+
+        assert len(generator.calls) == 8
+        assert 1 < generator.max_active <= 3
+        # Entries keep the input order
+        assert [entry["name"] for entry in manifest["files"]] == [f.name for f in files]
+        assert manifest["files"][5]["summary"] == "Summary of # Doc 5"
+
+    async def test_cache_is_shared_across_projects(self, project_dir, tmp_path):
+        first = FakeSpecGenerator()
+        await _generate(project_dir, first, [_context_file(project_dir, "a.md", "# Same\n")])
+
+        other_dir = tmp_path / "other"
+        other_dir.mkdir()
+        second = FakeSpecGenerator()
+        manifest = await _generate(
+            other_dir, second, [_context_file(other_dir, "b.md", "# Same\n")], cache_dir=tmp_path / "cache"
+        )
+
+        assert len(first.calls) == 1
+        assert second.calls == []
+        assert manifest["files"][0]["summary"] == "Summary of # Same"
+
+    async def test_identical_files_share_one_request(self, project_dir):
+        files = [_context_file(project_dir, f"copy{i}.md", "# Copy\n") for i in range(4)]
+        generator = FakeSpecGenerator()
+
+        manifest = await _generate(project_dir, generator, files)
+
+        assert len(generator.calls) == 1
+        assert {entry["summary"] for entry in manifest["files"]} == {"Summary of # Copy"}
+
+    async def test_fallback_summaries_are_not_cached(self, project_dir):
+        files = [_context_file(project_dir, "a.md", "# Doc\n")]
+        await _generate(project_dir, FakeSpecGenerator(fail=True), files)
+
+        generator = FakeSpecGenerator()
+        manifest = await _generate(project_dir, generator, files)
+
+        assert len(generator.calls) == 1
+        assert manifest["files"][0]["summary"] == "Summary of # Doc"
+
+    async def test_fallback_returns_truncated_content(self, project_dir):
+        files = [_context_file(project_dir, "a.md", "# Doc\n" + "x" * 500)]
+
+        manifest = await _generate(project_dir, FakeSpecGenerator(fail=True), files)
+
+        summary = manifest["files"][0]["summary"]
+        assert summary.endswith("...")
+        assert summary.startswith("# Doc\n")
+
+    async def test_summary_quoting_the_content_is_cached(self, project_dir):
+        files = [_context_file(project_dir, "a.md", "# Doc\nMore text\n")]
+        await _generate(project_dir, FakeSpecGenerator(summary="# Doc"), files)
+
+        generator = FakeSpecGenerator()
+        manifest = await _generate(project_dir, generator, files)
+
+        assert generator.calls == []
+        assert manifest["files"][0]["summary"] == "# Doc"
+
+    async def test_model_is_part_of_cache_key(self, project_dir):
+        files = [_context_file(project_dir, "a.md", "# Doc\n")]
+        await _generate(project_dir, FakeSpecGenerator(), files)
+
+        generator = FakeSpecGenerator()
+        generator.summary_model = "other-model"
+        await _generate(project_dir, generator, files)
+
+        assert len(generator.calls) == 1
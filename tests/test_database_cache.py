@@ -0,0 +1,206 @@
+"""
+Tests for the TaskDatabase read-through query cache.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from server.database.cache import QueryCache, ReadThroughCache
+from server.database.operations import TaskDatabase
+
+
+class TestReadThroughCache:
+    """Test TTL, invalidation and miss coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_miss(self):
+        cache = ReadThroughCache("test", ttl=60)
+        loader = AsyncMock(return_value={"name": "demo"})
+
+        first = await cache.get("k", loader)
+        second = await cache.get("k", loader)
+
+        assert first == second == {"name": "demo"}
+        loader.assert_awaited_once()
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_returns_copies(self):
+        cache = ReadThroughCache("test", ttl=60)
+        loader = AsyncMock(return_value={"tags": ["a"]})
+
+        (await cache.get("k", loader))["tags"].append("b")
+
+        assert await cache.get("k", loader) == {"tags": ["a"]}
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_reloaded(self):
+        cache = ReadThroughCache("test", ttl=0.01)
+        loader = AsyncMock(side_effect=[1, 2])
+
+        assert await cache.get("k", loader) == 1
+        await asyncio.sleep(0.02)
+        assert await cache.get("k", loader) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        cache = ReadThroughCache("test", ttl=60)
+        loader = AsyncMock(side_effect=[1, 2])
+
+        await cache.get("k", loader)
+        cache.invalidate("k")
+
+        assert await cache.get("k", loader) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        cache = ReadThroughCache("test", ttl=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(cache.get("k", loader) for _ in range(5)))
+
+        assert results == [1] * 5
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_load_racing_invalidation_is_not_stored(self):
+        cache = ReadThroughCache("test", ttl=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await release.wait()
+            return "stale"
+
+        load = asyncio.create_task(cache.get("k", slow_loader))
+        await started.wait()
+        cache.invalidate("k")  # A write committed while the read was in flight
+        release.set()
+
+        assert await load == "stale"
+        assert await cache.get("k", AsyncMock(return_value="fresh")) == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache = ReadThroughCache("test", ttl=60, max_entries=2)
+
+        for key in ("a", "b", "c"):
+            await cache.get(key, AsyncMock(return_value=key))
+
+        assert len(cache) == 2
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_caching(self):
+        cache = ReadThroughCache("test", ttl=0)
+        loader = AsyncMock(return_value=1)
+
+        await cache.get("k", loader)
+        await cache.get("k", loader)
+
+        assert loader.await_count == 2
+
+
+class TestQueryCacheNotifications:
+    """Test handling of Migration 028 NOTIFY payloads."""
+
+    @pytest.mark.asyncio
+    async def test_notification_kinds(self):
+        cache = QueryCache()
+        project_id = str(uuid4())
+        for sub in cache.caches:
+            await sub.get(project_id, AsyncMock(return_value={}))
+
+        cache.handle_notification(f"session:{project_id}")
+        assert [len(sub) for sub in cache.caches] == [1, 0, 1]
+
+        cache.handle_notification(f"progress:{project_id}")
+        assert [len(sub) for sub in cache.caches] == [1, 0, 0]
+
+        cache.handle_notification(f"project:{project_id}")
+        assert [len(sub) for sub in cache.caches] == [0, 0, 0]
+        assert cache.get_stats()["notifications_received"] == 3
+
+
+class TestTaskDatabaseCaching:
+    """Test that TaskDatabase reads through the cache and writes invalidate it."""
+
+    @staticmethod
+    def _db():
+        db = TaskDatabase("postgresql://test", query_cache=QueryCache())
+        mock_conn = AsyncMock()
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+        return db, mock_conn
+
+    @pytest.mark.asyncio
+    async def test_get_project_is_cached_until_update(self):
+        db, mock_conn = self._db()
+        project_id = uuid4()
+        mock_conn.fetchrow.return_value = {"id": project_id, "name": "demo", "metadata": None}
+
+        await db.get_project(project_id)
+        await db.get_project(project_id)
+        assert mock_conn.fetchrow.await_count == 1
+
+        await db.update_project(project_id, name="renamed")
+        await db.get_project(project_id)
+        assert mock_conn.fetchrow.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_session_writes_invalidate_active_session(self):
+        db, mock_conn = self._db()
+        project_id = uuid4()
+        mock_conn.fetchrow.return_value = None
+
+        assert await db.get_active_session(project_id) is None
+        await db.start_session(uuid4())
+        mock_conn.fetchrow.return_value = {"id": uuid4(), "status": "running"}
+
+        assert (await db.get_active_session(project_id))["status"] == "running"
+
+    @pytest.mark.asyncio
+    async def test_task_status_invalidates_progress(self):
+        db, mock_conn = self._db()
+        project_id = uuid4()
+        mock_conn.fetchrow.return_value = {"project_id": project_id, "project_name": "demo", "total_tasks": 2}
+
+        await db.get_progress(project_id)
+        await db.get_progress(project_id)
+        assert mock_conn.fetchrow.await_count == 1
+
+        await db.update_task_status(1, True)
+        await db.get_progress(project_id)
+        assert mock_conn.fetchrow.await_count == 2
+
+        stats = db.get_cache_stats()
+        assert stats["caches"]["progress"]["hits"] == 1
+        assert stats["listener_connected"] is False
+
+    @pytest.mark.asyncio
+    async def test_no_cache_without_connect(self):
+        """A pool injected without connect() (as in tests/scripts) is not cached."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = None
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        await db.get_active_session(uuid4())
+        await db.get_active_session(uuid4())
+
+        assert mock_conn.fetchrow.await_count == 2
+        assert db.get_cache_stats() is None
@@ -98,6 +98,61 @@ class TestConnectionPool:
 
             assert db.pool == mock_pool
 
+    @pytest.mark.asyncio
+    async def test_connect_uses_configured_pool_settings(self):
+        """Test that pool sizing and statement caching come from the database config."""
+        from server.utils.config import Config
+
+        mock_create = AsyncMock(return_value=AsyncMock())
+
+        with patch('asyncpg.create_pool', new=mock_create), \
+                patch('server.database.operations.Config.load_default', return_value=Config()):
+            db = TaskDatabase("postgresql://test", query_cache=MagicMock())
+            db._start_query_cache = MagicMock()
+            await db.connect()
+
+        kwargs = mock_create.call_args.kwargs
+        assert (kwargs['min_size'], kwargs['max_size']) == (2, 20)
+        assert kwargs['statement_cache_size'] == 100
+        assert kwargs['init'] == db._init_connection
+
+    @pytest.mark.asyncio
+    async def test_acquire_records_telemetry(self):
+        """Test that acquire/release feed the pool telemetry."""
+        from server.database.telemetry import PoolTelemetry
+
+        db = TaskDatabase("postgresql://test")
+        db.telemetry = PoolTelemetry(max_size=5)
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = AsyncMock()
+
+        async with db.acquire():
+            assert db.telemetry.current_in_use == 1
+
+        stats = db.telemetry.get_stats()
+        assert stats['in_use'] == 0
+        assert stats['acquire_wait_ms']['count'] == 1
+        assert stats['in_use_at_acquire']['buckets']['le_1'] == 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout_raises_pool_exhausted(self):
+        """Test that waiting past the acquire timeout raises DatabasePoolExhaustedError."""
+        import asyncio
+        from server.database.telemetry import PoolTelemetry
+        from server.utils.errors import DatabasePoolExhaustedError
+
+        db = TaskDatabase("postgresql://test")
+        db.telemetry = PoolTelemetry(max_size=5)
+        db.pool = AsyncMock()
+        db.pool.acquire.side_effect = asyncio.TimeoutError()
+
+        with pytest.raises(DatabasePoolExhaustedError):
+            async with db.acquire():
+                pass
+
+        assert db.pool.acquire.await_count == 1  # Not retried
+        assert db.telemetry.acquire_errors == 1
+
     @pytest.mark.asyncio
     async def test_disconnect_closes_pool(self):
         """Test that disconnect closes the pool."""
@@ -203,9 +258,390 @@ class TestSessionOperationsSimple:
         mock_conn.execute.assert_called_once()
 
 
+class TestProgressOperations:
+    """Tests for trigger-maintained progress counters."""
+
+    @pytest.mark.asyncio
+    async def test_get_progress_reads_summary_row(self):
+        """Test that get_progress reads project_progress and computes percentages."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        project_id = uuid4()
+        mock_conn.fetchrow.return_value = {
+            'project_id': project_id,
+            'project_name': 'demo',
+            'total_epics': 2,
+            'completed_epics': 1,
+            'total_tasks': 8,
+            'completed_tasks': 2,
+            'total_task_tests': 6,
+            'passing_task_tests': 3,
+            'total_epic_tests': 2,
+            'passing_epic_tests': 1,
+        }
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        progress = await db.get_progress(project_id)
+
+        assert "FROM project_progress" in mock_conn.fetchrow.call_args.args[0]
+        mock_conn.fetchval.assert_not_called()
+        assert progress['total_tests'] == 8
+        assert progress['passing_tests'] == 4
+        assert progress['task_completion_pct'] == 25.0
+        assert progress['test_pass_pct'] == 50.0
+
+    @pytest.mark.asyncio
+    async def test_get_progress_rebuilds_missing_row(self):
+        """Test that a missing project_progress row is rebuilt on read."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        project_id = uuid4()
+        mock_conn.fetchrow.side_effect = [None, {
+            'project_id': project_id,
+            'project_name': 'demo',
+            'total_epics': 1,
+            'completed_epics': 0,
+            'total_tasks': 0,
+            'completed_tasks': 0,
+            'total_task_tests': 0,
+            'passing_task_tests': 0,
+            'total_epic_tests': 0,
+            'passing_epic_tests': 0,
+        }]
+        mock_conn.fetchval.return_value = 1
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        progress = await db.get_progress(project_id)
+
+        mock_conn.fetchval.assert_called_once_with("SELECT rebuild_project_progress($1)", project_id)
+        assert progress['total_epics'] == 1
+        assert progress['task_completion_pct'] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_rebuild_progress_all_projects(self):
+        """Test that rebuild_progress returns the number of rebuilt rows."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        mock_conn.fetchval.return_value = 3
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        assert await db.rebuild_progress() == 3
+        mock_conn.fetchval.assert_called_once_with("SELECT rebuild_project_progress($1)", None)
+
+
+class TestProjectOverviewOperations:
+    """Tests for the batched project listing."""
+
+    @staticmethod
+    def _project_row(project_id, name, **counters):
+        row = {'id': project_id, 'name': name, 'pp_exists': True}
+        for col in ("total_epics", "completed_epics", "total_tasks", "completed_tasks",
+                    "total_task_tests", "passing_task_tests", "total_epic_tests", "passing_epic_tests"):
+            row[f"pp_{col}"] = counters.get(col, 0)
+        return row
+
+    @pytest.mark.asyncio
+    async def test_list_projects_overview_batches_queries(self):
+        """Test that next tasks, tests and sessions are fetched once for all projects."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        p1, p2 = uuid4(), uuid4()
+        mock_conn.fetch.side_effect = [
+            [self._project_row(p1, 'one', total_tasks=4, completed_tasks=1),
+             self._project_row(p2, 'two')],
+            [{'id': 7, 'project_id': p1, 'description': 'task'}],
+            [{'id': 1, 'task_id': 7, 'description': 'test'}],
+            [{'id': uuid4(), 'project_id': p2, 'status': 'running'}],
+        ]
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        projects = await db.list_projects_overview(limit=2, offset=4)
+
+        assert mock_conn.fetch.call_count == 4
+        first = mock_conn.fetch.call_args_list[0].args
+        assert "LEFT JOIN project_progress" in first[0]
+        assert first[1:] == (2, 4)
+        assert "DISTINCT ON (t.project_id)" in mock_conn.fetch.call_args_list[1].args[0]
+        assert mock_conn.fetch.call_args_list[1].args[1] == [p1, p2]
+
+        assert projects[0]['progress']['task_completion_pct'] == 25.0
+        assert 'pp_total_tasks' not in projects[0]
+        assert projects[0]['next_task']['tests'] == [{'id': 1, 'task_id': 7, 'description': 'test'}]
+        assert projects[0]['active_session'] is None
+        assert projects[1]['next_task'] is None
+        assert projects[1]['active_session']['status'] == 'running'
+
+    @pytest.mark.asyncio
+    async def test_list_projects_overview_rebuilds_missing_progress(self):
+        """Test that projects without a progress row get it rebuilt."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        project_id = uuid4()
+        row = self._project_row(project_id, 'legacy')
+        row['pp_exists'] = False
+        mock_conn.fetch.side_effect = [
+            [row],
+            [{'project_id': project_id, 'total_epics': 3, 'completed_epics': 1}],
+        ]
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        projects = await db.list_projects_overview(
+            include_next_task=False, include_active_session=False
+        )
+
+        mock_conn.fetchval.assert_called_once_with("SELECT rebuild_project_progress($1)", project_id)
+        assert projects[0]['progress']['total_epics'] == 3
+        assert 'next_task' not in projects[0]
+
+
+class TestEpicLeaseOperations:
+    """Tests for epic leasing used by parallel sessions."""
+
+    @pytest.mark.asyncio
+    async def test_claim_next_epic_returns_none_when_nothing_claimable(self):
+        """Test that claim_next_epic returns None and defaults the exclude list."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = None
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        project_id = uuid4()
+        result = await db.claim_next_epic(project_id, "worker-1")
+
+        assert result is None
+        args = mock_conn.fetchrow.call_args.args
+        assert "FOR UPDATE SKIP LOCKED" in args[0]
+        assert args[1:] == (project_id, "worker-1", [])
+
+    @pytest.mark.asyncio
+    async def test_release_epic_lease(self):
+        """Test that release_epic_lease clears the lease for the worker."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        await db.release_epic_lease(5, "worker-1")
+
+        args = mock_conn.execute.call_args.args
+        assert args[1:] == (5, "worker-1")
+
+    @pytest.mark.asyncio
+    async def test_renew_epic_lease(self):
+        """Test that renew_epic_lease refreshes only a lease held by the worker."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        mock_conn.execute.side_effect = ["UPDATE 1", "UPDATE 0"]
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        assert await db.renew_epic_lease(5, "worker-1") is True
+        assert await db.renew_epic_lease(5, "worker-2") is False
+
+        args = mock_conn.execute.call_args.args
+        assert "leased_by = $2" in args[0]
+        assert args[1:] == (5, "worker-2")
+
+
+class TestReviewJobOperations:
+    """Tests for the deep review job queue."""
+
+    @staticmethod
+    def _db(mock_conn):
+        db = TaskDatabase("postgresql://test")
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_enqueue_skips_sessions_in_flight(self):
+        """Test that jobs are inserted in one statement that ignores in-flight sessions."""
+        mock_conn = AsyncMock()
+        mock_conn.fetch.return_value = [{'id': uuid4(), 'session_number': 1}]
+        db = self._db(mock_conn)
+        project_id, s1, s2 = uuid4(), uuid4(), uuid4()
+
+        jobs = await db.enqueue_review_jobs(
+            project_id,
+            [{'id': s1, 'session_number': 1}, {'id': s2, 'session_number': 2}],
+            model="opus",
+        )
+
+        assert len(jobs) == 1
+        args = mock_conn.fetch.call_args.args
+        assert "ON CONFLICT (session_id) WHERE status IN ('queued', 'running') DO NOTHING" in args[0]
+        assert args[1:] == (project_id, [s1, s2], [1, 2], "opus", 3)
+
+    @pytest.mark.asyncio
+    async def test_claim_excludes_saturated_models(self):
+        """Test that claim_review_job leases with SKIP LOCKED and passes the excluded models."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = None
+        db = self._db(mock_conn)
+
+        assert await db.claim_review_job("worker-1", 960, exclude_models=["opus"]) is None
+
+        args = mock_conn.fetchrow.call_args.args
+        assert "FOR UPDATE SKIP LOCKED" in args[0]
+        assert args[1:] == ("worker-1", 960, ["opus"])
+
+    @pytest.mark.asyncio
+    async def test_requeue_expired_returns_count(self):
+        """Test that requeue_expired_review_jobs parses the UPDATE row count."""
+        mock_conn = AsyncMock()
+        mock_conn.execute.return_value = "UPDATE 2"
+        db = self._db(mock_conn)
+
+        assert await db.requeue_expired_review_jobs() == 2
+
+
+class TestSessionJobOperations:
+    """Tests for the session worker job queue."""
+
+    @staticmethod
+    def _db(mock_conn):
+        db = TaskDatabase("postgresql://test")
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_enqueue_returns_none_when_project_has_active_job(self):
+        """Test that a second run for a project is not queued."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = None
+        db = self._db(mock_conn)
+        project_id = uuid4()
+
+        assert await db.enqueue_session_job(project_id, "coding", {"max_iterations": 3}) is None
+
+        args = mock_conn.fetchrow.call_args.args
+        assert "ON CONFLICT (project_id) WHERE status IN ('queued', 'running') DO NOTHING" in args[0]
+        assert args[1:] == (project_id, "coding", '{"max_iterations": 3}')
+
+    @pytest.mark.asyncio
+    async def test_claim_decodes_params(self):
+        """Test that claim_session_job leases with SKIP LOCKED and decodes params."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = {'id': uuid4(), 'kind': 'initialize', 'params': '{"initializer_model": "opus"}'}
+        db = self._db(mock_conn)
+
+        job = await db.claim_session_job("worker-1", 60)
+
+        assert job['params'] == {"initializer_model": "opus"}
+        args = mock_conn.fetchrow.call_args.args
+        assert "FOR UPDATE SKIP LOCKED" in args[0]
+        assert args[1:] == ("worker-1", 60)
+
+    @pytest.mark.asyncio
+    async def test_request_stop_reports_whether_a_job_was_found(self):
+        """Test that request_session_job_stop returns False when nothing is queued or running."""
+        mock_conn = AsyncMock()
+        mock_conn.execute.return_value = "UPDATE 0"
+        db = self._db(mock_conn)
+        project_id, session_id = uuid4(), uuid4()
+
+        assert await db.request_session_job_stop(project_id, session_id=session_id) is False
+        assert mock_conn.execute.call_args.args[1:] == (project_id, session_id, None)
+
+
 class TestTaskOperationsSimple:
     """Simple tests for task operations."""
 
+    @pytest.mark.asyncio
+    async def test_claim_next_task_uses_skip_locked(self):
+        """Test that claim_next_task leases with FOR UPDATE SKIP LOCKED."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = {'id': 11, 'epic_id': 2, 'epic_name': 'Epic'}
+        mock_conn.fetch.return_value = [{'id': 1, 'task_id': 11}]
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        project_id = uuid4()
+        task = await db.claim_next_task(project_id, "worker-1", ttl=120)
+
+        args = mock_conn.fetchrow.call_args.args
+        assert "FOR UPDATE OF ct SKIP LOCKED" in args[0]
+        assert args[1:] == (project_id, "worker-1", 120, None)
+        assert task['id'] == 11
+        assert task['tests'] == [{'id': 1, 'task_id': 11}]
+
+    @pytest.mark.asyncio
+    async def test_claim_next_task_returns_none(self):
+        """Test that claim_next_task returns None when no task is claimable."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = None
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        assert await db.claim_next_task(uuid4(), "worker-1") is None
+        mock_conn.fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_renews_task_leases(self):
+        """Test that the session heartbeat extends leases held by the session."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        session_id = uuid4()
+        await db.update_session_heartbeat(session_id)
+        assert mock_conn.execute.call_count == 1
+
+        await db.update_session_heartbeat(session_id, lease_ttl=300)
+        assert mock_conn.execute.call_count == 3
+        assert mock_conn.execute.call_args.args[1:] == (str(session_id), 300)
+
+    @pytest.mark.asyncio
+    async def test_cleanup_stale_sessions_reclaims_expired_leases(self):
+        """Test that cleanup_stale_sessions reclaims expired task leases."""
+        db = TaskDatabase("postgresql://test")
+        mock_conn = AsyncMock()
+        mock_conn.execute.side_effect = ["UPDATE 1", "UPDATE 0", "UPDATE 2"]
+
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+
+        count = await db.cleanup_stale_sessions()
+
+        assert count == 1
+        reclaim_sql = mock_conn.execute.call_args_list[2].args[0]
+        assert "lease_expires_at < NOW()" in reclaim_sql
+
     @pytest.mark.asyncio
     async def test_update_task_status_params(self):
         """Test update_task_status parameter requirements."""
@@ -234,6 +670,107 @@ class TestTaskOperationsSimple:
             await db.list_tasks()
 
 
+class TestRoadmapOperations:
+    """Tests for bulk roadmap creation."""
+
+    @staticmethod
+    def _db(mock_conn):
+        db = TaskDatabase("postgresql://test")
+        transaction = MagicMock()
+        transaction.__aenter__ = AsyncMock()
+        transaction.__aexit__ = AsyncMock(return_value=False)
+        mock_conn.transaction = MagicMock(return_value=transaction)
+        db.pool = AsyncMock()
+        db.pool.acquire.return_value = mock_conn
+        db.pool.release = AsyncMock()
+        return db
+
+    @staticmethod
+    def _reserved(query, count):
+        start = {"'epics'": 10, "'tasks'": 100, "'task_tests'": 1000}
+        base = next(v for k, v in start.items() if k in query)
+        return [{'id': base + i} for i in range(count)]
+
+    @pytest.mark.asyncio
+    async def test_create_roadmap_copies_all_rows_in_one_transaction(self):
+        """Test that epics, tasks and tests are written with COPY using reserved IDs."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchval.return_value = 3  # Next epic priority
+        mock_conn.fetch.side_effect = self._reserved
+        db = self._db(mock_conn)
+        project_id = uuid4()
+
+        result = await db.create_roadmap(project_id, [
+            {'name': 'Foundation', 'tasks': [
+                {'description': 'Set up DB', 'action': 'Create schema', 'tests': [
+                    {'category': 'functional', 'description': 'Schema exists', 'steps': ['Connect']},
+                    {'description': 'Pool works'},
+                ]},
+                {'description': 'Set up API'},
+            ]},
+            {'name': 'Polish', 'priority': 9},
+        ])
+
+        assert result == [
+            {'id': 10, 'name': 'Foundation', 'tasks': [
+                {'id': 100, 'description': 'Set up DB', 'tests': [
+                    {'id': 1000, 'description': 'Schema exists'},
+                    {'id': 1001, 'description': 'Pool works'},
+                ]},
+                {'id': 101, 'description': 'Set up API', 'tests': []},
+            ]},
+            {'id': 11, 'name': 'Polish', 'tasks': []},
+        ]
+        mock_conn.transaction.assert_called_once()
+
+        copies = {c.args[0]: c.kwargs['records'] for c in mock_conn.copy_records_to_table.call_args_list}
+        assert list(copies) == ['epics', 'tasks', 'task_tests']
+        assert copies['epics'] == [
+            (10, project_id, 'Foundation', None, 3),
+            (11, project_id, 'Polish', None, 9),
+        ]
+        assert [(r[0], r[1], r[5]) for r in copies['tasks']] == [(100, 10, 1), (101, 10, 2)]
+        assert copies['task_tests'][1] == (
+            1001, 100, project_id, 'functional', 'unit', 'Pool works', None, None, '[]'
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_roadmap_adds_tasks_to_existing_epic(self):
+        """Test that epic_id entries append tasks after the epic's existing ones."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchval.return_value = 1
+
+        async def fetch(query, *args):
+            if 'FROM epics e' in query:
+                return [{'id': 7, 'name': 'Existing', 'max_task_priority': 4}]
+            return self._reserved(query, args[0])
+
+        mock_conn.fetch.side_effect = fetch
+        db = self._db(mock_conn)
+
+        result = await db.create_roadmap(uuid4(), [
+            {'epic_id': '7', 'tasks': [{'description': 'One more'}]}
+        ])
+
+        assert result[0]['name'] == 'Existing'
+        (call,) = mock_conn.copy_records_to_table.call_args_list
+        assert call.args[0] == 'tasks'
+        assert [(r[1], r[5]) for r in call.kwargs['records']] == [(7, 5)]
+
+    @pytest.mark.asyncio
+    async def test_create_roadmap_rejects_unknown_epic(self):
+        """Test that an epic_id outside the project aborts before writing."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchval.return_value = 1
+        mock_conn.fetch.return_value = []
+        db = self._db(mock_conn)
+
+        with pytest.raises(ValueError, match="not found"):
+            await db.create_roadmap(uuid4(), [{'epic_id': 99, 'tasks': [{'description': 'x'}]}])
+
+        mock_conn.copy_records_to_table.assert_not_called()
+
+
 class TestErrorConditions:
     """Test error handling."""
 
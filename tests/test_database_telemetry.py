@@ -0,0 +1,57 @@
+"""
+Tests for connection pool telemetry.
+"""
+
+import logging
+from types import SimpleNamespace
+
+from server.database.telemetry import Histogram, PoolTelemetry
+
+
+def _query(elapsed, exception=None):
+    return SimpleNamespace(
+        query="SELECT *\n    FROM tasks WHERE id = $1", args=(1,), elapsed=elapsed, exception=exception
+    )
+
+
+class TestHistogram:
+    """Test bucket counts and percentiles."""
+
+    def test_observe_and_percentiles(self):
+        histogram = Histogram([1, 10, 100])
+        for value in (0.5, 5, 5, 50, 500):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["buckets"] == {"le_1": 1, "le_10": 2, "le_100": 1, "overflow": 1}
+        assert snapshot["p50"] == 10
+        assert snapshot["p99"] == 500
+        assert snapshot["max"] == 500
+
+    def test_empty(self):
+        assert Histogram([1]).snapshot()["p50"] is None
+
+
+class TestPoolTelemetry:
+    """Test query logging."""
+
+    def test_slow_query_is_logged(self, caplog):
+        telemetry = PoolTelemetry(max_size=5, slow_query_ms=100)
+        caplog.set_level(logging.DEBUG, logger="performance.db_query")
+
+        telemetry.log_query(_query(0.01))
+        telemetry.log_query(_query(0.25))
+
+        warnings = [r for r in caplog.records if r.levelname == "WARNING"]
+        assert len(warnings) == 1
+        assert warnings[0].query == "SELECT * FROM tasks WHERE id = $1"
+        assert telemetry.slow_queries == 1
+        assert telemetry.get_stats()["query_ms"]["count"] == 2
+
+    def test_failed_query_is_counted(self):
+        telemetry = PoolTelemetry(max_size=5, slow_query_ms=0)
+
+        telemetry.log_query(_query(0.5, exception=RuntimeError("boom")))
+
+        assert telemetry.query_errors == 1
+        assert telemetry.slow_queries == 0
@@ -0,0 +1,185 @@
+"""
+Tests for the WebSocket event bus.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from server.api.event_bus import (
+    EventDecoder,
+    InMemoryEventBus,
+    PostgresEventBus,
+    create_event_bus,
+    encode_event,
+)
+
+
+class FakeConnection:
+    """asyncpg connection stand-in that routes pg_notify to LISTENers."""
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    def add_termination_listener(self, callback):
+        pass
+
+    async def add_listener(self, channel, callback):
+        self.hub.listeners.append((self, channel, callback))
+
+    def transaction(self):
+        conn = self
+
+        class _Transaction:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Transaction()
+
+    async def executemany(self, query, args):
+        assert query == "SELECT pg_notify($1, $2)"
+        for channel, payload in args:
+            self.hub.notify(channel, payload)
+
+
+class FakeHub:
+    """A 'database' shared by several workers."""
+
+    def __init__(self):
+        self.listeners = []
+
+    async def connect(self):
+        return FakeConnection(self)
+
+    def notify(self, channel, payload):
+        for conn, listen_channel, callback in self.listeners:
+            if listen_channel == channel:
+                callback(conn, 1, channel, payload)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestEncoding:
+    """Test NOTIFY payload chunking."""
+
+    def test_round_trip(self):
+        decoder = EventDecoder()
+        payloads = encode_event("w1", "p1", {"type": "progress", "text": "é"})
+
+        assert len(payloads) == 1
+        assert decoder.feed(payloads[0]) == ("w1", "p1", {"type": "progress", "text": "é"})
+
+    def test_large_event_is_chunked(self):
+        decoder = EventDecoder()
+        data = {"type": "log", "text": "x" * 20000}
+        payloads = encode_event("w1", "p1", data, max_chunk=7000)
+
+        assert len(payloads) == 3
+        assert all(len(p.encode()) < 8000 for p in payloads)
+        assert decoder.feed(payloads[0]) is None
+        assert decoder.feed(payloads[1]) is None
+        assert decoder.feed(payloads[2]) == ("w1", "p1", data)
+
+    def test_malformed_payload_is_ignored(self):
+        assert EventDecoder().feed("garbage") is None
+
+
+class TestInMemoryEventBus:
+    """Test local delivery."""
+
+    @pytest.mark.asyncio
+    async def test_publish_delivers_locally(self):
+        bus = InMemoryEventBus()
+        handler = AsyncMock()
+        bus.subscribe(handler)
+
+        await bus.publish("p1", {"type": "session_started"})
+
+        handler.assert_awaited_once_with("p1", {"type": "session_started"})
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_contained(self):
+        bus = InMemoryEventBus()
+        bus.subscribe(AsyncMock(side_effect=RuntimeError("boom")))
+
+        await bus.publish("p1", {"type": "x"})
+
+
+class TestPostgresEventBus:
+    """Test fan-out across workers."""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_other_workers_once(self):
+        hub = FakeHub()
+        worker_a, worker_b = PostgresEventBus(hub.connect), PostgresEventBus(hub.connect)
+        received_a, received_b = AsyncMock(), AsyncMock()
+        worker_a.subscribe(received_a)
+        worker_b.subscribe(received_b)
+        await worker_a.start()
+        await worker_b.start()
+        await _settle()
+
+        try:
+            await worker_a.publish("p1", {"type": "progress", "n": 1})
+            await worker_a.publish("p1", {"type": "progress", "n": 2})
+            await _settle()
+        finally:
+            await worker_a.stop()
+            await worker_b.stop()
+
+        # Local delivery happens once, not again via the worker's own NOTIFY
+        assert [c.args[1]["n"] for c in received_a.await_args_list] == [1, 2]
+        assert [c.args[1]["n"] for c in received_b.await_args_list] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_not_started_delivers_locally_only(self):
+        connect = AsyncMock()
+        bus = PostgresEventBus(connect)
+        handler = AsyncMock()
+        bus.subscribe(handler)
+
+        await bus.publish("p1", {"type": "x"})
+
+        handler.assert_awaited_once()
+        connect.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self):
+        bus = PostgresEventBus(AsyncMock(), queue_size=2)
+        bus._tasks = [MagicMock()]  # Pretend started, without a publisher draining the queue
+
+        for n in range(3):
+            await bus.publish("p1", {"n": n})
+
+        assert bus.dropped == 1
+        assert [bus._queue.get_nowait()[1]["n"] for _ in range(2)] == [1, 2]
+
+
+class TestCreateEventBus:
+    """Test backend selection."""
+
+    def test_memory_backend(self):
+        assert isinstance(create_event_bus("memory"), InMemoryEventBus)
+
+    def test_postgres_backend(self):
+        bus = create_event_bus("postgres", "postgresql://test", channel="events", queue_size=5)
+
+        assert isinstance(bus, PostgresEventBus)
+        assert bus.channel == "events"
+
+    def test_postgres_without_database_falls_back(self):
+        assert isinstance(create_event_bus("postgres", None), InMemoryEventBus)
@@ -0,0 +1,138 @@
+"""
+Tests for coalescing of count-type WebSocket events.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from server.api.event_coalescer import EventCoalescer, RateWindow
+
+
+class Recorder:
+    """Publisher that records what reaches the event bus."""
+
+    def __init__(self):
+        self.events = []
+
+    async def __call__(self, project_id, data):
+        self.events.append((project_id, data))
+
+    @property
+    def types(self):
+        return [data["type"] for _, data in self.events]
+
+
+def _tool_progress(name, **extra):
+    return {"type": "progress", "event": {"type": "tool_use", "tool_name": name, **extra}}
+
+
+class TestEventCoalescer:
+    """Test snapshot merging and pass-through."""
+
+    @pytest.mark.asyncio
+    async def test_first_event_is_sent_immediately(self):
+        published = Recorder()
+        coalescer = EventCoalescer(published, interval=60)
+
+        await coalescer.submit("p1", _tool_progress("Read"))
+
+        assert published.events == [("p1", {"type": "progress", "event": {
+            "type": "tool_use", "tool_name": "Read", "count": 1
+        }})]
+
+    @pytest.mark.asyncio
+    async def test_burst_is_merged_into_one_snapshot(self):
+        published = Recorder()
+        coalescer = EventCoalescer(published, interval=0.02)
+
+        await coalescer.submit("p1", _tool_progress("Read"))
+        for name in ("Edit", "Bash", "Grep"):
+            await coalescer.submit("p1", _tool_progress(name))
+        for n in (1, 2, 3):
+            await coalescer.submit("p1", {"type": "tool_use", "session_id": "s1", "tool_count": n})
+        assert len(published.events) == 1
+
+        await asyncio.sleep(0.05)
+
+        snapshot = [data for _, data in published.events[1:]]
+        assert snapshot[0]["event"] == {"type": "tool_use", "tool_name": "Grep", "count": 3}
+        assert snapshot[1]["tool_count"] == 3
+        assert len(snapshot) == 2
+
+    @pytest.mark.asyncio
+    async def test_tool_result_errors_are_summed(self):
+        published = Recorder()
+        coalescer = EventCoalescer(published, interval=60)
+        coalescer._last_flush["p1"] = time.monotonic()  # Inside the interval
+
+        for is_error in (True, False, True):
+            await coalescer.submit("p1", {"type": "progress", "event": {"type": "tool_result", "is_error": is_error}})
+        await coalescer.close()
+
+        assert len(published.events) == 1
+        event = published.events[0][1]["event"]
+        assert (event["count"], event["error_count"]) == (3, 2)
+
+    @pytest.mark.asyncio
+    async def test_state_transition_flushes_pending_snapshot_first(self):
+        published = Recorder()
+        coalescer = EventCoalescer(published, interval=60)
+
+        await coalescer.submit("p1", _tool_progress("Read"))
+        await coalescer.submit("p1", _tool_progress("Edit"))
+        await coalescer.submit("p1", {"type": "task_updated", "task_id": 1, "done": True})
+
+        assert published.types == ["progress", "progress", "task_updated"]
+        assert published.events[1][1]["event"]["tool_name"] == "Edit"
+
+    @pytest.mark.asyncio
+    async def test_projects_are_shaped_independently(self):
+        published = Recorder()
+        coalescer = EventCoalescer(published, interval=60)
+
+        await coalescer.submit("p1", _tool_progress("Read"))
+        await coalescer.submit("p2", _tool_progress("Read"))
+
+        assert [project_id for project_id, _ in published.events] == ["p1", "p2"]
+
+    @pytest.mark.asyncio
+    async def test_zero_interval_passes_everything_through(self):
+        published = Recorder()
+        coalescer = EventCoalescer(published, interval=0)
+
+        for name in ("Read", "Edit"):
+            await coalescer.submit("p1", _tool_progress(name))
+
+        assert [data["event"] for _, data in published.events] == [
+            {"type": "tool_use", "tool_name": "Read"},
+            {"type": "tool_use", "tool_name": "Edit"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_project_stats(self):
+        published = Recorder()
+        coalescer = EventCoalescer(published, interval=60)
+
+        for name in ("Read", "Edit", "Bash"):
+            await coalescer.submit("p1", _tool_progress(name))
+        await coalescer.submit("p1", {"type": "session_complete"})
+
+        stats = coalescer.get_project_stats("p1")
+        assert (stats["received"], stats["published"], stats["coalesced"]) == (4, 3, 1)
+        assert stats["by_type"] == {"progress": 3, "session_complete": 1}
+        assert stats["received_per_second"] > stats["published_per_second"]
+        assert coalescer.get_project_stats("p2") is None
+
+
+class TestRateWindow:
+    """Test sliding-window rates."""
+
+    def test_rate_expires_old_buckets(self):
+        window = RateWindow(window=10)
+        for now in (100.0, 100.5, 101.0):
+            window.add(now)
+
+        assert window.rate(now=105.0) == pytest.approx(0.3)
+        assert window.rate(now=111.0) == 0
@@ -0,0 +1,166 @@
+"""
+Tests for the pooled outbound HTTP client registry.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from server.llm.openai_compatible import OpenAICompatibleClient
+from server.llm.provider_router import LLMConfig, LLMProvider, get_provider_client
+from server.utils import http_clients
+from server.utils.http_clients import HttpClientRegistry
+
+
+class KeepAliveServer:
+    """Minimal HTTP/1.1 server that counts TCP connections."""
+
+    def __init__(self, body: dict):
+        self.body = json.dumps(body).encode()
+        self.connections = 0
+        self.requests = 0
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(self.body)}\r\n\r\n".encode()
+                    + self.body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class TestHttpClientRegistry:
+    """Test client reuse, limits and stats."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_and_keeps_connections_alive(self):
+        registry = HttpClientRegistry()
+        async with KeepAliveServer({"ok": True}) as server:
+            client = registry.get("test", base_url=server.url)
+            assert registry.get("test") is client
+
+            for _ in range(3):
+                response = await client.get("/ping")
+                assert response.json() == {"ok": True}
+
+            stats = registry.get_stats()["pools"]["test"]
+            assert server.requests == 3
+            assert server.connections == 1
+            assert stats["requests"] == 3
+            assert stats["connections"] == 1
+            assert stats["idle"] == 1
+
+            await registry.close_all()
+        assert registry.get_stats()["clients"] == 0
+
+    @pytest.mark.asyncio
+    async def test_host_limits(self):
+        registry = HttpClientRegistry(max_connections=50, max_keepalive_connections=20, host_limits={"localhost": 2})
+
+        local = registry.get("local", base_url="http://localhost:8080/v1")
+        remote = registry.get("remote", base_url="https://api.github.com")
+
+        assert local._transport._pool._max_connections == 2
+        assert local._transport._pool._max_keepalive_connections == 2
+        assert remote._transport._pool._max_connections == 50
+        await registry.close_all()
+
+    def test_http2_without_h2_falls_back(self, monkeypatch):
+        monkeypatch.setattr(http_clients, "_http2_available", lambda: False)
+
+        assert HttpClientRegistry(http2=True).http2 is False
+
+    @pytest.mark.asyncio
+    async def test_closed_client_is_recreated(self):
+        registry = HttpClientRegistry()
+        client = registry.get("test")
+        await registry.close("test")
+
+        assert client.is_closed
+        assert registry.get("test") is not client
+        assert registry.clients_created == 2
+        await registry.close_all()
+
+    @pytest.mark.asyncio
+    async def test_client_from_other_loop_is_closed_when_replaced(self):
+        import threading
+
+        registry = HttpClientRegistry()
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            async def create():
+                return registry.get("test")
+
+            old = asyncio.run_coroutine_threadsafe(create(), other_loop).result(timeout=5)
+            new = registry.get("test")
+
+            assert new is not old
+            for _ in range(100):
+                if old.is_closed:
+                    break
+                await asyncio.sleep(0.01)
+            assert old.is_closed
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join(timeout=5)
+            other_loop.close()
+            await registry.close_all()
+
+
+class TestLLMClientReuse:
+    """Test that LLM requests share clients and connections."""
+
+    def test_provider_client_is_cached(self):
+        config = LLMConfig(lmstudio_api_base="http://localhost:1234/v1", lmstudio_model="m")
+
+        first = get_provider_client(LLMProvider.LMSTUDIO, config)
+
+        assert get_provider_client(LLMProvider.LMSTUDIO, config) is first
+        assert get_provider_client(LLMProvider.LLAMACPP, config) is not first
+
+    @pytest.mark.asyncio
+    async def test_openai_compatible_requests_share_a_connection(self, monkeypatch):
+        registry = HttpClientRegistry()
+        monkeypatch.setattr(http_clients, "_registry", registry)
+        reply = {"choices": [{"message": {"content": "hi"}}]}
+
+        async with KeepAliveServer(reply) as server:
+            for _ in range(2):
+                client = OpenAICompatibleClient(base_url=f"{server.url}/v1", model="m")
+                assert await client.chat([]) == "hi"
+
+            assert server.requests == 2
+            assert server.connections == 1
+            await registry.close_all()
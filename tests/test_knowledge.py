@@ -16,6 +16,7 @@ from server.knowledge.vault_manager import (
     Note,
     SearchResult,
 )
+from server.knowledge.search_index import VaultSearchIndex
 from server.knowledge.context_engine import (
     ContextEngine,
     ContextChunk,
@@ -201,6 +202,101 @@ class TestVaultManager:
         assert stats["notes_count"] == 3
         assert stats["total_size_bytes"] > 0
 
+    def test_search_ranks_by_relevance(self, temp_vault):
+        """Test BM25 ranking across multiple query terms."""
+        (Path(temp_vault) / "auth.md").write_text(
+            "# Authentication\n\nAuthentication content: tokens, sessions and authentication flows."
+        )
+        manager = VaultManager(vault_path=temp_vault)
+
+        results = manager.search("authentication content")
+
+        assert results[0].note.path == "auth.md"
+        assert len(results) == 4  # Any term matches
+        assert results[0].matches[0] == "# Authentication"
+
+    def test_search_prefix(self, temp_vault):
+        """Test prefix matching of query terms."""
+        manager = VaultManager(vault_path=temp_vault)
+
+        assert manager.search("nest") == []
+        assert [r.note.path for r in manager.search("nest", prefix=True)] == [
+            str(Path("subdir") / "note3.md")
+        ]
+
+    def test_search_case_sensitive(self, temp_vault):
+        """Test case-sensitive filtering of search results."""
+        manager = VaultManager(vault_path=temp_vault)
+
+        assert [r.note.path for r in manager.search("Content", case_sensitive=True)] == ["note1.md"]
+
+    def test_search_sees_written_and_deleted_notes(self, temp_vault):
+        """Test that write_note/delete_note update the search index."""
+        manager = VaultManager(vault_path=temp_vault)
+        assert manager.search("zebra") == []
+
+        manager.write_note("zoo.md", "# Zoo\n\nA zebra.")
+        assert [r.note.path for r in manager.search("zebra")] == ["zoo.md"]
+
+        manager.delete_note("zoo.md")
+        assert manager.search("zebra") == []
+
+
+class TestVaultSearchIndex:
+    """Tests for the persistent vault search index."""
+
+    @pytest.fixture
+    def vault(self, tmp_path):
+        (tmp_path / "a.md").write_text("python testing with pytest")
+        (tmp_path / "b.md").write_text("javascript testing")
+        (tmp_path / ".trash").mkdir()
+        (tmp_path / ".trash" / "old.md").write_text("python")
+        return tmp_path
+
+    def test_refresh_skips_hidden_directories(self, vault):
+        index = VaultSearchIndex(vault)
+
+        assert index.refresh() == 2
+        assert sorted(index.notes) == ["a.md", "b.md"]
+
+    def test_refresh_is_incremental(self, vault):
+        index = VaultSearchIndex(vault, refresh_interval=0)
+        index.refresh()
+
+        assert index.refresh() == 0
+        (vault / "b.md").write_text("javascript testing with python")
+        (vault / "a.md").unlink()
+
+        assert index.refresh() == 2
+        assert [path for path, _ in index.search("python")] == ["b.md"]
+
+    def test_refresh_is_throttled(self, vault):
+        index = VaultSearchIndex(vault, refresh_interval=60)
+        index.refresh()
+        (vault / "c.md").write_text("python")
+
+        assert index.refresh() == 0
+        assert index.refresh(force=True) == 1
+
+    def test_persisted_index_is_reused(self, vault):
+        index = VaultSearchIndex(vault)
+        index.refresh()
+        assert index.index_path.exists()
+
+        reloaded = VaultSearchIndex(vault)
+        with patch.object(VaultSearchIndex, "_add") as mock_add:
+            assert reloaded.refresh() == 0
+        mock_add.assert_not_called()
+        assert [path for path, _ in reloaded.search("pytest")] == ["a.md"]
+
+    def test_bm25_prefers_rarer_terms(self, vault):
+        index = VaultSearchIndex(vault)
+        index.refresh()
+
+        scores = dict(index.search("python testing"))
+
+        assert scores["a.md"] > scores["b.md"]
+
 
 class TestContextEngine:
     """Tests for ContextEngine."""
@@ -0,0 +1,122 @@
+"""
+Tests for compressed session log archival.
+"""
+
+import gzip
+import json
+
+import pytest
+
+from server.utils.log_archive import (
+    archive_session_logs,
+    compress_log,
+    compressed_path_for,
+    frames_path_for,
+    glob_logs,
+    open_log,
+    open_log_seekable,
+    read_log_text,
+    resolve_log_path,
+)
+from server.utils.log_index import SessionLogIndex
+from server.utils.observability import SessionLogger
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "session_001_20260101_120000.jsonl"
+    with open(path, "w") as f:
+        for i in range(200):
+            f.write(json.dumps({"event": "tool_use" if i % 2 else "tool_result", "n": i, "text": "é"}) + "\n")
+    return path
+
+
+class TestCompressLog:
+    """Test framed gzip compression."""
+
+    def test_replaces_plain_file(self, log_path):
+        original = log_path.read_bytes()
+
+        compressed = compress_log(log_path, frame_bytes=1024)
+
+        assert compressed == compressed_path_for(log_path)
+        assert not log_path.exists()
+        # Still a standard gzip file
+        assert gzip.decompress(compressed.read_bytes()) == original
+        assert read_log_text(log_path) == original.decode()
+
+        frames = json.loads(frames_path_for(log_path).read_text())
+        assert len(frames["frames"]) > 1
+        assert frames["size"] == len(original)
+
+    def test_missing_file(self, tmp_path):
+        assert compress_log(tmp_path / "missing.jsonl") is None
+
+    def test_seek_into_later_frame(self, log_path):
+        original = log_path.read_bytes()
+        offset = original.index(b'{"event": "tool_use", "n": 151')
+        compress_log(log_path, frame_bytes=1024)
+
+        f, size = open_log_seekable(log_path)
+        with f:
+            f.seek(offset)
+            line = f.readline()
+
+        assert size == len(original)
+        assert json.loads(line)["n"] == 151
+
+    def test_archive_is_best_effort(self, log_path, tmp_path):
+        written = archive_session_logs(log_path, tmp_path / "missing.txt")
+
+        assert written == [compressed_path_for(log_path)]
+
+
+class TestTransparentReads:
+    """Test that readers find compressed logs by their logical name."""
+
+    def test_resolve_prefers_plain_file(self, log_path):
+        assert resolve_log_path(log_path) == log_path
+        compress_log(log_path)
+        assert resolve_log_path(log_path) == compressed_path_for(log_path)
+
+    def test_glob_returns_logical_paths(self, log_path, tmp_path):
+        (tmp_path / "session_002_20260101_130000.jsonl").write_text("")
+        compress_log(log_path)
+
+        assert glob_logs(tmp_path, "session_*.jsonl") == [
+            log_path, tmp_path / "session_002_20260101_130000.jsonl"
+        ]
+
+    def test_open_log_text(self, log_path):
+        compress_log(log_path)
+
+        with open_log(log_path) as f:
+            assert json.loads(f.readline())["text"] == "é"
+
+    def test_index_reads_compressed_log(self, log_path):
+        index = SessionLogIndex.ensure(log_path)
+        compress_log(log_path, frame_bytes=1024)
+
+        lines = list(index.iter_lines(offset=150, limit=3, events=["tool_use"]))
+
+        assert [json.loads(line)["n"] for _, line in lines] == [151, 153, 155]
+        assert index.total_lines() == 200
+
+    def test_index_built_from_compressed_log(self, log_path):
+        compress_log(log_path)
+
+        index = SessionLogIndex.ensure(compressed_path_for(log_path))
+
+        assert len(index) == 200
+        assert [json.loads(line)["n"] for _, line in index.iter_lines(offset=198)] == [198, 199]
+
+    def test_session_logger_output(self, tmp_path):
+        session_logger = SessionLogger(tmp_path, 1, "coding", "test-model")
+        session_logger.log_system_message("init", "hello")
+        session_logger.finalize("continue")
+
+        archive_session_logs(session_logger.jsonl_file, session_logger.txt_file)
+
+        assert "SESSION 1" in read_log_text(session_logger.txt_file)
+        events = [json.loads(line)["event"] for _, line in SessionLogIndex(session_logger.jsonl_file).iter_lines()]
+        assert events == ["session_start", "system_message", "session_end"]
@@ -0,0 +1,124 @@
+"""
+Tests for the session log sidecar offset index.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from server.utils.log_index import (
+    RECORD_SIZE,
+    SessionLogIndex,
+    format_index_record,
+    index_path_for,
+    parse_index_record,
+)
+from server.utils.observability import SessionLogger
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _write_log(path, events):
+    """Write a JSONL log with one line per (event, minutes-after-START) pair."""
+    with open(path, "w") as f:
+        for i, (event, minutes) in enumerate(events):
+            timestamp = (START + timedelta(minutes=minutes)).isoformat()
+            f.write(json.dumps({"event": event, "timestamp": timestamp, "n": i, "text": "é"}) + "\n")
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "session_001_20260101_120000.jsonl"
+    _write_log(path, [
+        ("session_start", 0),
+        ("tool_use", 1),
+        ("tool_result", 2),
+        ("tool_use", 3),
+        ("tool_result", 4),
+        ("session_end", 5),
+    ])
+    return path
+
+
+def _numbers(lines):
+    return [json.loads(line)["n"] for _, line in lines]
+
+
+class TestIndexRecords:
+    """Test the fixed-width record format."""
+
+    def test_round_trip(self):
+        record = format_index_record(1234, 1767268800.5, "tool_result")
+
+        assert len(record) == RECORD_SIZE
+        assert parse_index_record(record) == (1234, 1767268800.5, "tool_result")
+
+    def test_long_event_names_are_truncated(self):
+        record = format_index_record(0, 0.0, "x" * 100)
+
+        assert len(record) == RECORD_SIZE
+
+
+class TestSessionLogIndex:
+    """Test seeking and filtering through the index."""
+
+    def test_ensure_builds_missing_index(self, log_path):
+        index = SessionLogIndex.ensure(log_path)
+
+        assert index_path_for(log_path).exists()
+        assert len(index) == 6
+        assert index.total_lines() == 6
+
+    def test_offset_and_limit(self, log_path):
+        index = SessionLogIndex.ensure(log_path)
+
+        lines = list(index.iter_lines(offset=2, limit=3))
+
+        assert [n for n, _ in lines] == [2, 3, 4]
+        assert _numbers(lines) == [2, 3, 4]
+        assert json.loads(lines[0][1])["text"] == "é"
+
+    def test_event_filter(self, log_path):
+        index = SessionLogIndex.ensure(log_path)
+
+        assert _numbers(index.iter_lines(events=["tool_use"])) == [1, 3]
+        assert _numbers(index.iter_lines(offset=2, events=["tool_use", "session_end"])) == [3, 5]
+
+    def test_time_range(self, log_path):
+        index = SessionLogIndex.ensure(log_path)
+        since = (START + timedelta(minutes=2)).timestamp()
+        until = (START + timedelta(minutes=4)).timestamp()
+
+        assert index.first_line_at(since) == 2
+        assert _numbers(index.iter_lines(since=since, until=until)) == [2, 3, 4]
+
+    def test_unindexed_tail_is_read(self, log_path):
+        index = SessionLogIndex.ensure(log_path)
+        with open(log_path, "a") as f:
+            f.write(json.dumps({"event": "tool_use", "timestamp": START.isoformat(), "n": 6}) + "\n")
+            f.write('{"event": "partial"')  # Still being written
+
+        assert index.total_lines() == 7
+        assert _numbers(index.iter_lines(offset=5)) == [5, 6]
+        assert _numbers(index.iter_lines(events=["tool_use"])) == [1, 3, 6]
+
+    def test_index_ahead_of_log_is_ignored(self, log_path):
+        index = SessionLogIndex.ensure(log_path)
+        with open(index.index_path, "a") as f:
+            f.write(format_index_record(log_path.stat().st_size, 0.0, "tool_use"))
+
+        assert _numbers(index.iter_lines(offset=4)) == [4, 5]
+
+    def test_session_logger_writes_index(self, tmp_path):
+        session_logger = SessionLogger(tmp_path, 1, "coding", "test-model")
+        session_logger.log_system_message("init", "hello")
+        session_logger.log_error(ValueError("boom"))
+        session_logger.finalize("continue")
+
+        index = SessionLogIndex(session_logger.jsonl_file)
+
+        assert len(index) == 4
+        events = [json.loads(line)["event"] for _, line in index.iter_lines()]
+        assert events == ["session_start", "system_message", "error", "session_end"]
+        assert [json.loads(line)["event"] for _, line in index.iter_lines(events=["error"])] == ["error"]
@@ -0,0 +1,162 @@
+"""
+Tests for the shared MCP task manager server (mcp.mode: shared).
+"""
+
+import os
+import signal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from server.client.mcp_server import SharedMcpServer, scope_headers
+
+
+class TestScopeHeaders:
+    """Test mapping of a session's stdio environment to request headers."""
+
+    def test_scope_headers(self):
+        env = {
+            "DATABASE_URL": "postgresql://localhost/yokeflow",
+            "PROJECT_ID": "p1",
+            "EPIC_ID": "3",
+            "WORKER_ID": "s1",
+            "TASK_LEASE_TTL": "600",
+            "DB_POOL_MAX": "3",
+        }
+
+        assert scope_headers(env) == {
+            "X-Project-Id": "p1",
+            "X-Epic-Id": "3",
+            "X-Worker-Id": "s1",
+            "X-Task-Lease-Ttl": "600",
+        }
+
+    def test_from_config(self):
+        config = SimpleNamespace(mcp=SimpleNamespace(
+            host="0.0.0.0", port=9000, pool_max_size=5, startup_timeout=1.0, health_interval=2.0
+        ))
+
+        server = SharedMcpServer.from_config(config)
+
+        assert server.url == "http://0.0.0.0:9000/mcp"
+        assert server.pool_max_size == 5
+
+
+class TestSharedMcpServer:
+    """Test adopting, spawning and monitoring the shared server."""
+
+    @pytest.mark.asyncio
+    async def test_adopts_running_server(self, tmp_path):
+        server = SharedMcpServer(server_path=tmp_path / "index.js")
+        with patch.object(server, "health_check", AsyncMock(return_value={"status": "ok"})), \
+                patch.object(server, "_spawn", AsyncMock()) as spawn:
+            assert await server.ensure_running() == server.url
+
+        spawn.assert_not_called()
+        assert not server.owned
+
+    @pytest.mark.asyncio
+    async def test_spawns_when_unhealthy(self, tmp_path):
+        server = SharedMcpServer(server_path=tmp_path / "index.js")
+        with patch.object(server, "health_check", AsyncMock(return_value=None)), \
+                patch.object(server, "_spawn", AsyncMock()) as spawn:
+            await server.ensure_running()
+
+        spawn.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_build_fails(self, tmp_path):
+        server = SharedMcpServer(server_path=tmp_path / "index.js")
+        with patch.object(server, "health_check", AsyncMock(return_value=None)):
+            with pytest.raises(RuntimeError, match="npm run build"):
+                await server.ensure_running()
+
+    @pytest.mark.asyncio
+    async def test_server_exiting_during_startup_fails(self, tmp_path, monkeypatch):
+        entry = tmp_path / "index.js"
+        entry.write_text("process.exit(3);\n")
+        monkeypatch.setenv("DATABASE_URL", "postgresql://localhost/yokeflow")
+        server = SharedMcpServer(server_path=entry, startup_timeout=5.0, log_path=tmp_path / "mcp.log")
+
+        process = MagicMock(returncode=3, pid=1234)
+        process.poll.return_value = 3
+        with patch.object(server, "health_check", AsyncMock(return_value=None)), \
+                patch("subprocess.Popen", return_value=process) as spawn:
+            with pytest.raises(RuntimeError, match="exited with code 3"):
+                await server.ensure_running()
+
+        env = spawn.call_args.kwargs["env"]
+        assert env["MCP_TRANSPORT"] == "http"
+        assert env["MCP_PORT"] == "8765"
+        assert spawn.call_args.kwargs["start_new_session"] is True
+        assert not server.owned
+
+        # The per-run secret is handed to the server and kept owner-only for adopters
+        secret_file = server.state_dir / "secret"
+        assert env["MCP_SHARED_SECRET"] == secret_file.read_text()
+        assert secret_file.stat().st_mode & 0o777 == 0o600
+        assert server.auth_headers() == {"Authorization": f"Bearer {env['MCP_SHARED_SECRET']}"}
+
+    @pytest.mark.asyncio
+    async def test_start_survives_failure_and_stop_cleans_up(self, tmp_path):
+        server = SharedMcpServer(
+            server_path=tmp_path / "index.js", health_interval=60, log_path=tmp_path / "mcp.log"
+        )
+        with patch.object(server, "ensure_running", AsyncMock(side_effect=RuntimeError("boom"))):
+            await server.start()
+
+        assert server._monitor is not None
+        await server.stop()
+        assert server._monitor is None
+
+
+class TestSharedMcpServerOwnership:
+    """Test that the server is only stopped by the last process using it."""
+
+    def _server(self, tmp_path):
+        return SharedMcpServer(server_path=tmp_path / "index.js", log_path=tmp_path / "mcp.log")
+
+    @pytest.mark.asyncio
+    async def test_stop_leaves_server_for_live_adopter(self, tmp_path):
+        server = self._server(tmp_path)
+        process = MagicMock(pid=4321)
+        process.poll.return_value = None
+        server._process = process
+        server._renew_lease()
+        # Another live process (our parent) adopted the server
+        (server.state_dir / "adopters" / str(os.getppid())).touch()
+
+        await server.stop()
+
+        process.terminate.assert_not_called()
+        assert not server.owned
+        assert not (server.state_dir / "adopters" / str(os.getpid())).exists()
+
+    @pytest.mark.asyncio
+    async def test_stop_terminates_when_last_user(self, tmp_path):
+        server = self._server(tmp_path)
+        process = MagicMock(pid=4321)
+        process.poll.return_value = None
+        server._process = process
+        server._renew_lease()
+        # A stale lease of a process that is gone doesn't keep the server alive
+        stale = server.state_dir / "adopters" / "999999999"
+        stale.touch()
+
+        with patch.object(server, "health_check", AsyncMock(return_value=None)):
+            await server.stop()
+
+        process.terminate.assert_called_once()
+        assert not stale.exists()
+
+    @pytest.mark.asyncio
+    async def test_last_adopter_stops_server_spawned_elsewhere(self, tmp_path):
+        server = self._server(tmp_path)
+        server._write_state("server.pid", "4321")
+
+        with patch.object(server, "health_check", AsyncMock(return_value={"status": "ok"})), \
+                patch("os.kill") as kill:
+            await server.stop()
+
+        kill.assert_called_once_with(4321, signal.SIGTERM)
@@ -10,6 +10,7 @@ Tests the orchestration layer that manages:
 
 import asyncio
 import json
+import os
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, Mock, patch, call
 from uuid import UUID, uuid4
@@ -21,7 +22,7 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from server.agent.orchestrator import AgentOrchestrator, SessionInfo
-from server.agent.models import SessionStatus, SessionType
+from server.agent.models import SessionStatus, SessionType, PreparedSession
 from server.utils.errors import (
     YokeFlowError,
     ProjectValidationError,
@@ -56,7 +57,8 @@ class TestAgentOrchestrator:
                     docker_network="bridge",
                     docker_memory_limit="2g",
                     docker_cpu_limit=2.0,
-                    docker_ports=[]
+                    docker_ports=[],
+                    docker_prewarm=False
                 ),
                 docker=MagicMock(
                     enabled=True
@@ -441,47 +443,101 @@ class TestAgentOrchestrator:
         """Test listing all projects."""
         project1_id = uuid4()
         project2_id = uuid4()
+        progress = {
+            'total_epics': 0,
+            'completed_epics': 0,
+            'total_tasks': 0,
+            'completed_tasks': 0,
+            'total_tests': 0,
+            'passing_tests': 0
+        }
         projects = [
-            {'id': project1_id, 'name': 'project1', 'status': 'active'},
-            {'id': project2_id, 'name': 'project2', 'status': 'completed'}
+            {'id': project1_id, 'name': 'project1', 'status': 'active',
+             'progress': dict(progress), 'next_task': None, 'active_session': None},
+            {'id': project2_id, 'name': 'project2', 'status': 'completed',
+             'progress': dict(progress), 'next_task': None, 'active_session': None}
         ]
 
         with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db):
-            # Mock list_projects to return the projects
-            mock_db.list_projects.return_value = projects
-
-            # Mock get_project to return each project when queried by ID
-            def get_project_side_effect(project_id):
-                for project in projects:
-                    if project['id'] == project_id:
-                        return project
-                return None
-            mock_db.get_project.side_effect = get_project_side_effect
-
-            # Mock progress-related methods
-            mock_db.get_progress.return_value = {
-                'total_epics': 0,
-                'completed_epics': 0,
-                'total_tasks': 0,
-                'completed_tasks': 0,
-                'total_tests': 0,
-                'passed_tests': 0
-            }
-            mock_db.get_next_task.return_value = None
-            mock_db.get_active_session.return_value = None
+            mock_db.list_projects_overview.return_value = projects
 
             # Mock Path operations to avoid filesystem checks
             with patch('server.agent.orchestrator.Path') as mock_path:
                 mock_path_instance = MagicMock()
                 mock_path.return_value = mock_path_instance
                 mock_path_instance.__truediv__ = MagicMock(return_value=mock_path_instance)
-                mock_path_instance.exists.return_value = False
+                mock_path_instance.stat.side_effect = FileNotFoundError
 
                 result = await orchestrator.list_projects()
 
                 assert len(result) == 2
                 assert result[0]['name'] == 'project1'
                 assert result[1]['name'] == 'project2'
+                assert result[0]['active_sessions'] == []
+                assert result[0]['is_initialized'] is False
+
+            # All projects are loaded in one batched call, not per project
+            mock_db.list_projects_overview.assert_called_once()
+            mock_db.get_project.assert_not_called()
+            mock_db.get_progress.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_list_projects_fields_and_pagination(self, orchestrator, mock_db):
+        """Test that field selection skips the optional queries."""
+        projects = [{
+            'id': uuid4(), 'name': 'project1', 'status': 'active',
+            'progress': {'total_epics': 2}
+        }]
+
+        with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db):
+            mock_db.list_projects_overview.return_value = projects
+
+            result = await orchestrator.list_projects(limit=10, offset=20, fields=[])
+
+            mock_db.list_projects_overview.assert_called_once_with(
+                user_id=None, limit=10, offset=20,
+                include_next_task=False, include_active_session=False
+            )
+            assert result[0]['is_initialized'] is True
+            assert 'next_task' not in result[0]
+            assert 'active_sessions' not in result[0]
+            assert 'needs_env_config' not in result[0]
+
+            with pytest.raises(ValueError):
+                await orchestrator.list_projects(fields=['bogus'])
+
+    def test_env_status_cached_by_mtime(self, orchestrator, tmp_path):
+        """Test that .env status is cached until the files change."""
+        example = tmp_path / ".env.example"
+        example.write_text("# comment only\n")
+
+        status = orchestrator._get_env_status(tmp_path)
+        assert status == {'has_env_file': False, 'has_env_example': True, 'has_env_variables': False}
+
+        with patch.object(Path, 'read_text', side_effect=AssertionError("re-read")):
+            assert orchestrator._get_env_status(tmp_path) is status
+
+        example.write_text("API_KEY=\n")
+        os.utime(example, (example.stat().st_atime, example.stat().st_mtime + 10))
+        assert orchestrator._get_env_status(tmp_path)['has_env_variables'] is True
+
+    @pytest.mark.asyncio
+    async def test_archive_flushes_unfinalized_session_logs(self, orchestrator, tmp_path):
+        """Test that an errored session's buffered log lines reach the archive."""
+        from server.utils.log_archive import read_log_text
+        from server.utils.observability import SessionLogger
+
+        orchestrator.config.project.compress_session_logs = True
+        session_logger = SessionLogger(tmp_path, 1, "coding")
+        session_logger.log_error(RuntimeError("sandbox crashed"))
+
+        # No finalize(): the session failed before it could write its summary
+        orchestrator._archive_session_logs(session_logger)
+        await asyncio.gather(*orchestrator._background_tasks)
+
+        assert not session_logger.txt_file.exists()
+        assert "sandbox crashed" in read_log_text(session_logger.txt_file)
+        assert "sandbox crashed" in read_log_text(session_logger.jsonl_file)
 
     # =========================================================================
     # Event Callback Tests
@@ -514,6 +570,273 @@ class TestAgentOrchestrator:
                 # Event callbacks would be triggered during session execution
                 # which we're not testing here directly
 
+    # =========================================================================
+    # Parallel Epic Session Tests
+    # =========================================================================
+
+    @pytest.fixture
+    def mock_worktrees(self, tmp_path):
+        """Create a mock worktree manager."""
+        worktrees = MagicMock()
+        worktrees.create = AsyncMock()
+        worktrees.merge = AsyncMock(return_value=True)
+        worktrees.remove = AsyncMock()
+        worktrees.worktree_path.side_effect = lambda epic_id: tmp_path / f"proj--epic-{epic_id}"
+        worktrees.branch_name.side_effect = lambda epic_id: f"yokeflow/epic-{epic_id}"
+        return worktrees
+
+    @pytest.mark.asyncio
+    async def test_parallel_sessions_respect_project_limit(
+        self, orchestrator, mock_db, mock_worktrees, sample_project_id
+    ):
+        """Test that parallel epic sessions never exceed the per-project limit."""
+        orchestrator.config.parallel = MagicMock(max_sessions_per_project=2, max_sessions_global=6)
+        mock_db.claim_next_epic.side_effect = [
+            {'id': 1, 'name': 'Epic 1'},
+            {'id': 2, 'name': 'Epic 2'},
+            {'id': 3, 'name': 'Epic 3'},
+            None,
+            None,
+        ]
+        mock_db.get_progress.return_value = {'total_tasks': 10, 'completed_tasks': 4}
+
+        active = 0
+        peak = 0
+        epics_run = []
+
+        async def fake_start_session(project_id, coding_model, progress_callback, epic_id, worktree_path, priority=0):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            epics_run.append(epic_id)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return SessionInfo(
+                session_id=str(uuid4()),
+                project_id=str(project_id),
+                session_number=epic_id,
+                session_type=SessionType.CODING,
+                model=coding_model,
+                status=SessionStatus.COMPLETED,
+                created_at=datetime.now()
+            )
+
+        with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db), \
+             patch('server.agent.orchestrator.SandboxManager'), \
+             patch.object(orchestrator, 'start_session', side_effect=fake_start_session):
+            result = await orchestrator._run_parallel_coding_sessions(
+                sample_project_id, mock_worktrees, 'claude-sonnet', None
+            )
+
+        assert peak == 2
+        assert sorted(epics_run) == [1, 2, 3]
+        assert result.status == SessionStatus.COMPLETED
+        assert mock_worktrees.merge.await_count == 3
+        assert mock_db.release_epic_lease.await_count == 3
+        mock_db.mark_project_complete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_parallel_merge_conflict_excludes_epic(
+        self, orchestrator, mock_db, mock_worktrees, sample_project_id
+    ):
+        """Test that an epic whose merge conflicts is kept out of later leases."""
+        orchestrator.config.parallel = MagicMock(max_sessions_per_project=1, max_sessions_global=6)
+        mock_db.claim_next_epic.side_effect = [{'id': 7, 'name': 'Epic 7'}, None]
+        mock_db.get_progress.return_value = {'total_tasks': 5, 'completed_tasks': 3}
+        mock_worktrees.merge.return_value = False
+
+        session = SessionInfo(
+            session_id=str(uuid4()),
+            project_id=str(sample_project_id),
+            session_number=3,
+            session_type=SessionType.CODING,
+            model='claude-sonnet',
+            status=SessionStatus.COMPLETED,
+            created_at=datetime.now()
+        )
+
+        with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db), \
+             patch('server.agent.orchestrator.SandboxManager') as mock_sandbox_manager, \
+             patch.object(orchestrator, 'start_session', AsyncMock(return_value=session)):
+            await orchestrator._run_parallel_coding_sessions(
+                sample_project_id, mock_worktrees, 'claude-sonnet', None
+            )
+
+        mock_worktrees.remove.assert_not_called()
+        mock_sandbox_manager.delete_docker_container.assert_not_called()
+        mock_db.release_epic_lease.assert_awaited_once()
+        # Second claim must skip the conflicted epic
+        assert mock_db.claim_next_epic.call_args_list[1].kwargs['exclude_epic_ids'] == [7]
+
+    @pytest.mark.asyncio
+    async def test_parallel_claims_exclude_running_epics(
+        self, orchestrator, mock_db, mock_worktrees, sample_project_id
+    ):
+        """Test that epics still running are never leased again (e.g. after lease expiry)."""
+        orchestrator.config.parallel = MagicMock(max_sessions_per_project=2, max_sessions_global=6)
+        mock_db.claim_next_epic.side_effect = [{'id': 1, 'name': 'Epic 1'}, None, None]
+        mock_db.get_progress.return_value = {'total_tasks': 5, 'completed_tasks': 3}
+
+        session = SessionInfo(
+            session_id=str(uuid4()),
+            project_id=str(sample_project_id),
+            session_number=3,
+            session_type=SessionType.CODING,
+            model='claude-sonnet',
+            status=SessionStatus.COMPLETED,
+            created_at=datetime.now()
+        )
+
+        with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db), \
+             patch('server.agent.orchestrator.SandboxManager'), \
+             patch.object(orchestrator, 'start_session', AsyncMock(return_value=session)):
+            await orchestrator._run_parallel_coding_sessions(
+                sample_project_id, mock_worktrees, 'claude-sonnet', None
+            )
+
+        assert mock_db.claim_next_epic.call_args_list[1].kwargs['exclude_epic_ids'] == [1]
+
+    @pytest.mark.asyncio
+    async def test_parallel_lease_release_failure_does_not_abort(
+        self, orchestrator, mock_db, mock_worktrees, sample_project_id
+    ):
+        """Test that a failing lease release is logged instead of aborting the loop."""
+        orchestrator.config.parallel = MagicMock(max_sessions_per_project=1, max_sessions_global=6)
+        mock_db.claim_next_epic.side_effect = [{'id': 1, 'name': 'Epic 1'}, {'id': 2, 'name': 'Epic 2'}, None]
+        mock_db.release_epic_lease.side_effect = RuntimeError("connection lost")
+        mock_db.get_progress.return_value = {'total_tasks': 5, 'completed_tasks': 3}
+
+        session = SessionInfo(
+            session_id=str(uuid4()),
+            project_id=str(sample_project_id),
+            session_number=3,
+            session_type=SessionType.CODING,
+            model='claude-sonnet',
+            status=SessionStatus.COMPLETED,
+            created_at=datetime.now()
+        )
+
+        with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db), \
+             patch('server.agent.orchestrator.SandboxManager'), \
+             patch.object(orchestrator, 'start_session', AsyncMock(return_value=session)):
+            result = await orchestrator._run_parallel_coding_sessions(
+                sample_project_id, mock_worktrees, 'claude-sonnet', None
+            )
+
+        assert result is session
+        assert mock_db.release_epic_lease.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_parallel_stops_leasing_after_error(
+        self, orchestrator, mock_db, mock_worktrees, sample_project_id
+    ):
+        """Test that a failed epic session stops new epics from being leased."""
+        orchestrator.config.parallel = MagicMock(max_sessions_per_project=1, max_sessions_global=6)
+        mock_db.claim_next_epic.side_effect = [{'id': 1, 'name': 'Epic 1'}, {'id': 2, 'name': 'Epic 2'}]
+        mock_db.get_progress.return_value = {'total_tasks': 5, 'completed_tasks': 1}
+
+        session = SessionInfo(
+            session_id=str(uuid4()),
+            project_id=str(sample_project_id),
+            session_number=2,
+            session_type=SessionType.CODING,
+            model='claude-sonnet',
+            status=SessionStatus.ERROR,
+            created_at=datetime.now()
+        )
+
+        with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db), \
+             patch('server.agent.orchestrator.SandboxManager'), \
+             patch.object(orchestrator, 'start_session', AsyncMock(return_value=session)):
+            result = await orchestrator._run_parallel_coding_sessions(
+                sample_project_id, mock_worktrees, 'claude-sonnet', None
+            )
+
+        assert result.status == SessionStatus.ERROR
+        assert mock_db.claim_next_epic.await_count == 1
+
+    # =========================================================================
+    # Pipelined Session Setup Tests
+    # =========================================================================
+
+    def _coding_session(self, project_id, status=SessionStatus.COMPLETED):
+        return SessionInfo(
+            session_id=str(uuid4()),
+            project_id=str(project_id),
+            session_number=2,
+            session_type=SessionType.CODING,
+            model='claude-sonnet',
+            status=status,
+            created_at=datetime.now()
+        )
+
+    @pytest.mark.asyncio
+    async def test_pipelined_loop_hands_preparation_to_next_session(self, orchestrator, mock_db, sample_project_id):
+        """Test that the next session receives the setup prepared during the delay."""
+        orchestrator.config.timing = MagicMock(auto_continue_delay=0, pipeline_sessions=True)
+        mock_db.get_project.return_value = {'id': sample_project_id, 'name': 'demo', 'completed_at': None}
+        mock_db.list_epics.return_value = [{'id': 1}]
+        mock_db.get_progress.return_value = {
+            'total_epics': 2, 'completed_epics': 0, 'total_tasks': 10, 'completed_tasks': 1
+        }
+        prepared = PreparedSession(project={}, sandbox_type='docker', sandbox=MagicMock(stop=AsyncMock()), prompt='go')
+        start_session = AsyncMock(return_value=self._coding_session(sample_project_id))
+
+        with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db), \
+             patch.object(orchestrator, 'start_session', start_session), \
+             patch.object(orchestrator, '_prepare_coding_session', AsyncMock(return_value=prepared)) as prepare:
+            await orchestrator.start_coding_sessions(sample_project_id, 'claude-sonnet', max_iterations=2)
+
+        assert [c.kwargs['prepared'] for c in start_session.call_args_list] == [None, prepared]
+        # No preparation after the last allowed session
+        prepare.assert_awaited_once()
+        prepared.sandbox.stop.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unused_preparation_is_discarded(self, orchestrator, mock_db, sample_project_id):
+        """Test that the prepared sandbox is stopped when the loop ends instead."""
+        orchestrator.config.timing = MagicMock(auto_continue_delay=0, pipeline_sessions=True)
+        mock_db.get_project.return_value = {'id': sample_project_id, 'name': 'demo', 'completed_at': None}
+        mock_db.list_epics.return_value = [{'id': 1}]
+        progress = iter([
+            {'total_epics': 2, 'completed_epics': 1},  # Before session 2
+            {'total_tasks': 10, 'completed_tasks': 9},  # After session 2
+            {'total_epics': 2, 'completed_epics': 2},  # Before session 3: all epics done
+        ])
+
+        async def get_progress(project_id):
+            await asyncio.sleep(0.01)  # Lets the preparation finish
+            return next(progress)
+
+        mock_db.get_progress.side_effect = get_progress
+        prepared = PreparedSession(project={}, sandbox_type='docker', sandbox=MagicMock(stop=AsyncMock()), prompt='go')
+
+        with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db), \
+             patch.object(orchestrator, 'start_session', AsyncMock(return_value=self._coding_session(sample_project_id))), \
+             patch.object(orchestrator, '_prepare_coding_session', AsyncMock(return_value=prepared)):
+            await orchestrator.start_coding_sessions(sample_project_id, 'claude-sonnet')
+
+        prepared.sandbox.stop.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_preparation_falls_back(self, orchestrator, mock_db, sample_project_id):
+        """Test that a sandbox that fails to start during preparation is stopped."""
+        orchestrator.config.timing = MagicMock(sandbox_startup_timeout=5)
+        mock_db.get_project.return_value = {
+            'id': sample_project_id, 'name': 'demo', 'local_path': '/tmp/demo', 'metadata': {}
+        }
+        sandbox = MagicMock(
+            prepare=AsyncMock(), start=AsyncMock(side_effect=RuntimeError("docker down")), stop=AsyncMock()
+        )
+
+        with patch('server.agent.orchestrator.DatabaseManager', return_value=mock_db), \
+             patch('server.agent.orchestrator.SandboxManager') as mock_sandbox_manager:
+            mock_sandbox_manager.create_sandbox.return_value = sandbox
+            result = await orchestrator._prepare_coding_session(sample_project_id)
+
+        assert result is None
+        sandbox.stop.assert_awaited_once()
+
     # =========================================================================
     # Integration Tests
     # =========================================================================
@@ -313,6 +313,20 @@ class TestGitHubAdapter:
         assert adapter.verify_webhook_signature(payload, expected_sig) is True
         assert adapter.verify_webhook_signature(payload, "sha256=invalid") is False
 
+    @pytest.mark.asyncio
+    async def test_clients_are_separate_per_token(self):
+        """Test that adapters with different tokens don't share auth headers."""
+        from server.remote.adapters.github import GitHubAdapter
+
+        first = await GitHubAdapter(token="token-a", webhook_secret="s")._get_client()
+        second = await GitHubAdapter(token="token-b", webhook_secret="s")._get_client()
+        same = await GitHubAdapter(token="token-a", webhook_secret="s")._get_client()
+
+        assert first is not second
+        assert first is same
+        assert first.headers["Authorization"] == "Bearer token-a"
+        assert second.headers["Authorization"] == "Bearer token-b"
+
     def test_parse_issue_comment(self):
         """Test parsing issue comment event."""
         from server.remote.adapters.github import GitHubAdapter
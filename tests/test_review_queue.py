@@ -0,0 +1,211 @@
+"""
+Tests for the deep review job queue.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from server.quality.review_queue import ReviewQueue
+
+
+class FakeReviewDB:
+    """In-memory stand-in for the review_jobs operations of TaskDatabase."""
+
+    def __init__(self):
+        self.jobs = {}
+
+    async def enqueue_review_jobs(self, project_id, sessions, model=None, max_attempts=3):
+        in_flight = {j["session_id"] for j in self.jobs.values() if j["status"] in ("queued", "running")}
+        created = []
+        for s in sessions:
+            if s["id"] in in_flight:
+                continue
+            job = {
+                "id": uuid4(), "project_id": project_id, "project_name": "demo",
+                "session_id": s["id"], "session_number": s["session_number"],
+                "model": model, "status": "queued", "attempts": 0, "max_attempts": max_attempts,
+            }
+            self.jobs[job["id"]] = job
+            created.append(dict(job))
+        return created
+
+    async def claim_review_job(self, worker_id, ttl, exclude_models=None):
+        for job in self.jobs.values():
+            if job["status"] == "queued" and (job["model"] or "default") not in (exclude_models or []):
+                job["status"] = "running"
+                job["attempts"] += 1
+                return dict(job)
+        return None
+
+    async def complete_review_job(self, job_id, result):
+        self.jobs[job_id].update(status="completed", result=result)
+
+    async def fail_review_job(self, job_id, error, retry_delay=None):
+        job = self.jobs[job_id]
+        retry = retry_delay is not None and job["attempts"] < job["max_attempts"]
+        job.update(status="queued" if retry else "failed", last_error=error)
+        return dict(job)
+
+    async def requeue_expired_review_jobs(self):
+        return 0
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    async def __call__(self, project_id, data):
+        self.events.append(data)
+
+    @property
+    def types(self):
+        return [data["type"] for data in self.events]
+
+
+def _sessions(count):
+    return [{"id": uuid4(), "session_number": n} for n in range(1, count + 1)]
+
+
+def _queue(db, run_review, tmp_path, **kwargs):
+    (tmp_path / "demo").mkdir(exist_ok=True)
+
+    async def provider():
+        return db
+
+    kwargs.setdefault("poll_interval", 0.01)
+    return ReviewQueue(provider, run_review, generations_dir=str(tmp_path), **kwargs)
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class TestReviewQueue:
+    """Test worker pool limits, dedup and retries."""
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_bounds_concurrency(self, tmp_path):
+        db = FakeReviewDB()
+        active = 0
+        peak = 0
+
+        async def run_review(session_id, project_path, model):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return {"check_id": uuid4(), "overall_rating": 8}
+
+        queue = _queue(db, run_review, tmp_path, workers=3)
+        await queue.enqueue(uuid4(), _sessions(10))
+        await queue.start()
+        try:
+            await _wait_for(lambda: queue.completed == 10)
+        finally:
+            await queue.stop()
+
+        assert peak == 3
+        assert all(job["status"] == "completed" for job in db.jobs.values())
+
+    @pytest.mark.asyncio
+    async def test_model_limit_caps_concurrency_per_model(self, tmp_path):
+        db = FakeReviewDB()
+        running_models = []
+
+        async def run_review(session_id, project_path, model):
+            running_models.append(model)
+            assert running_models.count("opus") <= 1
+            await asyncio.sleep(0.02)
+            running_models.remove(model)
+            return {"overall_rating": 7}
+
+        queue = _queue(db, run_review, tmp_path, workers=4, model_limits={"opus": 1})
+        project_id = uuid4()
+        await queue.enqueue(project_id, _sessions(4), model="opus")
+        await queue.start()
+        try:
+            await _wait_for(lambda: queue.completed == 4)
+        finally:
+            await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_sessions_in_flight_are_not_queued_twice(self, tmp_path):
+        db = FakeReviewDB()
+        queue = _queue(db, None, tmp_path)
+        sessions = _sessions(3)
+
+        first = await queue.enqueue(uuid4(), sessions)
+        second = await queue.enqueue(uuid4(), sessions + _sessions(1))
+
+        assert (len(first), len(second)) == (3, 1)
+
+    @pytest.mark.asyncio
+    async def test_failed_review_is_retried_with_backoff(self, tmp_path):
+        db = FakeReviewDB()
+        calls = 0
+
+        async def run_review(session_id, project_path, model):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("rate limited")
+            return {"overall_rating": 9}
+
+        published = Recorder()
+        queue = _queue(db, run_review, tmp_path, workers=1, retry_delay=5)
+        queue._publish = published
+        await queue.enqueue(uuid4(), _sessions(1))
+        await queue.start()
+        try:
+            await _wait_for(lambda: queue.completed == 1)
+        finally:
+            await queue.stop()
+
+        assert published.types == [
+            "deep_review_queued", "deep_review_started", "deep_review_retrying",
+            "deep_review_started", "deep_review_completed",
+        ]
+        assert published.events[2]["retry_in"] == 5
+        assert published.events[-1]["rating"] == 9
+        assert queue._backoff(3) == 20
+
+    @pytest.mark.asyncio
+    async def test_job_fails_after_max_attempts(self, tmp_path):
+        db = FakeReviewDB()
+
+        async def run_review(session_id, project_path, model):
+            raise RuntimeError("boom")
+
+        queue = _queue(db, run_review, tmp_path, workers=1, retry_delay=0, max_attempts=2)
+        await queue.enqueue(uuid4(), _sessions(1))
+        await queue.start()
+        try:
+            await _wait_for(lambda: queue.failed == 1)
+        finally:
+            await queue.stop()
+
+        (job,) = db.jobs.values()
+        assert (job["status"], job["attempts"], job["last_error"]) == ("failed", 2, "boom")
+
+    @pytest.mark.asyncio
+    async def test_missing_project_directory_is_not_retried(self, tmp_path):
+        db = FakeReviewDB()
+        queue = _queue(db, None, tmp_path, workers=1)
+        (tmp_path / "demo").rmdir()
+
+        await queue.enqueue(uuid4(), _sessions(1))
+        await queue.start()
+        try:
+            await _wait_for(lambda: queue.failed == 1)
+        finally:
+            await queue.stop()
+
+        (job,) = db.jobs.values()
+        assert job["attempts"] == 1
+        assert "Project directory not found" in job["last_error"]
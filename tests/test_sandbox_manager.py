@@ -23,10 +23,19 @@ from server.sandbox.manager import (
     Sandbox,
     LocalSandbox,
     DockerSandbox,
-    SandboxManager
+    SandboxManager,
+    reset_docker_client
 )
 
 
+@pytest.fixture(autouse=True)
+def fresh_docker_client():
+    """Don't leak the shared Docker client between tests."""
+    reset_docker_client()
+    yield
+    reset_docker_client()
+
+
 @pytest.mark.unit
 class TestDockerSandboxUnit:
     """Unit tests for DockerSandbox using mocks (no real Docker needed)."""
@@ -132,20 +141,24 @@ class TestDockerSandboxUnit:
             assert docker_sandbox.container_id == "test-container-id"
             assert docker_sandbox.is_running is True
 
-    @pytest.mark.asyncio
-    async def test_docker_sandbox_execute_with_mock(self, docker_sandbox):
-        """Test command execution with mocked Docker container."""
-        # Mock container
+    @staticmethod
+    def _mock_exec_client(chunks, exit_code=0):
+        """Mock client whose low-level exec API streams the given (stdout, stderr) chunks."""
         mock_container = MagicMock()
         mock_container.status = "running"
-        mock_container.reload = MagicMock()
 
-        # exec_run returns (exit_code, (stdout, stderr)) when demux=True
-        mock_container.exec_run.return_value = (0, (b"Hello from mock", b""))
-
-        # Mock client
         mock_client = MagicMock()
         mock_client.containers.get.return_value = mock_container
+        mock_client.api.exec_create.return_value = {"Id": "exec-id"}
+        mock_client.api.exec_start.return_value = iter(chunks)
+        mock_client.api.exec_inspect.return_value = {"ExitCode": exit_code}
+        return mock_client
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_execute_with_mock(self, docker_sandbox):
+        """Test command execution with mocked Docker container."""
+        # exec_start(stream=True, demux=True) yields (stdout, stderr) chunks
+        mock_client = self._mock_exec_client([(b"Hello from ", None), (b"mock", b"warn")])
 
         # Set container_id and client for execute to work
         docker_sandbox.container_id = "test-container-id"
@@ -156,8 +169,204 @@ class TestDockerSandboxUnit:
 
         # Verify result
         assert result["returncode"] == 0
-        assert "Hello from mock" in result["stdout"]
-        mock_container.exec_run.assert_called_once()
+        assert result["stdout"] == "Hello from mock"
+        assert result["stderr"] == "warn"
+        mock_client.api.exec_start.assert_called_once_with("exec-id", stream=True, demux=True)
+        command = mock_client.api.exec_create.call_args.args[1]
+        assert not command.startswith("timeout")
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_execute_streams_output(self, docker_sandbox):
+        """Test that output chunks are passed to the callback as they arrive."""
+        # Multi-byte character split across chunks is decoded once complete
+        mock_client = self._mock_exec_client([(b"line 1\n", None), (b"\xc3", None), (b"\xa9\n", b"oops\n")])
+        docker_sandbox.container_id = "test-container-id"
+        docker_sandbox.client = mock_client
+
+        received = []
+        result = await docker_sandbox.execute_command(
+            "build", output_callback=lambda stream, text: received.append((stream, text))
+        )
+
+        assert received == [("stdout", "line 1\n"), ("stdout", "\u00e9\n"), ("stderr", "oops\n")]
+        assert result["stdout"] == "line 1\n\u00e9\n"
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_execute_enforces_timeout(self, docker_sandbox):
+        """Test that timeouts are enforced in the container and reported."""
+        import time
+
+        def killed_after_timeout():
+            yield (b"partial", None)
+            time.sleep(1.05)
+
+        # coreutils `timeout` exits with 124 when it kills the command
+        mock_client = self._mock_exec_client(killed_after_timeout(), exit_code=124)
+        docker_sandbox.container_id = "test-container-id"
+        docker_sandbox.client = mock_client
+
+        result = await docker_sandbox.execute_command("sleep 100", timeout=1)
+
+        command = mock_client.api.exec_create.call_args.args[1]
+        assert command.startswith("timeout -k 5 1 sh -c ")
+        assert result["returncode"] == -1
+        assert result["stdout"] == "partial"
+        assert "timed out after 1 seconds" in result["stderr"]
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_execute_keeps_own_timeout_exit_codes(self, docker_sandbox):
+        """Test that a command exiting with 124 before its timeout is not reported as timed out."""
+        mock_client = self._mock_exec_client([(b"done", None)], exit_code=124)
+        docker_sandbox.container_id = "test-container-id"
+        docker_sandbox.client = mock_client
+
+        result = await docker_sandbox.execute_command("exit 124", timeout=5)
+
+        assert result["returncode"] == 124
+        assert "timed out" not in result["stderr"]
+
+    def test_docker_client_is_shared(self):
+        """Test that the Docker client is created once and reused."""
+        from server.sandbox.manager import get_docker_client
+
+        with patch('subprocess.run') as mock_run, \
+             patch('docker.from_env') as mock_from_env:
+            mock_run.return_value.returncode = 1
+
+            first = get_docker_client()
+            second = get_docker_client()
+
+            assert first is second
+            mock_from_env.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_start_uses_toolchain_image(self, docker_sandbox):
+        """Test that new containers start from the cached toolchain image without setup."""
+        import docker.errors
+
+        mock_client = MagicMock()
+        mock_client.containers.get.side_effect = docker.errors.NotFound("Container not found")
+        mock_client.containers.run.return_value = MagicMock(id="new-container-id")
+
+        with patch('server.sandbox.manager.get_docker_client', return_value=mock_client), \
+             patch('server.sandbox.manager.ensure_toolchain_image', return_value="yokeflow-toolchain:abc") as mock_ensure, \
+             patch.object(docker_sandbox, '_resolve_port_bindings', return_value={}), \
+             patch.object(docker_sandbox, '_setup_container', new_callable=AsyncMock) as mock_setup:
+
+            await docker_sandbox.start()
+
+        mock_ensure.assert_called_once_with(mock_client, "test-image:latest")
+        assert mock_client.containers.run.call_args.args[0] == "yokeflow-toolchain:abc"
+        mock_setup.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_prepare_builds_image_once(self, docker_sandbox):
+        """Test that start() reuses the image prepared before it instead of building again."""
+        import docker.errors
+
+        mock_client = MagicMock()
+        mock_client.containers.get.side_effect = docker.errors.NotFound("Container not found")
+        mock_client.containers.run.return_value = MagicMock(id="new-container-id")
+
+        with patch('server.sandbox.manager.get_docker_client', return_value=mock_client), \
+             patch('server.sandbox.manager.ensure_toolchain_image', return_value=None) as mock_ensure, \
+             patch.object(docker_sandbox, '_resolve_port_bindings', return_value={}), \
+             patch.object(docker_sandbox, '_setup_container', new_callable=AsyncMock) as mock_setup:
+
+            await docker_sandbox.prepare()
+            await docker_sandbox.start()
+
+        # A failed build is not retried inside the timed start()
+        mock_ensure.assert_called_once_with(mock_client, "test-image:latest")
+        assert mock_client.containers.run.call_args.args[0] == "test-image:latest"
+        mock_setup.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_prepare_logs_slow_build(self, docker_sandbox, caplog):
+        """Test that a long toolchain build logs progress."""
+        import time
+
+        def slow_build(client, image):
+            time.sleep(0.2)
+            return "yokeflow-toolchain:abc"
+
+        with patch('server.sandbox.manager.get_docker_client', return_value=MagicMock()), \
+             patch('server.sandbox.manager.ensure_toolchain_image', side_effect=slow_build), \
+             patch('server.sandbox.manager.IMAGE_BUILD_LOG_INTERVAL', 0.05), \
+             caplog.at_level("INFO", logger="server.sandbox.manager"):
+            await docker_sandbox.prepare()
+
+        assert docker_sandbox._toolchain_image == "yokeflow-toolchain:abc"
+        assert "Still building sandbox toolchain image" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_claims_prewarmed_container(self, docker_sandbox):
+        """Test that a prewarmed, never-started container is started instead of recreated."""
+        docker_sandbox.session_type = "initializer"
+        prewarmed = MagicMock(
+            id="prewarmed-id", status="created",
+            labels={"yokeflow.prewarmed": "true", "yokeflow.toolchain.hash": "abc"}
+        )
+        mock_client = MagicMock()
+        mock_client.containers.get.return_value = prewarmed
+
+        with patch('server.sandbox.manager.get_docker_client', return_value=mock_client), \
+             patch.object(docker_sandbox, '_setup_container', new_callable=AsyncMock) as mock_setup:
+
+            await docker_sandbox.start()
+
+        prewarmed.start.assert_called_once()
+        prewarmed.remove.assert_not_called()
+        mock_client.containers.run.assert_not_called()
+        mock_setup.assert_not_called()
+        assert docker_sandbox.container_id == "prewarmed-id"
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_adopts_container_on_name_conflict(self, docker_sandbox):
+        """Test that a container created by a concurrent prewarm is adopted on 409 Conflict."""
+        import docker.errors
+
+        prewarmed = MagicMock(
+            id="prewarmed-id", status="created",
+            labels={"yokeflow.prewarmed": "true", "yokeflow.toolchain.hash": "abc"}
+        )
+        mock_client = MagicMock()
+        mock_client.containers.get.side_effect = [docker.errors.NotFound("Container not found"), prewarmed]
+        mock_client.containers.run.side_effect = docker.errors.APIError(
+            "Conflict", response=MagicMock(status_code=409)
+        )
+
+        with patch('server.sandbox.manager.get_docker_client', return_value=mock_client), \
+             patch('server.sandbox.manager.ensure_toolchain_image', return_value="yokeflow-toolchain:abc"), \
+             patch.object(docker_sandbox, '_resolve_port_bindings', return_value={}), \
+             patch.object(docker_sandbox, '_setup_container', new_callable=AsyncMock) as mock_setup:
+
+            await docker_sandbox.start()
+
+        prewarmed.start.assert_called_once()
+        mock_setup.assert_not_called()
+        assert docker_sandbox.container_id == "prewarmed-id"
+        assert docker_sandbox.is_running
+
+    @pytest.mark.asyncio
+    async def test_docker_sandbox_prewarm_creates_stopped_container(self, docker_sandbox):
+        """Test that prewarm creates (but does not start) the project's container."""
+        import docker.errors
+
+        mock_client = MagicMock()
+        mock_client.containers.get.side_effect = docker.errors.NotFound("Container not found")
+
+        with patch('server.sandbox.manager.get_docker_client', return_value=mock_client), \
+             patch('server.sandbox.manager.ensure_toolchain_image', return_value="yokeflow-toolchain:abc"), \
+             patch.object(docker_sandbox, '_resolve_port_bindings', return_value={}):
+
+            assert await docker_sandbox.prewarm() is True
+
+        mock_client.containers.run.assert_not_called()
+        args = mock_client.containers.create.call_args
+        assert args.args[0] == "yokeflow-toolchain:abc"
+        assert args.kwargs["labels"] == {"yokeflow.prewarmed": "true", "yokeflow.toolchain.hash": "abc"}
+        assert args.kwargs["name"] == "yokeflow-test_project"
 
     @pytest.mark.asyncio
     async def test_docker_sandbox_error_handling(self, docker_sandbox):
@@ -337,4 +546,53 @@ class TestLocalSandbox:
     def test_local_sandbox_working_directory(self, local_sandbox):
         """Test getting working directory for LocalSandbox."""
         working_dir = local_sandbox.get_working_directory()
-        assert working_dir == str(local_sandbox.project_dir)
\ No newline at end of file
+        assert working_dir == str(local_sandbox.project_dir)
+
+@pytest.mark.unit
+class TestToolchainImageCache:
+    """Unit tests for the sandbox toolchain image cache."""
+
+    def test_tag_changes_with_spec(self):
+        """Test that the image tag is a hash of base image and commands."""
+        from server.sandbox.image_cache import toolchain_image_tag
+
+        tag = toolchain_image_tag("node:20", ["apt-get update"])
+
+        assert tag.startswith("yokeflow-toolchain:")
+        assert tag == toolchain_image_tag("node:20", ["apt-get update"])
+        assert tag != toolchain_image_tag("node:22", ["apt-get update"])
+        assert tag != toolchain_image_tag("node:20", ["apt-get update", "npm install -g pnpm"])
+
+    def test_render_dockerfile_one_layer_per_command(self):
+        """Test that each install command becomes its own cached layer."""
+        from server.sandbox.image_cache import render_dockerfile
+
+        dockerfile = render_dockerfile("node:20", ["apt-get update", "npm install -g pnpm"])
+
+        assert dockerfile.startswith("FROM node:20\n")
+        assert "RUN apt-get update\nRUN npm install -g pnpm\n" in dockerfile
+
+    def test_ensure_toolchain_image_reuses_existing(self):
+        """Test that an existing image is used without building."""
+        from server.sandbox.image_cache import ensure_toolchain_image, toolchain_image_tag
+
+        client = MagicMock()
+        tag = ensure_toolchain_image(client, "node:20", ["apt-get update"])
+
+        assert tag == toolchain_image_tag("node:20", ["apt-get update"])
+        client.images.build.assert_not_called()
+
+    def test_ensure_toolchain_image_builds_missing(self):
+        """Test that a missing image is built, and build failures return None."""
+        import docker.errors
+        from server.sandbox.image_cache import ensure_toolchain_image
+
+        client = MagicMock()
+        client.images.get.side_effect = docker.errors.ImageNotFound("missing")
+
+        tag = ensure_toolchain_image(client, "node:20", ["apt-get update"])
+
+        assert client.images.build.call_args.kwargs["tag"] == tag
+
+        client.images.build.side_effect = docker.errors.BuildError("failed", [])
+        assert ensure_toolchain_image(client, "node:20", ["apt-get update"]) is None
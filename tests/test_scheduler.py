@@ -0,0 +1,170 @@
+"""
+Tests for the session scheduler (admission control across projects).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from server.agent.scheduler import SessionDemand, SessionScheduler, parse_memory, resolve_budget
+
+GB = 1024 ** 3
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    async def __call__(self, project_id, event_type, data):
+        self.events.append((project_id, event_type, data))
+
+    def of_type(self, event_type):
+        return [(project_id, data) for project_id, kind, data in self.events if kind == event_type]
+
+
+async def _hold(scheduler, project_id, order, release, demand=None, priority=0):
+    async with scheduler.slot(project_id, demand, priority=priority):
+        order.append(project_id)
+        await release.wait()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestParsing:
+    """Test budget and size parsing."""
+
+    def test_parse_memory(self):
+        assert parse_memory("2g") == 2 * GB
+        assert parse_memory("512m") == 512 * 1024 ** 2
+        assert parse_memory("1.5GB") == int(1.5 * GB)
+        assert parse_memory(1024) == 1024
+        with pytest.raises(ValueError):
+            parse_memory("lots")
+
+    def test_resolve_budget(self):
+        assert resolve_budget("auto", lambda: 8, float) == 8
+        assert resolve_budget("", lambda: 8, float) is None
+        assert resolve_budget(0, lambda: 8, float) is None
+        assert resolve_budget("4", lambda: 8, float) == 4.0
+        assert resolve_budget("lots", lambda: 8, parse_memory) is None
+
+    def test_demand_comes_from_docker_limits(self):
+        sandbox = SimpleNamespace(docker_memory_limit="2g", docker_cpu_limit="1.5")
+
+        assert SessionScheduler.demand_for("docker", sandbox) == SessionDemand(2 * GB, 1.5)
+        assert SessionScheduler.demand_for("e2b", sandbox) == SessionDemand()
+
+
+class TestSessionScheduler:
+    """Test limits, queue ordering and position reporting."""
+
+    @pytest.mark.asyncio
+    async def test_max_sessions_limits_concurrency(self):
+        scheduler = SessionScheduler(max_sessions=2)
+        order, release = [], asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(scheduler, f"p{i}", order, release)) for i in range(3)]
+        await _settle()
+
+        assert order == ["p0", "p1"]
+        assert scheduler.get_stats()["queued"] == 1
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == ["p0", "p1", "p2"]
+        assert scheduler.get_stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_memory_budget_holds_head_of_queue(self):
+        scheduler = SessionScheduler(memory_budget=4 * GB)
+        order, release = [], asyncio.Event()
+        big, small = SessionDemand(memory=3 * GB), SessionDemand(memory=1 * GB)
+
+        tasks = [
+            asyncio.create_task(_hold(scheduler, "a", order, release, big)),
+            asyncio.create_task(_hold(scheduler, "b", order, release, big)),
+            asyncio.create_task(_hold(scheduler, "c", order, release, small)),
+        ]
+        await _settle()
+
+        # "c" would fit, but doesn't overtake "b"
+        assert order == ["a"]
+        release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_oversized_session_runs_alone(self):
+        scheduler = SessionScheduler(memory_budget=1 * GB)
+        order, release = [], asyncio.Event()
+        release.set()
+
+        await _hold(scheduler, "a", order, release, SessionDemand(memory=8 * GB))
+
+        assert order == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_priority_then_round_robin_between_projects(self):
+        scheduler = SessionScheduler(max_sessions=1)
+        order, gate = [], asyncio.Event()
+        blocker = asyncio.create_task(_hold(scheduler, "busy", order, gate))
+        await _settle()
+
+        releases = {}
+
+        async def run(project_id, priority=0):
+            releases[project_id] = asyncio.Event()
+            releases[project_id].set()
+            await _hold(scheduler, project_id, order, releases[project_id], priority=priority)
+
+        tasks = [
+            asyncio.create_task(run("busy")),
+            asyncio.create_task(run("other")),
+            asyncio.create_task(run("urgent", priority=5)),
+        ]
+        await _settle()
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+
+        # Priority first; then the project that ran least recently
+        assert order == ["busy", "urgent", "other", "busy"]
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_told_their_position(self):
+        events = Recorder()
+        scheduler = SessionScheduler(max_sessions=1, on_queue_update=events)
+        order, release = [], asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(scheduler, f"p{i}", order, release)) for i in range(3)]
+        await _settle()
+
+        queued = events.of_type("session_queued")
+        assert {(project_id, data["position"]) for project_id, data in queued} == {("p1", 1), ("p2", 2)}
+
+        release.set()
+        await asyncio.gather(*tasks)
+        await _settle()
+
+        assert [project_id for project_id, _ in events.of_type("session_admitted")] == ["p1", "p2"]
+        assert ("p2", 1) in {(project_id, data["position"]) for project_id, data in events.of_type("session_queued")}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = SessionScheduler(max_sessions=1)
+        order, release = [], asyncio.Event()
+
+        first = asyncio.create_task(_hold(scheduler, "a", order, release))
+        waiting = asyncio.create_task(_hold(scheduler, "b", order, release))
+        await _settle()
+        assert scheduler.queue_position("b") == 1
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert scheduler.queue_position("b") is None
+
+        release.set()
+        await first
+        assert order == ["a"]
+        assert scheduler.get_stats()["running"] == 0
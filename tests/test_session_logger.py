@@ -0,0 +1,102 @@
+"""
+Tests for SessionLogger buffered log writing.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from server.utils.observability import BufferedLogWriter, SessionLogger
+
+
+@pytest.fixture
+def session_logger(tmp_path):
+    logger = SessionLogger(tmp_path, 1, "coding", "test-model")
+    yield logger
+    logger._writer.close()
+
+
+def _jsonl_events(path):
+    return [json.loads(line)["event"] for line in path.read_text().splitlines()]
+
+
+class TestBufferedLogWriter:
+    """Test the buffered writer behind SessionLogger."""
+
+    def test_writes_are_buffered_until_flush(self, tmp_path):
+        writer = BufferedLogWriter(flush_interval=60)
+        path = tmp_path / "log.txt"
+
+        writer.write(path, "one\n")
+        writer.write(path, "two\n")
+        assert not path.exists()
+
+        writer.flush()
+        assert path.read_text() == "one\ntwo\n"
+        writer.close()
+
+    def test_size_threshold_applies_backpressure(self, tmp_path):
+        writer = BufferedLogWriter(flush_interval=60, flush_bytes=4, max_buffer_bytes=8)
+        path = tmp_path / "log.txt"
+
+        writer.write(path, "12345678")
+
+        # Over max_buffer_bytes: flushed inline without waiting for the thread
+        assert path.read_text() == "12345678"
+        writer.close()
+
+    def test_background_thread_flushes(self, tmp_path):
+        writer = BufferedLogWriter(flush_interval=0.01)
+        path = tmp_path / "log.txt"
+
+        writer.write(path, "background\n")
+        for _ in range(200):
+            if path.exists() and path.read_text():
+                break
+            time.sleep(0.01)
+
+        assert path.read_text() == "background\n"
+        writer.close()
+
+    def test_write_after_close_reopens(self, tmp_path):
+        writer = BufferedLogWriter(flush_interval=60)
+        path = tmp_path / "log.txt"
+
+        writer.write(path, "a")
+        writer.close()
+        writer.write(path, "b")
+        writer.close()
+
+        assert path.read_text() == "ab"
+
+
+class TestSessionLogger:
+    """Test SessionLogger file output."""
+
+    def test_header_written_immediately(self, session_logger):
+        assert "SESSION 1" in session_logger.txt_file.read_text()
+        assert _jsonl_events(session_logger.jsonl_file) == ["session_start"]
+
+    def test_finalize_flushes_everything(self, session_logger):
+        session_logger.log_system_message("init", "hello")
+        session_logger.log_error(ValueError("boom"))
+
+        session_logger.finalize("continue", "done")
+
+        assert _jsonl_events(session_logger.jsonl_file) == [
+            "session_start", "system_message", "error", "session_end"
+        ]
+        text = session_logger.txt_file.read_text()
+        assert "[System: init]" in text
+        assert "SESSION SUMMARY" in text
+
+    def test_flush_is_durable(self, session_logger):
+        session_logger.log_system_message("init", "hello")
+
+        with patch('server.utils.observability.os.fsync') as mock_fsync:
+            session_logger.flush()
+
+        assert mock_fsync.call_count == 3  # jsonl + index + txt
+        assert _jsonl_events(session_logger.jsonl_file)[-1] == "system_message"
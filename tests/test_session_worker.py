@@ -0,0 +1,204 @@
+"""
+Tests for the out-of-process session worker.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from server.agent.session_worker import SessionWorker, run_session_job
+
+
+class FakeSession:
+    def __init__(self, number):
+        self.number = number
+
+    def to_dict(self):
+        return {"session_number": self.number}
+
+
+class FakeOrchestrator:
+    """Records calls; coding runs block until released."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.release = asyncio.Event()
+        self.session_managers = {}
+        self.stopped = []
+        self.stop_after_current = {}
+
+    async def start_initialization(self, project_id, initializer_model=None, progress_callback=None, priority=0):
+        await progress_callback({"type": "tool_use", "tool_name": "Read"})
+        if self.fail:
+            raise ValueError("Project already initialized")
+        return FakeSession(1)
+
+    async def start_coding_sessions(self, project_id, coding_model=None, max_iterations=0,
+                                    progress_callback=None, parallel=False, priority=0):
+        await self.release.wait()
+        return FakeSession(5)
+
+    async def stop_session(self, session_id, reason=""):
+        self.stopped.append(session_id)
+        self.release.set()
+        return True
+
+    def set_stop_after_current(self, project_id, stop=True):
+        self.stop_after_current[str(project_id)] = stop
+
+
+class FakeJobDB:
+    """In-memory stand-in for the session_jobs operations of TaskDatabase."""
+
+    def __init__(self, jobs):
+        self.queued = list(jobs)
+        self.rows = {}
+        self.finished = {}
+
+    async def claim_session_job(self, worker_id, ttl):
+        if not self.queued:
+            return None
+        job = self.queued.pop(0)
+        self.rows[job["id"]] = {
+            "id": job["id"], "project_id": job["project_id"], "stop_requested": False,
+            "stop_session_id": None, "stop_after_current": False,
+        }
+        return job
+
+    async def renew_session_jobs(self, worker_id, ttl):
+        return [dict(row) for job_id, row in self.rows.items() if job_id not in self.finished]
+
+    async def expire_session_jobs(self):
+        return 0
+
+    async def finish_session_job(self, job_id, error=None, result=None):
+        self.finished[job_id] = (error, result)
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    async def __call__(self, project_id, data):
+        self.events.append(data)
+
+    @property
+    def types(self):
+        return [data["type"] for data in self.events]
+
+
+def _job(kind, **params):
+    return {"id": uuid4(), "project_id": uuid4(), "kind": kind, "params": params}
+
+
+def _worker(db, orchestrator, notify, **kwargs):
+    async def provider():
+        return db
+    return SessionWorker(provider, orchestrator, notify, poll_interval=0.01, **kwargs)
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class TestRunSessionJob:
+    """Test the run shared by the API and the workers."""
+
+    @pytest.mark.asyncio
+    async def test_initialization_reports_progress_and_completion(self):
+        notify = Recorder()
+
+        result = await run_session_job(FakeOrchestrator(), "initialize", uuid4(), {}, notify)
+
+        assert result == {"session_number": 1}
+        assert notify.types == ["progress", "initialization_complete"]
+
+    @pytest.mark.asyncio
+    async def test_failure_sends_error_event_and_reraises(self):
+        notify = Recorder()
+
+        with pytest.raises(ValueError):
+            await run_session_job(FakeOrchestrator(fail=True), "initialize", uuid4(), {}, notify)
+
+        assert notify.types == ["progress", "initialization_error"]
+        assert notify.events[-1]["error"] == "Project already initialized"
+
+
+class TestSessionWorker:
+    """Test claiming, completion and stop requests."""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_and_records_results(self):
+        good, bad = _job("initialize"), _job("unknown")
+        db = FakeJobDB([good, bad])
+        worker = _worker(db, FakeOrchestrator(), Recorder())
+
+        await worker.start()
+        try:
+            await _wait_for(lambda: len(db.finished) == 2)
+        finally:
+            await worker.stop()
+
+        assert db.finished[good["id"]] == (None, {"session_number": 1})
+        assert "Unknown session job kind" in db.finished[bad["id"]][0]
+
+    @pytest.mark.asyncio
+    async def test_respects_concurrency(self):
+        db = FakeJobDB([_job("coding") for _ in range(3)])
+        orchestrator = FakeOrchestrator()
+        worker = _worker(db, orchestrator, Recorder(), concurrency=2)
+
+        await worker.start()
+        try:
+            await _wait_for(lambda: len(worker._jobs) == 2)
+            await asyncio.sleep(0.05)
+            assert len(db.queued) == 1
+            orchestrator.release.set()
+            await _wait_for(lambda: len(db.finished) == 3)
+        finally:
+            await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_applies_stop_requests(self):
+        job = _job("coding")
+        db = FakeJobDB([job])
+        orchestrator = FakeOrchestrator()
+        notify = Recorder()
+        worker = _worker(db, orchestrator, notify)
+        session_id = uuid4()
+
+        await worker.start()
+        try:
+            await _wait_for(lambda: job["id"] in db.rows)
+            db.rows[job["id"]].update(stop_after_current=True)
+            await worker.heartbeat()
+            assert orchestrator.stop_after_current == {str(job["project_id"]): True}
+
+            db.rows[job["id"]].update(stop_requested=True, stop_session_id=session_id)
+            await worker.heartbeat()
+            await worker.heartbeat()  # Applied once
+            await _wait_for(lambda: job["id"] in db.finished)
+        finally:
+            await worker.stop()
+
+        assert orchestrator.stopped == [session_id]
+        assert "session_stopped" in notify.types
+        assert worker._stopped_sessions == {}  # Pruned when the job finished
+
+    @pytest.mark.asyncio
+    async def test_shutdown_records_interrupted_runs(self):
+        job = _job("coding")
+        db = FakeJobDB([job])
+        orchestrator = FakeOrchestrator()
+        orchestrator.session_managers = {}
+        worker = _worker(db, orchestrator, Recorder())
+
+        await worker.start()
+        await _wait_for(lambda: job["id"] in worker._jobs)
+        await worker.stop()
+
+        assert db.finished[job["id"]] == ("Session worker shut down", None)
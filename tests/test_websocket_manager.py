@@ -0,0 +1,123 @@
+"""
+Tests for per-client WebSocket send queues.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from server.api.websocket_manager import SLOW_CLIENT_CLOSE_CODE, ConnectionManager
+
+
+def _websocket(send_text=None):
+    websocket = MagicMock()
+    websocket.send_text = send_text or AsyncMock()
+    websocket.close = AsyncMock()
+    return websocket
+
+
+async def _never_completes(text):
+    await asyncio.Event().wait()
+
+
+def _sent(websocket):
+    return [json.loads(c.args[0]) for c in websocket.send_text.await_args_list]
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestConnectionManager:
+    """Test broadcasting through per-client queues."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_reaches_project_clients(self):
+        manager = ConnectionManager()
+        ws_a, ws_b, ws_other = _websocket(), _websocket(), _websocket()
+        manager.connect("p1", ws_a)
+        manager.connect("p1", ws_b)
+        manager.connect("p2", ws_other)
+
+        assert await manager.broadcast("p1", {"type": "session_started"}) == 2
+        await _settle()
+
+        assert _sent(ws_a) == _sent(ws_b) == [{"type": "session_started"}]
+        ws_other.send_text.assert_not_awaited()
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_stalled_client_does_not_block_others(self):
+        manager = ConnectionManager(send_timeout=60)
+        stalled = _websocket(AsyncMock(side_effect=_never_completes))
+        healthy = _websocket()
+        manager.connect("p1", stalled)
+        manager.connect("p1", healthy)
+
+        for n in range(3):
+            await asyncio.wait_for(manager.broadcast("p1", {"type": "task_updated", "n": n}), timeout=1)
+        await _settle()
+
+        assert [m["n"] for m in _sent(healthy)] == [0, 1, 2]
+        await manager.close_all()
+        assert manager.connection_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self):
+        manager = ConnectionManager(queue_size=2)
+        client = manager.connect("p1", _websocket())
+        await client.close()  # Stop the writer so messages stay queued
+        client.closed = False
+
+        for n in range(3):
+            await manager.broadcast("p1", {"type": "task_updated", "n": n})
+
+        assert [json.loads(text)["n"] for _, text in client._pending] == [1, 2]
+        assert manager.get_stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_coalescing_keeps_newest_per_session(self):
+        manager = ConnectionManager(coalesce_types=["tool_use"])
+        client = manager.connect("p1", _websocket())
+        await client.close()
+        client.closed = False
+
+        await manager.broadcast("p1", {"type": "tool_use", "session_id": "s1", "tool_count": 1})
+        await manager.broadcast("p1", {"type": "tool_use", "session_id": "s2", "tool_count": 1})
+        await manager.broadcast("p1", {"type": "task_updated", "task_id": 7})
+        await manager.broadcast("p1", {"type": "tool_use", "session_id": "s1", "tool_count": 2})
+
+        queued = [json.loads(text) for _, text in client._pending]
+        assert [(m["type"], m.get("session_id"), m.get("tool_count")) for m in queued] == [
+            ("tool_use", "s2", 1),
+            ("task_updated", None, None),
+            ("tool_use", "s1", 2),
+        ]
+        assert manager.get_stats()["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_disconnects_client(self):
+        manager = ConnectionManager(send_timeout=0.01)
+        websocket = _websocket(AsyncMock(side_effect=_never_completes))
+        manager.connect("p1", websocket)
+
+        await manager.broadcast("p1", {"type": "progress"})
+        await asyncio.sleep(0.05)
+
+        assert manager.connection_count("p1") == 0
+        websocket.close.assert_awaited_once_with(code=SLOW_CLIENT_CLOSE_CODE)
+
+    @pytest.mark.asyncio
+    async def test_failed_send_removes_client(self):
+        manager = ConnectionManager()
+        client = manager.connect("p1", _websocket(AsyncMock(side_effect=RuntimeError("closed"))))
+
+        await manager.broadcast("p1", {"type": "progress"})
+        await _settle()
+
+        assert client.closed
+        assert manager.connection_count() == 0
+        assert await manager.broadcast("p1", {"type": "progress"}) == 0
@@ -0,0 +1,93 @@
+"""
+Tests for per-epic git worktree management used by parallel sessions.
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from server.agent.worktree import WorktreeManager
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git not installed")
+
+
+def _git(cwd: Path, *args: str) -> str:
+    result = subprocess.run(
+        ['git', *args], cwd=str(cwd), capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a git repository with one commit."""
+    project_dir = tmp_path / "generations" / "demo"
+    project_dir.mkdir(parents=True)
+    _git(project_dir, 'init', '-q')
+    _git(project_dir, 'config', 'user.email', 'test@example.com')
+    _git(project_dir, 'config', 'user.name', 'Test')
+    (project_dir / "README.md").write_text("demo\n")
+    _git(project_dir, 'add', '-A')
+    _git(project_dir, 'commit', '-q', '-m', 'initial')
+    return project_dir
+
+
+@pytest.fixture
+def worktrees(project):
+    return WorktreeManager(project, project.parent / ".worktrees")
+
+
+class TestWorktreeManager:
+    """Test worktree lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_is_available(self, worktrees, tmp_path):
+        assert await worktrees.is_available()
+
+        not_git = WorktreeManager(tmp_path / "plain", tmp_path / ".worktrees")
+        (tmp_path / "plain").mkdir()
+        assert not await not_git.is_available()
+
+    @pytest.mark.asyncio
+    async def test_create_merge_remove(self, worktrees, project):
+        path = await worktrees.create(1)
+
+        assert path == project.parent / ".worktrees" / "demo--epic-1"
+        assert (path / "README.md").exists()
+        assert _git(path, 'rev-parse', '--abbrev-ref', 'HEAD') == "yokeflow/epic-1"
+
+        # Uncommitted work in the worktree is committed and merged back
+        (path / "feature.txt").write_text("feature\n")
+        assert await worktrees.merge(1)
+        assert (project / "feature.txt").read_text() == "feature\n"
+
+        await worktrees.remove(1)
+        assert not path.exists()
+        assert _git(project, 'branch', '--list', 'yokeflow/epic-1') == ""
+
+    @pytest.mark.asyncio
+    async def test_create_reuses_existing_worktree(self, worktrees):
+        first = await worktrees.create(2)
+        (first / "wip.txt").write_text("wip\n")
+
+        second = await worktrees.create(2)
+
+        assert second == first
+        assert (second / "wip.txt").exists()
+
+    @pytest.mark.asyncio
+    async def test_merge_conflict_is_aborted(self, worktrees, project):
+        path = await worktrees.create(3)
+        (path / "README.md").write_text("from epic\n")
+
+        (project / "README.md").write_text("from main\n")
+        _git(project, 'commit', '-q', '-am', 'main change')
+
+        assert not await worktrees.merge(3)
+
+        # Main checkout is left clean and the worktree is kept for manual resolution
+        assert _git(project, 'status', '--porcelain') == ""
+        assert (project / "README.md").read_text() == "from main\n"
+        assert path.exists()
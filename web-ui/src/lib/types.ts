@@ -193,6 +193,8 @@ export interface WebSocketMessage {
     | 'initial_state'
     | 'progress_update'
     | 'progress'  // Real-time progress events from agent
+    | 'session_queued'  // Session waiting for a scheduler slot (position changed)
+    | 'session_admitted'  // Queued session got a slot and is starting
     | 'session_started'
     | 'session_complete'
     | 'initialization_complete'  // Initialization (Session 0) completed
@@ -207,8 +209,10 @@ export interface WebSocketMessage {
     | 'project_complete'  // Project fully complete
     | 'prompt_improvement_complete'  // Prompt improvement analysis completed
     | 'prompt_improvement_failed'  // Prompt improvement analysis failed
+    | 'deep_review_queued'  // Deep review queued for a session
     | 'deep_review_started'  // Deep review started for a session
     | 'deep_review_completed'  // Deep review completed successfully
+    | 'deep_review_retrying'  // Deep review attempt failed, will be retried
     | 'deep_review_failed';  // Deep review failed with error
   progress?: Progress;
   session_id?: string;
@@ -231,6 +235,17 @@ export interface WebSocketMessage {
   // Prompt improvement event fields
   analysis_id?: string;  // For prompt_improvement_complete/failed events
   proposals_count?: number;  // For prompt_improvement_complete event
+  // Deep review job fields
+  job_id?: string;  // For deep_review_* events
+  attempt?: number;  // For deep_review_* events
+  retry_in?: number;  // For deep_review_retrying event (seconds)
+  rating?: number;  // For deep_review_completed event
+  // Session scheduler fields
+  position?: number;  // For session_queued event (1 = next to run)
+  queue_length?: number;  // For session_queued event
+  priority?: number;  // For session_queued event
+  running?: number;  // For session_queued/session_admitted events (sessions running)
+  waited_seconds?: number;  // For session_admitted event
   // Real-time progress event data
   event?: {
     type: 'tool_use' | 'tool_result';
@@ -238,6 +253,8 @@ export interface WebSocketMessage {
     tool_id?: string;
     timestamp?: string;
     is_error?: boolean;
+    count?: number;  // Events merged into this snapshot
+    error_count?: number;  // Merged tool_result errors
   };
   project_id?: string;  // For all events
 }
@@ -525,6 +542,7 @@ export interface TriggerBulkReviewsRequest {
   last_n?: number;  // For 'last_n' mode
   session_ids?: string[];  // For 'range' mode
   session_number?: number;  // For 'single' mode
+  model?: string;  // Review model (default: server default)
 }
 
 /**
@@ -535,6 +553,8 @@ export interface TriggerBulkReviewsResponse {
   project_id: string;
   mode: string;
   sessions_triggered: number;
+  sessions_skipped?: number;  // Sessions with a review already queued or running
+  job_ids?: string[];
   status: string;
 }
 
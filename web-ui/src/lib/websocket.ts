@@ -114,13 +114,14 @@ export function useProjectWebSocket(
                 const event = data.event;
 
                 if (event.type === 'tool_use' && event.tool_name) {
-                  // Increment tool count
-                  setToolCount(prev => (prev || 0) + 1);
+                  // Increment tool count (the server merges bursts into one event with a count)
+                  const increment = event.count || 1;
+                  setToolCount(prev => (prev || 0) + increment);
 
                   // Optionally trigger callback if provided
                   if (onToolUseRef.current) {
                     // We don't have session_number in the event, so pass 0
-                    onToolUseRef.current(event.tool_name, (toolCount || 0) + 1, 0);
+                    onToolUseRef.current(event.tool_name, (toolCount || 0) + increment, 0);
                   }
                 } else if (event.type === 'tool_result') {
                   // Tool result received - could update UI if needed
@@ -245,7 +246,24 @@ export function useProjectWebSocket(
               }
               break;
 
+            // Session scheduler events
+            case 'session_queued':
+              console.log(`[WebSocket] Session queued: position ${data.position} of ${data.queue_length} (${data.running} running)`);
+              break;
+
+            case 'session_admitted':
+              console.log(`[WebSocket] Session admitted after ${data.waited_seconds}s in queue`);
+              break;
+
             // Deep review events
+            case 'deep_review_queued':
+              console.log(`[WebSocket] Deep review queued for session ${data.session_number}`);
+              break;
+
+            case 'deep_review_retrying':
+              console.warn(`[WebSocket] Deep review for session ${data.session_number} failed (attempt ${data.attempt}), retrying in ${data.retry_in}s:`, data.error);
+              break;
+
             case 'deep_review_started':
               console.log(`[WebSocket] Deep review started for session ${data.session_number}`);
               if (onDeepReviewStartedRef.current && data.session_id && data.session_number) {
@@ -282,8 +300,8 @@ export function useProjectWebSocket(
         console.log(`[WebSocket] Disconnected (code: ${event.code}, reason: ${event.reason})`);
         setConnected(false);
 
-        // Attempt to reconnect after 3 seconds
-        if (!event.wasClean) {
+        // Attempt to reconnect after 3 seconds (1013: server dropped us for falling behind)
+        if (!event.wasClean || event.code === 1013) {
           reconnectTimeoutRef.current = setTimeout(() => {
             console.log('[WebSocket] Attempting to reconnect...');
             connect();